@@ -0,0 +1,297 @@
+"""
+Admission Control and Load Shedding
+
+Under a burst every accepted request competes for CPU in TensorFlow and
+scipy, so all of them slow down. Admission control keeps the server at the
+load it can serve within its latency budget and rejects the rest quickly:
+
+- ClientRateLimiter: one token bucket per client that identifies itself
+  with an X-Client-ID header. An empty bucket returns 429 with Retry-After.
+  Requests without the header are not rate-limited: headsets behind one NAT
+  or proxy share a remote address and would share one bucket.
+- StageLimiter: bounded concurrency per pipeline stage with a bounded wait
+  queue. The expected wait of a new request is estimated from the queue
+  depth and an EWMA of recent service times; when the queue is full or the
+  estimate exceeds the stage's latency budget the request gets 503 with
+  Retry-After instead of queueing.
+
+Rejections are counted in ecg_requests_shed_total{stage, reason}; in-flight
+and queued requests per stage are exported as gauges.
+
+Author: Backend Developer 1
+Project: HoloHuman XR - Immerse the Bay 2025
+"""
+
+import math
+import threading
+import time
+from collections import OrderedDict
+
+from metrics import ADMISSION_IN_FLIGHT, ADMISSION_QUEUE_DEPTH, REQUESTS_SHED
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is shed (status 429 or 503)"""
+
+    def __init__(self, stage, reason, status_code, retry_after_s, message):
+        super().__init__(message)
+        self.stage = stage
+        self.reason = reason
+        self.status_code = status_code
+        self.retry_after_s = retry_after_s
+        self.message = message
+
+    @property
+    def retry_after_header(self):
+        """Retry-After value in whole seconds (at least 1)"""
+        return str(max(1, math.ceil(self.retry_after_s)))
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at rate tokens per second"""
+
+    def __init__(self, rate, burst, now):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = now
+
+    def try_acquire(self, now):
+        """
+        Take one token if available
+
+        Returns:
+            float: 0.0 if a token was taken, else seconds until one is available
+        """
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return 0.0
+
+        return (1.0 - self.tokens) / self.rate
+
+
+class ClientRateLimiter:
+    """
+    Per-client token buckets (LRU-bounded number of tracked clients)
+
+    Idle clients are dropped after idle_ttl_seconds; a full bucket is
+    recreated for them on their next request. clock returns seconds
+    (time.monotonic; tests inject a fake one).
+    """
+
+    def __init__(self, rate_per_second=5.0, burst=10, max_clients=4096, idle_ttl_seconds=300,
+                 clock=time.monotonic):
+        self.rate_per_second = rate_per_second
+        self.burst = burst
+        self.max_clients = max_clients
+        self.idle_ttl_seconds = idle_ttl_seconds
+        self.clock = clock
+
+        self._buckets = OrderedDict()  # client_id -> TokenBucket, least recently used first
+        self._lock = threading.Lock()
+
+    def acquire(self, client_id):
+        """
+        Spend one token of the client's bucket
+
+        Returns:
+            float: 0.0 if allowed, else seconds until the client may retry
+        """
+        now = self.clock()
+
+        with self._lock:
+            bucket = self._buckets.pop(client_id, None)
+            if bucket is None or now - bucket.updated > self.idle_ttl_seconds:
+                bucket = TokenBucket(self.rate_per_second, self.burst, now)
+            self._buckets[client_id] = bucket
+
+            while len(self._buckets) > self.max_clients:
+                self._buckets.popitem(last=False)
+
+            return bucket.try_acquire(now)
+
+    def tracked_clients(self):
+        with self._lock:
+            return len(self._buckets)
+
+
+class StageLimiter:
+    """
+    Bounded concurrency for one pipeline stage with latency-budget shedding
+
+    At most max_concurrency requests run the stage at once; up to max_queue
+    more wait. A request is rejected when the queue is full, when its
+    predicted wait exceeds latency_budget_s, or when it has waited that long
+    without getting a slot.
+    """
+
+    # Service time estimate before the first request completes (seconds)
+    INITIAL_SERVICE_TIME_S = 0.1
+
+    # Weight of the newest sample in the service time EWMA
+    EWMA_ALPHA = 0.2
+
+    def __init__(self, name, max_concurrency, max_queue, latency_budget_s):
+        self.name = name
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.max_queue = max(0, int(max_queue))
+        self.latency_budget_s = float(latency_budget_s)
+
+        self.active = 0
+        self.waiting = 0
+        self.service_time_s = self.INITIAL_SERVICE_TIME_S
+        self._condition = threading.Condition()
+
+        self.stats = {
+            'admitted': 0,
+            'queued': 0,
+            'shed_queue_full': 0,
+            'shed_latency_budget': 0,
+            'shed_queue_timeout': 0
+        }
+
+    def predicted_wait_s(self, waiting_ahead):
+        """Expected wait for a request with waiting_ahead requests queued in front of it"""
+        rounds = (waiting_ahead + self.active - self.max_concurrency + 1) / self.max_concurrency
+        return max(0.0, rounds) * self.service_time_s
+
+    def _reject(self, reason, retry_after_s, message):
+        self.stats[f'shed_{reason}'] += 1
+        REQUESTS_SHED.labels(self.name, reason).inc()
+        raise AdmissionRejected(self.name, reason, 503, retry_after_s, message)
+
+    def _publish(self):
+        ADMISSION_IN_FLIGHT.labels(self.name).set(self.active)
+        ADMISSION_QUEUE_DEPTH.labels(self.name).set(self.waiting)
+
+    def acquire(self):
+        """
+        Take a stage slot, waiting within the latency budget
+
+        Raises:
+            AdmissionRejected: 503 when the request is shed
+        """
+        with self._condition:
+            if self.active < self.max_concurrency and self.waiting == 0:
+                self.active += 1
+                self.stats['admitted'] += 1
+                self._publish()
+                return
+
+            predicted_wait_s = self.predicted_wait_s(self.waiting)
+
+            if self.waiting >= self.max_queue:
+                self._reject('queue_full', predicted_wait_s,
+                             f'{self.name} queue is full ({self.waiting} waiting)')
+
+            if predicted_wait_s > self.latency_budget_s:
+                self._reject('latency_budget', predicted_wait_s,
+                             f'Predicted {self.name} wait {predicted_wait_s * 1000:.0f}ms exceeds '
+                             f'budget {self.latency_budget_s * 1000:.0f}ms')
+
+            self.waiting += 1
+            self.stats['queued'] += 1
+            self._publish()
+
+            deadline = time.monotonic() + self.latency_budget_s
+            try:
+                while self.active >= self.max_concurrency:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._reject('queue_timeout', self.predicted_wait_s(self.waiting - 1),
+                                     f'Waited {self.latency_budget_s * 1000:.0f}ms for a {self.name} slot')
+                    self._condition.wait(remaining)
+            finally:
+                self.waiting -= 1
+                self._publish()
+
+            self.active += 1
+            self.stats['admitted'] += 1
+            self._publish()
+
+    def release(self, service_time_s):
+        """Free a slot and fold the request's service time into the estimate"""
+        with self._condition:
+            self.active -= 1
+            self.service_time_s += self.EWMA_ALPHA * (service_time_s - self.service_time_s)
+            self._publish()
+            self._condition.notify()
+
+    def slot(self):
+        """Acquire a slot now; release it with StageSlot.release() (idempotent)"""
+        self.acquire()
+        return StageSlot(self)
+
+    def get_stats(self):
+        with self._condition:
+            return {
+                'max_concurrency': self.max_concurrency,
+                'max_queue': self.max_queue,
+                'latency_budget_ms': round(self.latency_budget_s * 1000, 1),
+                'in_flight': self.active,
+                'queue_depth': self.waiting,
+                'service_time_ms': round(self.service_time_s * 1000, 2),
+                'predicted_wait_ms': round(self.predicted_wait_s(self.waiting) * 1000, 2),
+                **self.stats
+            }
+
+
+class StageSlot:
+    """A held StageLimiter slot; released once, with the time it was held"""
+
+    def __init__(self, limiter):
+        self.limiter = limiter
+        self.started = time.perf_counter()
+        self.released = False
+
+    def release(self):
+        if not self.released:
+            self.released = True
+            self.limiter.release(time.perf_counter() - self.started)
+
+
+class AdmissionController:
+    """Per-client rate limits in front of per-stage concurrency limits"""
+
+    def __init__(self, stages, client_limiter=None, enabled=True):
+        self.stages = {stage.name: stage for stage in stages}
+        self.client_limiter = client_limiter
+        self.enabled = enabled
+
+    def admit(self, stage_name, client_id=None):
+        """
+        Admit a request to a stage
+
+        Only requests with a client_id (X-Client-ID) are rate-limited.
+
+        Returns:
+            StageSlot or None (admission disabled)
+
+        Raises:
+            AdmissionRejected: 429 (client over its rate) or 503 (stage overloaded)
+        """
+        if not self.enabled:
+            return None
+
+        if self.client_limiter is not None and client_id:
+            retry_after_s = self.client_limiter.acquire(client_id)
+            if retry_after_s > 0:
+                REQUESTS_SHED.labels(stage_name, 'client_rate').inc()
+                raise AdmissionRejected(
+                    stage_name, 'client_rate', 429, retry_after_s,
+                    f'Client rate limit of {self.client_limiter.rate_per_second:g} requests/s exceeded'
+                )
+
+        return self.stages[stage_name].slot()
+
+    def get_stats(self):
+        return {
+            'enabled': self.enabled,
+            'client_rate_per_s': self.client_limiter.rate_per_second if self.client_limiter else None,
+            'client_burst': self.client_limiter.burst if self.client_limiter else None,
+            'tracked_clients': self.client_limiter.tracked_clients() if self.client_limiter else 0,
+            'stages': {name: stage.get_stats() for name, stage in self.stages.items()}
+        }
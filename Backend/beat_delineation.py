@@ -0,0 +1,419 @@
+"""
+Beat Delineation
+
+P wave, QRS complex and T wave onset/peak/offset for every beat, found from
+the signal rather than fixed offsets from the R-peak:
+
+- QRS: the steepest slopes within +-80 ms of the R-peak bound the complex;
+  onset/offset are where the slope stays below QRS_SLOPE_FRACTION of the
+  steepest one for FLAT_RUN_S (so the turn of a Q or S wave does not end it).
+- T and P (on the lead smoothed over WAVE_SMOOTHING_S): the steepest rise
+  and steepest fall in the search region after / before the QRS bracket the
+  wave, the peak lies between them (its polarity is the order of the two),
+  and onset/offset are where the slope falls below WAVE_SLOPE_FRACTION of
+  the limb's steepest slope, as in wavelet modulus-maxima delineators. No
+  isoelectric level is needed. A wave without both a rising and a falling
+  limb, or smaller than WAVE_MIN_FRACTION of the QRS amplitude, counts as
+  not detected.
+
+All beats and delineation leads are handled at once. The leads are
+bandpass-filtered together and per-sample features computed once over the
+(leads, samples) matrix; sliding_window_view over the padded features,
+indexed with the R-peaks, gives each stage a (beats, leads, window) array
+covering only the samples it searches (QRS around the R-peak, P before it,
+T after it), and every step is a masked argmax or a first/last-true search
+along the window axis. Per-lead landmarks are
+combined with the median over the leads that found the wave.
+
+/api/ecg/beat/<index> delineates one beat, /api/ecg/beats/details all of
+them, through the same code.
+
+Author: Backend Developer 1
+Project: HoloHuman XR - Immerse the Bay 2025
+"""
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.ndimage import maximum_filter1d, uniform_filter1d
+from scipy.signal import butter, filtfilt
+
+from waveform_codec import encode_waveform
+
+# Lead name -> column in the (samples, 12) signal (ECGHeartRateAnalyzer.LEAD_PRIORITY)
+LEAD_INDEX = {'II': 1, 'V1': 6, 'V5': 10, 'I': 0, 'aVF': 7}
+
+# Leads delineated alongside the R-peak detection lead
+DELINEATION_LEADS = ('II', 'V1', 'V5')
+
+# raw_samples: +-200 ms of the detection lead around the R-peak
+BEAT_HALF_WINDOW_S = 0.2
+
+# Delineation window after each R-peak, and how far into the neighbouring
+# RR intervals a beat may reach (fraction of the previous / next RR)
+WINDOW_AFTER_S = 0.6
+PREVIOUS_RR_FRACTION = 0.5
+NEXT_RR_FRACTION = 0.8
+
+# QRS: steepest slopes within +-QRS_SEARCH_S of the R-peak, boundaries within QRS_MAX_HALF_WIDTH_S
+QRS_SEARCH_S = 0.08
+QRS_MAX_HALF_WIDTH_S = 0.15
+QRS_SLOPE_FRACTION = 0.1
+FLAT_RUN_S = 0.015
+
+# P wave within P_SEARCH_S before QRS onset, T wave T_SEARCH_S after QRS offset
+P_SEARCH_S = 0.3
+T_SEARCH_S = (0.04, 0.5)
+WAVE_SMOOTHING_S = 0.02
+WAVE_SLOPE_FRACTION = 0.2
+WAVE_MIN_FRACTION = 0.05
+
+WIDE_QRS_MS = 120
+PROLONGED_PR_MS = 200
+SHORT_PR_MS = 120
+PROLONGED_QTC_MS = 470
+
+LANDMARKS = ('p_onset', 'p_peak', 'p_offset', 'qrs_onset', 'qrs_peak', 'qrs_offset',
+             't_onset', 't_peak', 't_offset')
+
+
+def stacked_beat_windows(lead_signal, r_peaks, half_window):
+    """
+    (beats, 2 * half_window) array of the lead centered on each R-peak
+
+    Samples outside the recording read as zeros; beat_start/beat_end give the
+    in-recording part of each window.
+
+    Returns:
+        tuple: (windows, beat_start, beat_end)
+    """
+    padded = np.pad(lead_signal, half_window)
+    windows = sliding_window_view(padded, 2 * half_window)[r_peaks]
+
+    beat_start = np.maximum(0, r_peaks - half_window)
+    beat_end = np.minimum(len(lead_signal), r_peaks + half_window)
+    return windows, beat_start, beat_end
+
+
+def bandpass_leads(ecg_signal, lead_indices, sampling_rate, filtered_leads=None):
+    """
+    (leads, samples) bandpass-filtered matrix of the given leads (one contiguous row per lead)
+
+    Uses the same filter as ECGHeartRateAnalyzer.bandpass_filter, so leads
+    already filtered for R-peak detection (signal sessions) are reused as is;
+    the rest are filtered in one call.
+    """
+    filtered_leads = filtered_leads or {}
+    filtered = np.empty((len(lead_indices), len(ecg_signal)), dtype=np.float32)
+
+    missing = [row for row, lead_index in enumerate(lead_indices) if lead_index not in filtered_leads]
+    if missing:
+        nyquist = 0.5 * sampling_rate
+        b, a = butter(2, [0.5 / nyquist, 40 / nyquist], btype='band')
+        filtered[missing] = filtfilt(b, a, ecg_signal[:, [lead_indices[row] for row in missing]].T, axis=-1)
+
+    for row, lead_index in enumerate(lead_indices):
+        if lead_index in filtered_leads:
+            filtered[row] = filtered_leads[lead_index]
+
+    return filtered
+
+
+def _first(mask):
+    """Index of the first True along the last axis (-1 if none)"""
+    return np.where(mask.any(axis=-1), mask.argmax(axis=-1), -1)
+
+
+def _last(mask):
+    """Index of the last True along the last axis (-1 if none)"""
+    return np.where(mask.any(axis=-1), mask.shape[-1] - 1 - mask[..., ::-1].argmax(axis=-1), -1)
+
+
+def _masked_argmax(values, mask):
+    """Index of the largest value where mask is True (-1 if mask is empty)"""
+    return np.where(mask.any(axis=-1), np.where(mask, values, -np.inf).argmax(axis=-1), -1)
+
+
+def _take(values, index):
+    """values[..., index] per row (index clipped into the window)"""
+    index = np.clip(index, 0, values.shape[-1] - 1).astype(np.int64)
+    return np.take_along_axis(values, index[..., None], axis=-1)[..., 0]
+
+
+def _lead_median(values, detected):
+    """Median over the leads that detected the landmark (NaN if none did)"""
+    ordered = np.sort(np.where(detected, values, np.nan), axis=1)  # NaN sorts last
+    count = detected.sum(axis=1)
+    low = np.take_along_axis(ordered, (np.maximum(count - 1, 0) // 2)[:, None], axis=1)[:, 0]
+    high = np.take_along_axis(ordered, np.minimum(count // 2, ordered.shape[1] - 1)[:, None], axis=1)[:, 0]
+    return np.where(count > 0, (low + high) / 2, np.nan)
+
+
+def _delineate_wave(signal, slope, start, region, bounds, floor, ceiling, min_amplitude):
+    """
+    Onset, peak and offset of the wave between the steepest rise and fall in region
+
+    Args:
+        signal, slope: (beats, leads, window) smoothed lead and its slope, window
+                       index 0 at `start` samples from the R-peak
+        region: Where the wave's limbs are searched
+        bounds: Where its onset / offset may lie; floor / ceiling (relative to the
+                R-peak) when not found
+        min_amplitude: (beats, leads) smallest peak-to-boundary amplitude
+
+    Returns:
+        tuple: (onset, peak, offset, detected) arrays over (beats, leads), relative to the R-peak
+    """
+    window = np.arange(signal.shape[-1])
+    abs_slope = np.abs(slope)
+
+    rise = _masked_argmax(slope, region)
+    fall = _masked_argmax(-slope, region)
+    polarity = np.where(rise < fall, 1.0, -1.0)
+    first, second = np.minimum(rise, fall), np.maximum(rise, fall)
+
+    between = region & (window >= first[..., None]) & (window <= second[..., None])
+    peak = _masked_argmax(signal * polarity[..., None], between)
+
+    onset = _last(bounds & (window < first[..., None])
+                  & (abs_slope < WAVE_SLOPE_FRACTION * _take(abs_slope, first)[..., None]))
+    offset = _first(bounds & (window > second[..., None])
+                    & (abs_slope < WAVE_SLOPE_FRACTION * _take(abs_slope, second)[..., None]))
+    onset = np.where(onset >= 0, onset, floor - start)
+    offset = np.where(offset >= 0, offset, ceiling - start)
+
+    amplitude = polarity * (_take(signal, peak) - (_take(signal, onset) + _take(signal, offset)) / 2)
+    detected = ((rise >= 0) & (fall >= 0) & (_take(slope, rise) > 0) & (_take(slope, fall) < 0)
+                & (amplitude >= min_amplitude))
+    return onset + start, peak + start, offset + start, detected
+
+
+def delineate_beats(ecg_signal, r_peaks, lead_used, sampling_rate, filtered_leads=None,
+                    leads=DELINEATION_LEADS, beat_indices=None):
+    """
+    P/QRS/T landmarks, intervals and annotations for every beat
+
+    Args:
+        ecg_signal: (samples, 12) array
+        r_peaks: R-peak sample indices (all beats of the recording)
+        lead_used: Lead name the R-peaks were detected on (always delineated)
+        sampling_rate: Hz
+        filtered_leads: Optional {lead_index: bandpass-filtered lead} to reuse
+        leads: Lead names to delineate and combine
+        beat_indices: Optional subset of beats to delineate; neighbouring
+                      R-peaks still bound each beat's search regions
+
+    Returns:
+        dict of per-beat arrays: absolute landmark samples (NaN when a wave is
+        not detected), pr/qrs/qt/qtc intervals in ms, 'annotations' (list of
+        str), per-lead landmarks and the detection lead's beat windows
+    """
+    all_peaks = np.asarray(r_peaks, dtype=np.int64)
+    selected = np.arange(len(all_peaks)) if beat_indices is None else np.asarray(beat_indices, dtype=np.int64)
+    beats = all_peaks[selected]
+    num_samples = len(ecg_signal)
+
+    lead_names = [lead_used] + [lead for lead in leads if lead != lead_used]
+    lead_indices = [LEAD_INDEX.get(lead, 1) for lead in lead_names]
+    num_leads = len(lead_names)
+
+    def samples(duration_s):
+        return int(round(duration_s * sampling_rate))
+
+    search, max_half_width = samples(QRS_SEARCH_S), samples(QRS_MAX_HALF_WIDTH_S)
+    before = max_half_width + samples(P_SEARCH_S)
+    after = samples(WINDOW_AFTER_S)
+
+    # Per-sample features on the (leads, samples) matrix: slope, the largest slope over the
+    # FLAT_RUN_S samples ending at / starting at each sample, and the smoothed lead for P and T
+    filtered = bandpass_leads(ecg_signal, lead_indices, sampling_rate, filtered_leads)
+    sample_slope = np.abs(np.gradient(filtered, axis=-1))
+    run = samples(FLAT_RUN_S) | 1
+    smoothed = uniform_filter1d(filtered, max(1, samples(WAVE_SMOOTHING_S)), axis=-1)
+
+    # Each beat may use the recording between its share of the neighbouring RR intervals
+    has_previous, has_next = selected > 0, selected < len(all_peaks) - 1
+    previous_peaks = all_peaks[np.maximum(selected - 1, 0)]
+    next_peaks = all_peaks[np.minimum(selected + 1, len(all_peaks) - 1)]
+    left = np.where(has_previous, beats - (PREVIOUS_RR_FRACTION * (beats - previous_peaks)).astype(np.int64), 0)
+    right = np.where(has_next, beats + (NEXT_RR_FRACTION * (next_peaks - beats)).astype(np.int64), num_samples)
+    left, right = np.maximum(left, 0) - beats, np.minimum(right, num_samples) - beats
+
+    def stack(*features, start, stop):
+        """
+        (beats, leads, stop - start) stacks of per-sample features from `start` to `stop`
+        samples around each R-peak, and where those samples are usable
+        """
+        stacks = []
+        for feature in features:
+            padded = np.pad(feature, ((0, 0), (before, after)))
+            view = sliding_window_view(padded, stop - start, axis=-1)
+            stacks.append(view[:, beats + before + start].transpose(1, 0, 2))
+        relative = np.arange(start, stop)
+        usable = (relative >= left[:, None]) & (relative < right[:, None])
+        return (*stacks, usable[:, None, :])
+
+    # QRS: steepest slopes either side of the R-peak, boundaries where the slope stays flat
+    start = -max_half_width
+    signal, abs_slope, run_max_before, run_max_after, valid = stack(
+        filtered, sample_slope,
+        maximum_filter1d(sample_slope, run, axis=-1, origin=run // 2),
+        maximum_filter1d(sample_slope, run, axis=-1, origin=-(run // 2)),
+        start=start, stop=max_half_width + 1)
+    window = np.arange(start, max_half_width + 1)
+
+    steepest_up = _masked_argmax(abs_slope, valid & (window >= -search) & (window <= 0))
+    steepest_down = _masked_argmax(abs_slope, valid & (window >= 0) & (window <= search))
+    threshold = QRS_SLOPE_FRACTION * np.maximum(_take(abs_slope, steepest_up), _take(abs_slope, steepest_down))
+
+    qrs_onset = _last(valid & (run_max_before < threshold[..., None]) & (window < (steepest_up + start)[..., None]))
+    qrs_offset = _first(valid & (run_max_after < threshold[..., None]) & (window > (steepest_down + start)[..., None]))
+    qrs_detected = (qrs_onset >= 0) & (qrs_offset >= 0)
+    qrs_onset = np.where(qrs_onset >= 0, qrs_onset + start, -max_half_width)
+    qrs_offset = np.where(qrs_offset >= 0, qrs_offset + start, max_half_width)
+
+    in_qrs = valid & (window >= qrs_onset[..., None]) & (window <= qrs_offset[..., None])
+    qrs_amplitude = np.where(in_qrs, signal, -np.inf).max(axis=-1) - np.where(in_qrs, signal, np.inf).min(axis=-1)
+    qrs_amplitude = np.where(np.isfinite(qrs_amplitude), qrs_amplitude, 0.0)
+    min_amplitude = WAVE_MIN_FRACTION * qrs_amplitude
+
+    # Largest deflection from the level at QRS onset
+    qrs_peak = _masked_argmax(np.abs(signal - _take(signal, qrs_onset - start)[..., None]), in_qrs) + start
+
+    # T wave after the QRS, its offset up to the end of the beat's share
+    wave_slope = np.gradient(smoothed, axis=-1)
+    wave_signal, slope, valid = stack(smoothed, wave_slope, start=0, stop=after)
+    window = np.arange(after)
+    t_bounds = valid & (window >= qrs_offset[..., None])
+    t_region = (t_bounds & (window > (qrs_offset + samples(T_SEARCH_S[0]))[..., None])
+                & (window <= (qrs_offset + samples(T_SEARCH_S[1]))[..., None]))
+    t_ceiling = np.broadcast_to(_last(valid), qrs_offset.shape)
+    t_onset, t_peak, t_offset, t_detected = _delineate_wave(
+        wave_signal, slope, 0, t_region, t_bounds, qrs_offset, t_ceiling, min_amplitude)
+
+    # P wave before the QRS; the search stops half a smoothing window short of QRS onset
+    # so the QRS slope does not leak in
+    start = -before
+    wave_signal, slope, valid = stack(smoothed, wave_slope, start=start, stop=0)
+    window = np.arange(start, 0)
+    p_floor = np.maximum(qrs_onset - samples(P_SEARCH_S), _first(valid) + start)
+    p_ceiling = qrs_onset - samples(WAVE_SMOOTHING_S) // 2
+    p_region = valid & (window >= p_floor[..., None]) & (window <= p_ceiling[..., None])
+    p_onset, p_peak, p_offset, p_detected = _delineate_wave(
+        wave_signal, slope, start, p_region, p_region, p_floor, p_ceiling, min_amplitude)
+
+    lead_landmarks = {
+        'p_onset': (p_onset, p_detected), 'p_peak': (p_peak, p_detected), 'p_offset': (p_offset, p_detected),
+        'qrs_onset': (qrs_onset, qrs_detected), 'qrs_peak': (qrs_peak, qrs_detected),
+        'qrs_offset': (qrs_offset, qrs_detected),
+        't_onset': (t_onset, t_detected), 't_peak': (t_peak, t_detected), 't_offset': (t_offset, t_detected)
+    }
+
+    # Combine leads: a wave counts when at least half of the leads found it
+    to_absolute = beats.astype(float)
+    landmarks = {}
+    for name, (values, detected) in lead_landmarks.items():
+        majority = 2 * detected.sum(axis=1) >= num_leads
+        landmarks[name] = np.where(majority, _lead_median(values, detected), np.nan) + to_absolute
+
+    # The QRS is always reported; the detection lead decides when the leads disagree
+    for name in ('qrs_onset', 'qrs_peak', 'qrs_offset'):
+        fallback = lead_landmarks[name][0][:, 0] + to_absolute
+        landmarks[name] = np.where(np.isnan(landmarks[name]), fallback, landmarks[name])
+
+    pr_interval_ms = (landmarks['qrs_onset'] - landmarks['p_onset']) / sampling_rate * 1000
+    qrs_duration_ms = (landmarks['qrs_offset'] - landmarks['qrs_onset']) / sampling_rate * 1000
+    qt_interval_ms = (landmarks['t_offset'] - landmarks['qrs_onset']) / sampling_rate * 1000
+
+    # Bazett QTc with the preceding RR interval (following one for the first beat)
+    rr_samples = np.where(has_previous, beats - previous_peaks,
+                          np.where(has_next, next_peaks - beats, 0)).astype(float)
+    rr_samples[rr_samples <= 0] = np.nan
+    qtc_interval_ms = qt_interval_ms / np.sqrt(rr_samples / sampling_rate)
+
+    with np.errstate(invalid='ignore'):
+        annotations = np.select(
+            [qrs_duration_ms > WIDE_QRS_MS,
+             np.isnan(landmarks['p_peak']),
+             pr_interval_ms > PROLONGED_PR_MS,
+             pr_interval_ms < SHORT_PR_MS,
+             qtc_interval_ms > PROLONGED_QTC_MS],
+            ["Wide QRS complex (possible bundle branch block)",
+             "No P wave detected (possible atrial fibrillation or junctional rhythm)",
+             "Prolonged PR interval (possible AV block)",
+             "Short PR interval (possible pre-excitation)",
+             "Prolonged QTc interval"],
+            default="Normal sinus beat"
+        ).tolist()
+
+    # raw_samples: unfiltered detection lead, +-200 ms
+    half_window = int(BEAT_HALF_WINDOW_S * sampling_rate)
+    windows, beat_start, beat_end = stacked_beat_windows(ecg_signal[:, lead_indices[0]], beats, half_window)
+
+    return {
+        'r_peak': beats,
+        **landmarks,
+        'pr_interval_ms': pr_interval_ms,
+        'qrs_duration_ms': qrs_duration_ms,
+        'qt_interval_ms': qt_interval_ms,
+        'qtc_interval_ms': qtc_interval_ms,
+        'annotations': annotations,
+        'lead_landmarks': {
+            name: np.where(detected, values + to_absolute[:, None], np.nan)
+            for name, (values, detected) in lead_landmarks.items()
+        },
+        'leads': lead_names,
+        'windows': windows,
+        'beat_start': beat_start,
+        'beat_end': beat_end,
+        'window_offset': beat_start - (beats - half_window),
+        'lead_used': lead_used
+    }
+
+
+def _sample_or_none(value):
+    return None if np.isnan(value) else int(round(value))
+
+
+def _ms_or_none(value):
+    return None if np.isnan(value) else round(float(value), 1)
+
+
+def beat_details(delineation, include_samples=True, waveform_encoding='json'):
+    """
+    Per-beat response dicts (the /api/ecg/beat/<index> layout) from delineate_beats()
+
+    Landmarks and intervals of undetected waves are None. raw_samples is
+    encoded with waveform_codec.encode_waveform (waveform_encoding).
+
+    Returns:
+        list: one dict per beat, in R-peak order
+    """
+    columns = {name: delineation[name].tolist() for name in LANDMARKS}
+    intervals = {
+        name: delineation[name].tolist()
+        for name in ('pr_interval_ms', 'qrs_duration_ms', 'qt_interval_ms', 'qtc_interval_ms')
+    }
+    window_offset = delineation['window_offset'].tolist()
+    window_length = (delineation['beat_end'] - delineation['beat_start']).tolist()
+
+    details = []
+    for index, r_peak in enumerate(delineation['r_peak'].tolist()):
+        def wave(prefix):
+            return {
+                point: _sample_or_none(columns[f'{prefix}_{point}'][index])
+                for point in ('onset', 'peak', 'offset')
+            }
+
+        detail = {
+            'r_peak_sample': r_peak,
+            'waveform': {'p_wave': wave('p'), 'qrs_complex': wave('qrs'), 't_wave': wave('t')},
+            'intervals': {name: _ms_or_none(values[index]) for name, values in intervals.items()},
+            'annotations': delineation['annotations'][index]
+        }
+        if include_samples:
+            offset = window_offset[index]
+            detail['raw_samples'] = encode_waveform(
+                delineation['windows'][index, offset:offset + window_length[index]], waveform_encoding)
+        details.append(detail)
+
+    return details
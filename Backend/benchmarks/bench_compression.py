@@ -0,0 +1,178 @@
+"""
+Benchmark: request / response compression over a simulated headset link
+
+Runs the API in-process (werkzeug, threaded) behind a TCP proxy that models
+a constrained link: each direction is serialized at the link bandwidth and
+delivered after a one-way delay (RTT / 2). Measures end-to-end latency of
+/api/ecg/analyze and /api/ecg/beat/<i> with a Unity-style JSON body
+(4 decimal places) for identity, gzip and zstd in both directions.
+
+Usage (from Backend/):
+    python benchmarks/bench_compression.py [--iterations 10] [--links 10:30,50:10]
+        --links: comma-separated bandwidth_mbps:rtt_ms profiles
+"""
+
+import argparse
+import json
+import os
+import queue
+import socket
+import sys
+import threading
+import time
+
+import numpy as np
+import requests
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.join(BACKEND_DIR, 'data'))
+
+from generate_test_ecg import generate_synthetic_ecg
+from compression import SUPPORTED_ENCODINGS, compress
+
+
+class ThrottledLinkProxy:
+    """TCP proxy: per-direction bandwidth limit plus one-way propagation delay"""
+
+    def __init__(self, upstream_port, bandwidth_mbps, rtt_ms):
+        self.upstream_port = upstream_port
+        self.bytes_per_s = bandwidth_mbps * 1e6 / 8
+        self.one_way_s = rtt_ms / 2000
+
+        self.listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.listener.bind(('127.0.0.1', 0))
+        self.listener.listen(16)
+        self.port = self.listener.getsockname()[1]
+
+        threading.Thread(target=self._accept_loop, daemon=True).start()
+
+    def close(self):
+        self.listener.close()
+
+    def _accept_loop(self):
+        while True:
+            try:
+                client, _ = self.listener.accept()
+            except OSError:
+                return
+            upstream = socket.create_connection(('127.0.0.1', self.upstream_port))
+            for sock in (client, upstream):
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self._start_direction(client, upstream)
+            self._start_direction(upstream, client)
+
+    def _start_direction(self, source, destination):
+        """Reader timestamps chunks as the link would deliver them; writer waits and sends"""
+        chunks = queue.Queue()
+
+        def read():
+            link_free_at = 0.0
+            while True:
+                try:
+                    data = source.recv(16384)
+                except OSError:
+                    data = b''
+                if not data:
+                    chunks.put((0.0, None))
+                    return
+                # Serialization on the link, then propagation
+                link_free_at = max(time.perf_counter(), link_free_at) + len(data) / self.bytes_per_s
+                chunks.put((link_free_at + self.one_way_s, data))
+
+        def write():
+            while True:
+                deliver_at, data = chunks.get()
+                if data is None:
+                    try:
+                        destination.shutdown(socket.SHUT_WR)
+                    except OSError:
+                        pass
+                    return
+                delay = deliver_at - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                try:
+                    destination.sendall(data)
+                except OSError:
+                    return
+
+        threading.Thread(target=read, daemon=True).start()
+        threading.Thread(target=write, daemon=True).start()
+
+
+def start_server():
+    """Serve ecg_api on an ephemeral port in a background thread"""
+    from werkzeug.serving import make_server
+    import ecg_api
+
+    ecg_api.initialize()
+    server = make_server('127.0.0.1', 0, ecg_api.app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run_case(session, url, body, request_encoding, accept_encoding, iterations):
+    """Median end-to-end latency (including client-side compression) and bytes on the wire"""
+    headers = {'Content-Type': 'application/json', 'Accept-Encoding': accept_encoding or 'identity'}
+    if request_encoding:
+        headers['Content-Encoding'] = request_encoding
+
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        wire_request = compress(body, request_encoding) if request_encoding else body
+        response = session.post(url, data=wire_request, headers=headers, stream=True)
+        wire_body = response.raw.read(decode_content=False)
+        timings.append((time.perf_counter() - start) * 1000)
+
+        if response.status_code != 200:
+            raise RuntimeError(f'{url}: {response.status_code}')
+
+    return float(np.median(timings)), len(wire_request), len(wire_body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compression over a constrained link')
+    parser.add_argument('--iterations', type=int, default=10)
+    parser.add_argument('--links', default='10:30,50:10', help='bandwidth_mbps:rtt_ms profiles')
+    args = parser.parse_args()
+
+    np.random.seed(42)
+    ecg_signal = np.round(generate_synthetic_ecg(), 4)
+    body = json.dumps({'ecg_signal': ecg_signal.tolist(), 'output_mode': 'clinical_expert'}).encode()
+
+    server = start_server()
+    encodings = [None] + list(SUPPORTED_ENCODINGS)
+
+    print("=" * 92)
+    print(f"COMPRESSION OVER A CONSTRAINED LINK (request body {len(body) / 1024:.0f} KB JSON)")
+    print("=" * 92)
+
+    for profile in args.links.split(','):
+        bandwidth_mbps, rtt_ms = (float(value) for value in profile.split(':'))
+        proxy = ThrottledLinkProxy(server.server_port, bandwidth_mbps, rtt_ms)
+        session = requests.Session()
+
+        print(f"\nLink: {bandwidth_mbps:g} Mbit/s, {rtt_ms:g} ms RTT")
+        print(f"{'Endpoint':<20} {'Upload':<8} {'Download':<9} {'Sent (KB)':<11} {'Received (KB)':<14} {'Median (ms)':<12}")
+        print("-" * 80)
+
+        for path in ['/api/ecg/analyze', '/api/ecg/beat/3']:
+            url = f'http://127.0.0.1:{proxy.port}{path}'
+            run_case(session, url, body, None, None, 1)  # Warm result / LLM caches
+
+            for encoding in encodings:
+                median_ms, sent, received = run_case(session, url, body, encoding, encoding, args.iterations)
+                label = encoding or 'identity'
+                print(f"{path:<20} {label:<8} {label:<9} {sent / 1024:<11.1f} {received / 1024:<14.1f} {median_ms:<12.1f}")
+
+        session.close()
+        proxy.close()
+
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark: P/QRS/T delineation throughput (beats per second)
+
+Delineates every beat of 10 s, 60 s and 120 s recordings with 1, 3 and 5
+leads in one vectorized delineate_beats() call, and compares with
+delineating the same beats one at a time (beat_indices=[i], the cost of one
+/api/ecg/beat/<index> request each). Filtering is included, as in a
+request without a signal session.
+
+Usage (from Backend/):
+    python benchmarks/bench_delineation.py [--iterations 20]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.join(BACKEND_DIR, 'data'))
+
+from generate_test_ecg import generate_synthetic_ecg
+from ecg_heartrate_analyzer import ECGHeartRateAnalyzer
+from beat_delineation import delineate_beats
+
+RECORDING_SECONDS = (10.24, 60.0, 120.0)
+LEAD_SETS = (('II',), ('II', 'V1', 'V5'), ('II', 'V1', 'V5', 'I', 'aVF'))
+
+# Vectorized throughput targets (beats/s) for the default three leads
+TARGET_BEATS_PER_S = {10.24: 3000, 60.0: 8000, 120.0: 8000}
+
+
+def time_call(func, iterations):
+    """Run func repeatedly and return the median in ms"""
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return float(np.median(timings))
+
+
+def bench_recording(analyzer, ecg_signal, iterations):
+    duration_s = len(ecg_signal) / analyzer.fs
+    r_peaks, lead_used, _, _ = analyzer.detect_r_peaks(ecg_signal)
+    r_peaks = np.asarray(r_peaks, dtype=np.int64)
+
+    print(f"\nRecording: {duration_s:.2f} s, {len(r_peaks)} beats")
+    print(f"{'Leads':<8} {'All beats (ms)':<16} {'Beats/s':<12} {'Per beat (ms)':<15} {'Speedup':<9} {'Target':<8}")
+    print("-" * 72)
+
+    for leads in LEAD_SETS:
+        vectorized_ms = time_call(
+            lambda: delineate_beats(ecg_signal, r_peaks, lead_used, analyzer.fs, leads=leads), iterations)
+
+        # One beat at a time (a sample of beats on long recordings)
+        sample = range(0, len(r_peaks), max(1, len(r_peaks) // 20))
+        per_beat_ms = time_call(
+            lambda: [delineate_beats(ecg_signal, r_peaks, lead_used, analyzer.fs, leads=leads, beat_indices=[i])
+                     for i in sample], max(1, iterations // 4)) / len(sample)
+
+        beats_per_s = len(r_peaks) / (vectorized_ms / 1000)
+        target = TARGET_BEATS_PER_S[duration_s] if len(leads) == 3 else None
+        status = '-' if target is None else ('PASS' if beats_per_s >= target else 'MISS')
+
+        print(f"{len(leads):<8} {vectorized_ms:<16.2f} {beats_per_s:<12,.0f} {per_beat_ms:<15.2f} "
+              f"{per_beat_ms * len(r_peaks) / vectorized_ms:<9.1f} {status:<8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Beat delineation throughput')
+    parser.add_argument('--iterations', type=int, default=20)
+    args = parser.parse_args()
+
+    print("=" * 72)
+    print("BEAT DELINEATION BENCHMARK")
+    print("=" * 72)
+    print(f"Targets (3 leads): {', '.join(f'{s:g} s >= {t:,} beats/s' for s, t in TARGET_BEATS_PER_S.items())}")
+
+    analyzer = ECGHeartRateAnalyzer(sampling_rate=400)
+    for duration_s in RECORDING_SECONDS:
+        np.random.seed(42)
+        ecg_signal = generate_synthetic_ecg(duration_sec=duration_s).astype(np.float32)
+        bench_recording(analyzer, ecg_signal, args.iterations)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""
+Benchmark: micro-batching InferenceScheduler vs direct predict calls
+
+Simulates N concurrent callers each predicting one (4096, 12) signal and
+reports throughput, latency percentiles and the scheduler's batch-size
+histogram for several max_batch_size / max_wait_ms settings.
+
+Uses model/model.hdf5 when present, otherwise a small stand-in Keras model
+with the same input/output shape (absolute numbers then only show overhead).
+
+Usage (from Backend/):
+    python benchmarks/bench_inference_scheduler.py [--requests 128] [--concurrency 32]
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from model_loader import ECGModelLoader, InferenceScheduler
+
+
+def build_loader():
+    """Load the real model, or a stand-in model with the same shapes"""
+    loader = ECGModelLoader(model_path=os.path.join(BACKEND_DIR, 'model', 'model.hdf5'))
+    if loader.load_model():
+        print(f"Using model: {loader.model_path}")
+        return loader
+
+    import keras
+
+    print("model/model.hdf5 not found - using stand-in Conv1D model")
+    inputs = keras.Input((4096, 12))
+    x = keras.layers.Conv1D(64, 16, strides=4, activation='relu')(inputs)
+    x = keras.layers.Conv1D(64, 16, strides=4, activation='relu')(x)
+    x = keras.layers.GlobalAveragePooling1D()(x)
+    outputs = keras.layers.Dense(6, activation='sigmoid')(x)
+    loader.model = keras.Model(inputs, outputs)
+    loader.simulation_mode = False
+    loader.predict(np.zeros((4096, 12), dtype=np.float32))  # Warmup
+    return loader
+
+
+def run(predict, signals, concurrency):
+    """Run predictions from a thread pool, return (total_s, latencies_ms)"""
+    def timed(signal):
+        start = time.perf_counter()
+        predict(signal)
+        return (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies = list(pool.map(timed, signals))
+    return time.perf_counter() - start, np.array(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='InferenceScheduler benchmark')
+    parser.add_argument('--requests', type=int, default=128)
+    parser.add_argument('--concurrency', type=int, default=32)
+    args = parser.parse_args()
+
+    loader = build_loader()
+    signals = np.random.randn(args.requests, 4096, 12).astype(np.float32)
+
+    print(f"\n{'Mode':<28} {'Req/s':<10} {'p50 (ms)':<10} {'p99 (ms)':<10} {'Avg batch':<10}")
+    print("-" * 70)
+
+    total_s, latencies = run(loader.predict, signals, args.concurrency)
+    print(f"{'direct predict()':<28} {args.requests / total_s:<10.1f} "
+          f"{np.percentile(latencies, 50):<10.1f} {np.percentile(latencies, 99):<10.1f} {'1.0':<10}")
+
+    for max_batch_size, max_wait_ms in [(8, 2), (16, 5), (32, 5), (32, 10)]:
+        scheduler = InferenceScheduler(loader, max_batch_size=max_batch_size, max_wait_ms=max_wait_ms)
+        total_s, latencies = run(scheduler.predict, signals, args.concurrency)
+        stats = scheduler.get_stats()
+        label = f"scheduler b={max_batch_size} w={max_wait_ms}ms"
+        print(f"{label:<28} {args.requests / total_s:<10.1f} "
+              f"{np.percentile(latencies, 50):<10.1f} {np.percentile(latencies, 99):<10.1f} "
+              f"{stats['avg_batch_size']:<10}")
+
+    print(f"\nLast batch-size histogram: {stats['batch_size_histogram']}")
+    print(f"Last queue-depth histogram: {stats['queue_depth_histogram']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""
+Benchmark: JSON vs binary ECG ingestion
+
+Compares the cost of turning a request body into a (4096, 12) float32 array:
+1. JSON nested list -> json.loads -> np.array (original path)
+2. application/octet-stream float32 -> np.frombuffer (zero-copy)
+3. application/octet-stream int16 -> np.frombuffer + scale to mV
+4. application/x-npy float32 -> header parse + np.frombuffer
+
+Also measures end-to-end /api/ecg/beats latency for JSON vs binary bodies
+through the Flask test client (no server needed).
+
+Usage (from Backend/):
+    python benchmarks/bench_ingestion.py [--iterations 50]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.join(BACKEND_DIR, 'data'))
+
+from generate_test_ecg import generate_synthetic_ecg
+from ecg_payload import decode_binary_ecg, encode_raw_ecg, encode_npy_ecg
+
+
+def time_call(func, iterations):
+    """Run func repeatedly and return (median_ms, p95_ms)"""
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return float(np.median(timings)), float(np.percentile(timings, 95))
+
+
+def bench_decoding(ecg_signal, iterations):
+    """Decode-only comparison (no Flask)"""
+    json_body = json.dumps({'ecg_signal': ecg_signal.tolist()}).encode()
+    raw_f32, raw_f32_headers = encode_raw_ecg(ecg_signal, dtype='float32')
+    raw_i16, raw_i16_headers = encode_raw_ecg(ecg_signal, dtype='int16')
+    npy_body, npy_headers = encode_npy_ecg(ecg_signal)
+
+    cases = [
+        ('JSON nested list', json_body,
+         lambda: np.array(json.loads(json_body)['ecg_signal'], dtype=np.float32)),
+        ('octet-stream float32', raw_f32,
+         lambda: decode_binary_ecg(raw_f32, raw_f32_headers['Content-Type'], raw_f32_headers)),
+        ('octet-stream int16', raw_i16,
+         lambda: decode_binary_ecg(raw_i16, raw_i16_headers['Content-Type'], raw_i16_headers)),
+        ('.npy float32', npy_body,
+         lambda: decode_binary_ecg(npy_body, npy_headers['Content-Type'], npy_headers)),
+    ]
+
+    print(f"\n{'Decode path':<24} {'Body (KB)':<12} {'Median (ms)':<14} {'p95 (ms)':<10}")
+    print("-" * 64)
+    for name, body, func in cases:
+        median_ms, p95_ms = time_call(func, iterations)
+        print(f"{name:<24} {len(body) / 1024:<12.1f} {median_ms:<14.3f} {p95_ms:<10.3f}")
+
+
+def bench_endpoint(ecg_signal, iterations):
+    """End-to-end /api/ecg/beats through the Flask test client"""
+    from ecg_api import app
+
+    client = app.test_client()
+    json_payload = {'ecg_signal': ecg_signal.tolist()}
+    raw_f32, raw_f32_headers = encode_raw_ecg(ecg_signal, dtype='float32')
+
+    cases = [
+        ('JSON', lambda: client.post('/api/ecg/beats', json=json_payload)),
+        ('octet-stream float32', lambda: client.post('/api/ecg/beats', data=raw_f32, headers=raw_f32_headers)),
+    ]
+
+    print(f"\n{'/api/ecg/beats body':<24} {'Median (ms)':<14} {'p95 (ms)':<10}")
+    print("-" * 52)
+    for name, func in cases:
+        response = func()
+        if response.status_code != 200:
+            print(f"{name:<24} ERROR: {response.status_code}")
+            continue
+        median_ms, p95_ms = time_call(func, iterations)
+        print(f"{name:<24} {median_ms:<14.3f} {p95_ms:<10.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='JSON vs binary ECG ingestion benchmark')
+    parser.add_argument('--iterations', type=int, default=50)
+    parser.add_argument('--skip-endpoint', action='store_true', help='Only benchmark decoding')
+    args = parser.parse_args()
+
+    print("=" * 64)
+    print("ECG INGESTION BENCHMARK (4096 samples x 12 leads)")
+    print("=" * 64)
+
+    np.random.seed(42)
+    ecg_signal = generate_synthetic_ecg().astype(np.float32)
+
+    bench_decoding(ecg_signal, args.iterations)
+    if not args.skip_endpoint:
+        bench_endpoint(ecg_signal, args.iterations)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+"""
+Benchmark: stdlib JSON vs FastJSONProvider (orjson + NumPy)
+
+1. Codec only: parse a 4096 x 12 ecg_signal body into a float32 array, and
+   encode an R-peak / raw-sample heavy response
+2. End-to-end /api/ecg/analyze and /api/ecg/beat/<i> through the Flask test
+   client with each provider installed on the app (results are cached after
+   the warm-up request, so the codec dominates what is left)
+
+"Before" is Flask's DefaultJSONProvider with NumPy arrays converted by
+.tolist() - what the routes did before FastJSONProvider.
+
+Usage (from Backend/):
+    python benchmarks/bench_json_codec.py [--iterations 50]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+from flask.json.provider import DefaultJSONProvider
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.join(BACKEND_DIR, 'data'))
+
+from generate_test_ecg import generate_synthetic_ecg
+import json_codec
+from json_codec import FastJSONProvider
+
+
+class StdlibJSONProvider(DefaultJSONProvider):
+    """Baseline: stdlib json, NumPy arrays via .tolist()"""
+    default = staticmethod(json_codec.numpy_default)
+
+
+def time_call(func, iterations):
+    """Run func repeatedly and return (median_ms, p95_ms)"""
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return float(np.median(timings)), float(np.percentile(timings, 95))
+
+
+def bench_codec(ecg_signal, iterations):
+    """Decode / encode without Flask"""
+    body = json.dumps({'ecg_signal': ecg_signal.tolist(), 'output_mode': 'clinical_expert'}).encode()
+
+    # /api/ecg/beats + /api/ecg/beat-like response: peaks, 12 lead x 10 s samples, floats
+    response_obj = {
+        'r_peaks': np.arange(0, 4096, 333, dtype=np.int64),
+        'raw_samples': ecg_signal,
+        'rr_intervals_ms': [833.3] * 12,
+        'predictions': {'RBBB': np.float32(0.12), 'LBBB': np.float32(0.03)}
+    }
+
+    cases = [
+        ('decode stdlib', lambda: np.array(json.loads(body)['ecg_signal'], dtype=np.float32)),
+        ('decode fast', lambda: np.asarray(json_codec.loads(body)['ecg_signal'], dtype=np.float32)),
+        ('encode stdlib', lambda: json.dumps(response_obj, default=json_codec.numpy_default)),
+        ('encode fast', lambda: json_codec.dumps_bytes(response_obj)),
+    ]
+
+    print(f"\nJSON backend: {'orjson' if json_codec.HAS_ORJSON else 'stdlib (orjson not installed)'}")
+    print(f"\n{'Codec path':<24} {'Median (ms)':<14} {'p95 (ms)':<10}")
+    print("-" * 52)
+    for name, func in cases:
+        median_ms, p95_ms = time_call(func, iterations)
+        print(f"{name:<24} {median_ms:<14.3f} {p95_ms:<10.3f}")
+
+    stdlib_size = len(json.dumps(response_obj, default=json_codec.numpy_default, separators=(',', ':')))
+    fast_size = len(json_codec.dumps_bytes(response_obj))
+    print(f"Response size: stdlib {stdlib_size / 1024:.1f} KB, fast {fast_size / 1024:.1f} KB "
+          f"(float32 values printed at float32 precision)")
+
+
+def bench_endpoints(ecg_signal, iterations):
+    """End-to-end through the Flask test client with each provider"""
+    import ecg_api
+
+    client = ecg_api.app.test_client()
+    payload = json.dumps({'ecg_signal': ecg_signal.tolist()})
+    headers = {'Content-Type': 'application/json'}
+
+
+    print(f"\n{'Endpoint':<20} {'Provider':<10} {'Median (ms)':<14} {'p95 (ms)':<10} {'Body (KB)':<10}")
+    print("-" * 68)
+    for path in ['/api/ecg/analyze', '/api/ecg/beat/3']:
+        for provider_name, provider in [('stdlib', StdlibJSONProvider), ('fast', FastJSONProvider)]:
+            ecg_api.app.json = provider(ecg_api.app)
+
+            def call():
+                return client.post(path, data=payload, headers=headers)
+
+            response = call()  # Warm-up (fills the result / LLM caches)
+            if response.status_code != 200:
+                print(f"{path:<20} {provider_name:<10} ERROR: {response.status_code}")
+                continue
+
+            median_ms, p95_ms = time_call(call, iterations)
+            print(f"{path:<20} {provider_name:<10} {median_ms:<14.3f} {p95_ms:<10.3f} "
+                  f"{len(response.data) / 1024:<10.1f}")
+
+    ecg_api.app.json = FastJSONProvider(ecg_api.app)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='stdlib vs fast JSON codec benchmark')
+    parser.add_argument('--iterations', type=int, default=50)
+    parser.add_argument('--skip-endpoint', action='store_true', help='Only benchmark the codec')
+    args = parser.parse_args()
+
+    print("=" * 68)
+    print("JSON CODEC BENCHMARK (4096 samples x 12 leads)")
+    print("=" * 68)
+
+    np.random.seed(42)
+    # C-contiguous float32, like a decoded request body
+    ecg_signal = np.ascontiguousarray(generate_synthetic_ecg(), dtype=np.float32)
+
+    bench_codec(ecg_signal, args.iterations)
+    if not args.skip_endpoint:
+        bench_endpoints(ecg_signal, args.iterations)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+"""
+Benchmark: /api/ecg/segment cost vs window size
+
+Compares three ways of finding the R-peaks of a [start, end] window:
+1. Whole-recording detection (detect_r_peaks over every sample and fallback
+   lead, then a boolean mask) - the original segment path
+2. Window-local detection (detect_r_peaks_in_window: window + settling margin,
+   at least MIN_DETECTION_SECONDS)
+3. searchsorted lookup on already known R-peaks (signal_id sessions and
+   replayed recordings)
+
+for 10.24 s and 60 s recordings and window sizes from 0.5 s to 8 s, and checks
+that window-local detection finds the same beats as whole-recording detection.
+
+Usage (from Backend/):
+    python benchmarks/bench_segment.py [--iterations 30]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.join(BACKEND_DIR, 'data'))
+
+from generate_test_ecg import generate_synthetic_ecg
+from ecg_heartrate_analyzer import ECGHeartRateAnalyzer
+
+WINDOW_SECONDS = (0.5, 1.0, 2.0, 4.0, 8.0)
+RECORDING_SECONDS = (10.24, 60.0)
+
+
+def time_call(func, iterations):
+    """Run func repeatedly and return the median in ms"""
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return float(np.median(timings))
+
+
+def bench_recording(analyzer, ecg_signal, iterations):
+    """Median cost of each path per window size for one recording"""
+    fs = analyzer.fs
+    duration_s = len(ecg_signal) / fs
+    known_peaks = np.asarray(analyzer.detect_r_peaks(ecg_signal)[0], dtype=np.int64)
+
+    print(f"\nRecording: {duration_s:.2f} s ({len(ecg_signal)} samples), {len(known_peaks)} beats")
+    print(f"{'Window (s)':<12} {'Whole (ms)':<12} {'Window (ms)':<13} {'Lookup (us)':<13} {'Speedup':<9} {'Same beats':<10}")
+    print("-" * 72)
+
+    for window_s in WINDOW_SECONDS:
+        start = int((duration_s / 2 - window_s / 2) * fs)
+        end = start + int(window_s * fs)
+
+        def whole():
+            peaks = np.asarray(analyzer.detect_r_peaks(ecg_signal)[0], dtype=np.int64)
+            return peaks[(peaks >= start) & (peaks <= end)]
+
+        def window():
+            return analyzer.detect_r_peaks_in_window(ecg_signal, start, end)[0]
+
+        def lookup():
+            return known_peaks[np.searchsorted(known_peaks, start, side='left'):
+                               np.searchsorted(known_peaks, end, side='right')]
+
+        # Beats may shift by a sample or two at the filter edges
+        whole_peaks, window_peaks = whole(), window()
+        same = len(whole_peaks) == len(window_peaks) and np.all(np.abs(whole_peaks - window_peaks) <= 2)
+
+        whole_ms = time_call(whole, iterations)
+        window_ms = time_call(window, iterations)
+        lookup_us = time_call(lookup, iterations * 10) * 1000
+
+        print(f"{window_s:<12.1f} {whole_ms:<12.2f} {window_ms:<13.2f} {lookup_us:<13.1f} "
+              f"{whole_ms / window_ms:<9.1f} {'yes' if same else 'NO':<10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Segment analysis cost vs window size')
+    parser.add_argument('--iterations', type=int, default=30)
+    args = parser.parse_args()
+
+    print("=" * 72)
+    print("SEGMENT ANALYSIS BENCHMARK")
+    print("=" * 72)
+
+    analyzer = ECGHeartRateAnalyzer(sampling_rate=400)
+    for duration_s in RECORDING_SECONDS:
+        np.random.seed(42)
+        ecg_signal = generate_synthetic_ecg(duration_sec=duration_s).astype(np.float32)
+        bench_recording(analyzer, ecg_signal, args.iterations)
+
+
+if __name__ == '__main__':
+    main()
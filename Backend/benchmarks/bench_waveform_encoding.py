@@ -0,0 +1,104 @@
+"""
+Benchmark: waveform payload size and client decode time per encoding
+
+Builds the /api/ecg/beats/details and /api/ecg/beat/<index> responses for
+10.24 s and 60 s recordings with waveform_encoding json, int16 and float16,
+and measures:
+1. Response size (raw and gzip, as sent with Accept-Encoding: gzip)
+2. Server encode time (beat_details + JSON serialization)
+3. Client decode time (JSON parse + raw_samples -> float32 arrays)
+4. Largest decoding error vs the float32 samples
+
+Usage (from Backend/):
+    python benchmarks/bench_waveform_encoding.py [--iterations 50]
+"""
+
+import argparse
+import gzip
+import os
+import sys
+import time
+
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.join(BACKEND_DIR, 'data'))
+
+from generate_test_ecg import generate_synthetic_ecg
+from ecg_heartrate_analyzer import ECGHeartRateAnalyzer
+from beat_delineation import delineate_beats, beat_details
+from waveform_codec import WAVEFORM_ENCODINGS, decode_waveform
+import json_codec
+
+RECORDING_SECONDS = (10.24, 60.0)
+
+
+def time_call(func, iterations):
+    """Run func repeatedly and return the median in ms"""
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return float(np.median(timings))
+
+
+def bench_payload(name, build, iterations):
+    """Size, encode and decode cost of one response per encoding"""
+    print(f"\n{name}")
+    print(f"{'Encoding':<10} {'Bytes':<11} {'Gzip':<10} {'Encode (ms)':<13} {'Decode (ms)':<13} {'Max error (uV)':<14}")
+    print("-" * 72)
+
+    reference = None
+    for encoding in WAVEFORM_ENCODINGS:
+        body = json_codec.dumps_bytes(build(encoding))
+
+        def decode():
+            return [decode_waveform(beat['raw_samples']) for beat in json_codec.loads(body)['beats']]
+
+        samples = decode()
+        if reference is None:
+            reference = samples
+        error_uv = max(float(np.abs(a - b).max()) for a, b in zip(samples, reference)) * 1000
+
+        encode_ms = time_call(lambda: json_codec.dumps_bytes(build(encoding)), iterations)
+        decode_ms = time_call(decode, iterations)
+
+        print(f"{encoding:<10} {len(body):<11,} {len(gzip.compress(body, 6)):<10,} "
+              f"{encode_ms:<13.3f} {decode_ms:<13.3f} {error_uv:<14.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Waveform encoding payload size and decode time')
+    parser.add_argument('--iterations', type=int, default=50)
+    args = parser.parse_args()
+
+    print("=" * 72)
+    print("WAVEFORM ENCODING BENCHMARK")
+    print("=" * 72)
+    print(f"JSON library: {'orjson' if json_codec.HAS_ORJSON else 'stdlib json'}")
+
+    analyzer = ECGHeartRateAnalyzer(sampling_rate=400)
+    for duration_s in RECORDING_SECONDS:
+        np.random.seed(42)
+        ecg_signal = generate_synthetic_ecg(duration_sec=duration_s).astype(np.float32)
+        r_peaks, lead_used, _, _ = analyzer.detect_r_peaks(ecg_signal)
+        delineation = delineate_beats(ecg_signal, np.asarray(r_peaks), lead_used, analyzer.fs)
+        num_beats = len(r_peaks)
+
+        bench_payload(
+            f"/api/ecg/beats/details: {duration_s:g} s recording, {num_beats} beats",
+            lambda encoding: {'beats': beat_details(delineation, waveform_encoding=encoding)},
+            args.iterations)
+
+        if duration_s == RECORDING_SECONDS[0]:
+            single = delineate_beats(ecg_signal, np.asarray(r_peaks), lead_used, analyzer.fs, beat_indices=[2])
+            bench_payload(
+                "/api/ecg/beat/2: one beat",
+                lambda encoding: {'beats': beat_details(single, waveform_encoding=encoding)},
+                args.iterations * 4)
+
+
+if __name__ == '__main__':
+    main()
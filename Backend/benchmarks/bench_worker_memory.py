@@ -0,0 +1,151 @@
+"""
+Benchmark: memory per gunicorn worker, with and without preload_app
+
+Starts `gunicorn -c gunicorn.conf.py wsgi:app` with N workers, waits until
+every worker has loaded the model, sends one /api/ecg/analyze request, then
+reads /proc/<pid>/smaps_rollup for the master and each worker:
+
+- RSS: resident pages (shared pages counted in every process)
+- PSS: proportional set size (shared pages split between the processes
+       sharing them) - the sum over all processes is the real footprint
+- USS: Private_Clean + Private_Dirty, what the worker alone costs
+
+If model/model.hdf5 is missing, a stand-in with the same architecture
+(automatic-ecg-diagnosis/model.py, random weights) is saved to a temporary
+file and passed through ECG_MODEL_PATH.
+
+Linux only (smaps_rollup). Usage (from Backend/):
+    python benchmarks/bench_worker_memory.py [--workers 1,2,4] [--port 5055]
+"""
+
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import requests
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BACKEND_DIR, 'data'))
+
+from generate_test_ecg import generate_synthetic_ecg
+
+
+def build_stand_in_model(path):
+    """Save the real architecture with random weights to path"""
+    sys.path.insert(0, os.path.join(BACKEND_DIR, 'automatic-ecg-diagnosis'))
+    from model import get_model
+
+    get_model(6).save(path)
+    return path
+
+
+def read_memory_kb(pid):
+    """RSS / PSS / USS of a process in kB"""
+    fields = {}
+    with open(f'/proc/{pid}/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 2 and parts[0].endswith(':') and parts[1].isdigit():
+                fields[parts[0][:-1]] = int(parts[1])
+
+    return {
+        'rss': fields['Rss'],
+        'pss': fields['Pss'],
+        'uss': fields['Private_Clean'] + fields['Private_Dirty']
+    }
+
+
+def child_pids(pid):
+    """Direct children of pid"""
+    with open(f'/proc/{pid}/task/{pid}/children') as f:
+        return [int(child) for child in f.read().split()]
+
+
+def run_case(workers, preload, port, env, request_body, boot_timeout=180):
+    """Boot gunicorn, exercise it and measure every process"""
+    case_env = dict(env,
+                    PORT=str(port),
+                    GUNICORN_WORKERS=str(workers),
+                    GUNICORN_PRELOAD='1' if preload else '0')
+
+    start = time.time()
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'wsgi:app'],
+        cwd=BACKEND_DIR, env=case_env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+    )
+
+    try:
+        # Every worker logs "Completed: Model loading" once its post_worker_init hook has run
+        loaded = 0
+        while loaded < workers:
+            line = server.stderr.readline()
+            if not line:
+                raise RuntimeError('gunicorn exited during boot')
+            if 'Completed: Model loading' in line:
+                loaded += 1
+            if time.time() - start > boot_timeout:
+                raise RuntimeError('timed out waiting for workers')
+        boot_s = time.time() - start
+
+        response = requests.post(f'http://localhost:{port}/api/ecg/analyze', json=request_body, timeout=60)
+        simulation = response.json().get('metadata', {}).get('simulation_mode')
+
+        master = read_memory_kb(server.pid)
+        worker_memory = [read_memory_kb(pid) for pid in child_pids(server.pid)]
+        return boot_s, simulation, master, worker_memory
+
+    finally:
+        server.send_signal(signal.SIGTERM)
+        try:
+            server.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            server.kill()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Gunicorn memory per worker')
+    parser.add_argument('--workers', default='1,2,4', help='Comma-separated worker counts')
+    parser.add_argument('--port', type=int, default=5055)
+    args = parser.parse_args()
+
+    env = dict(os.environ, GUNICORN_THREADS='4', LLM_CACHE_DB='')
+    env.pop('ANTHROPIC_API_KEY', None)  # Fallback interpretations only
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        if 'ECG_MODEL_PATH' not in env and not os.path.exists(os.path.join(BACKEND_DIR, 'model', 'model.hdf5')):
+            print("model/model.hdf5 not found - using a stand-in with the same architecture")
+            env['ECG_MODEL_PATH'] = build_stand_in_model(os.path.join(tmp_dir, 'stand_in.hdf5'))
+
+        ecg_signal = generate_synthetic_ecg()
+        request_body = {'ecg_signal': np.asarray(ecg_signal).tolist(), 'output_mode': 'clinical_expert'}
+
+        print("=" * 96)
+        print("GUNICORN MEMORY PER WORKER (MB)")
+        print("=" * 96)
+        print(f"{'workers':>7} {'preload':>8} {'boot s':>7} {'master PSS':>11} {'worker RSS':>11} "
+              f"{'worker PSS':>11} {'worker USS':>11} {'total PSS':>10}")
+
+        for workers in [int(n) for n in args.workers.split(',')]:
+            for preload in (False, True):
+                boot_s, simulation, master, worker_memory = run_case(
+                    workers, preload, args.port, env, request_body
+                )
+                if simulation:
+                    print("[WARNING] Server answered in simulation mode - model not loaded")
+
+                def mean_mb(field):
+                    return np.mean([m[field] for m in worker_memory]) / 1024
+
+                total_pss = (master['pss'] + sum(m['pss'] for m in worker_memory)) / 1024
+                print(f"{workers:>7} {'yes' if preload else 'no':>8} {boot_s:>7.1f} {master['pss'] / 1024:>11.1f} "
+                      f"{mean_mb('rss'):>11.1f} {mean_mb('pss'):>11.1f} {mean_mb('uss'):>11.1f} {total_pss:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
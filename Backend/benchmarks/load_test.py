@@ -0,0 +1,334 @@
+"""
+Load test: throughput and latency percentiles per endpoint under concurrency
+
+Drives the API with synthetic 12-lead ECGs (data/generate_test_ecg.py, a
+spread of heart rates) from a pool of client threads. Each request picks
+an endpoint from a weighted mix of analyze / beats / beat / segment.
+Every concurrency level runs the same seeded request sequence, so runs
+are reproducible and comparable.
+
+Targets:
+- default: ecg_api served in-process (werkzeug, threaded) on an ephemeral
+  port. The LLM runs in fallback mode (--llm fallback) or behind a stub
+  client with a fixed latency (--llm stub), and the persistent LLM cache
+  is disabled so stub responses never reach disk. Client and server share
+  one interpreter (GIL), so compare in-process runs with each other only.
+- --url: an already running server (python ecg_api.py, gunicorn). The
+  server's own LLM configuration applies; start it without
+  ANTHROPIC_API_KEY for fallback mode.
+
+Each client thread sends its own X-Client-ID, so the server's per-client
+rate limit applies per simulated headset. Requests shed by admission
+control (429/503) are counted separately from errors. --no-admission
+turns admission control off for in-process runs.
+
+Results are written as JSON (--output) and can be compared with a
+previous run (--compare).
+
+Usage (from Backend/):
+    python benchmarks/load_test.py [--concurrency 1,4,16] [--requests 200]
+        [--mix analyze=4,beats=2,beat=2,segment=1] [--llm stub --llm-latency-ms 800]
+        [--url http://localhost:5000] [--no-admission] [--output results.json] [--compare previous.json]
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import numpy as np
+import requests
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.join(BACKEND_DIR, 'data'))
+
+from generate_test_ecg import generate_synthetic_ecg
+
+ENDPOINTS = ('analyze', 'beats', 'beat', 'segment')
+PERCENTILES = (50, 90, 95, 99)
+
+
+class StubLLMClient:
+    """Stands in for the Anthropic client: fixed latency, canned JSON interpretation"""
+
+    def __init__(self, latency_ms):
+        self.latency_s = latency_ms / 1000
+        self.calls = 0
+        self._lock = threading.Lock()
+        self.messages = self
+
+    def create(self, **kwargs):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.latency_s)
+
+        text = json.dumps({
+            'summary': 'Load-test stub interpretation',
+            'max_tokens': kwargs.get('max_tokens')
+        })
+        return SimpleNamespace(content=[SimpleNamespace(text=text)])
+
+
+def parse_mix(mix):
+    """'analyze=4,beats=2' -> {'analyze': 4.0, 'beats': 2.0}"""
+    weights = {}
+    for part in mix.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise SystemExit(f"Unknown endpoint in --mix: {name} (choose from {', '.join(ENDPOINTS)})")
+        weights[name] = float(weight or 1)
+    return weights
+
+
+def build_signals(count, seed):
+    """Unity-style JSON bodies (4 decimal places) for `count` distinct recordings"""
+    np.random.seed(seed)
+    signals = []
+    for heart_rate in np.linspace(50, 120, count):
+        ecg_signal = np.round(generate_synthetic_ecg(heart_rate_bpm=float(heart_rate)), 4)
+        signals.append(ecg_signal.tolist())
+    return signals
+
+
+def build_plan(signals, weights, total, seed):
+    """Seeded sequence of (endpoint, path, body bytes)"""
+    rng = random.Random(seed)
+    names = list(weights)
+    encoded = {}
+
+    plan = []
+    for _ in range(total):
+        endpoint = rng.choices(names, weights=[weights[name] for name in names])[0]
+        signal_index = rng.randrange(len(signals))
+        body = {'ecg_signal': signals[signal_index]}
+        path = f'/api/ecg/{endpoint}'
+
+        if endpoint == 'beat':
+            path = f'/api/ecg/beat/{rng.randrange(6)}'
+        elif endpoint == 'segment':
+            start_ms = rng.randrange(0, 8000, 250)
+            body.update(start_ms=start_ms, end_ms=start_ms + 2000)
+
+        # Bodies without extra fields are shared between requests
+        if len(body) == 1:
+            if signal_index not in encoded:
+                encoded[signal_index] = json.dumps(body).encode()
+            data = encoded[signal_index]
+        else:
+            data = json.dumps(body).encode()
+
+        plan.append((endpoint, path, data))
+    return plan
+
+
+def start_server(llm_mode, llm_latency_ms, admission_control=True):
+    """Serve ecg_api in-process on an ephemeral port"""
+    import logging
+    from werkzeug.serving import make_server
+
+    os.environ['LLM_CACHE_DB'] = ''  # Keep stub / fallback responses off disk
+    import ecg_api
+
+    ecg_api.initialize()
+    ecg_api.admission.enabled = admission_control
+    stub = None
+    if llm_mode == 'stub':
+        stub = StubLLMClient(llm_latency_ms)
+        ecg_api.clinical_llm.client = stub
+    else:
+        ecg_api.clinical_llm.client = None
+
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    server = make_server('127.0.0.1', 0, ecg_api.app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, ecg_api, stub
+
+
+def summarize(latencies_ms, errors, shed, wall_s):
+    """Count, error / shed counts, throughput and latency percentiles for one endpoint"""
+    latencies = np.array(latencies_ms) if latencies_ms else np.zeros(1)
+    summary = {
+        'requests': len(latencies_ms) + errors + shed,
+        'errors': errors,
+        'shed': shed,
+        'throughput_rps': round(len(latencies_ms) / wall_s, 2)
+    }
+    for p in PERCENTILES:
+        summary[f'p{p}_ms'] = round(float(np.percentile(latencies, p)), 2)
+    summary['max_ms'] = round(float(latencies.max()), 2)
+    return summary
+
+
+def run_level(base_url, plan, concurrency):
+    """Send the whole plan from `concurrency` threads; per-endpoint summaries"""
+    local = threading.local()
+    lock = threading.Lock()
+    latencies = {}
+    errors = {}
+    shed = {}
+    error_samples = []
+
+    def send(item):
+        endpoint, path, data = item
+        if not hasattr(local, 'session'):
+            local.session = requests.Session()
+
+        start = time.perf_counter()
+        try:
+            response = local.session.post(base_url + path, data=data,
+                                          headers={'Content-Type': 'application/json',
+                                                   'X-Client-ID': f'load-test-{threading.get_ident()}'},
+                                          timeout=120)
+            ok = response.status_code == 200
+            status = response.status_code
+        except requests.exceptions.RequestException as e:
+            ok, status = False, type(e).__name__
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        with lock:
+            if ok:
+                latencies.setdefault(endpoint, []).append(elapsed_ms)
+                latencies.setdefault('all', []).append(elapsed_ms)
+            elif status in (429, 503):
+                shed[endpoint] = shed.get(endpoint, 0) + 1
+                shed['all'] = shed.get('all', 0) + 1
+            else:
+                errors[endpoint] = errors.get(endpoint, 0) + 1
+                errors['all'] = errors.get('all', 0) + 1
+                if len(error_samples) < 5:
+                    error_samples.append(f'{path}: {status}')
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(send, plan))
+    wall_s = time.perf_counter() - start
+
+    names = [name for name in ENDPOINTS if name in latencies or name in errors or name in shed] + ['all']
+    return {
+        'concurrency': concurrency,
+        'wall_s': round(wall_s, 3),
+        'endpoints': {
+            name: summarize(latencies.get(name, []), errors.get(name, 0), shed.get(name, 0), wall_s)
+            for name in names
+        },
+        'error_samples': error_samples
+    }
+
+
+def print_level(level, previous=None):
+    """Table for one concurrency level (with deltas against a previous run)"""
+    print(f"\nConcurrency {level['concurrency']} ({level['wall_s']:.1f} s)")
+    header = f"{'Endpoint':<10} {'Requests':<9} {'Errors':<7} {'Shed':<6} {'req/s':<8}"
+    header += ''.join(f"{f'p{p} (ms)':<10}" for p in PERCENTILES) + f"{'max (ms)':<10}"
+    if previous:
+        header += f"{'p95 vs prev':<12}"
+    print(header)
+    print("-" * len(header))
+
+    for name, stats in level['endpoints'].items():
+        row = f"{name:<10} {stats['requests']:<9} {stats['errors']:<7} {stats.get('shed', 0):<6} {stats['throughput_rps']:<8.1f}"
+        row += ''.join(f"{stats[f'p{p}_ms']:<10.1f}" for p in PERCENTILES) + f"{stats['max_ms']:<10.1f}"
+
+        before = (previous or {}).get('endpoints', {}).get(name)
+        if before and before['p95_ms'] > 0:
+            row += f"{(stats['p95_ms'] / before['p95_ms'] - 1) * 100:+.0f}%"
+        print(row)
+
+    for sample in level['error_samples']:
+        print(f"  [ERROR] {sample}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='HTTP load test for the ECG API')
+    parser.add_argument('--url', help='Running server (default: serve ecg_api in-process)')
+    parser.add_argument('--concurrency', default='1,4,16', help='Comma-separated client thread counts')
+    parser.add_argument('--requests', type=int, default=200, help='Requests per concurrency level')
+    parser.add_argument('--mix', default='analyze=4,beats=2,beat=2,segment=1', help='endpoint=weight list')
+    parser.add_argument('--signals', type=int, default=16, help='Distinct synthetic recordings')
+    parser.add_argument('--llm', choices=['fallback', 'stub'], default='fallback',
+                        help='In-process LLM: built-in fallback or stub client')
+    parser.add_argument('--llm-latency-ms', type=float, default=800, help='Stub LLM latency')
+    parser.add_argument('--no-admission', action='store_true',
+                        help='In-process: disable admission control (rate limits, load shedding)')
+    parser.add_argument('--warmup', type=int, default=10, help='Unmeasured requests before each level')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='Write results as JSON')
+    parser.add_argument('--compare', help='Previous results JSON to compare against')
+    args = parser.parse_args()
+
+    weights = parse_mix(args.mix)
+    levels = [int(value) for value in args.concurrency.split(',')]
+
+    print("=" * 96)
+    print("LOAD TEST")
+    print("=" * 96)
+
+    signals = build_signals(args.signals, args.seed)
+    plan = build_plan(signals, weights, args.requests, args.seed)
+    warmup = build_plan(signals, weights, args.warmup, args.seed + 1)
+
+    server = ecg_api = stub = None
+    if args.url:
+        base_url = args.url.rstrip('/')
+        target = base_url
+        requests.get(base_url + '/health', timeout=10).raise_for_status()
+    else:
+        server, ecg_api, stub = start_server(args.llm, args.llm_latency_ms, admission_control=not args.no_admission)
+        base_url = f'http://127.0.0.1:{server.server_port}'
+        target = f"in-process (llm={args.llm}, model {'simulation' if ecg_api.ecg_model.simulation_mode else 'loaded'})"
+
+    print(f"Target: {target}")
+    print(f"Mix: {args.mix} | {args.requests} requests per level | {args.signals} recordings")
+
+    previous = {}
+    if args.compare:
+        with open(args.compare) as f:
+            previous = {level['concurrency']: level for level in json.load(f)['levels']}
+        print(f"Comparing with: {args.compare}")
+
+    results = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'config': {
+            'target': target,
+            'mix': weights,
+            'requests': args.requests,
+            'signals': args.signals,
+            'llm': None if args.url else args.llm,
+            'llm_latency_ms': args.llm_latency_ms if (not args.url and args.llm == 'stub') else None,
+            'admission_control': None if args.url else not args.no_admission,
+            'seed': args.seed,
+            'python': platform.python_version(),
+            'cpu_count': os.cpu_count()
+        },
+        'levels': []
+    }
+
+    for concurrency in levels:
+        run_level(base_url, warmup, concurrency)
+        level = run_level(base_url, plan, concurrency)
+        results['levels'].append(level)
+        print_level(level, previous.get(concurrency))
+
+    if stub is not None:
+        print(f"\nStub LLM calls: {stub.calls} (the rest were LLM cache hits)")
+        results['config']['stub_llm_calls'] = stub.calls
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    if server is not None:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -12,6 +12,8 @@ Project: HoloHuman XR - Immerse the Bay 2025
 
 import os
 import json
+import hashlib
+import inspect
 from anthropic import Anthropic
 
 
@@ -24,6 +26,24 @@ class ClinicalDecisionSupportLLM:
     2. patient_education: Patient-friendly explanations (legacy)
     """
 
+    # Prompt builder per output mode (their source is hashed into the prompt version)
+    PROMPT_BUILDERS = {
+        'clinical_expert': 'build_clinical_expert_prompt',
+        'patient_education': 'build_patient_education_prompt',
+        'storytelling': 'build_storytelling_prompt'
+    }
+
+    MODEL = "claude-3-5-sonnet-20241022"
+
+    MAX_TOKENS = {
+        'clinical_expert': 2500,
+        'patient_education': 1500,
+        'storytelling': 1500
+    }
+
+    # Bump when parse_llm_response() or the JSON shape the prompts ask for changes
+    PROMPT_SCHEMA_VERSION = 1
+
     def __init__(self, api_key=None):
         """
         Initialize clinical decision support system.
@@ -50,6 +70,34 @@ class ClinicalDecisionSupportLLM:
         self._init_clinical_expert_fallbacks()
         self._init_storytelling_fallbacks()
 
+        self.prompt_versions = self._compute_prompt_versions()
+
+    def _compute_prompt_versions(self):
+        """
+        Fingerprint each output mode's prompt pipeline.
+
+        Hashes the source of the mode's prompt builder, MODEL, the mode's
+        MAX_TOKENS and PROMPT_SCHEMA_VERSION, so persisted interpretations are
+        invalidated whenever a prompt, the model or the response format changes
+        (and not on unrelated edits elsewhere in the class).
+
+        Returns:
+            dict: {output_mode: 12-char version hash}
+        """
+        def source_of(method_name):
+            method = getattr(type(self), method_name)
+            try:
+                return inspect.getsource(method)
+            except (OSError, TypeError):
+                # Source unavailable (e.g. bytecode-only deploy) - fall back to the bytecode
+                return method.__code__.co_code.hex() + repr(method.__code__.co_consts)
+
+        def fingerprint(mode, builder):
+            parts = (source_of(builder), self.MODEL, str(self.MAX_TOKENS[mode]), str(self.PROMPT_SCHEMA_VERSION))
+            return hashlib.sha256('\n'.join(parts).encode()).hexdigest()[:12]
+
+        return {mode: fingerprint(mode, builder) for mode, builder in self.PROMPT_BUILDERS.items()}
+
     def _init_patient_education_fallbacks(self):
         """Initialize patient education fallback explanations (legacy mode)."""
         self.patient_fallbacks = {
@@ -765,6 +813,22 @@ Respond with ONLY the JSON structure above."""
         """
         Generate clinical interpretation.
 
+        Args: see analyze_with_source()
+
+        Returns:
+            dict: Complete interpretation based on output_mode
+        """
+        interpretation, _ = self.analyze_with_source(
+            predictions_dict, heart_rate_data, region_health,
+            top_condition, confidence, output_mode=output_mode, **kwargs
+        )
+        return interpretation
+
+    def analyze_with_source(self, predictions_dict, heart_rate_data, region_health,
+                            top_condition, confidence, output_mode='clinical_expert', **kwargs):
+        """
+        Generate clinical interpretation and report where it came from.
+
         Args:
             predictions_dict (dict): {condition: probability}
             heart_rate_data (dict): {bpm, rr_intervals_ms, beat_timestamps, r_peak_count}
@@ -775,7 +839,7 @@ Respond with ONLY the JSON structure above."""
             **kwargs: Additional arguments (e.g., region_focus for storytelling mode)
 
         Returns:
-            dict: Complete interpretation based on output_mode
+            tuple: (interpretation dict, source) - source is 'claude' or 'fallback'
         """
         if output_mode not in ['clinical_expert', 'patient_education', 'storytelling']:
             raise ValueError(f"Invalid output_mode: {output_mode}. Must be 'clinical_expert', 'patient_education', or 'storytelling'")
@@ -802,8 +866,8 @@ Respond with ONLY the JSON structure above."""
         if self.client:
             try:
                 message = self.client.messages.create(
-                    model="claude-3-5-sonnet-20241022",
-                    max_tokens=2500 if output_mode == 'clinical_expert' else 1500,
+                    model=self.MODEL,
+                    max_tokens=self.MAX_TOKENS.get(output_mode, 1500),
                     messages=[
                         {"role": "user", "content": prompt}
                     ]
@@ -814,7 +878,7 @@ Respond with ONLY the JSON structure above."""
 
                 if interpretation:
                     print(f"[ClinicalLLM] Successfully generated {output_mode} interpretation via Claude API")
-                    return interpretation
+                    return interpretation, 'claude'
                 else:
                     print(f"[ClinicalLLM] Failed to parse Claude response, using fallback")
 
@@ -825,12 +889,27 @@ Respond with ONLY the JSON structure above."""
         # Use fallback if API fails or not available
         print(f"[ClinicalLLM] Using fallback {output_mode} interpretation")
 
+        interpretation = self.get_fallback(
+            top_condition, confidence, heart_rate_data, region_health,
+            output_mode=output_mode, region_focus=kwargs.get('region_focus', None)
+        )
+
+        return interpretation, 'fallback'
+
+    def get_fallback(self, top_condition, confidence, heart_rate_data, region_health,
+                     output_mode='clinical_expert', region_focus=None):
+        """
+        Hardcoded interpretation for output_mode: used by analyze_with_source()
+        when Claude is unavailable, and when Claude misses a request's latency budget.
+
+        Returns:
+            dict: Same layout as the Claude interpretation for that mode
+        """
         if output_mode == 'clinical_expert':
             return self.get_clinical_expert_fallback(
                 top_condition, confidence, heart_rate_data, region_health
             )
         elif output_mode == 'storytelling':
-            region_focus = kwargs.get('region_focus', None)
             return self.get_storytelling_fallback(
                 top_condition, confidence, heart_rate_data, region_health, region_focus=region_focus
             )
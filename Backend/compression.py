@@ -0,0 +1,213 @@
+"""
+HTTP Body Compression
+
+Headsets upload ~200 KB-1 MB of JSON per call over Wi-Fi and download large
+drilldown responses. ECG JSON compresses 3-5x, which matters more than the
+CPU cost on slow links.
+
+Requests: `Content-Encoding: gzip` or `zstd` bodies are decompressed by
+RequestDecompressionMiddleware before Flask sees them. The compressed stream
+is read in chunks, concatenated gzip members / zstd frames are all decoded,
+and decompression stops as soon as the output exceeds max_bytes (no
+decompression bombs). Failures are left in the WSGI environ
+for the app to report as JSON errors.
+
+Responses: compress_response() encodes JSON/text bodies of at least
+min_bytes with the client's preferred Accept-Encoding (zstd, then gzip).
+
+zstd needs the optional `zstandard` package; gzip always works.
+
+Author: Backend Developer 1
+Project: HoloHuman XR - Immerse the Bay 2025
+"""
+
+import io
+import zlib
+
+from werkzeug.wsgi import get_input_stream
+
+try:
+    import zstandard
+except ImportError:  # Optional: gzip only
+    zstandard = None
+
+SUPPORTED_ENCODINGS = ('zstd', 'gzip') if zstandard is not None else ('gzip',)
+
+GZIP_LEVEL = 5
+ZSTD_LEVEL = 3
+
+# Compressed bytes per zstd decompress() call: a zstd block expands at most ~32768x,
+# so the output can pass max_bytes by at most ~8 MB before the check rejects it
+ZSTD_FEED_BYTES = 256
+
+COMPRESSIBLE_MIMETYPES = ('application/json', 'text/plain', 'text/html', 'text/csv')
+
+# WSGI environ key carrying a decompression failure: (status_code, message)
+DECOMPRESSION_ERROR_KEY = 'ecg.decompression_error'
+
+
+class BodyTooLargeError(ValueError):
+    """Decompressed body exceeds the configured limit"""
+
+
+def decompress_stream(stream, encoding, max_bytes, chunk_size=64 * 1024):
+    """
+    Decompress a gzip / zstd stream chunk by chunk
+
+    Args:
+        stream: File-like object with the compressed body
+        encoding: 'gzip' or 'zstd'
+        max_bytes: Maximum decompressed size
+
+    Returns:
+        bytes: decompressed body
+
+    Raises:
+        BodyTooLargeError: output would exceed max_bytes
+        ValueError: corrupt or truncated data, unsupported encoding
+    """
+    output = bytearray()
+
+    if encoding == 'gzip':
+        decompressor = zlib.decompressobj(wbits=16 + zlib.MAX_WBITS)
+        pending = b''
+        try:
+            while True:
+                if decompressor.eof:
+                    # Concatenated members (RFC 1952): the next one starts in unused_data
+                    pending = decompressor.unused_data or stream.read(chunk_size)
+                    if not pending:
+                        break
+                    decompressor = zlib.decompressobj(wbits=16 + zlib.MAX_WBITS)
+
+                chunk = decompressor.unconsumed_tail or pending or stream.read(chunk_size)
+                pending = b''
+                if not chunk:
+                    raise ValueError('truncated gzip body')
+
+                # Never produce more than one byte past the limit
+                output += decompressor.decompress(chunk, max_bytes + 1 - len(output))
+                if len(output) > max_bytes:
+                    raise BodyTooLargeError(f'decompressed body exceeds {max_bytes} bytes')
+        except zlib.error as e:
+            raise ValueError(f'invalid gzip body: {e}') from e
+
+    elif encoding == 'zstd' and zstandard is not None:
+        decompressor = zstandard.ZstdDecompressor()
+        frame = decompressor.decompressobj()
+        try:
+            while True:
+                chunk = stream.read(chunk_size)
+                if not chunk:
+                    break
+
+                while chunk:
+                    if frame.eof:
+                        # Concatenated frames: each gets its own decompression object
+                        frame = decompressor.decompressobj()
+
+                    # decompress() has no output limit - feed small pieces so the cap
+                    # is checked before a highly compressible piece can overshoot it
+                    piece, chunk = chunk[:ZSTD_FEED_BYTES], chunk[ZSTD_FEED_BYTES:]
+                    output += frame.decompress(piece)
+                    if frame.eof:
+                        chunk = frame.unused_data + chunk
+
+                    if len(output) > max_bytes:
+                        raise BodyTooLargeError(f'decompressed body exceeds {max_bytes} bytes')
+
+            if not frame.eof:
+                raise ValueError('truncated zstd body')
+        except zstandard.ZstdError as e:
+            raise ValueError(f'invalid zstd body: {e}') from e
+
+    else:
+        raise ValueError(f'unsupported Content-Encoding: {encoding}')
+
+    return bytes(output)
+
+
+class RequestDecompressionMiddleware:
+    """WSGI middleware replacing a compressed request body with the decompressed one"""
+
+    def __init__(self, wsgi_app, max_bytes):
+        self.wsgi_app = wsgi_app
+        self.max_bytes = max_bytes
+
+    def __call__(self, environ, start_response):
+        encoding = environ.get('HTTP_CONTENT_ENCODING', '').strip().lower()
+
+        if encoding and encoding != 'identity':
+            if encoding == 'x-gzip':
+                encoding = 'gzip'
+
+            try:
+                body = decompress_stream(get_input_stream(environ), encoding, self.max_bytes)
+            except BodyTooLargeError as e:
+                environ[DECOMPRESSION_ERROR_KEY] = (413, str(e))
+                body = b''
+            except ValueError as e:
+                status = 415 if encoding not in SUPPORTED_ENCODINGS else 400
+                environ[DECOMPRESSION_ERROR_KEY] = (status, str(e))
+                body = b''
+
+            environ['wsgi.input'] = io.BytesIO(body)
+            environ['CONTENT_LENGTH'] = str(len(body))
+            environ.pop('HTTP_CONTENT_ENCODING', None)
+            environ.pop('wsgi.input_terminated', None)
+
+        return self.wsgi_app(environ, start_response)
+
+
+def choose_encoding(accept_encodings):
+    """
+    Best response encoding for a parsed Accept-Encoding header
+
+    Returns:
+        str: 'zstd', 'gzip' or None (identity)
+    """
+    return accept_encodings.best_match(SUPPORTED_ENCODINGS)
+
+
+def compress(data, encoding):
+    """Compress bytes with 'gzip' or 'zstd'"""
+    if encoding == 'zstd':
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush()
+
+
+def compress_response(response, accept_encodings, min_bytes):
+    """
+    Compress a Flask response in place if the client accepts it and it is worth it
+
+    Skips streamed (SSE) responses, already-encoded bodies, non-text mimetypes,
+    non-2xx responses, bodies below min_bytes and results that would not be smaller.
+
+    Returns:
+        str: encoding applied, or None
+    """
+    response.vary.add('Accept-Encoding')
+
+    if (response.direct_passthrough or response.is_streamed
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES
+            or not 200 <= response.status_code < 300):
+        return None
+
+    encoding = choose_encoding(accept_encodings)
+    if encoding is None:
+        return None
+
+    data = response.get_data()
+    if len(data) < min_bytes:
+        return None
+
+    compressed = compress(data, encoding)
+    if len(compressed) >= len(data):
+        return None
+
+    response.set_data(compressed)
+    response.headers['Content-Encoding'] = encoding
+    return encoding
@@ -1,77 +1,500 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, g, request, jsonify
 from flask_cors import CORS
 import numpy as np
+import os
 import time
-import json
-from functools import lru_cache
-import hashlib
+from functools import wraps
 
-from model_loader import ECGModelLoader
+from model_loader import ECGModelLoader, InferenceScheduler
 from ecg_heartrate_analyzer import ECGHeartRateAnalyzer
 from heart_region_mapper import HeartRegionMapper
 from clinical_decision_support_llm import ClinicalDecisionSupportLLM
+import json_codec
+from json_codec import FastJSONProvider
+from compression import RequestDecompressionMiddleware, DECOMPRESSION_ERROR_KEY, compress_response
+from ecg_payload import ECGPayloadError, is_binary_payload, decode_binary_ecg
+from signal_store import SignalSessionStore, build_signal_session
+from signal_quality import assess_signal_quality
+from beat_delineation import delineate_beats, beat_details
+from waveform_codec import WaveformEncodingError, parse_waveform_encoding
+from admission import AdmissionController, AdmissionRejected, ClientRateLimiter, StageLimiter
+from ecg_windows import MODEL_SAMPLING_RATE, MIN_SAMPLING_RATE, MAX_SAMPLING_RATE, WINDOW_SAMPLES, \
+    AGGREGATION_METHODS, resample_to_model_rate, cut_windows, aggregate_window_predictions
+from result_cache import ResultCache, signal_fingerprint
+from interpretation_jobs import InterpretationJobStore
+from ecg_stream import ECGStreamStore
+from llm_cache import LLMResponseCache, PersistentLLMCache, build_cache_key
 from logger import api_logger, PerformanceTimer
+from metrics import registry as metrics_registry, REQUEST_DURATION, RESPONSES, FALLBACKS, SIMULATION_MODE, \
+    COALESCED_WAITERS, record_cache_lookup
 
 app = Flask(__name__)
+app.json = FastJSONProvider(app)  # orjson + NumPy for request.get_json() / jsonify()
 CORS(app)
 
+# gzip / zstd request bodies (Content-Encoding), decompressed up to REQUEST_MAX_DECOMPRESSED_MB
+app.wsgi_app = RequestDecompressionMiddleware(
+    app.wsgi_app,
+    max_bytes=int(float(os.getenv('REQUEST_MAX_DECOMPRESSED_MB', '16')) * 1024 * 1024)
+)
+
+# Responses of at least this many bytes are compressed per Accept-Encoding (0 disables)
+RESPONSE_COMPRESSION_MIN_BYTES = int(os.getenv('RESPONSE_COMPRESSION_MIN_BYTES', '1024'))
+
 # Global module instances
-ecg_model = ECGModelLoader()
+ecg_model = ECGModelLoader(model_path=os.getenv('ECG_MODEL_PATH', 'model/model.hdf5'))
 hr_analyzer = ECGHeartRateAnalyzer(sampling_rate=400)
 region_mapper = HeartRegionMapper()
 clinical_llm = ClinicalDecisionSupportLLM()
 
-# Cache statistics
-cache_stats = {'hits': 0, 'misses': 0}
-
+# Micro-batching scheduler shared by concurrent /api/ecg/analyze requests
+inference_scheduler = InferenceScheduler(
+    ecg_model,
+    max_batch_size=int(os.getenv('INFERENCE_MAX_BATCH_SIZE', '16')),
+    max_wait_ms=float(os.getenv('INFERENCE_MAX_WAIT_MS', '5'))
+)
+
+# Uploaded signals for the temporal drilldown endpoints (signal_id -> cached R-peaks)
+signal_store = SignalSessionStore(
+    max_bytes=int(float(os.getenv('SIGNAL_SESSION_MAX_MB', '256')) * 1024 * 1024),
+    ttl_seconds=float(os.getenv('SIGNAL_SESSION_TTL_S', '600'))
+)
+
+# Content-addressed cache of model predictions, R-peaks and HR metrics (replayed recordings)
+result_cache = ResultCache(
+    max_bytes=int(float(os.getenv('RESULT_CACHE_MAX_MB', '64')) * 1024 * 1024)
+)
+
+# Background LLM interpretation jobs (async_interpretation=true on /api/ecg/analyze)
+interpretation_jobs = InterpretationJobStore(
+    max_workers=int(os.getenv('LLM_JOB_WORKERS', '4')),
+    ttl_seconds=float(os.getenv('LLM_JOB_TTL_S', '600')),
+    max_jobs=int(os.getenv('LLM_JOB_MAX', '1000'))
+)
+
+# Live bedside-monitor streams (ring buffer + incremental R-peaks + prediction hop)
+stream_store = ECGStreamStore(
+    max_streams=int(os.getenv('STREAM_MAX_OPEN', '64')),
+    ttl_seconds=float(os.getenv('STREAM_TTL_S', '300'))
+)
+STREAM_DEFAULT_HOP_SECONDS = float(os.getenv('STREAM_HOP_SECONDS', '2'))
+
+# Latency budget for the synchronous LLM stage (per request: "llm_budget_ms"; 0 = wait for Claude).
+# Past it /api/ecg/analyze answers with the mode's fallback and the call finishes in the background.
+LLM_BUDGET_MS = float(os.getenv('LLM_BUDGET_MS', '5000'))
+
+# Seconds between SSE keepalive comments while an interpretation job is running
+SSE_KEEPALIVE_S = 15
+
+# Disk tier for LLM interpretations (survives restarts; LLM_CACHE_DB="" disables it)
+LLM_CACHE_DB = os.getenv('LLM_CACHE_DB', 'cache/llm_cache.sqlite3')
+persistent_llm_cache = PersistentLLMCache(
+    LLM_CACHE_DB,
+    ttl_seconds=float(os.getenv('LLM_CACHE_DB_TTL_S', str(7 * 24 * 3600))),
+    max_rows=int(os.getenv('LLM_CACHE_DB_MAX_ROWS', '10000'))
+) if LLM_CACHE_DB else None
+
+# LLM interpretations keyed on the bucketed create_cache_key() (TTL + LRU bound)
+llm_cache = LLMResponseCache(
+    max_entries=int(os.getenv('LLM_CACHE_MAX_ENTRIES', '128')),
+    ttl_seconds=float(os.getenv('LLM_CACHE_TTL_S', '600')),
+    persistent=persistent_llm_cache
+)
+
+# Maximum number of recordings accepted by /api/ecg/analyze/batch
+MAX_BATCH_SIZE = 64
+
+# Admission control: per-client token buckets (clients sending X-Client-ID) in front of
+# bounded per-stage concurrency. Requests over a client's rate get 429; requests that would wait longer than the stage's
+# latency budget get 503 - both with Retry-After.
+admission = AdmissionController(
+    [
+        StageLimiter(
+            'analyze',
+            max_concurrency=int(os.getenv('ADMISSION_ANALYZE_CONCURRENCY', str(os.cpu_count() or 4))),
+            max_queue=int(os.getenv('ADMISSION_MAX_QUEUE', '32')),
+            latency_budget_s=float(os.getenv('ADMISSION_ANALYZE_BUDGET_MS', '2000')) / 1000
+        ),
+        StageLimiter(
+            'temporal',
+            max_concurrency=int(os.getenv('ADMISSION_TEMPORAL_CONCURRENCY', str(os.cpu_count() or 4))),
+            max_queue=int(os.getenv('ADMISSION_MAX_QUEUE', '32')),
+            latency_budget_s=float(os.getenv('ADMISSION_TEMPORAL_BUDGET_MS', '500')) / 1000
+        )
+    ],
+    client_limiter=ClientRateLimiter(
+        rate_per_second=float(os.getenv('CLIENT_RATE_PER_S', '10')),
+        burst=int(os.getenv('CLIENT_BURST', '20'))
+    ),
+    enabled=os.getenv('ADMISSION_CONTROL', '1') != '0'
+)
+
+# Recordings of any sampling rate are resampled to 400 Hz; longer ones are cut into
+# overlapping 4096-sample model windows whose predictions are aggregated
+RECORDING_MIN_SECONDS = float(os.getenv('RECORDING_MIN_SECONDS', '5'))
+RECORDING_MAX_SECONDS = float(os.getenv('RECORDING_MAX_SECONDS', '120'))
+WINDOW_HOP_SECONDS = float(os.getenv('WINDOW_HOP_SECONDS', '5'))
+WINDOW_AGGREGATION = os.getenv('WINDOW_AGGREGATION', 'max')
+if WINDOW_AGGREGATION not in AGGREGATION_METHODS:
+    WINDOW_AGGREGATION = 'max'
+
+
+def initialize(load_model: bool = True):
+    """
+    Initialize backend modules with safety nets
 
-def initialize():
-    """Initialize backend modules with safety nets"""
+    Args:
+        load_model: Load the TensorFlow model now. The pre-fork server (wsgi.py)
+                    passes False in the master and calls load_ecg_model() in each
+                    worker: TensorFlow's runtime hangs in a child forked after it
+                    has run, so only fork-safe state is built before forking.
+    """
     api_logger.info("Initializing HoloHuman XR Backend...")
 
-    with PerformanceTimer("Model loading", api_logger):
+    if load_model:
+        load_ecg_model()
+
+    api_logger.info("Backend initialization complete!")
+
+
+def load_ecg_model():
+    """Load the ECG model weights (once per process)"""
+    with PerformanceTimer("Model loading", api_logger, stage="model_loading"):
         model_loaded = ecg_model.load_model()
 
+    SIMULATION_MODE.set(1 if ecg_model.simulation_mode else 0)
+
     if not model_loaded:
         api_logger.warning("Model not loaded - running in FALLBACK mode (serving cached predictions)")
         api_logger.warning("To use full ML inference, ensure model/model.hdf5 exists")
     else:
         api_logger.info(f"ECG model loaded successfully: {ecg_model.model_path}")
 
-    api_logger.info("Backend initialization complete!")
-
 
-def validate_ecg_input(ecg_signal: np.ndarray) -> tuple[bool, str]:
+def validate_ecg_input(ecg_signal: np.ndarray, quality=None) -> tuple[bool, str]:
     """
     Validate ECG signal input for safety and quality
 
+    NaN/Inf, amplitude range, flat-line and variance checks are read from the
+    single-pass SignalQualityReport (signal_quality.py). Pass the report when
+    the caller already has it so the signal is not scanned again.
+
     Returns: (is_valid, error_message)
     """
-    # Check for NaN or Inf values
-    if np.isnan(ecg_signal).any():
-        nan_percentage = np.isnan(ecg_signal).sum() / ecg_signal.size * 100
-        if nan_percentage > 5:
-            return False, f"Signal contains {nan_percentage:.1f}% NaN values (threshold: 5%)"
+    if quality is None:
+        quality = assess_signal_quality(ecg_signal)
 
-    if np.isinf(ecg_signal).any():
-        return False, "Signal contains infinite values"
+    validation_error = quality.validation_error()
+    if validation_error is not None:
+        return False, validation_error
 
-    # Check amplitude range (realistic ECG: -5mV to +5mV)
-    signal_min, signal_max = ecg_signal.min(), ecg_signal.max()
-    if signal_min < -5.0 or signal_max > 5.0:
-        return False, f"Signal amplitude out of range: [{signal_min:.2f}, {signal_max:.2f}] (expected: [-5.0, 5.0] mV)"
+    return True, "OK"
 
-    # Check for flat-line signal (>90% zeros)
-    zero_percentage = (np.abs(ecg_signal) < 0.001).sum() / ecg_signal.size * 100
-    if zero_percentage > 90:
-        return False, f"Signal appears flat-line ({zero_percentage:.1f}% zeros)"
 
-    # Check signal quality (basic SNR estimate)
-    signal_std = np.std(ecg_signal)
-    if signal_std < 0.01:
-        return False, f"Signal has very low variance (std={signal_std:.4f}), possible noise or artifact"
+def load_ecg_request(endpoint: str):
+    """
+    Read request parameters and the ECG signal from a JSON or binary body
 
-    return True, "OK"
+    JSON bodies carry parameters next to "ecg_signal". Binary bodies
+    (application/octet-stream or application/x-npy, see ecg_payload.py)
+    carry only the signal; parameters come from the query string.
+
+    Returns: (data, ecg_signal, error_response) - error_response is None on success
+    """
+    if is_binary_payload(request.content_type):
+        data = request.args.to_dict()
+
+        try:
+            ecg_signal = decode_binary_ecg(request.get_data(cache=False), request.content_type, request.headers)
+        except ECGPayloadError as e:
+            error_id = api_logger.generate_error_id()
+            api_logger.error(f"{error_id}: Invalid binary ecg_signal in {endpoint} - {str(e)}")
+            return data, None, (jsonify({
+                'error': f"{'Unsupported' if e.status_code == 415 else 'Invalid'} binary ECG payload: {str(e)}",
+                'error_id': error_id,
+                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+            }), e.status_code)
+
+        return data, ecg_signal, None
+
+    data = request.get_json(silent=True)
+
+    if not data:
+        error_id = api_logger.generate_error_id()
+        api_logger.error(f"{error_id}: No JSON data in request body for {endpoint}")
+        return data, None, (jsonify({
+            'error': 'Request body must be valid JSON',
+            'error_id': error_id,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+        }), 400)
+
+    if 'ecg_signal' not in data:
+        error_id = api_logger.generate_error_id()
+        api_logger.error(f"{error_id}: Missing ecg_signal in {endpoint}")
+        return data, None, (jsonify({
+            'error': 'Missing required field: ecg_signal',
+            'error_id': error_id,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+        }), 400)
+
+    # Convert to numpy array
+    try:
+        ecg_signal = np.asarray(data['ecg_signal'], dtype=np.float32)
+    except (ValueError, TypeError) as e:
+        error_id = api_logger.generate_error_id()
+        api_logger.error(f"{error_id}: Invalid ecg_signal format - {str(e)}")
+        return data, None, (jsonify({
+            'error': 'ecg_signal must be a numeric array',
+            'error_id': error_id,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+        }), 400)
+
+    return data, ecg_signal, None
+
+
+def prepare_recording(data: dict, ecg_signal: np.ndarray, endpoint: str):
+    """
+    Bring a 12-lead recording of any sampling rate and duration onto the 400 Hz model grid
+
+    The sampling rate comes from "sampling_rate" (JSON body or query string,
+    default 400). Sample indices in responses refer to the resampled signal.
+
+    Returns: (ecg_signal at 400 Hz, sampling_rate, error_response) - error_response is None on success
+    """
+    def reject(message):
+        error_id = api_logger.generate_error_id()
+        api_logger.error(f"{error_id}: {message} in {endpoint}")
+        return None, None, (jsonify({
+            'error': message,
+            'error_id': error_id,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+        }), 400)
+
+    try:
+        sampling_rate = float((data or {}).get('sampling_rate', MODEL_SAMPLING_RATE))
+    except (TypeError, ValueError):
+        return reject(f"Invalid sampling_rate {(data or {}).get('sampling_rate')!r}")
+
+    if not MIN_SAMPLING_RATE <= sampling_rate <= MAX_SAMPLING_RATE:
+        return reject(f'sampling_rate must be {MIN_SAMPLING_RATE}-{MAX_SAMPLING_RATE} Hz, got {sampling_rate:g}')
+
+    if ecg_signal.ndim != 2 or ecg_signal.shape[1] != 12:
+        return reject(f'Invalid ECG shape {ecg_signal.shape}, expected (samples, 12) for 12-lead ECG')
+
+    duration_s = len(ecg_signal) / sampling_rate
+    if not RECORDING_MIN_SECONDS <= duration_s <= RECORDING_MAX_SECONDS:
+        return reject(
+            f'Recording is {duration_s:.2f}s long, expected {RECORDING_MIN_SECONDS:g}-{RECORDING_MAX_SECONDS:g}s '
+            f'({len(ecg_signal)} samples at {sampling_rate:g} Hz)'
+        )
+
+    if sampling_rate != MODEL_SAMPLING_RATE:
+        with PerformanceTimer(f"Resampling ({sampling_rate:g} Hz -> {MODEL_SAMPLING_RATE} Hz)", api_logger,
+                              stage="resampling"):
+            ecg_signal = resample_to_model_rate(ecg_signal, sampling_rate)
+
+    return ecg_signal, sampling_rate, None
+
+
+def load_waveform_encoding(data: dict, endpoint: str):
+    """
+    Read the optional "waveform_encoding" (JSON body or query string) for raw_samples
+
+    Returns: (encoding, error_response) - error_response is None on success
+    """
+    try:
+        return parse_waveform_encoding((data or {}).get('waveform_encoding')
+                                       or request.args.get('waveform_encoding')), None
+    except WaveformEncodingError as e:
+        error_id = api_logger.generate_error_id()
+        api_logger.warning(f"{error_id}: {str(e)} in {endpoint}")
+        return None, (jsonify({
+            'error': str(e),
+            'error_id': error_id,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+        }), 400)
+
+
+def load_signal_session(endpoint: str, detect: bool = True):
+    """
+    Resolve the signal for a temporal drilldown endpoint
+
+    Requests either reference an uploaded recording by "signal_id" (JSON body
+    or query string) and reuse its cached filtered leads and R-peaks, or send
+    the full signal, which is analyzed for this request only.
+
+    With detect=False a full signal is not run through whole-recording R-peak
+    detection: the session carries cached R-peaks if this recording was seen
+    before, else r_peaks is None and the caller detects what it needs.
+
+    Returns: (data, session, error_response) - error_response is None on success
+    """
+    data = None if is_binary_payload(request.content_type) else request.get_json(silent=True)
+    signal_id = (data or {}).get('signal_id') or request.args.get('signal_id')
+
+    if signal_id:
+        session = signal_store.get(signal_id)
+        if session is None:
+            error_id = api_logger.generate_error_id()
+            api_logger.warning(f"{error_id}: Unknown or expired signal_id {signal_id} in {endpoint}")
+            return data, None, (jsonify({
+                'error': f'Unknown or expired signal_id: {signal_id}',
+                'error_id': error_id,
+                'suggestion': 'Upload the recording again via POST /api/ecg/signals',
+                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+            }), 404)
+
+        return (data if data is not None else request.args.to_dict()), session, None
+
+    data, ecg_signal, error_response = load_ecg_request(endpoint)
+    if error_response:
+        return data, None, error_response
+
+    # Shape / sampling rate validation and resampling to 400 Hz
+    ecg_signal, _, error_response = prepare_recording(data, ecg_signal, endpoint)
+    if error_response:
+        return data, None, error_response
+
+    fingerprint = signal_fingerprint(ecg_signal)
+
+    if not detect:
+        detection = result_cache.get(result_cache.make_key('r_peaks', fingerprint, hr_analyzer.fs))
+        record_cache_lookup('r_peaks', detection is not None)
+        if detection is None:
+            return data, {'signal': ecg_signal, 'r_peaks': None, 'sampling_rate': hr_analyzer.fs}, None
+        return data, build_signal_session(ecg_signal, hr_analyzer, filter_all_leads=False, detection=detection), None
+
+    # Detect R-peaks (reused across replays of the same recording)
+    with PerformanceTimer(f"Beat detection ({endpoint})", api_logger, stage="beat_detection"):
+        detection, _ = cached_r_peaks(ecg_signal, fingerprint, assess_signal_quality(ecg_signal))
+        session = build_signal_session(ecg_signal, hr_analyzer, filter_all_leads=False, detection=detection)
+
+    return data, session, None
+
+
+def prediction_cache_key(fingerprint: str, *qualifiers) -> str:
+    """Result-cache key for model predictions of a signal (qualifiers: windowing settings)"""
+    # Fallback predictions get their own key so they are never served once the model loads
+    model_version = ecg_model.model_version + ('-fallback' if ecg_model.simulation_mode else '')
+    return result_cache.make_key('predictions', fingerprint, model_version, *qualifiers)
+
+
+def cached_predict(ecg_signal: np.ndarray, fingerprint: str, quality=None):
+    """
+    Model predictions via the result cache and the micro-batching scheduler
+
+    Returns: (predictions_dict, cached)
+    """
+    all_finite = quality.all_finite if quality is not None else None
+    predictions_dict, cached = result_cache.get_or_compute(
+        prediction_cache_key(fingerprint),
+        lambda: inference_scheduler.predict(ecg_signal, all_finite=all_finite)
+    )
+    record_cache_lookup('predictions', cached)
+    if ecg_model.simulation_mode:
+        FALLBACKS.labels('model_simulation').inc()
+
+    return predictions_dict, cached
+
+
+def cached_predict_windows(ecg_signal: np.ndarray, fingerprint: str, quality=None):
+    """
+    Model predictions for a 400 Hz recording of any length
+
+    Exactly one window goes through cached_predict(). Longer recordings are cut
+    into overlapping windows (WINDOW_HOP_SECONDS apart) that run as one
+    predict_batch() call; per-window probabilities are combined with
+    WINDOW_AGGREGATION. Shorter ones are zero-padded to one window.
+
+    Returns: (predictions_dict, windows, cached) - windows lists each window's
+             start/end in ms and its top condition
+    """
+    if len(ecg_signal) == WINDOW_SAMPLES:
+        predictions_dict, cached = cached_predict(ecg_signal, fingerprint, quality)
+        top_condition, confidence = ecg_model.get_top_condition(predictions_dict)
+        return predictions_dict, [{
+            'start_ms': 0.0,
+            'end_ms': round(WINDOW_SAMPLES / MODEL_SAMPLING_RATE * 1000, 1),
+            'top_condition': top_condition,
+            'confidence': round(confidence, 3)
+        }], cached
+
+    hop_samples = int(WINDOW_HOP_SECONDS * MODEL_SAMPLING_RATE)
+
+    def predict_windows():
+        windows, starts = cut_windows(ecg_signal, hop_samples)
+        all_finite = quality.all_finite if quality is not None else None
+        finite_items = None if all_finite is None else np.full(len(windows), all_finite)
+
+        with PerformanceTimer(f"Windowed model prediction (N={len(windows)})", api_logger,
+                              stage="windowed_model_prediction"):
+            window_predictions = ecg_model.predict_batch(windows, finite_items=finite_items)
+
+        window_summaries = []
+        for start, predictions in zip(starts, window_predictions):
+            top_condition, confidence = ecg_model.get_top_condition(predictions)
+            end = min(start + WINDOW_SAMPLES, len(ecg_signal))
+            window_summaries.append({
+                'start_ms': round(start / MODEL_SAMPLING_RATE * 1000, 1),
+                'end_ms': round(end / MODEL_SAMPLING_RATE * 1000, 1),
+                'top_condition': top_condition,
+                'confidence': round(confidence, 3)
+            })
+
+        return aggregate_window_predictions(window_predictions, WINDOW_AGGREGATION), window_summaries
+
+    (predictions_dict, windows), cached = result_cache.get_or_compute(
+        prediction_cache_key(fingerprint, hop_samples, WINDOW_AGGREGATION),
+        predict_windows
+    )
+    record_cache_lookup('predictions', cached)
+    if ecg_model.simulation_mode:
+        FALLBACKS.labels('model_simulation').inc()
+
+    return predictions_dict, windows, cached
+
+
+def cached_heart_rate(ecg_signal: np.ndarray, fingerprint: str, quality=None):
+    """
+    Heart rate analysis via the result cache
+
+    Returns: (heart_rate_data, cached)
+    """
+    lead_variance = quality.lead_variance() if quality is not None else None
+    heart_rate_data, cached = result_cache.get_or_compute(
+        result_cache.make_key('heart_rate', fingerprint, hr_analyzer.fs),
+        lambda: hr_analyzer.analyze(ecg_signal, lead_variance=lead_variance)
+    )
+    record_cache_lookup('heart_rate', cached)
+    if heart_rate_data.get('fallback_triggered'):
+        FALLBACKS.labels('hr_lead_fallback').inc()
+
+    return heart_rate_data, cached
+
+
+def cached_r_peaks(ecg_signal: np.ndarray, fingerprint: str, quality=None):
+    """
+    Multi-lead R-peak detection via the result cache
+
+    Returns: ((r_peaks, lead_used, lead_quality, fallback_triggered), cached)
+    """
+    lead_variance = quality.lead_variance() if quality is not None else None
+
+    def detect():
+        r_peaks, lead_used, lead_quality, fallback_triggered = hr_analyzer.detect_r_peaks(
+            ecg_signal, lead_variance=lead_variance
+        )
+        r_peaks = np.asarray(r_peaks, dtype=np.int64)
+        r_peaks.flags.writeable = False  # Shared across requests
+        return r_peaks, lead_used, lead_quality, fallback_triggered
+
+    detection, cached = result_cache.get_or_compute(
+        result_cache.make_key('r_peaks', fingerprint, hr_analyzer.fs),
+        detect
+    )
+    record_cache_lookup('r_peaks', cached)
+
+    return detection, cached
 
 
 def create_cache_key(predictions_dict: dict, top_condition: str, confidence: float, output_mode: str, region_focus: str = None) -> str:
@@ -79,60 +502,265 @@ def create_cache_key(predictions_dict: dict, top_condition: str, confidence: flo
     Create cache key for LLM responses
 
     Bucket confidence to reduce cache misses from tiny variations
+    (shared with warm_cache.py via llm_cache.build_cache_key)
     """
-    confidence_bucket = round(confidence, 1)  # Round to nearest 0.1
-    key_data = f"{top_condition}:{confidence_bucket}:{output_mode}"
+    return build_cache_key(top_condition, confidence, output_mode, region_focus)
 
-    # Add region_focus to cache key for storytelling mode
-    if output_mode == 'storytelling' and region_focus:
-        key_data += f":{region_focus}"
 
-    return hashlib.md5(key_data.encode()).hexdigest()
+def get_cached_llm_response(cache_key: str, predictions_dict: dict, heart_rate_data: dict,
+                            region_health: dict, top_condition: str,
+                            confidence: float, output_mode: str, region_focus: str = None):
+    """
+    Cached LLM interpretation (llm_cache, keyed on the bucketed cache_key only)
 
+    Memory misses fall through to the persistent tier for the current prompt version.
+    Concurrent misses on the same key share one Claude call (single-flight).
 
-@lru_cache(maxsize=128)
-def get_cached_llm_response(cache_key: str, predictions_json: str, hr_json: str,
-                            region_json: str, top_condition: str,
-                            confidence: float, output_mode: str, region_focus: str = None):
+    Returns:
+        tuple: (interpretation, cache_hit, source) - cache_hit is True for callers
+               that did not make the Claude call themselves; source is 'claude',
+               'fallback' or 'cache'
+    """
+    prompt_version = clinical_llm.prompt_versions.get(output_mode)
+    llm_source = {}
+
+    def call_llm():
+        api_logger.info(f"Cache MISS for key {cache_key[:8]}... - calling Claude API")
+
+        # Build kwargs for storytelling mode
+        kwargs = {}
+        if output_mode == 'storytelling' and region_focus:
+            kwargs['region_focus'] = region_focus
+
+        interpretation, source = clinical_llm.analyze_with_source(
+            predictions_dict,
+            heart_rate_data,
+            region_health,
+            top_condition,
+            confidence,
+            output_mode=output_mode,
+            **kwargs
+        )
+
+        if source != 'claude':
+            FALLBACKS.labels('llm_fallback').inc()
+        llm_source['source'] = source
+
+        # Only Claude output is cached - a fallback must not hide the API's recovery
+        return interpretation, source == 'claude'
+
+    interpretation, source, stored = llm_cache.get_or_compute(cache_key, call_llm, output_mode, prompt_version)
+    record_cache_lookup('llm', source == 'cache')
+
+    if source == 'cache':
+        api_logger.info(f"Cache HIT for key {cache_key[:8]}...")
+    elif source == 'coalesced':
+        COALESCED_WAITERS.labels('llm').inc()
+        api_logger.info(f"Cache MISS for key {cache_key[:8]}... - shared an in-flight Claude call")
+
+    if not stored:
+        # Callers that waited on a failed call get its fallback, not a cache hit
+        return interpretation, False, llm_source.get('source', 'fallback')
+    if source != 'computed':
+        return interpretation, True, 'cache'
+    return interpretation, False, llm_source['source']
+
+
+def interpret_ecg(predictions_dict: dict, heart_rate_data: dict, region_health: dict,
+                  top_condition: str, confidence: float, output_mode: str, region_focus: str = None):
     """
-    Cached LLM interpretation (10-minute TTL via LRU)
+    Clinical decision support via the LLM response cache
 
-    Args are JSON strings to make them hashable for cache
+    Runs inline for synchronous requests and on the interpretation job
+    executor for async_interpretation requests.
+
+    Returns:
+        dict: {'llm_interpretation': ..., 'cache_hit': bool,
+               'interpretation_source': 'claude' | 'cache' | 'fallback'}
     """
-    predictions_dict = json.loads(predictions_json)
-    heart_rate_data = json.loads(hr_json)
-    region_health = json.loads(region_json)
+    cache_key = create_cache_key(predictions_dict, top_condition, confidence, output_mode, region_focus)
 
-    api_logger.info(f"Cache MISS for key {cache_key[:8]}... - calling Claude API")
-    cache_stats['misses'] += 1
+    with PerformanceTimer("LLM interpretation (with cache)", api_logger, stage="llm_interpretation"):
+        llm_interpretation, cache_hit, source = get_cached_llm_response(
+            cache_key, predictions_dict, heart_rate_data, region_health,
+            top_condition, confidence, output_mode, region_focus
+        )
 
-    # Build kwargs for storytelling mode
-    kwargs = {}
-    if output_mode == 'storytelling' and region_focus:
-        kwargs['region_focus'] = region_focus
+    return {'llm_interpretation': llm_interpretation, 'cache_hit': cache_hit, 'interpretation_source': source}
 
-    return clinical_llm.analyze(
-        predictions_dict,
-        heart_rate_data,
-        region_health,
-        top_condition,
-        confidence,
-        output_mode=output_mode,
-        **kwargs
-    )
+
+def interpret_ecg_within_budget(budget_ms: float, predictions_dict: dict, heart_rate_data: dict,
+                                region_health: dict, top_condition: str, confidence: float,
+                                output_mode: str, region_focus: str = None):
+    """
+    interpret_ecg() with a deadline
+
+    Cache hits (memory or persistent tier) run inline. Misses run as an interpretation job; if it has not
+    finished after budget_ms the mode's fallback is returned instead, and the
+    job keeps running - it fills the LLM cache and can be fetched by its
+    interpretation_job_id. A job that fails, or cannot be queued because the
+    job store is full, also gets the mode's fallback.
+
+    Returns:
+        dict: interpret_ecg() result plus 'interpretation_job_id' (set only
+              when the deadline passed)
+    """
+    cache_key = create_cache_key(predictions_dict, top_condition, confidence, output_mode, region_focus)
+    args = (predictions_dict, heart_rate_data, region_health, top_condition, confidence, output_mode, region_focus)
+
+    if budget_ms <= 0 or llm_cache.contains(cache_key, clinical_llm.prompt_versions.get(output_mode)):
+        return {**interpret_ecg(*args), 'interpretation_job_id': None}
+
+    def fallback(job_id=None):
+        return {
+            'llm_interpretation': clinical_llm.get_fallback(top_condition, confidence, heart_rate_data,
+                                                            region_health, output_mode=output_mode,
+                                                            region_focus=region_focus),
+            'cache_hit': False,
+            'interpretation_source': 'fallback',
+            'interpretation_job_id': job_id
+        }
+
+    try:
+        job_id = interpretation_jobs.submit(interpret_ecg, *args, request_id=api_logger.request_id)
+    except AdmissionRejected as e:
+        FALLBACKS.labels('llm_fallback').inc()
+        api_logger.warning(f"LLM interpretation not queued ({e.message}) - serving {output_mode} fallback")
+        return fallback()
+
+    job = interpretation_jobs.wait(job_id, timeout=budget_ms / 1000)
+
+    if job['status'] == 'complete':
+        return {**job['result'], 'interpretation_job_id': None}
+
+    if job['status'] == 'failed':
+        FALLBACKS.labels('llm_fallback').inc()
+        error_id = api_logger.generate_error_id()
+        api_logger.error(f"{error_id}: LLM interpretation {job_id} failed - {job['error']} - "
+                         f"serving {output_mode} fallback")
+        return fallback()
+
+    FALLBACKS.labels('llm_deadline').inc()
+    api_logger.warning(f"LLM interpretation exceeded {budget_ms:g}ms budget - "
+                       f"serving {output_mode} fallback, {job_id} continues in the background")
+    return fallback(job_id)
+
+
+def release_admission_slot():
+    """Give back this request's admission slot early (e.g. before waiting on the LLM)"""
+    slot = g.pop('admission_slot', None)
+    if slot is not None:
+        slot.release()
+
+
+def shed_response(rejection: AdmissionRejected):
+    """429/503 error response with Retry-After for a shed request"""
+    error_id = api_logger.generate_error_id()
+    api_logger.warning(f"{error_id}: Request shed ({rejection.stage}/{rejection.reason}) for client "
+                       f"{request.headers.get('X-Client-ID') or request.remote_addr} - {rejection.message}")
+    response = jsonify({
+        'error': 'Too many requests' if rejection.status_code == 429 else 'Server overloaded',
+        'error_id': error_id,
+        'details': rejection.message,
+        'retry_after_s': round(rejection.retry_after_s, 3),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+    })
+    response.status_code = rejection.status_code
+    response.headers['Retry-After'] = rejection.retry_after_header
+    return response
+
+
+def admission_controlled(stage: str):
+    """
+    Route decorator: admit the request to a stage before the view runs
+
+    Clients sending an X-Client-ID header get a per-client rate limit; every
+    request passes the stage concurrency limit. Shed requests return 429/503
+    with Retry-After before the body is parsed.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            client_id = request.headers.get('X-Client-ID')
+            try:
+                g.admission_slot = admission.admit(stage, client_id)
+            except AdmissionRejected as e:
+                return shed_response(e)
+
+            try:
+                return view(*args, **kwargs)
+            finally:
+                release_admission_slot()
+
+        return wrapper
+    return decorator
+
+
+def metrics_endpoint_label() -> str:
+    """Route pattern for metric labels (bounded cardinality, unlike request.path)"""
+    return request.url_rule.rule if request.url_rule else 'unmatched'
 
 
 @app.before_request
 def before_request():
-    """Set request ID for logging context"""
+    """Set request ID for logging context and start the request timer"""
     request_id = api_logger.set_request_id()
     api_logger.info(f"Request received: {request.method} {request.path}")
 
+    g.request_timer = PerformanceTimer(
+        f"{request.method} {request.path}", api_logger,
+        histogram=REQUEST_DURATION.labels(metrics_endpoint_label())
+    ).__enter__()
+
+
+@app.before_request
+def reject_undecodable_body():
+    """Report request bodies RequestDecompressionMiddleware could not decompress"""
+    decompression_error = request.environ.get(DECOMPRESSION_ERROR_KEY)
+    if decompression_error is None:
+        return None
+
+    status_code, message = decompression_error
+    error_id = api_logger.generate_error_id()
+    api_logger.error(f"{error_id}: Compressed request body rejected ({status_code}) - {message}")
+
+    return jsonify({
+        'error': f'Could not decompress request body: {message}',
+        'error_id': error_id,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+    }), status_code
+
+
+@app.after_request
+def after_request(response):
+    """Count responses per endpoint and status code"""
+    RESPONSES.labels(metrics_endpoint_label(), response.status_code).inc()
+    return response
+
+
+@app.after_request
+def compress_large_response(response):
+    """gzip / zstd JSON responses per Accept-Encoding"""
+    if RESPONSE_COMPRESSION_MIN_BYTES > 0:
+        compress_response(response, request.accept_encodings, RESPONSE_COMPRESSION_MIN_BYTES)
+    return response
+
+
+@app.teardown_request
+def teardown_request(error):
+    """Record the total request time (SSE endpoints: until the stream is handed to the server)"""
+    request_timer = g.pop('request_timer', None)
+    if request_timer is not None:
+        request_timer.__exit__(type(error) if error else None, error, None)
+
+    api_logger.clear_request_id()
+
 
 @app.route('/health', methods=['GET'])
 def health_check():
     """Enhanced health check with model status"""
     model_status = 'loaded' if ecg_model.model is not None else 'fallback_mode'
+    llm_stats = llm_cache.get_stats()
 
     return jsonify({
         'status': 'healthy',
@@ -140,129 +768,135 @@ def health_check():
         'model_status': model_status,
         'model_path': ecg_model.model_path if ecg_model.model else None,
         'simulation_mode': ecg_model.simulation_mode,
-        'cache_stats': cache_stats.copy(),
+        'cache_stats': {
+            'hits': llm_stats['hits'],
+            'misses': llm_stats['misses']
+        },
         'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
     })
 
 
 @app.route('/api/ecg/analyze', methods=['POST'])
+@admission_controlled('analyze')
 def analyze_ecg():
     """
     Main ECG analysis endpoint with safety nets and caching
 
     Request body:
     {
-        "ecg_signal": [[...], [...], ...],  # 4096 x 12 array
+        "ecg_signal": [[...], [...], ...],  # samples x 12 array (4096 x 12 at 400 Hz = one model window)
+        "sampling_rate": 500,                # Optional: Hz, default 400 (resampled to 400 Hz)
         "output_mode": "clinical_expert",    # Optional: clinical_expert|patient_education|storytelling
-        "region_focus": "rbbb"               # Optional: for storytelling mode
+        "region_focus": "rbbb",              # Optional: for storytelling mode
+        "async_interpretation": false,       # Optional: return immediately with interpretation_job_id
+        "llm_budget_ms": 5000                # Optional: LLM deadline, then fallback (default LLM_BUDGET_MS)
     }
     """
     start_time = time.time()
 
     try:
         # === INPUT VALIDATION ===
-        data = request.get_json()
+        with PerformanceTimer("Input validation", api_logger, stage="validation"):
+            data, ecg_signal, error_response = load_ecg_request('/api/ecg/analyze')
+            if error_response:
+                return error_response
+
+            # Shape / sampling rate validation and resampling to 400 Hz
+            original_samples = len(ecg_signal)
+            ecg_signal, sampling_rate, error_response = prepare_recording(data, ecg_signal, '/api/ecg/analyze')
+            if error_response:
+                return error_response
+
+            # Quality validation (one pass; the report is reused by the stages below)
+            quality = assess_signal_quality(ecg_signal)
+            is_valid, validation_msg = validate_ecg_input(ecg_signal, quality)
+            if not is_valid:
+                error_id = api_logger.generate_error_id()
+                api_logger.warning(f"{error_id}: Signal validation failed - {validation_msg}")
+                return jsonify({
+                    'error': 'ECG signal quality check failed',
+                    'error_id': error_id,
+                    'details': validation_msg,
+                    'signal_quality': quality.to_dict(),
+                    'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+                }), 400
 
-        if not data:
-            error_id = api_logger.generate_error_id()
-            api_logger.error(f"{error_id}: No JSON data in request body")
-            return jsonify({
-                'error': 'Request body must be valid JSON',
-                'error_id': error_id,
-                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
-            }), 400
+        api_logger.info("Input validation passed")
 
-        if 'ecg_signal' not in data:
-            error_id = api_logger.generate_error_id()
-            api_logger.error(f"{error_id}: Missing ecg_signal field")
-            return jsonify({
-                'error': 'Missing required field: ecg_signal',
-                'error_id': error_id,
-                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
-            }), 400
+        # === PROCESSING PIPELINE ===
+        output_mode = data.get('output_mode', 'clinical_expert')
+        region_focus = data.get('region_focus', None)
+        async_interpretation = str(data.get('async_interpretation', 'false')).lower() in ('true', '1', 'yes')
 
-        # Convert to numpy array
         try:
-            ecg_signal = np.array(data['ecg_signal'], dtype=np.float32)
-        except (ValueError, TypeError) as e:
-            error_id = api_logger.generate_error_id()
-            api_logger.error(f"{error_id}: Invalid ecg_signal format - {str(e)}")
-            return jsonify({
-                'error': 'ecg_signal must be a numeric array',
-                'error_id': error_id,
-                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
-            }), 400
-
-        # Shape validation
-        if ecg_signal.shape != (4096, 12):
-            error_id = api_logger.generate_error_id()
-            api_logger.error(f"{error_id}: Invalid shape {ecg_signal.shape}")
-            return jsonify({
-                'error': f'Invalid ECG shape {ecg_signal.shape}, expected (4096, 12) for 12-lead ECG',
-                'error_id': error_id,
-                'expected_shape': [4096, 12],
-                'actual_shape': list(ecg_signal.shape),
-                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
-            }), 400
-
-        # Quality validation
-        is_valid, validation_msg = validate_ecg_input(ecg_signal)
-        if not is_valid:
+            llm_budget_ms = float(data.get('llm_budget_ms', LLM_BUDGET_MS))
+            if not np.isfinite(llm_budget_ms) or llm_budget_ms < 0:
+                raise ValueError(llm_budget_ms)
+        except (TypeError, ValueError):
             error_id = api_logger.generate_error_id()
-            api_logger.warning(f"{error_id}: Signal validation failed - {validation_msg}")
+            api_logger.warning(f"{error_id}: Invalid llm_budget_ms {data.get('llm_budget_ms')!r}")
             return jsonify({
-                'error': 'ECG signal quality check failed',
+                'error': 'llm_budget_ms must be a non-negative number of milliseconds',
                 'error_id': error_id,
-                'details': validation_msg,
                 'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
             }), 400
 
-        api_logger.info("Input validation passed")
-
-        # === PROCESSING PIPELINE ===
-        output_mode = data.get('output_mode', 'clinical_expert')
-        region_focus = data.get('region_focus', None)
+        fingerprint = signal_fingerprint(ecg_signal)
 
-        # 1. ECG Model Prediction
-        with PerformanceTimer("Model prediction", api_logger):
-            predictions_dict = ecg_model.predict(ecg_signal)
+        # 1. ECG Model Prediction (one window, or aggregated overlapping windows)
+        with PerformanceTimer("Model prediction", api_logger, stage="model_prediction"):
+            predictions_dict, windows, predictions_cached = cached_predict_windows(ecg_signal, fingerprint, quality)
             top_condition, confidence = ecg_model.get_top_condition(predictions_dict)
 
-        # 2. Heart Rate Analysis
-        with PerformanceTimer("Heart rate analysis", api_logger):
-            heart_rate_data = hr_analyzer.analyze(ecg_signal)
+        # 2. Heart Rate Analysis (full recording)
+        with PerformanceTimer("Heart rate analysis", api_logger, stage="heart_rate_analysis"):
+            heart_rate_data, heart_rate_cached = cached_heart_rate(ecg_signal, fingerprint, quality)
 
         # 3. Region Mapping
-        with PerformanceTimer("Region mapping", api_logger):
+        with PerformanceTimer("Region mapping", api_logger, stage="region_mapping"):
             region_health = region_mapper.get_region_health_status(predictions_dict)
             activation_sequence = region_mapper.get_activation_sequence(region_health)
 
-        # 4. Clinical Decision Support (with caching)
-        cache_key = create_cache_key(predictions_dict, top_condition, confidence, output_mode, region_focus)
+        # The LLM call waits on the network, not the CPU - free the analyze slot
+        release_admission_slot()
 
-        try:
-            # Convert dicts to JSON strings for caching (must be hashable)
-            predictions_json = json.dumps(predictions_dict, sort_keys=True)
-            hr_json = json.dumps(heart_rate_data, sort_keys=True)
-            region_json = json.dumps(region_health, sort_keys=True)
-
-            with PerformanceTimer("LLM interpretation (with cache)", api_logger):
-                llm_interpretation = get_cached_llm_response(
-                    cache_key, predictions_json, hr_json, region_json,
+        # 4. Clinical Decision Support (with caching)
+        interpretation_job_id = None
+        llm_interpretation = None
+        interpretation_source = None
+        cache_hit = False
+
+        if async_interpretation:
+            # Return signal analysis now; the headset fetches the interpretation later
+            try:
+                interpretation_job_id = interpretation_jobs.submit(
+                    interpret_ecg, predictions_dict, heart_rate_data, region_health,
+                    top_condition, confidence, output_mode, region_focus,
+                    request_id=api_logger.request_id
+                )
+                api_logger.info(f"LLM interpretation queued as {interpretation_job_id}")
+            except AdmissionRejected as e:
+                # Job store full: keep the finished signal analysis, answer with the mode's fallback
+                FALLBACKS.labels('llm_fallback').inc()
+                api_logger.warning(f"LLM interpretation not queued ({e.message}) - serving {output_mode} fallback")
+                llm_interpretation = clinical_llm.get_fallback(top_condition, confidence, heart_rate_data,
+                                                               region_health, output_mode=output_mode,
+                                                               region_focus=region_focus)
+                interpretation_source = 'fallback'
+        else:
+            try:
+                interpretation = interpret_ecg_within_budget(
+                    llm_budget_ms, predictions_dict, heart_rate_data, region_health,
                     top_condition, confidence, output_mode, region_focus
                 )
+                llm_interpretation = interpretation['llm_interpretation']
+                interpretation_source = interpretation['interpretation_source']
+                interpretation_job_id = interpretation['interpretation_job_id']
+                cache_hit = interpretation['cache_hit']
 
-            # Check if this was a cache hit
-            cache_hit = cache_stats['hits'] > 0 or cache_key in str(get_cached_llm_response.cache_info())
-            if cache_hit:
-                cache_stats['hits'] += 1
-                api_logger.info(f"Cache HIT for key {cache_key[:8]}...")
-
-        except Exception as llm_error:
-            error_id = api_logger.generate_error_id()
-            api_logger.error(f"{error_id}: LLM processing failed - {str(llm_error)}")
-            llm_interpretation = None
-            cache_hit = False
+            except Exception as llm_error:
+                error_id = api_logger.generate_error_id()
+                api_logger.error(f"{error_id}: LLM processing failed - {str(llm_error)}")
 
         # === RESPONSE ===
         processing_time_ms = (time.time() - start_time) * 1000
@@ -270,17 +904,32 @@ def analyze_ecg():
         response_data = {
             'predictions': predictions_dict,
             'heart_rate': heart_rate_data,
+            'signal_quality': quality.to_dict(),
+            'recording': {
+                'sampling_rate': sampling_rate,
+                'duration_s': round(original_samples / sampling_rate, 2),
+                'resampled_samples': len(ecg_signal),
+                'window_aggregation': WINDOW_AGGREGATION if len(windows) > 1 else None,
+                'windows': windows
+            },
             'region_health': region_health if region_health else None,
             'activation_sequence': activation_sequence if activation_sequence else None,
             'llm_interpretation': llm_interpretation if llm_interpretation else None,
+            'interpretation_source': interpretation_source,
+            'interpretation_job_id': interpretation_job_id,
             'top_condition': top_condition,
             'confidence': round(confidence, 3),
             'processing_time_ms': round(processing_time_ms, 2),
-            'model_version': '1.0.0',
+            'model_version': ecg_model.model_version,
             'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
             'metadata': {
                 'simulation_mode': ecg_model.simulation_mode,
                 'cache_hit': cache_hit,
+                'llm_budget_ms': None if async_interpretation else llm_budget_ms,
+                'result_cache_hit': {
+                    'predictions': predictions_cached,
+                    'heart_rate': heart_rate_cached
+                },
                 'output_mode': output_mode,
                 'region_focus': region_focus if output_mode == 'storytelling' else None,
                 'request_id': api_logger.request_id
@@ -302,116 +951,393 @@ def analyze_ecg():
         }), 500
 
 
-@app.route('/api/cache/stats', methods=['GET'])
-def cache_statistics():
-    """Get cache performance statistics"""
-    cache_info = get_cached_llm_response.cache_info()
-
-    total_requests = cache_stats['hits'] + cache_stats['misses']
-    hit_rate = (cache_stats['hits'] / total_requests * 100) if total_requests > 0 else 0
-
-    return jsonify({
-        'cache_stats': {
-            'hits': cache_stats['hits'],
-            'misses': cache_stats['misses'],
-            'total_requests': total_requests,
-            'hit_rate_percent': round(hit_rate, 2)
-        },
-        'lru_cache_info': {
-            'hits': cache_info.hits,
-            'misses': cache_info.misses,
-            'max_size': cache_info.maxsize,
-            'current_size': cache_info.currsize
-        }
-    })
-
-
-@app.route('/api/cache/clear', methods=['POST'])
-def clear_cache():
-    """Clear LLM response cache (admin only)"""
-    get_cached_llm_response.cache_clear()
-    cache_stats['hits'] = 0
-    cache_stats['misses'] = 0
-
-    api_logger.info("Cache cleared by admin request")
+def batch_item_error(index: int, error: str, details: str = None) -> dict:
+    """Build a per-item error entry for /api/ecg/analyze/batch"""
+    error_id = api_logger.generate_error_id()
+    api_logger.warning(f"{error_id}: Batch item {index} rejected - {details or error}")
 
-    return jsonify({
-        'message': 'Cache cleared successfully',
-        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
-    })
+    item_error = {
+        'index': index,
+        'status': 'error',
+        'error': error,
+        'error_id': error_id
+    }
+    if details:
+        item_error['details'] = details
 
+    return item_error
 
-# ============================================================================
-# PHASE 3: TEMPORAL DRILLDOWN ENDPOINTS
-# ============================================================================
 
-@app.route('/api/ecg/beats', methods=['POST'])
-def get_beats():
+@app.route('/api/ecg/analyze/batch', methods=['POST'])
+@admission_controlled('analyze')
+def analyze_ecg_batch():
     """
-    Fast R-peak detection endpoint for VR timeline scrubbing
+    Batch ECG analysis endpoint - one model forward pass for N recordings
 
-    Request body:
+    Runs model prediction, heart rate analysis and region mapping for every
+    recording. Invalid items are reported individually and do not fail the batch.
+    LLM interpretation is not included (use /api/ecg/analyze per recording).
+
+    Request body (JSON):
     {
-        "ecg_signal": [[...], [...], ...]  # 4096 x 12 array
+        "ecg_signals": [[[...], ...], ...]   # N x 4096 x 12 array
     }
 
+    Or binary (application/octet-stream / application/x-npy) with
+    X-ECG-Shape: N,4096,12 - see ecg_payload.py
+
     Response:
     {
-        "r_peaks": [350, 980, 1610, ...],
-        "beat_count": 12,
-        "avg_rr_interval_ms": 830.0,
-        "rhythm": "regular"
+        "results": [
+            {"index": 0, "status": "ok", "predictions": {...}, "heart_rate": {...}, ...},
+            {"index": 1, "status": "error", "error": "...", "error_id": "ERR-XR-..."}
+        ],
+        "batch_size": 2,
+        "succeeded": 1,
+        "failed": 1
     }
     """
     start_time = time.time()
 
     try:
-        # Input validation
-        data = request.get_json()
+        # === INPUT VALIDATION ===
+        if is_binary_payload(request.content_type):
+            data, ecg_batch, error_response = load_ecg_request('/api/ecg/analyze/batch')
+            if error_response:
+                return error_response
+
+            if ecg_batch.ndim == 2:
+                ecg_batch = ecg_batch[np.newaxis]
+
+            if ecg_batch.ndim != 3:
+                error_id = api_logger.generate_error_id()
+                api_logger.error(f"{error_id}: Invalid batch shape {ecg_batch.shape}")
+                return jsonify({
+                    'error': f'Invalid ECG batch shape {ecg_batch.shape}, expected (N, 4096, 12)',
+                    'error_id': error_id,
+                    'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+                }), 400
+
+            ecg_signals = list(ecg_batch)
+        else:
+            data = request.get_json(silent=True)
 
-        if not data or 'ecg_signal' not in data:
-            error_id = api_logger.generate_error_id()
-            api_logger.error(f"{error_id}: Missing ecg_signal in /api/ecg/beats")
-            return jsonify({
-                'error': 'Missing required field: ecg_signal',
-                'error_id': error_id,
-                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
-            }), 400
+            if not data or not isinstance(data.get('ecg_signals'), list):
+                error_id = api_logger.generate_error_id()
+                api_logger.error(f"{error_id}: Missing ecg_signals in /api/ecg/analyze/batch")
+                return jsonify({
+                    'error': 'Missing required field: ecg_signals (list of 4096 x 12 arrays)',
+                    'error_id': error_id,
+                    'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+                }), 400
 
-        # Convert to numpy array
-        try:
-            ecg_signal = np.array(data['ecg_signal'], dtype=np.float32)
-        except (ValueError, TypeError) as e:
-            error_id = api_logger.generate_error_id()
-            api_logger.error(f"{error_id}: Invalid ecg_signal format - {str(e)}")
-            return jsonify({
-                'error': 'ecg_signal must be a numeric array',
-                'error_id': error_id,
-                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
-            }), 400
+            ecg_signals = data['ecg_signals']
 
-        # Shape validation
-        if ecg_signal.shape != (4096, 12):
+        if not ecg_signals or len(ecg_signals) > MAX_BATCH_SIZE:
             error_id = api_logger.generate_error_id()
-            api_logger.error(f"{error_id}: Invalid shape {ecg_signal.shape} in /api/ecg/beats")
+            api_logger.error(f"{error_id}: Invalid batch size {len(ecg_signals)}")
             return jsonify({
-                'error': f'Invalid ECG shape {ecg_signal.shape}, expected (4096, 12)',
+                'error': f'Batch must contain 1-{MAX_BATCH_SIZE} ECG signals, got {len(ecg_signals)}',
                 'error_id': error_id,
+                'max_batch_size': MAX_BATCH_SIZE,
                 'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
             }), 400
 
-        # Detect R-peaks
-        with PerformanceTimer("Beat detection", api_logger):
-            r_peaks, lead_used, lead_quality, fallback_triggered = hr_analyzer.detect_r_peaks(ecg_signal)
+        # Per-item conversion and validation
+        results = [None] * len(ecg_signals)
+        valid_indices = []
+        valid_signals = []
+        valid_qualities = []
+
+        for index, item in enumerate(ecg_signals):
+            try:
+                ecg_signal = np.asarray(item, dtype=np.float32)
+            except (ValueError, TypeError):
+                results[index] = batch_item_error(index, 'ecg_signal must be a numeric array')
+                continue
+
+            if ecg_signal.shape != (4096, 12):
+                results[index] = batch_item_error(
+                    index, f'Invalid ECG shape {ecg_signal.shape}, expected (4096, 12) for 12-lead ECG'
+                )
+                continue
 
-        # Calculate rhythm metrics
-        if len(r_peaks) >= 2:
-            rr_intervals = np.diff(r_peaks)
-            avg_rr_samples = np.mean(rr_intervals)
-            avg_rr_ms = (avg_rr_samples / hr_analyzer.fs) * 1000
+            quality = assess_signal_quality(ecg_signal)
+            is_valid, validation_msg = validate_ecg_input(ecg_signal, quality)
+            if not is_valid:
+                results[index] = batch_item_error(index, 'ECG signal quality check failed', validation_msg)
+                continue
 
-            # Rhythm regularity (CV < 0.15 = regular, >= 0.15 = irregular)
-            rr_cv = np.std(rr_intervals) / np.mean(rr_intervals)
+            valid_indices.append(index)
+            valid_signals.append(ecg_signal)
+            valid_qualities.append(quality)
+
+        api_logger.info(f"Batch validation: {len(valid_indices)}/{len(ecg_signals)} signals passed")
+
+        # === PROCESSING PIPELINE ===
+        # 1. ECG Model Prediction (result cache, then one forward pass for unique misses)
+        fingerprints = [signal_fingerprint(ecg_signal) for ecg_signal in valid_signals]
+        batch_predictions = [result_cache.get(prediction_cache_key(fp)) for fp in fingerprints]
+        cached_count = sum(1 for predictions_dict in batch_predictions if predictions_dict is not None)
+        for predictions_dict in batch_predictions:
+            record_cache_lookup('predictions', predictions_dict is not None)
+
+        miss_positions = {}  # fingerprint -> positions in valid_signals (duplicates share one slot)
+        for position, (fp, predictions_dict) in enumerate(zip(fingerprints, batch_predictions)):
+            if predictions_dict is None:
+                miss_positions.setdefault(fp, []).append(position)
+
+        if miss_positions:
+            with PerformanceTimer(f"Batch model prediction (N={len(miss_positions)})", api_logger,
+                                  stage="batch_model_prediction"):
+                computed = ecg_model.predict_batch(
+                    np.stack([valid_signals[positions[0]] for positions in miss_positions.values()]),
+                    finite_items=np.array([valid_qualities[positions[0]].all_finite
+                                           for positions in miss_positions.values()])
+                )
+
+            if ecg_model.simulation_mode:
+                FALLBACKS.labels('model_simulation').inc(len(miss_positions))
+
+            for (fp, positions), predictions_dict in zip(miss_positions.items(), computed):
+                result_cache.put(prediction_cache_key(fp), predictions_dict)
+                for position in positions:
+                    batch_predictions[position] = predictions_dict
+
+        # 2-3. Heart Rate Analysis and Region Mapping per item
+        with PerformanceTimer(f"Batch heart rate + region mapping (N={len(valid_signals)})", api_logger,
+                              stage="batch_heart_rate_region_mapping"):
+            for index, ecg_signal, quality, fp, predictions_dict in zip(valid_indices, valid_signals, valid_qualities,
+                                                                        fingerprints, batch_predictions):
+                try:
+                    top_condition, confidence = ecg_model.get_top_condition(predictions_dict)
+                    heart_rate_data, _ = cached_heart_rate(ecg_signal, fp, quality)
+                    region_health = region_mapper.get_region_health_status(predictions_dict)
+                    activation_sequence = region_mapper.get_activation_sequence(region_health)
+                except Exception as item_error:
+                    results[index] = batch_item_error(index, 'ECG analysis failed', str(item_error))
+                    continue
+
+                results[index] = {
+                    'index': index,
+                    'status': 'ok',
+                    'predictions': predictions_dict,
+                    'heart_rate': heart_rate_data,
+                    'signal_quality': quality.to_dict(),
+                    'region_health': region_health if region_health else None,
+                    'activation_sequence': activation_sequence if activation_sequence else None,
+                    'top_condition': top_condition,
+                    'confidence': round(confidence, 3)
+                }
+
+        # === RESPONSE ===
+        processing_time_ms = (time.time() - start_time) * 1000
+        succeeded = sum(1 for result in results if result['status'] == 'ok')
+
+        response_data = {
+            'results': results,
+            'batch_size': len(results),
+            'succeeded': succeeded,
+            'failed': len(results) - succeeded,
+            'processing_time_ms': round(processing_time_ms, 2),
+            'model_version': ecg_model.model_version,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            'metadata': {
+                'simulation_mode': ecg_model.simulation_mode,
+                'result_cache_hits': cached_count,
+                'request_id': api_logger.request_id
+            }
+        }
+
+        api_logger.info(f"Batch completed: {succeeded}/{len(results)} succeeded in {processing_time_ms:.2f}ms")
+        return jsonify(response_data)
+
+    except Exception as e:
+        error_id = api_logger.generate_error_id()
+        api_logger.error(f"{error_id}: Unexpected error in analyze_ecg_batch - {str(e)}", exc_info=True)
+
+        return jsonify({
+            'error': 'An internal processing error occurred',
+            'error_id': error_id,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            'suggestion': 'Please check your ECG data format and try again'
+        }), 500
+
+
+@app.route('/api/cache/stats', methods=['GET'])
+def cache_statistics():
+    """Get cache performance statistics"""
+    llm_stats = llm_cache.get_stats()
+
+    return jsonify({
+        'cache_stats': {
+            'hits': llm_stats['hits'],
+            'misses': llm_stats['misses'],
+            'total_requests': llm_stats['total_requests'],
+            'hit_rate_percent': llm_stats['hit_rate_percent']
+        },
+        'llm_cache': {
+            'entries': llm_stats['entries'],
+            'max_entries': llm_stats['max_entries'],
+            'ttl_seconds': llm_stats['ttl_seconds'],
+            'evictions': llm_stats['evictions'],
+            'expirations': llm_stats['expirations'],
+            'disk_hits': llm_stats['disk_hits'],
+            'in_flight': llm_stats['in_flight'],
+            'computations': llm_stats['computations'],
+            'coalesced': llm_stats['coalesced']
+        },
+        'persistent_llm_cache': persistent_llm_cache.get_stats() if persistent_llm_cache else None,
+        'result_cache': result_cache.get_stats()
+    })
+
+
+@app.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+    """
+    Prometheus scrape endpoint (text exposition format 0.0.4)
+
+    Stage latency histograms (ecg_stage_duration_seconds), total request time per
+    endpoint, responses per status, fallback/cache counters and error IDs.
+    """
+    SIMULATION_MODE.set(1 if ecg_model.simulation_mode else 0)
+    return Response(metrics_registry.render(), mimetype='text/plain; version=0.0.4')
+
+
+@app.route('/api/inference/stats', methods=['GET'])
+def inference_statistics():
+    """Get micro-batching scheduler statistics (queue depth, batch-size histogram)"""
+    return jsonify({
+        'inference_scheduler': inference_scheduler.get_stats(),
+        'simulation_mode': ecg_model.simulation_mode,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+    })
+
+
+@app.route('/api/admission/stats', methods=['GET'])
+def admission_statistics():
+    """Get admission control statistics (per-stage in-flight, queue depth, shed counts)"""
+    return jsonify({
+        'admission': admission.get_stats(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+    })
+
+
+@app.route('/api/cache/clear', methods=['POST'])
+def clear_cache():
+    """
+    Clear LLM response cache and the prediction/beat result cache (admin only)
+
+    Query params:
+        persistent: "true" to also delete the on-disk LLM responses
+    """
+    previous_stats = llm_cache.clear()
+    result_cache.clear()
+
+    if persistent_llm_cache and request.args.get('persistent', 'false').lower() == 'true':
+        persistent_llm_cache.clear()
+        api_logger.info("Persistent LLM cache cleared by admin request")
+
+    api_logger.info("Cache cleared by admin request")
+
+    return jsonify({
+        'message': 'Cache cleared successfully',
+        'previous_stats': previous_stats,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+    })
+
+
+@app.route('/api/cache/compact', methods=['POST'])
+def compact_cache():
+    """
+    Compact the persistent LLM cache (admin only)
+
+    Removes rows written by older prompt versions, rows past their TTL and
+    least-recently-used rows beyond the row limit, then VACUUMs the file.
+    """
+    if persistent_llm_cache is None:
+        error_id = api_logger.generate_error_id()
+        api_logger.warning(f"{error_id}: Compaction requested but persistent LLM cache is disabled")
+        return jsonify({
+            'error': 'Persistent LLM cache is disabled',
+            'error_id': error_id,
+            'suggestion': 'Set LLM_CACHE_DB to enable it',
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+        }), 404
+
+    size_before = persistent_llm_cache.get_stats()['size_bytes']
+
+    with PerformanceTimer("Persistent LLM cache compaction", api_logger, stage="llm_cache_compaction"):
+        compaction = persistent_llm_cache.compact(clinical_llm.prompt_versions)
+
+    compaction['size_bytes_before'] = size_before
+    compaction['size_bytes_after'] = persistent_llm_cache.get_stats()['size_bytes']
+
+    if compaction['error']:
+        error_id = api_logger.generate_error_id()
+        api_logger.error(f"{error_id}: Persistent LLM cache compaction failed - {compaction['error']}")
+        return jsonify({
+            'error': 'Persistent LLM cache compaction failed',
+            'error_id': error_id,
+            'details': compaction['error'],
+            'compaction': compaction,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+        }), 503
+
+    api_logger.info(f"Persistent LLM cache compacted: {compaction}")
+
+    return jsonify({
+        'message': 'Persistent LLM cache compacted',
+        'compaction': compaction,
+        'prompt_versions': clinical_llm.prompt_versions,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+    })
+
+
+# ============================================================================
+# PHASE 3: TEMPORAL DRILLDOWN ENDPOINTS
+# ============================================================================
+
+@app.route('/api/ecg/beats', methods=['POST'])
+@admission_controlled('temporal')
+def get_beats():
+    """
+    Fast R-peak detection endpoint for VR timeline scrubbing
+
+    Request body:
+    {
+        "ecg_signal": [[...], [...], ...]  # samples x 12 array, optional "sampling_rate" (Hz)
+    }
+    or {"signal_id": "SIG-..."} for a recording uploaded via POST /api/ecg/signals
+
+    Response:
+    {
+        "r_peaks": [350, 980, 1610, ...],
+        "beat_count": 12,
+        "avg_rr_interval_ms": 830.0,
+        "rhythm": "regular"
+    }
+    """
+    start_time = time.time()
+
+    try:
+        # Input validation
+        data, session, error_response = load_signal_session('/api/ecg/beats')
+        if error_response:
+            return error_response
+
+        r_peaks = session['r_peaks']
+        lead_used = session['lead_used']
+        lead_quality = session['lead_quality']
+
+        # Calculate rhythm metrics
+        if len(r_peaks) >= 2:
+            rr_intervals = np.diff(r_peaks)
+            avg_rr_samples = np.mean(rr_intervals)
+            avg_rr_ms = (avg_rr_samples / hr_analyzer.fs) * 1000
+
+            # Rhythm regularity (CV < 0.15 = regular, >= 0.15 = irregular)
+            rr_cv = np.std(rr_intervals) / np.mean(rr_intervals)
             rhythm = "regular" if rr_cv < 0.15 else "irregular"
         else:
             avg_rr_ms = 0.0
@@ -420,7 +1346,7 @@ def get_beats():
         processing_time_ms = (time.time() - start_time) * 1000
 
         response_data = {
-            'r_peaks': r_peaks.tolist(),
+            'r_peaks': r_peaks,  # NumPy arrays serialized by FastJSONProvider
             'beat_count': len(r_peaks),
             'avg_rr_interval_ms': round(avg_rr_ms, 1),
             'rhythm': rhythm,
@@ -429,6 +1355,8 @@ def get_beats():
             'processing_time_ms': round(processing_time_ms, 2),
             'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
         }
+        if session.get('signal_id'):
+            response_data['signal_id'] = session['signal_id']
 
         api_logger.info(f"Beat detection completed: {len(r_peaks)} beats in {processing_time_ms:.2f}ms")
         return jsonify(response_data)
@@ -444,14 +1372,20 @@ def get_beats():
 
 
 @app.route('/api/ecg/beat/<int:beat_index>', methods=['POST'])
+@admission_controlled('temporal')
 def get_beat_detail(beat_index):
     """
     Single beat waveform analysis
 
+    P/QRS/T landmarks are delineated from the signal (beat_delineation.py);
+    waves that are not found have null landmarks and intervals.
+
     Request body:
     {
-        "ecg_signal": [[...], [...], ...]  # 4096 x 12 array
+        "ecg_signal": [[...], [...], ...],  # samples x 12 array, optional "sampling_rate" (Hz)
+        "waveform_encoding": "int16"        # optional: json (default) | int16 | float16
     }
+    or {"signal_id": "SIG-..."} for a recording uploaded via POST /api/ecg/signals
 
     Response:
     {
@@ -464,9 +1398,10 @@ def get_beat_detail(beat_index):
         "intervals": {
             "pr_interval_ms": 170,
             "qrs_duration_ms": 100,
-            "qt_interval_ms": 400
+            "qt_interval_ms": 400,
+            "qtc_interval_ms": 420
         },
-        "raw_samples": [...],
+        "raw_samples": [...],               # or {"encoding", "scale", "offset", "data", ...}
         "annotations": "Normal sinus beat"
     }
     """
@@ -474,42 +1409,17 @@ def get_beat_detail(beat_index):
 
     try:
         # Input validation
-        data = request.get_json()
+        data, session, error_response = load_signal_session(f'/api/ecg/beat/{beat_index}')
+        if error_response:
+            return error_response
 
-        if not data or 'ecg_signal' not in data:
-            error_id = api_logger.generate_error_id()
-            api_logger.error(f"{error_id}: Missing ecg_signal in /api/ecg/beat/{beat_index}")
-            return jsonify({
-                'error': 'Missing required field: ecg_signal',
-                'error_id': error_id,
-                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
-            }), 400
+        waveform_encoding, error_response = load_waveform_encoding(data, f'/api/ecg/beat/{beat_index}')
+        if error_response:
+            return error_response
 
-        # Convert to numpy array
-        try:
-            ecg_signal = np.array(data['ecg_signal'], dtype=np.float32)
-        except (ValueError, TypeError) as e:
-            error_id = api_logger.generate_error_id()
-            api_logger.error(f"{error_id}: Invalid ecg_signal format - {str(e)}")
-            return jsonify({
-                'error': 'ecg_signal must be a numeric array',
-                'error_id': error_id,
-                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
-            }), 400
-
-        # Shape validation
-        if ecg_signal.shape != (4096, 12):
-            error_id = api_logger.generate_error_id()
-            api_logger.error(f"{error_id}: Invalid shape {ecg_signal.shape}")
-            return jsonify({
-                'error': f'Invalid ECG shape {ecg_signal.shape}, expected (4096, 12)',
-                'error_id': error_id,
-                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
-            }), 400
-
-        # Detect R-peaks
-        with PerformanceTimer(f"Beat {beat_index} analysis", api_logger):
-            r_peaks, lead_used, _, _ = hr_analyzer.detect_r_peaks(ecg_signal)
+        ecg_signal = session['signal']
+        r_peaks = session['r_peaks']
+        lead_used = session['lead_used']
 
         # Validate beat index
         if beat_index < 0 or beat_index >= len(r_peaks):
@@ -522,77 +1432,17 @@ def get_beat_detail(beat_index):
                 'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
             }), 400
 
-        # Extract beat window (±200ms around R-peak)
-        r_peak_sample = int(r_peaks[beat_index])
-        window_samples = int(0.2 * hr_analyzer.fs)  # 200ms = 80 samples at 400Hz
-        beat_start = max(0, r_peak_sample - window_samples)
-        beat_end = min(len(ecg_signal), r_peak_sample + window_samples)
-
-        # Get lead used for analysis
-        lead_index = {'II': 1, 'V1': 6, 'V5': 10, 'I': 0, 'aVF': 7}.get(lead_used, 1)
-        beat_signal = ecg_signal[beat_start:beat_end, lead_index]
-
-        # Simple waveform detection (placeholder - could be enhanced with actual detection)
-        # For now, we'll estimate based on typical ECG intervals
-        relative_r_peak = r_peak_sample - beat_start
-
-        # Estimate P-wave (typically 40-80ms before QRS onset)
-        p_onset = max(0, relative_r_peak - 60)
-        p_peak = max(0, relative_r_peak - 50)
-        p_offset = max(0, relative_r_peak - 30)
-
-        # QRS complex (typically 80-120ms wide)
-        qrs_onset = max(0, relative_r_peak - 20)
-        qrs_peak = relative_r_peak
-        qrs_offset = min(len(beat_signal) - 1, relative_r_peak + 30)
-
-        # T-wave (typically 100-200ms after QRS offset)
-        t_onset = min(len(beat_signal) - 1, qrs_offset + 20)
-        t_peak = min(len(beat_signal) - 1, qrs_offset + 70)
-        t_offset = min(len(beat_signal) - 1, qrs_offset + 120)
-
-        # Calculate intervals in ms
-        pr_interval_ms = ((qrs_onset - p_onset) / hr_analyzer.fs) * 1000
-        qrs_duration_ms = ((qrs_offset - qrs_onset) / hr_analyzer.fs) * 1000
-        qt_interval_ms = ((t_offset - qrs_onset) / hr_analyzer.fs) * 1000
-
-        # Generate annotation
-        annotation = "Normal sinus beat"
-        if qrs_duration_ms > 120:
-            annotation = "Wide QRS complex (possible bundle branch block)"
-        elif pr_interval_ms > 200:
-            annotation = "Prolonged PR interval (possible AV block)"
+        # Landmarks, intervals and annotation for this beat (shared with /api/ecg/beats/details)
+        delineation = delineate_beats(ecg_signal, r_peaks, lead_used, hr_analyzer.fs,
+                                      filtered_leads=session.get('filtered_leads'), beat_indices=[beat_index])
+        detail = beat_details(delineation, waveform_encoding=waveform_encoding)[0]
 
         processing_time_ms = (time.time() - start_time) * 1000
 
         response_data = {
             'beat_index': beat_index,
-            'r_peak_sample': r_peak_sample,
-            'waveform': {
-                'p_wave': {
-                    'onset': int(beat_start + p_onset),
-                    'peak': int(beat_start + p_peak),
-                    'offset': int(beat_start + p_offset)
-                },
-                'qrs_complex': {
-                    'onset': int(beat_start + qrs_onset),
-                    'peak': int(beat_start + qrs_peak),
-                    'offset': int(beat_start + qrs_offset)
-                },
-                't_wave': {
-                    'onset': int(beat_start + t_onset),
-                    'peak': int(beat_start + t_peak),
-                    'offset': int(beat_start + t_offset)
-                }
-            },
-            'intervals': {
-                'pr_interval_ms': round(pr_interval_ms, 1),
-                'qrs_duration_ms': round(qrs_duration_ms, 1),
-                'qt_interval_ms': round(qt_interval_ms, 1)
-            },
-            'raw_samples': beat_signal.tolist(),
+            **detail,
             'lead_used': lead_used,
-            'annotations': annotation,
             'processing_time_ms': round(processing_time_ms, 2),
             'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
         }
@@ -610,14 +1460,92 @@ def get_beat_detail(beat_index):
         }), 500
 
 
+@app.route('/api/ecg/beats/details', methods=['POST'])
+@admission_controlled('temporal')
+def get_all_beat_details():
+    """
+    Waveform landmarks, intervals and annotation for every beat in one request
+
+    Same per-beat layout as /api/ecg/beat/<index>, computed for all beats at
+    once over stacked beat windows instead of one request per beat.
+
+    Request body:
+    {
+        "ecg_signal": [[...], [...], ...],  # samples x 12 array, optional "sampling_rate" (Hz)
+        "include_samples": true,            # optional, false omits raw_samples
+        "waveform_encoding": "int16"        # optional: json (default) | int16 | float16
+    }
+    or {"signal_id": "SIG-..."} for a recording uploaded via POST /api/ecg/signals
+
+    Response:
+    {
+        "beat_count": 12,
+        "lead_used": "II",
+        "beats": [
+            {"beat_index": 0, "r_peak_sample": 350, "waveform": {...}, "intervals": {...},
+             "raw_samples": [...], "annotations": "Normal sinus beat"},
+            ...
+        ]
+    }
+    """
+    start_time = time.time()
+
+    try:
+        # Input validation
+        data, session, error_response = load_signal_session('/api/ecg/beats/details')
+        if error_response:
+            return error_response
+
+        include_samples = str(data.get('include_samples', 'true')).lower() in ('true', '1', 'yes')
+        waveform_encoding, error_response = load_waveform_encoding(data, '/api/ecg/beats/details')
+        if error_response:
+            return error_response
+
+        with PerformanceTimer("Beat delineation", api_logger, stage="beat_delineation"):
+            delineation = delineate_beats(session['signal'], session['r_peaks'], session['lead_used'],
+                                          hr_analyzer.fs, filtered_leads=session.get('filtered_leads'))
+            beats = beat_details(delineation, include_samples=include_samples,
+                                 waveform_encoding=waveform_encoding)
+
+        for beat_index, beat in enumerate(beats):
+            beat['beat_index'] = beat_index
+
+        processing_time_ms = (time.time() - start_time) * 1000
+
+        response_data = {
+            'beat_count': len(beats),
+            'lead_used': session['lead_used'],
+            'delineation_leads': delineation['leads'],
+            'sampling_rate': hr_analyzer.fs,
+            'beats': beats,
+            'processing_time_ms': round(processing_time_ms, 2),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+        }
+        if session.get('signal_id'):
+            response_data['signal_id'] = session['signal_id']
+
+        api_logger.info(f"Beat details completed: {len(beats)} beats in {processing_time_ms:.2f}ms")
+        return jsonify(response_data)
+
+    except Exception as e:
+        error_id = api_logger.generate_error_id()
+        api_logger.error(f"{error_id}: Error in /api/ecg/beats/details - {str(e)}", exc_info=True)
+        return jsonify({
+            'error': 'Beat details failed',
+            'error_id': error_id,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+        }), 500
+
+
 @app.route('/api/ecg/segment', methods=['POST'])
+@admission_controlled('temporal')
 def get_segment():
     """
     Time window analysis endpoint
 
     Request body:
     {
-        "ecg_signal": [[...], [...], ...],  # 4096 x 12 array
+        "ecg_signal": [[...], [...], ...],  # samples x 12 array (or "signal_id": "SIG-...")
         "start_ms": 1000,                    # Start time in milliseconds
         "end_ms": 3000                       # End time in milliseconds
     }
@@ -629,27 +1557,26 @@ def get_segment():
             "end_ms": 3000,
             "beats_in_segment": 2,
             "rhythm_analysis": "Regular sinus rhythm",
+            "heart_rate": {"bpm": 72.3, "mean_rr_ms": 830.0, "sdnn_ms": 0.0, ...},
             "events": [
                 {"type": "r_peak", "time_ms": 1350},
                 {"type": "r_peak", "time_ms": 2180}
-            ]
+            ],
+            "detection": "window"              # "cached": known R-peaks, "window": window-local detection
         }
     }
+
+    Known R-peaks (signal_id sessions, replayed recordings) are looked up with
+    searchsorted. Otherwise only the window plus a filter-settling margin is
+    analyzed (ECGHeartRateAnalyzer.detect_r_peaks_in_window).
     """
     start_time = time.time()
 
     try:
         # Input validation
-        data = request.get_json()
-
-        if not data or 'ecg_signal' not in data:
-            error_id = api_logger.generate_error_id()
-            api_logger.error(f"{error_id}: Missing ecg_signal in /api/ecg/segment")
-            return jsonify({
-                'error': 'Missing required field: ecg_signal',
-                'error_id': error_id,
-                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
-            }), 400
+        data, session, error_response = load_signal_session('/api/ecg/segment', detect=False)
+        if error_response:
+            return error_response
 
         if 'start_ms' not in data or 'end_ms' not in data:
             error_id = api_logger.generate_error_id()
@@ -660,27 +1587,7 @@ def get_segment():
                 'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
             }), 400
 
-        # Convert to numpy array
-        try:
-            ecg_signal = np.array(data['ecg_signal'], dtype=np.float32)
-        except (ValueError, TypeError) as e:
-            error_id = api_logger.generate_error_id()
-            api_logger.error(f"{error_id}: Invalid ecg_signal format - {str(e)}")
-            return jsonify({
-                'error': 'ecg_signal must be a numeric array',
-                'error_id': error_id,
-                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
-            }), 400
-
-        # Shape validation
-        if ecg_signal.shape != (4096, 12):
-            error_id = api_logger.generate_error_id()
-            api_logger.error(f"{error_id}: Invalid shape {ecg_signal.shape}")
-            return jsonify({
-                'error': f'Invalid ECG shape {ecg_signal.shape}, expected (4096, 12)',
-                'error_id': error_id,
-                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
-            }), 400
+        ecg_signal = session['signal']
 
         # Get time range
         start_ms = float(data['start_ms'])
@@ -697,15 +1604,26 @@ def get_segment():
                 'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
             }), 400
 
-        # Detect R-peaks
-        with PerformanceTimer(f"Segment analysis [{start_ms}-{end_ms}ms]", api_logger):
-            r_peaks, lead_used, _, _ = hr_analyzer.detect_r_peaks(ecg_signal)
+        start_sample = start_ms * hr_analyzer.fs / 1000
+        end_sample = end_ms * hr_analyzer.fs / 1000
+
+        if session['r_peaks'] is not None:
+            # Known (sorted) R-peaks: binary search for the window
+            r_peaks = session['r_peaks']
+            segment_peaks = r_peaks[np.searchsorted(r_peaks, start_sample, side='left'):
+                                    np.searchsorted(r_peaks, end_sample, side='right')]
+            lead_used = session['lead_used']
+            detection_mode = 'cached'
+            analyzed_samples = 0
+        else:
+            with PerformanceTimer("Window-local beat detection", api_logger, stage="segment_beat_detection"):
+                segment_peaks, lead_used, _, _, analyzed_samples = hr_analyzer.detect_r_peaks_in_window(
+                    ecg_signal, int(np.ceil(start_sample)), int(np.floor(end_sample))
+                )
+            detection_mode = 'window'
 
         # Convert R-peaks to milliseconds
-        r_peaks_ms = (r_peaks / hr_analyzer.fs) * 1000
-
-        # Filter R-peaks within time window
-        beats_in_segment = r_peaks_ms[(r_peaks_ms >= start_ms) & (r_peaks_ms <= end_ms)]
+        beats_in_segment = (segment_peaks / hr_analyzer.fs) * 1000
 
         # Analyze rhythm in segment
         if len(beats_in_segment) >= 2:
@@ -741,8 +1659,11 @@ def get_segment():
                 'duration_ms': end_ms - start_ms,
                 'beats_in_segment': len(beats_in_segment),
                 'rhythm_analysis': rhythm,
+                'heart_rate': hr_analyzer.rr_statistics(segment_peaks),
                 'events': events,
-                'lead_used': lead_used
+                'lead_used': lead_used,
+                'detection': detection_mode,
+                'analyzed_samples': analyzed_samples
             },
             'processing_time_ms': round(processing_time_ms, 2),
             'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
@@ -761,6 +1682,462 @@ def get_segment():
         }), 500
 
 
+# ============================================================================
+# SIGNAL SESSIONS: UPLOAD ONCE, SCRUB BY signal_id
+# ============================================================================
+
+@app.route('/api/ecg/signals', methods=['POST'])
+@admission_controlled('temporal')
+def create_signal_session():
+    """
+    Upload a recording once for the temporal drilldown endpoints
+
+    Filters the priority leads and detects R-peaks once; /api/ecg/beats,
+    /api/ecg/beat/<index> and /api/ecg/segment then accept {"signal_id": ...}
+    instead of the full signal.
+
+    Request body:
+    {
+        "ecg_signal": [[...], [...], ...]  # samples x 12 array (or binary body), optional "sampling_rate"
+    }
+
+    Response:
+    {
+        "signal_id": "SIG-3F2A9C1B7D4E",
+        "beat_count": 12,
+        "r_peaks": [350, 980, ...],
+        "lead_used": "II",
+        "ttl_seconds": 600
+    }
+    """
+    start_time = time.time()
+
+    try:
+        data, ecg_signal, error_response = load_ecg_request('/api/ecg/signals')
+        if error_response:
+            return error_response
+
+        # Shape / sampling rate validation and resampling to 400 Hz
+        ecg_signal, _, error_response = prepare_recording(data, ecg_signal, '/api/ecg/signals')
+        if error_response:
+            return error_response
+
+        with PerformanceTimer("Signal session creation", api_logger, stage="signal_session_creation"):
+            quality = assess_signal_quality(ecg_signal)
+            session = build_signal_session(ecg_signal, hr_analyzer, lead_variance=quality.lead_variance())
+            signal_id = signal_store.add(session)
+
+        if signal_id is None:
+            error_id = api_logger.generate_error_id()
+            api_logger.error(f"{error_id}: Signal session exceeds store budget ({signal_store.max_bytes} bytes)")
+            return jsonify({
+                'error': 'Signal too large for session store',
+                'error_id': error_id,
+                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+            }), 413
+
+        processing_time_ms = (time.time() - start_time) * 1000
+
+        response_data = {
+            'signal_id': signal_id,
+            'beat_count': len(session['r_peaks']),
+            'r_peaks': session['r_peaks'],
+            'lead_used': session['lead_used'],
+            'lead_quality': round(session['lead_quality'], 2),
+            'signal_quality': quality.to_dict(),
+            'ttl_seconds': signal_store.ttl_seconds,
+            'processing_time_ms': round(processing_time_ms, 2),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+        }
+
+        api_logger.info(f"Signal session {signal_id} created: {len(session['r_peaks'])} beats in {processing_time_ms:.2f}ms")
+        return jsonify(response_data), 201
+
+    except Exception as e:
+        error_id = api_logger.generate_error_id()
+        api_logger.error(f"{error_id}: Error in /api/ecg/signals - {str(e)}", exc_info=True)
+        return jsonify({
+            'error': 'Signal session creation failed',
+            'error_id': error_id,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+        }), 500
+
+
+@app.route('/api/ecg/signals/<signal_id>', methods=['DELETE'])
+def delete_signal_session(signal_id):
+    """Release an uploaded recording before its TTL expires"""
+    if not signal_store.delete(signal_id):
+        error_id = api_logger.generate_error_id()
+        api_logger.warning(f"{error_id}: Delete of unknown signal_id {signal_id}")
+        return jsonify({
+            'error': f'Unknown or expired signal_id: {signal_id}',
+            'error_id': error_id,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+        }), 404
+
+    api_logger.info(f"Signal session {signal_id} deleted")
+    return jsonify({
+        'message': f'Signal session {signal_id} deleted',
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+    })
+
+
+@app.route('/api/ecg/signals/stats', methods=['GET'])
+def signal_session_statistics():
+    """Get signal session store statistics (memory use, hit rate, evictions)"""
+    return jsonify({
+        'signal_sessions': signal_store.get_stats(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+    })
+
+
+# ============================================================================
+# ASYNC LLM INTERPRETATION JOBS
+# ============================================================================
+
+def interpretation_job_response(job: dict) -> dict:
+    """Response body for an interpretation job snapshot"""
+    result = job['result'] or {}
+
+    return {
+        'job_id': job['job_id'],
+        'status': job['status'],
+        'llm_interpretation': result.get('llm_interpretation'),
+        'cache_hit': result.get('cache_hit', False),
+        'error': job['error'],
+        'elapsed_ms': job['elapsed_ms'],
+        'request_id': job['request_id'],
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+    }
+
+
+def unknown_interpretation_job(job_id: str):
+    """404 response for an unknown or expired job_id"""
+    error_id = api_logger.generate_error_id()
+    api_logger.warning(f"{error_id}: Unknown or expired interpretation job {job_id}")
+    return jsonify({
+        'error': f'Unknown or expired interpretation job: {job_id}',
+        'error_id': error_id,
+        'suggestion': 'Jobs are kept for a limited time after completion; re-run /api/ecg/analyze',
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+    }), 404
+
+
+@app.route('/api/interpretation/stats', methods=['GET'])
+def interpretation_job_statistics():
+    """Get interpretation job executor statistics"""
+    return jsonify({
+        'interpretation_jobs': interpretation_jobs.get_stats(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+    })
+
+
+@app.route('/api/interpretation/<job_id>', methods=['GET'])
+def get_interpretation(job_id):
+    """
+    Poll an async LLM interpretation job
+
+    Query params:
+        wait: Optional seconds to block for completion (long polling, max 30)
+
+    Response:
+    {
+        "job_id": "JOB-8C1F0A2B3D4E",
+        "status": "complete",              # pending|running|complete|failed
+        "llm_interpretation": {...},       # null until complete
+        "cache_hit": false,
+        "error": null,
+        "elapsed_ms": 2150.4
+    }
+    """
+    try:
+        wait_seconds = min(max(float(request.args.get('wait', 0)), 0.0), 30.0)
+    except ValueError:
+        wait_seconds = 0.0
+
+    if wait_seconds > 0:
+        job = interpretation_jobs.wait(job_id, timeout=wait_seconds)
+    else:
+        job = interpretation_jobs.get(job_id)
+
+    if job is None:
+        return unknown_interpretation_job(job_id)
+
+    return jsonify(interpretation_job_response(job))
+
+
+@app.route('/api/interpretation/<job_id>/stream', methods=['GET'])
+def stream_interpretation(job_id):
+    """
+    Server-Sent Events variant of /api/interpretation/<job_id>
+
+    Emits one "status" event, keepalive comments while the job runs, then a
+    single "interpretation" event with the same body as the polling endpoint.
+    """
+    job = interpretation_jobs.get(job_id)
+    if job is None:
+        return unknown_interpretation_job(job_id)
+
+    def generate():
+        yield f"event: status\ndata: {json_codec.dumps({'job_id': job_id, 'status': job['status']})}\n\n"
+
+        while True:
+            current = interpretation_jobs.wait(job_id, timeout=SSE_KEEPALIVE_S)
+            if current is None:
+                yield f"event: error\ndata: {json_codec.dumps({'job_id': job_id, 'error': 'Job expired'})}\n\n"
+                return
+
+            if current['status'] in ('complete', 'failed'):
+                yield f"event: interpretation\ndata: {json_codec.dumps(interpretation_job_response(current))}\n\n"
+                return
+
+            yield ": keepalive\n\n"
+
+    return Response(generate(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+
+# ============================================================================
+# STREAMING INGESTION: CHUNKED UPLOADS + SSE UPDATES
+# ============================================================================
+
+def unknown_stream(stream_id: str):
+    """404 response for an unknown, closed or expired stream_id"""
+    error_id = api_logger.generate_error_id()
+    api_logger.warning(f"{error_id}: Unknown or expired stream {stream_id}")
+    return jsonify({
+        'error': f'Unknown or expired stream_id: {stream_id}',
+        'error_id': error_id,
+        'suggestion': 'Open a new stream via POST /api/ecg/streams',
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+    }), 404
+
+
+@app.route('/api/ecg/streams', methods=['POST'])
+def create_stream():
+    """
+    Open a live ECG stream
+
+    Request body (optional):
+    {
+        "hop_seconds": 2.0   # Re-run the model every hop over the last 4096 samples (0.25-10.24)
+    }
+
+    Response:
+    {
+        "stream_id": "STR-5B2E7A9C0D1F",
+        "sampling_rate": 400,
+        "window_samples": 4096,
+        "hop_samples": 800,
+        "max_chunk_samples": 4096
+    }
+    """
+    data = request.get_json(silent=True) or {}
+
+    try:
+        hop_seconds = float(data.get('hop_seconds', STREAM_DEFAULT_HOP_SECONDS))
+    except (TypeError, ValueError):
+        hop_seconds = -1.0
+
+    window_seconds = 4096 / hr_analyzer.fs
+    if not 0.25 <= hop_seconds <= window_seconds:
+        error_id = api_logger.generate_error_id()
+        api_logger.error(f"{error_id}: Invalid hop_seconds {data.get('hop_seconds')}")
+        return jsonify({
+            'error': f'hop_seconds must be between 0.25 and {window_seconds}',
+            'error_id': error_id,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+        }), 400
+
+    stream = stream_store.create(hr_analyzer, window_samples=4096, hop_samples=int(hop_seconds * hr_analyzer.fs))
+    if stream is None:
+        error_id = api_logger.generate_error_id()
+        api_logger.error(f"{error_id}: Stream limit reached ({stream_store.max_streams})")
+        return jsonify({
+            'error': 'Too many open streams',
+            'error_id': error_id,
+            'max_streams': stream_store.max_streams,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+        }), 503
+
+    api_logger.info(f"Stream {stream.stream_id} opened (hop {stream.hop_samples} samples)")
+
+    return jsonify({
+        'stream_id': stream.stream_id,
+        'sampling_rate': hr_analyzer.fs,
+        'window_samples': stream.window_samples,
+        'hop_samples': stream.hop_samples,
+        'max_chunk_samples': stream.window_samples,
+        'ttl_seconds': stream_store.ttl_seconds,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+    }), 201
+
+
+@app.route('/api/ecg/streams/<stream_id>/chunks', methods=['POST'])
+def append_stream_chunk(stream_id):
+    """
+    Append samples to a live stream
+
+    Request body:
+    {
+        "samples": [[...12 leads...], ...]   # (n, 12), n <= 4096 - or a binary body with X-ECG-Shape: n,12
+    }
+
+    Response (also pushed to /api/ecg/streams/<stream_id>/events):
+    {
+        "sequence": 14,
+        "total_samples": 5600,
+        "new_r_peaks": [5210, 5543],          # Absolute sample indices
+        "heart_rate": {"bpm": 72.0, ...},
+        "predictions": {...},                 # Only when a prediction hop ran
+        "region_health": {...}
+    }
+    """
+    start_time = time.time()
+
+    stream = stream_store.get(stream_id)
+    if stream is None:
+        return unknown_stream(stream_id)
+
+    try:
+        # Accept chunks as JSON "samples" or a binary body (same decoding as full uploads)
+        chunk_status = 400
+        if is_binary_payload(request.content_type):
+            try:
+                samples = decode_binary_ecg(request.get_data(cache=False), request.content_type, request.headers)
+            except ECGPayloadError as e:
+                samples, chunk_error, chunk_status = None, f'Invalid binary chunk: {str(e)}', e.status_code
+        else:
+            data = request.get_json(silent=True) or {}
+            try:
+                samples = np.asarray(data['samples'], dtype=np.float32)
+            except (KeyError, ValueError, TypeError):
+                samples, chunk_error = None, 'Missing or non-numeric field: samples ((n, 12) array)'
+
+        if samples is not None:
+            if samples.ndim != 2 or samples.shape[1] != 12 or not 0 < len(samples) <= stream.window_samples:
+                samples, chunk_error = None, (
+                    f'Invalid chunk shape {samples.shape}, expected (n, 12) with 1 <= n <= {stream.window_samples}'
+                )
+            elif not np.isfinite(samples).all():
+                samples, chunk_error = None, 'Chunk contains NaN or infinite values'
+
+        if samples is None:
+            error_id = api_logger.generate_error_id()
+            api_logger.error(f"{error_id}: Rejected chunk for {stream_id} - {chunk_error}")
+            return jsonify({
+                'error': chunk_error,
+                'error_id': error_id,
+                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+            }), chunk_status
+
+        # Chunks of one stream are applied in order
+        with stream.lock:
+            with PerformanceTimer(f"Stream beat detection (n={len(samples)})", api_logger, stage="stream_beat_detection"):
+                new_r_peaks = stream.append(samples)
+                heart_rate_data = stream.heart_rate()
+            prediction_window = stream.take_prediction_window()
+            total_samples = stream.buffer.total_samples
+
+        update = {
+            'stream_id': stream_id,
+            'total_samples': total_samples,
+            'duration_s': round(total_samples / hr_analyzer.fs, 2),
+            'new_r_peaks': new_r_peaks,
+            'heart_rate': heart_rate_data
+        }
+
+        # Prediction hop over the last 4096 samples
+        if prediction_window is not None:
+            with PerformanceTimer("Stream model prediction", api_logger, stage="stream_model_prediction"):
+                predictions_dict = inference_scheduler.predict(prediction_window)
+                top_condition, confidence = ecg_model.get_top_condition(predictions_dict)
+                region_health = region_mapper.get_region_health_status(predictions_dict)
+
+            update.update({
+                'predictions': predictions_dict,
+                'top_condition': top_condition,
+                'confidence': round(confidence, 3),
+                'region_health': region_health,
+                'window_end_sample': total_samples
+            })
+
+        update['processing_time_ms'] = round((time.time() - start_time) * 1000, 2)
+        update['timestamp'] = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+
+        stream.publish(update)
+        stream_store.record_chunk(len(samples), prediction_window is not None)
+
+        return jsonify(update)
+
+    except Exception as e:
+        error_id = api_logger.generate_error_id()
+        api_logger.error(f"{error_id}: Error in stream chunk for {stream_id} - {str(e)}", exc_info=True)
+        return jsonify({
+            'error': 'Stream chunk processing failed',
+            'error_id': error_id,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+        }), 500
+
+
+@app.route('/api/ecg/streams/<stream_id>/events', methods=['GET'])
+def stream_events(stream_id):
+    """
+    Server-Sent Events feed of stream updates
+
+    Emits an "update" event per processed chunk (the latest one if the client
+    falls behind), keepalive comments while idle, and "closed" when the stream ends.
+    """
+    stream = stream_store.get(stream_id)
+    if stream is None:
+        return unknown_stream(stream_id)
+
+    def generate():
+        sequence = 0
+        if stream.latest_update is not None:
+            sequence = stream.sequence
+            yield f"event: update\ndata: {json_codec.dumps(stream.latest_update)}\n\n"
+
+        while True:
+            sequence, update = stream.wait_for_update(sequence, timeout=SSE_KEEPALIVE_S)
+            if update is not None:
+                yield f"event: update\ndata: {json_codec.dumps(update)}\n\n"
+            elif stream.closed:
+                yield f"event: closed\ndata: {json_codec.dumps({'stream_id': stream_id})}\n\n"
+                return
+            else:
+                yield ": keepalive\n\n"
+
+    return Response(generate(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+
+@app.route('/api/ecg/streams/<stream_id>', methods=['DELETE'])
+def close_stream(stream_id):
+    """Close a live stream (ends its SSE feed)"""
+    if not stream_store.close(stream_id):
+        return unknown_stream(stream_id)
+
+    api_logger.info(f"Stream {stream_id} closed")
+    return jsonify({
+        'message': f'Stream {stream_id} closed',
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+    })
+
+
+@app.route('/api/ecg/streams/stats', methods=['GET'])
+def stream_statistics():
+    """Get live stream statistics"""
+    return jsonify({
+        'streams': stream_store.get_stats(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+    })
+
+
 if __name__ == '__main__':
     initialize()
     app.run(host='0.0.0.0', port=5000, debug=True)
\ No newline at end of file
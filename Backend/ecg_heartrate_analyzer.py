@@ -17,6 +17,14 @@ class ECGHeartRateAnalyzer:
             (7, "aVF")      # Lead aVF - inferior view backup
         ]
 
+    # Leads below this variance score 0.0 quality (flat/dead lead)
+    FLAT_LEAD_VARIANCE = 0.001
+
+    # Window-local detection: filter-settling margin on each side of the window, and the
+    # shortest span detected (enough beats for lead quality scoring at low heart rates)
+    WINDOW_MARGIN_SECONDS = 1.0
+    MIN_DETECTION_SECONDS = 4.0
+
     def bandpass_filter(self, signal, lowcut=0.5, highcut=40):
         nyquist = 0.5 * self.fs
         low = lowcut / nyquist
@@ -24,13 +32,14 @@ class ECGHeartRateAnalyzer:
         b, a = butter(2, [low, high], btype='band')
         return filtfilt(b, a, signal)
 
-    def assess_signal_quality(self, signal, r_peaks):
+    def assess_signal_quality(self, signal, r_peaks, signal_power=None):
         """
         Assess ECG signal quality for R-peak detection
 
         Args:
             signal: 1D ECG signal
             r_peaks: Detected R-peak indices
+            signal_power: Optional precomputed variance of the lead (SignalQualityReport)
 
         Returns:
             float: Quality score (0.0 = poor, 1.0 = excellent)
@@ -39,8 +48,9 @@ class ECGHeartRateAnalyzer:
             return 0.0
 
         # 1. SNR estimate (signal-to-noise ratio)
-        signal_power = np.var(signal)
-        if signal_power < 0.001:  # Flat/dead lead
+        if signal_power is None:
+            signal_power = np.var(signal)
+        if signal_power < self.FLAT_LEAD_VARIANCE:  # Flat/dead lead
             return 0.0
 
         # 2. Rhythm regularity (coefficient of variation of RR intervals)
@@ -83,18 +93,42 @@ class ECGHeartRateAnalyzer:
 
         return min(1.0, max(0.0, quality))
 
-    def detect_r_peaks_single_lead(self, signal):
+    def is_flat_lead(self, lead_index, lead_variance):
+        """True if precomputed variance marks the lead as flat (never selected for R-peaks)"""
+        return lead_variance is not None and lead_variance.get(lead_index, 1.0) < self.FLAT_LEAD_VARIANCE
+
+    def filter_leads(self, ecg_signal, lead_variance=None):
+        """
+        Bandpass filter every priority lead once so results can be reused
+
+        Args:
+            ecg_signal: (samples, 12) array
+            lead_variance: Optional {lead_index: variance} (SignalQualityReport.lead_variance());
+                           flat leads are not filtered
+
+        Returns:
+            dict: {lead_index: filtered 1D signal}
+        """
+        return {
+            lead_index: self.bandpass_filter(ecg_signal[:, lead_index])
+            for lead_index, _ in self.LEAD_PRIORITY
+            if lead_index < ecg_signal.shape[1] and not self.is_flat_lead(lead_index, lead_variance)
+        }
+
+    def detect_r_peaks_single_lead(self, signal, filtered=None):
         """
         Detect R-peaks in a single ECG lead using Pan-Tompkins algorithm
 
         Args:
             signal: 1D ECG signal
+            filtered: Optional pre-computed bandpass_filter(signal)
 
         Returns:
             ndarray: R-peak sample indices
         """
         # Pan-Tompkins algorithm
-        filtered = self.bandpass_filter(signal)
+        if filtered is None:
+            filtered = self.bandpass_filter(signal)
         differentiated = np.diff(filtered)
         squared = differentiated ** 2
 
@@ -112,7 +146,7 @@ class ECGHeartRateAnalyzer:
 
         return peaks
 
-    def detect_r_peaks(self, ecg_signal):
+    def detect_r_peaks(self, ecg_signal, filtered_leads=None, lead_variance=None):
         """
         Detect R-peaks with multi-lead fallback
 
@@ -121,6 +155,9 @@ class ECGHeartRateAnalyzer:
 
         Args:
             ecg_signal: (4096, 12) array or 1D array
+            filtered_leads: Optional {lead_index: filtered signal} from filter_leads()
+            lead_variance: Optional {lead_index: variance} from SignalQualityReport.lead_variance().
+                           Flat leads are skipped without filtering or peak detection.
 
         Returns:
             tuple: (r_peaks, lead_used, lead_quality, fallback_triggered)
@@ -142,13 +179,23 @@ class ECGHeartRateAnalyzer:
             if lead_index >= ecg_signal.shape[1]:
                 continue  # Skip if lead doesn't exist
 
+            # If we've moved past Lead II, fallback was triggered
+            if lead_name != "II":
+                fallback_triggered = True
+
+            # A flat lead would score 0.0 - skip it without filtering
+            if self.is_flat_lead(lead_index, lead_variance):
+                continue
+
             signal = ecg_signal[:, lead_index]
 
             # Detect R-peaks
-            r_peaks = self.detect_r_peaks_single_lead(signal)
+            filtered = filtered_leads.get(lead_index) if filtered_leads else None
+            r_peaks = self.detect_r_peaks_single_lead(signal, filtered=filtered)
 
             # Assess quality
-            quality = self.assess_signal_quality(signal, r_peaks)
+            signal_power = lead_variance.get(lead_index) if lead_variance else None
+            quality = self.assess_signal_quality(signal, r_peaks, signal_power=signal_power)
 
             # Track best lead
             if quality > best_quality:
@@ -161,10 +208,6 @@ class ECGHeartRateAnalyzer:
             if lead_name == "II" and quality > 0.8:
                 return r_peaks, lead_name, quality, False
 
-            # If we've moved past Lead II, fallback was triggered
-            if lead_name != "II":
-                fallback_triggered = True
-
         # Return best result
         if best_peaks is not None:
             return best_peaks, best_lead_name, best_quality, fallback_triggered
@@ -172,6 +215,70 @@ class ECGHeartRateAnalyzer:
             # Extreme fallback: return empty peaks
             return np.array([]), "none", 0.0, True
 
+    def detect_r_peaks_in_window(self, ecg_signal, start_sample, end_sample, lead_variance=None):
+        """
+        R-peaks inside [start_sample, end_sample] without processing the whole recording
+
+        Runs the multi-lead detection on the window plus WINDOW_MARGIN_SECONDS on each
+        side (widened to MIN_DETECTION_SECONDS), so filter edge effects fall in the margin.
+
+        Args:
+            ecg_signal: (samples, 12) array
+            start_sample, end_sample: Window bounds (inclusive)
+            lead_variance: Optional {lead_index: variance} for the detection span
+
+        Returns:
+            tuple: (r_peaks (absolute indices), lead_used, lead_quality, fallback_triggered, detected_samples)
+        """
+        num_samples = len(ecg_signal)
+        margin = int(self.WINDOW_MARGIN_SECONDS * self.fs)
+        detect_start = max(0, int(start_sample) - margin)
+        detect_end = min(num_samples, int(end_sample) + 1 + margin)
+
+        min_span = int(self.MIN_DETECTION_SECONDS * self.fs)
+        if detect_end - detect_start < min_span:
+            center = (detect_start + detect_end) // 2
+            detect_start = max(0, min(center - min_span // 2, num_samples - min_span))
+            detect_end = min(num_samples, detect_start + min_span)
+
+        r_peaks, lead_used, lead_quality, fallback_triggered = self.detect_r_peaks(
+            ecg_signal[detect_start:detect_end], lead_variance=lead_variance
+        )
+
+        r_peaks = np.asarray(r_peaks, dtype=np.int64) + detect_start
+        r_peaks = r_peaks[(r_peaks >= start_sample) & (r_peaks <= end_sample)]
+
+        return r_peaks, lead_used, lead_quality, fallback_triggered, detect_end - detect_start
+
+    def rr_statistics(self, r_peak_indices):
+        """
+        Heart rate and RR-interval statistics for a set of consecutive R-peaks
+
+        Returns:
+            dict: bpm (median), min/max bpm, mean RR, SDNN and RMSSD in ms
+                  (None values with fewer than 2 peaks)
+        """
+        if len(r_peak_indices) < 2:
+            return {
+                'bpm': None, 'min_bpm': None, 'max_bpm': None,
+                'mean_rr_ms': None, 'sdnn_ms': None, 'rmssd_ms': None,
+                'rr_intervals_ms': []
+            }
+
+        rr_intervals_ms = np.diff(r_peak_indices) / self.fs * 1000
+        hr_per_interval = 60000 / rr_intervals_ms
+        successive = np.diff(rr_intervals_ms)
+
+        return {
+            'bpm': round(float(np.median(hr_per_interval)), 1),
+            'min_bpm': round(float(hr_per_interval.min()), 1),
+            'max_bpm': round(float(hr_per_interval.max()), 1),
+            'mean_rr_ms': round(float(rr_intervals_ms.mean()), 1),
+            'sdnn_ms': round(float(rr_intervals_ms.std()), 1),
+            'rmssd_ms': round(float(np.sqrt(np.mean(successive ** 2))), 1) if len(successive) else None,
+            'rr_intervals_ms': [round(float(rr), 1) for rr in rr_intervals_ms]
+        }
+
     def calculate_bpm(self, r_peak_indices):
         if len(r_peak_indices) < 2:
             return 60.0, []
@@ -187,10 +294,14 @@ class ECGHeartRateAnalyzer:
     def get_beat_timestamps(self, r_peak_indices):
         return (r_peak_indices / self.fs).tolist()
 
-    def analyze(self, ecg_signal):
+    def analyze(self, ecg_signal, lead_variance=None):
         """
         Complete analysis in one call with multi-lead fallback
 
+        Args:
+            ecg_signal: (4096, 12) array
+            lead_variance: Optional {lead_index: variance} from SignalQualityReport.lead_variance()
+
         Returns:
             dict: {
                 'bpm': float,
@@ -202,7 +313,7 @@ class ECGHeartRateAnalyzer:
                 'fallback_triggered': bool
             }
         """
-        r_peaks, lead_used, lead_quality, fallback_triggered = self.detect_r_peaks(ecg_signal)
+        r_peaks, lead_used, lead_quality, fallback_triggered = self.detect_r_peaks(ecg_signal, lead_variance=lead_variance)
         bpm, rr_intervals = self.calculate_bpm(r_peaks)
         timestamps = self.get_beat_timestamps(r_peaks)
 
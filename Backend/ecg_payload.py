@@ -0,0 +1,283 @@
+"""
+ECG Payload Decoding
+
+Decodes ECG signals from request bodies. Besides the original JSON format
+({"ecg_signal": [[...], ...]}) the API accepts binary uploads, which skip
+parsing ~49k JSON floats per request:
+
+- application/octet-stream: raw little-endian samples, row-major (samples x leads)
+    X-ECG-Shape: 4096,12         (required)
+    X-ECG-Dtype: float32|int16   (optional, default float32)
+    X-ECG-Scale: 0.001           (optional, mV per count for int16, default 0.001 = microvolts;
+                                  must be finite and positive)
+- application/x-npy: a NumPy .npy file (format 1.0, 2.0 or 3.0; float32 or int16, C order)
+
+Malformed bodies raise ECGPayloadError (400); .npy format versions other
+than 1.0 - 3.0 raise UnsupportedECGPayload (415).
+
+float32 bodies are wrapped with np.frombuffer (zero-copy, read-only view).
+int16 bodies are converted once to float32 millivolts.
+
+Author: Backend Developer 1
+Project: HoloHuman XR - Immerse the Bay 2025
+"""
+
+import io
+import math
+
+import numpy as np
+
+
+OCTET_STREAM_TYPES = ('application/octet-stream',)
+NPY_TYPES = ('application/x-npy', 'application/npy')
+NPY_MAGIC = b'\x93NUMPY'
+
+# Little-endian dtypes accepted for binary uploads
+SUPPORTED_DTYPES = {
+    'float32': np.dtype('<f4'),
+    'int16': np.dtype('<i2')
+}
+
+DEFAULT_INT16_SCALE = 0.001  # 1 count = 1 microvolt
+
+
+class ECGPayloadError(ValueError):
+    """Raised when a binary ECG body cannot be decoded"""
+    status_code = 400
+
+
+class UnsupportedECGPayload(ECGPayloadError):
+    """Raised for a binary format the server does not implement (e.g. an unknown .npy version)"""
+    status_code = 415
+
+
+def get_mimetype(content_type):
+    """Return the lower-cased mimetype without parameters"""
+    return (content_type or '').split(';')[0].strip().lower()
+
+
+def is_binary_payload(content_type):
+    """Check whether a Content-Type selects the binary upload path"""
+    return get_mimetype(content_type) in OCTET_STREAM_TYPES + NPY_TYPES
+
+
+def parse_shape_header(shape_header):
+    """
+    Parse an X-ECG-Shape header such as "4096,12" or "4096x12"
+
+    Returns:
+        tuple: shape as ints
+    """
+    if not shape_header:
+        raise ECGPayloadError('Missing X-ECG-Shape header for binary ECG upload')
+
+    try:
+        shape = tuple(
+            int(dim) for dim in shape_header.lower().replace('x', ',').split(',') if dim.strip()
+        )
+    except ValueError:
+        raise ECGPayloadError(f'Invalid X-ECG-Shape header: {shape_header!r}')
+
+    if not shape or any(dim <= 0 for dim in shape):
+        raise ECGPayloadError(f'Invalid X-ECG-Shape header: {shape_header!r}')
+
+    return shape
+
+
+def parse_scale_header(scale_header):
+    """
+    Parse an X-ECG-Scale header (mV per int16 count)
+
+    Returns:
+        float: finite, positive scale (DEFAULT_INT16_SCALE when the header is absent)
+    """
+    if not scale_header:
+        return DEFAULT_INT16_SCALE
+
+    try:
+        scale = float(scale_header)
+    except ValueError:
+        raise ECGPayloadError(f'Invalid X-ECG-Scale header: {scale_header!r}')
+
+    if not math.isfinite(scale) or scale <= 0:
+        raise ECGPayloadError(f'X-ECG-Scale must be a finite, positive number, got {scale_header!r}')
+
+    return scale
+
+
+def _element_count(shape, data_bytes, itemsize):
+    """
+    Number of elements in shape, or None if they do not fill exactly data_bytes
+
+    Python ints throughout (np.prod wraps around at int64), and no dimension
+    may exceed the data size before the product is taken.
+    """
+    if any(dim > data_bytes for dim in shape):
+        return None
+
+    count = math.prod(shape)
+    return count if count * itemsize == data_bytes else None
+
+
+def _to_float32(raw, scale):
+    """Convert decoded samples to float32 millivolts (no copy for float32 input)"""
+    if raw.dtype.kind == 'f':
+        return raw
+
+    signal = raw.astype(np.float32)
+    signal *= scale
+    return signal
+
+
+def decode_raw_ecg(body, shape_header, dtype_header=None, scale_header=None):
+    """
+    Decode an application/octet-stream ECG body
+
+    Args:
+        body: bytes of little-endian samples
+        shape_header: X-ECG-Shape value
+        dtype_header: X-ECG-Dtype value (float32|int16)
+        scale_header: X-ECG-Scale value (mV per count, int16 only)
+
+    Returns:
+        ndarray: float32 signal with the requested shape
+    """
+    shape = parse_shape_header(shape_header)
+
+    dtype_name = (dtype_header or 'float32').strip().lower()
+    if dtype_name not in SUPPORTED_DTYPES:
+        raise ECGPayloadError(f"Unsupported X-ECG-Dtype {dtype_name!r} (expected 'float32' or 'int16')")
+    dtype = SUPPORTED_DTYPES[dtype_name]
+
+    scale = parse_scale_header(scale_header)
+
+    count = _element_count(shape, len(body), dtype.itemsize)
+    if count is None:
+        raise ECGPayloadError(
+            f'Body has {len(body)} bytes, expected {math.prod(shape) * dtype.itemsize} for shape {shape} {dtype_name}'
+        )
+
+    raw = np.frombuffer(body, dtype=dtype, count=count).reshape(shape)
+    return _to_float32(raw, scale)
+
+
+def decode_npy_ecg(body, scale_header=None):
+    """
+    Decode a .npy ECG body without copying float32 data
+
+    Args:
+        body: bytes of a .npy file (format version 1.0 - 3.0)
+        scale_header: X-ECG-Scale value (mV per count, int16 only)
+
+    Returns:
+        ndarray: float32 signal
+    """
+    if not body.startswith(NPY_MAGIC):
+        raise ECGPayloadError('Body is not a valid .npy file')
+
+    stream = io.BytesIO(body)
+    try:
+        version = np.lib.format.read_magic(stream)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(stream)
+        elif version in ((2, 0), (3, 0)):
+            # 3.0 only differs from 2.0 by allowing a UTF-8 header, which matters for
+            # structured dtype field names - never a supported ECG dtype
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(stream)
+        else:
+            raise UnsupportedECGPayload(f'Unsupported .npy format version {version[0]}.{version[1]} '
+                                        f'(expected 1.0, 2.0 or 3.0)')
+    except UnsupportedECGPayload:
+        raise
+    except ValueError as e:
+        raise ECGPayloadError(f'Invalid .npy header: {e}')
+
+    if fortran_order:
+        raise ECGPayloadError('.npy ECG data must be C-ordered (samples x leads)')
+
+    if dtype not in SUPPORTED_DTYPES.values():
+        raise ECGPayloadError(f'Unsupported .npy dtype {dtype.str} (expected <f4 or <i2)')
+
+    scale = parse_scale_header(scale_header)
+
+    offset = stream.tell()
+    count = _element_count(shape, len(body) - offset, dtype.itemsize)
+    if count is None:
+        raise ECGPayloadError(f'.npy body size does not match header shape {shape}')
+
+    raw = np.frombuffer(body, dtype=dtype, count=count, offset=offset).reshape(shape)
+    return _to_float32(raw, scale)
+
+
+def decode_binary_ecg(body, content_type, headers):
+    """
+    Decode a binary ECG body based on its Content-Type
+
+    .npy files are also detected by magic bytes when sent as application/octet-stream.
+
+    Args:
+        body: raw request bytes
+        content_type: request Content-Type
+        headers: mapping with the X-ECG-* headers
+
+    Returns:
+        ndarray: float32 signal
+    """
+    if not body:
+        raise ECGPayloadError('Empty request body')
+
+    if get_mimetype(content_type) in NPY_TYPES or body.startswith(NPY_MAGIC):
+        return decode_npy_ecg(body, headers.get('X-ECG-Scale'))
+
+    return decode_raw_ecg(
+        body,
+        headers.get('X-ECG-Shape'),
+        headers.get('X-ECG-Dtype'),
+        headers.get('X-ECG-Scale')
+    )
+
+
+def _quantize(ecg_signal, dtype, scale):
+    """Convert a millivolt signal to little-endian float32 or int16 counts"""
+    ecg_signal = np.asarray(ecg_signal)
+
+    if dtype == 'int16':
+        return np.clip(np.round(ecg_signal / scale), -32768, 32767).astype('<i2')
+    return np.ascontiguousarray(ecg_signal, dtype='<f4')
+
+
+def encode_raw_ecg(ecg_signal, dtype='float32', scale=DEFAULT_INT16_SCALE):
+    """
+    Encode a signal for an application/octet-stream upload (client/test helper)
+
+    Returns:
+        tuple: (body bytes, headers dict)
+    """
+    raw = _quantize(ecg_signal, dtype, scale)
+
+    headers = {
+        'Content-Type': 'application/octet-stream',
+        'X-ECG-Shape': ','.join(str(dim) for dim in raw.shape),
+        'X-ECG-Dtype': dtype
+    }
+    if dtype == 'int16':
+        headers['X-ECG-Scale'] = str(scale)
+
+    return raw.tobytes(), headers
+
+
+def encode_npy_ecg(ecg_signal, dtype='float32', scale=DEFAULT_INT16_SCALE):
+    """
+    Encode a signal as an application/x-npy upload (client/test helper)
+
+    Returns:
+        tuple: (body bytes, headers dict)
+    """
+    buffer = io.BytesIO()
+    np.save(buffer, _quantize(ecg_signal, dtype, scale))
+
+    headers = {'Content-Type': 'application/x-npy'}
+    if dtype == 'int16':
+        headers['X-ECG-Scale'] = str(scale)
+
+    return buffer.getvalue(), headers
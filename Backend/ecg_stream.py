@@ -0,0 +1,296 @@
+"""
+Streaming ECG Ingestion
+
+Bedside monitors stream continuously instead of sending complete 4096-sample
+recordings. Each stream keeps a fixed-size ring buffer of the most recent
+samples, detects R-peaks incrementally on a short tail window as chunks
+arrive, and hands the last 4096 samples to the model every hop_samples.
+Updates are published to Server-Sent Events subscribers.
+
+Author: Backend Developer 1
+Project: HoloHuman XR - Immerse the Bay 2025
+"""
+
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+
+import numpy as np
+
+
+class ECGRingBuffer:
+    """Fixed-capacity (samples, leads) ring buffer"""
+
+    def __init__(self, capacity, n_leads=12):
+        self.capacity = capacity
+        self.n_leads = n_leads
+        self._data = np.zeros((capacity, n_leads), dtype=np.float32)
+        self._write_index = 0
+        self.total_samples = 0  # Samples ever written (absolute index of the next sample)
+
+    def __len__(self):
+        return min(self.total_samples, self.capacity)
+
+    def append(self, samples):
+        """Append (n, n_leads) samples, overwriting the oldest when full"""
+        samples = samples[-self.capacity:]
+        n = len(samples)
+
+        first = min(n, self.capacity - self._write_index)
+        self._data[self._write_index:self._write_index + first] = samples[:first]
+        if first < n:
+            self._data[:n - first] = samples[first:]
+
+        self._write_index = (self._write_index + n) % self.capacity
+        self.total_samples += n
+
+    def latest(self, n):
+        """
+        Most recent n samples in time order
+
+        Returns:
+            tuple: ((n, n_leads) copy, absolute index of its first sample)
+        """
+        n = min(n, len(self))
+        start = (self._write_index - n) % self.capacity
+
+        if start + n <= self.capacity:
+            window = self._data[start:start + n].copy()
+        else:
+            window = np.concatenate([self._data[start:], self._data[:self._write_index]])
+
+        return window, self.total_samples - n
+
+
+class ECGStream:
+    """
+    One live ECG stream: ring buffer, incremental R-peaks, prediction hop, update feed
+
+    Callers serialize append()/take_prediction_window() with stream.lock.
+    """
+
+    # Minimum buffered samples before beat detection starts (1 s)
+    MIN_DETECTION_SECONDS = 1.0
+    # Tail window re-scanned on each chunk (long enough for the 0.5 Hz bandpass)
+    DETECTION_WINDOW_SECONDS = 4.0
+    # Peaks this close to the newest sample are confirmed on the next chunk
+    EDGE_MARGIN_SECONDS = 0.25
+    # Beats kept for the heart rate estimate
+    HR_WINDOW_SECONDS = 10.24
+
+    def __init__(self, stream_id, hr_analyzer, window_samples=4096, hop_samples=800, n_leads=12):
+        self.stream_id = stream_id
+        self.hr_analyzer = hr_analyzer
+        self.fs = hr_analyzer.fs
+        self.window_samples = window_samples
+        self.hop_samples = hop_samples
+
+        self.buffer = ECGRingBuffer(window_samples, n_leads)
+        self.r_peaks = deque(maxlen=1024)  # Absolute sample indices
+        self.lead_used = None
+        self.next_prediction_at = window_samples  # Absolute sample count that triggers the next prediction
+
+        self.lock = threading.Lock()
+        self.created_at = time.time()
+        self.last_access = self.created_at
+
+        # Update feed for SSE subscribers
+        self._updates = threading.Condition()
+        self.sequence = 0
+        self.latest_update = None
+        self.closed = False
+
+    def append(self, samples):
+        """
+        Add a chunk and detect R-peaks in the new tail
+
+        Args:
+            samples: (n, n_leads) float32 array, n <= window_samples
+
+        Returns:
+            list: newly confirmed R-peak absolute sample indices
+        """
+        self.buffer.append(samples)
+        self.last_access = time.time()
+
+        if len(self.buffer) < int(self.MIN_DETECTION_SECONDS * self.fs):
+            return []
+
+        # Re-scan only the tail: the new chunk plus enough history for the filter to settle
+        detection_samples = max(int(self.DETECTION_WINDOW_SECONDS * self.fs), len(samples) + int(self.fs))
+        window, window_start = self.buffer.latest(detection_samples)
+
+        peaks, lead_used, _, _ = self.hr_analyzer.detect_r_peaks(window)
+        if lead_used != 'none':
+            self.lead_used = lead_used
+
+        edge = self.buffer.total_samples - int(self.EDGE_MARGIN_SECONDS * self.fs)
+        refractory = int(0.2 * self.fs)
+        last_peak = self.r_peaks[-1] if self.r_peaks else -refractory
+
+        new_peaks = []
+        for peak in np.asarray(peaks, dtype=np.int64) + window_start:
+            if last_peak + refractory <= peak < edge:
+                new_peaks.append(int(peak))
+                last_peak = peak
+
+        self.r_peaks.extend(new_peaks)
+        return new_peaks
+
+    def heart_rate(self):
+        """
+        Heart rate over the most recent HR_WINDOW_SECONDS of confirmed beats
+
+        Returns:
+            dict: bpm, rr_intervals_ms, beat_count, lead_used
+        """
+        horizon = self.buffer.total_samples - int(self.HR_WINDOW_SECONDS * self.fs)
+        recent = np.array([peak for peak in self.r_peaks if peak >= horizon], dtype=np.int64)
+        bpm, rr_intervals = self.hr_analyzer.calculate_bpm(recent)
+
+        return {
+            'bpm': round(bpm, 1),
+            'rr_intervals_ms': [round(rr, 1) for rr in rr_intervals],
+            'beat_count': len(recent),
+            'lead_used': self.lead_used
+        }
+
+    def take_prediction_window(self):
+        """
+        Last window_samples samples if a prediction is due (every hop_samples)
+
+        Returns:
+            ndarray: (window_samples, n_leads) copy, or None if not due yet
+        """
+        if self.buffer.total_samples < self.next_prediction_at:
+            return None
+
+        # Skip missed hops instead of queueing a backlog of stale windows
+        hops_due = (self.buffer.total_samples - self.next_prediction_at) // self.hop_samples + 1
+        self.next_prediction_at += hops_due * self.hop_samples
+
+        window, _ = self.buffer.latest(self.window_samples)
+        return window
+
+    def publish(self, update):
+        """Store an update and wake SSE subscribers"""
+        with self._updates:
+            self.sequence += 1
+            update['sequence'] = self.sequence
+            self.latest_update = update
+            self._updates.notify_all()
+        return self.sequence
+
+    def wait_for_update(self, after_sequence, timeout):
+        """
+        Block until an update newer than after_sequence is published
+
+        Returns:
+            tuple: (sequence, update) - update is None on timeout or if the stream closed
+        """
+        with self._updates:
+            self._updates.wait_for(lambda: self.sequence > after_sequence or self.closed, timeout=timeout)
+            if self.sequence > after_sequence:
+                return self.sequence, self.latest_update
+            return self.sequence, None
+
+    def close(self):
+        """Wake subscribers so they can end their streams"""
+        with self._updates:
+            self.closed = True
+            self._updates.notify_all()
+
+
+class ECGStreamStore:
+    """Thread-safe registry of live streams with idle TTL"""
+
+    def __init__(self, max_streams=64, ttl_seconds=300):
+        self.max_streams = max_streams
+        self.ttl_seconds = ttl_seconds
+
+        self._streams = OrderedDict()  # stream_id -> ECGStream
+        self._lock = threading.Lock()
+
+        self.stats = {
+            'created': 0,
+            'closed': 0,
+            'expired': 0,
+            'chunks': 0,
+            'samples': 0,
+            'predictions': 0
+        }
+
+    @staticmethod
+    def generate_stream_id() -> str:
+        """Generate unique stream ID"""
+        return f"STR-{uuid.uuid4().hex[:12].upper()}"
+
+    def _expire(self, now):
+        """Close streams idle longer than the TTL (lock must be held)"""
+        for stream_id in [sid for sid, s in self._streams.items() if now - s.last_access > self.ttl_seconds]:
+            self._streams.pop(stream_id).close()
+            self.stats['expired'] += 1
+
+    def create(self, hr_analyzer, window_samples=4096, hop_samples=800):
+        """
+        Open a stream
+
+        Returns:
+            ECGStream, or None if max_streams are already open
+        """
+        with self._lock:
+            self._expire(time.time())
+            if len(self._streams) >= self.max_streams:
+                return None
+
+            stream = ECGStream(self.generate_stream_id(), hr_analyzer, window_samples, hop_samples)
+            self._streams[stream.stream_id] = stream
+            self.stats['created'] += 1
+            return stream
+
+    def get(self, stream_id):
+        """Look up a live stream (None if unknown or expired)"""
+        with self._lock:
+            self._expire(time.time())
+            return self._streams.get(stream_id)
+
+    def close(self, stream_id):
+        """
+        Close a stream
+
+        Returns:
+            bool: True if the stream existed
+        """
+        with self._lock:
+            stream = self._streams.pop(stream_id, None)
+            if stream is None:
+                return False
+            self.stats['closed'] += 1
+
+        stream.close()
+        return True
+
+    def record_chunk(self, n_samples, predicted):
+        """Count an ingested chunk"""
+        with self._lock:
+            self.stats['chunks'] += 1
+            self.stats['samples'] += n_samples
+            if predicted:
+                self.stats['predictions'] += 1
+
+    def get_stats(self):
+        """
+        Stream statistics
+
+        Returns:
+            dict: open stream count and lifetime counters
+        """
+        with self._lock:
+            self._expire(time.time())
+            return {
+                'open_streams': len(self._streams),
+                'max_streams': self.max_streams,
+                'ttl_seconds': self.ttl_seconds,
+                **self.stats
+            }
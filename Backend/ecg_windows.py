@@ -0,0 +1,127 @@
+"""
+Recording Resampling and Windowing
+
+The model takes (4096, 12) windows sampled at 400 Hz (~10.24 s). Uploads
+come from monitors recording at 250 Hz, 500 Hz or other rates and last
+10-60 s. This module brings any 12-lead recording onto the model's grid:
+
+- resample_to_model_rate() converts to 400 Hz with a polyphase filter
+  (scipy.signal.resample_poly: one FIR pass per lead, no FFT of the whole
+  recording). 500 Hz -> 400 Hz is up=4, down=5; 250 Hz -> 400 Hz is up=8, down=5.
+- cut_windows() cuts overlapping 4096-sample windows (the last window is
+  aligned to the end so the tail is always covered). Recordings shorter than
+  one window are zero-padded, as in the model's training data.
+- aggregate_window_predictions() combines per-window probabilities.
+
+Heart rate and beat detection run on the full resampled recording; only the
+model sees windows.
+
+Author: Backend Developer 1
+Project: HoloHuman XR - Immerse the Bay 2025
+"""
+
+from fractions import Fraction
+
+import numpy as np
+from scipy.signal import resample_poly
+
+MODEL_SAMPLING_RATE = 400
+WINDOW_SAMPLES = 4096
+
+# Accepted upload sampling rates (Hz)
+MIN_SAMPLING_RATE = 100
+MAX_SAMPLING_RATE = 2000
+
+# Window aggregation methods: "max" reports a condition seen in any window
+# (e.g. paroxysmal AF), "mean" averages over the whole recording
+AGGREGATION_METHODS = ('max', 'mean')
+
+
+def resample_to_model_rate(ecg_signal, sampling_rate):
+    """
+    Polyphase resampling of a (samples, leads) recording to 400 Hz
+
+    Args:
+        ecg_signal: (samples, leads) float array
+        sampling_rate: Recording sampling rate in Hz
+
+    Returns:
+        ndarray: float32 (round(samples * 400 / sampling_rate), leads) array;
+                 the input itself when it is already at 400 Hz
+    """
+    ratio = Fraction(MODEL_SAMPLING_RATE / float(sampling_rate)).limit_denominator(1000)
+    if ratio == 1:
+        return ecg_signal
+
+    resampled = resample_poly(ecg_signal, ratio.numerator, ratio.denominator, axis=0)
+    return np.ascontiguousarray(resampled, dtype=np.float32)
+
+
+def window_starts(num_samples, hop_samples, window_samples=WINDOW_SAMPLES):
+    """
+    Start indices of overlapping windows covering a recording
+
+    Windows are hop_samples apart; a final window ending at the last sample
+    is added when the hop grid does not reach it.
+
+    Returns:
+        list: start sample of each window ([0] for recordings up to one window)
+    """
+    if num_samples <= window_samples:
+        return [0]
+
+    last_start = num_samples - window_samples
+    starts = list(range(0, last_start + 1, max(1, int(hop_samples))))
+    if starts[-1] != last_start:
+        starts.append(last_start)
+
+    return starts
+
+
+def cut_windows(ecg_signal, hop_samples, window_samples=WINDOW_SAMPLES):
+    """
+    Cut a 400 Hz recording into model windows
+
+    Args:
+        ecg_signal: (samples, leads) float32 array at 400 Hz
+        hop_samples: Distance between window starts
+
+    Returns:
+        tuple: ((N, window_samples, leads) float32 array, list of N start samples)
+    """
+    num_samples = len(ecg_signal)
+
+    if num_samples < window_samples:
+        # Zero-pad both sides, as in the model's training data
+        windows = np.zeros((1, window_samples, ecg_signal.shape[1]), dtype=np.float32)
+        offset = (window_samples - num_samples) // 2
+        windows[0, offset:offset + num_samples] = ecg_signal
+        return windows, [0]
+
+    starts = window_starts(num_samples, hop_samples, window_samples)
+    if len(starts) == 1:
+        return ecg_signal[np.newaxis], starts
+
+    windows = np.stack([ecg_signal[start:start + window_samples] for start in starts])
+    return windows, starts
+
+
+def aggregate_window_predictions(window_predictions, method='max'):
+    """
+    Combine per-window {condition: probability} dicts into one
+
+    Args:
+        window_predictions: list of dicts with the same conditions
+        method: 'max' or 'mean' (see AGGREGATION_METHODS)
+
+    Returns:
+        dict: {condition_name: probability}
+    """
+    if len(window_predictions) == 1:
+        return dict(window_predictions[0])
+
+    conditions = list(window_predictions[0])
+    probabilities = np.array([[predictions[name] for name in conditions] for predictions in window_predictions])
+    combined = probabilities.max(axis=0) if method == 'max' else probabilities.mean(axis=0)
+
+    return {name: float(probability) for name, probability in zip(conditions, combined)}
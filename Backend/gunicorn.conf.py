@@ -0,0 +1,42 @@
+"""
+Gunicorn configuration - production entry point for the HoloHuman XR backend
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+Environment variables:
+    HOST / PORT          Bind address (default 0.0.0.0:5000)
+    GUNICORN_WORKERS     Worker processes (default: min(4, CPU count))
+    GUNICORN_THREADS     Threads per worker (default 4) - concurrent requests
+                         in one worker share its micro-batching scheduler
+    GUNICORN_TIMEOUT     Worker timeout in seconds (default 120, covers model load)
+    GUNICORN_PRELOAD     "0" to import the app in each worker instead of the master
+
+Signal sessions, live streams and async interpretation jobs are kept in
+worker memory: with more than one worker, a client's follow-up requests may
+reach a worker that does not know its signal_id / stream_id / job_id (404).
+Use one worker with more threads, or sticky routing, for those features.
+
+Author: Backend Developer 1
+Project: HoloHuman XR - Immerse the Bay 2025
+"""
+
+import os
+
+bind = f"{os.getenv('HOST', '0.0.0.0')}:{os.getenv('PORT', '5000')}"
+workers = int(os.getenv('GUNICORN_WORKERS', str(min(4, os.cpu_count() or 1))))
+threads = int(os.getenv('GUNICORN_THREADS', '4'))
+worker_class = 'gthread'
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '120'))
+graceful_timeout = 30
+
+# Import wsgi.py (and everything it builds) once in the master, then fork
+preload_app = os.getenv('GUNICORN_PRELOAD', '1') != '0'
+
+accesslog = '-'
+
+
+def post_worker_init(worker):
+    """Load the TensorFlow model inside each forked worker"""
+    from ecg_api import load_ecg_model
+
+    load_ecg_model()
@@ -0,0 +1,243 @@
+"""
+Asynchronous LLM Interpretation Jobs
+
+The model, heart rate and region stages finish in tens of milliseconds, but
+the Claude call takes seconds. With async interpretation, /api/ecg/analyze
+returns the signal analysis immediately with an interpretation_job_id and the
+LLM call runs on a background executor; the headset fetches the result from
+/api/interpretation/<job_id> (polling) or its SSE stream.
+
+Unfinished jobs are bounded: once max_jobs are queued or running, submit()
+sheds the new job with AdmissionRejected (counted in
+ecg_requests_shed_total{stage="llm_jobs"}) instead of growing the queue;
+/api/ecg/analyze then answers with the mode's fallback interpretation.
+
+Author: Backend Developer 2
+Project: HoloHuman XR - Immerse the Bay 2025
+"""
+
+import contextvars
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+from admission import AdmissionRejected
+from metrics import REQUESTS_SHED
+
+
+class InterpretationJobStore:
+    """
+    Runs interpretation jobs on a thread pool and keeps their results for polling
+
+    Finished jobs are kept for ttl_seconds after completion; at most max_jobs
+    are retained (oldest finished jobs are dropped first), and at most max_jobs
+    may be unfinished at once.
+    """
+
+    STAGE = 'llm_jobs'
+
+    # Job duration assumed before any job has finished, and EWMA weight of the newest one
+    INITIAL_JOB_TIME_S = 2.0
+    EWMA_ALPHA = 0.2
+
+    def __init__(self, max_workers=4, ttl_seconds=600, max_jobs=1000):
+        self.max_workers = max_workers
+        self.ttl_seconds = ttl_seconds
+        self.max_jobs = max_jobs
+
+        self._jobs = OrderedDict()  # job_id -> job record, oldest first
+        self._lock = threading.Lock()
+
+        # Executor threads start on first submit (and again in a forked worker)
+        self._executor = None
+        self._executor_pid = None
+
+        self._unfinished = 0
+        self.job_time_s = self.INITIAL_JOB_TIME_S
+
+        self.stats = {
+            'submitted': 0,
+            'completed': 0,
+            'failed': 0,
+            'expired': 0,
+            'shed_queue_full': 0
+        }
+
+    @staticmethod
+    def generate_job_id() -> str:
+        """Generate unique interpretation job ID"""
+        return f"JOB-{uuid.uuid4().hex[:12].upper()}"
+
+    def _ensure_executor(self):
+        """Create the thread pool lazily (lock must be held)"""
+        if self._executor is None or self._executor_pid != os.getpid():
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix='llm-interpretation'
+            )
+            self._executor_pid = os.getpid()
+        return self._executor
+
+    def _on_done(self, job, future):
+        """Record completion time and outcome"""
+        job['completed_at'] = time.time()
+        with self._lock:
+            if future.exception() is not None:
+                self.stats['failed'] += 1
+            else:
+                self.stats['completed'] += 1
+
+    def _run(self, fn, *args, **kwargs):
+        """Job body: frees its queue slot before the future completes (waiters see it freed)"""
+        start = time.time()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._unfinished -= 1
+                self.job_time_s += self.EWMA_ALPHA * (time.time() - start - self.job_time_s)
+
+    def _expire(self, now):
+        """Drop finished jobs past their TTL or over max_jobs (lock must be held)"""
+        finished = [
+            job_id for job_id, job in self._jobs.items()
+            if job['completed_at'] is not None
+        ]
+        overflow = len(self._jobs) - self.max_jobs
+
+        for job_id in finished:
+            job = self._jobs[job_id]
+            if overflow > 0 or now - job['completed_at'] > self.ttl_seconds:
+                del self._jobs[job_id]
+                self.stats['expired'] += 1
+                overflow -= 1
+
+    def submit(self, fn, *args, request_id=None, **kwargs):
+        """
+        Run fn(*args, **kwargs) in the background
+
+        Args:
+            fn: Callable producing the job result
+            request_id: Originating request (for log correlation)
+
+        Returns:
+            str: job_id
+
+        Raises:
+            AdmissionRejected: max_jobs jobs are already queued or running (503)
+        """
+        job_id = self.generate_job_id()
+        job = {
+            'job_id': job_id,
+            'request_id': request_id,
+            'created_at': time.time(),
+            'completed_at': None,
+            'future': None
+        }
+
+        with self._lock:
+            self._expire(job['created_at'])
+            if self._unfinished >= self.max_jobs:
+                self._reject_queue_full()
+
+            # Run in a copy of the caller's context so job logs keep the request ID
+            future = self._ensure_executor().submit(contextvars.copy_context().run, self._run, fn, *args, **kwargs)
+            job['future'] = future
+            self._jobs[job_id] = job
+            self._unfinished += 1
+            self.stats['submitted'] += 1
+
+        future.add_done_callback(lambda done: self._on_done(job, done))
+        return job_id
+
+    def _reject_queue_full(self):
+        """Shed a submission; retry after the queue ahead has drained (lock must be held)"""
+        retry_after_s = (self._unfinished - self.max_workers + 1) / self.max_workers * self.job_time_s
+        self.stats['shed_queue_full'] += 1
+        REQUESTS_SHED.labels(self.STAGE, 'queue_full').inc()
+        raise AdmissionRejected(
+            self.STAGE, 'queue_full', 503, max(retry_after_s, self.job_time_s),
+            f'{self._unfinished} interpretation jobs already queued or running (limit {self.max_jobs})'
+        )
+
+    @staticmethod
+    def _snapshot(job):
+        """Public view of a job record"""
+        future = job['future']
+
+        if not future.done():
+            status = 'running' if future.running() else 'pending'
+            result, error = None, None
+        elif future.exception() is not None:
+            status = 'failed'
+            result, error = None, str(future.exception())
+        else:
+            status = 'complete'
+            result, error = future.result(), None
+
+        end_time = job['completed_at'] or time.time()
+
+        return {
+            'job_id': job['job_id'],
+            'status': status,
+            'result': result,
+            'error': error,
+            'request_id': job['request_id'],
+            'elapsed_ms': round((end_time - job['created_at']) * 1000, 2)
+        }
+
+    def get(self, job_id):
+        """
+        Current state of a job
+
+        Returns:
+            dict: job snapshot (status pending|running|complete|failed), or None if unknown/expired
+        """
+        with self._lock:
+            self._expire(time.time())
+            job = self._jobs.get(job_id)
+
+        return self._snapshot(job) if job else None
+
+    def wait(self, job_id, timeout=None):
+        """
+        Block until a job finishes or timeout elapses
+
+        Returns:
+            dict: job snapshot (may still be pending/running on timeout), or None if unknown
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None:
+            return None
+
+        try:
+            job['future'].exception(timeout=timeout)
+        except FutureTimeoutError:
+            pass
+
+        return self._snapshot(job)
+
+    def get_stats(self):
+        """
+        Job statistics
+
+        Returns:
+            dict: active/retained job counts and lifetime counters
+        """
+        with self._lock:
+            self._expire(time.time())
+            active = sum(1 for job in self._jobs.values() if not job['future'].done())
+
+            return {
+                'active_jobs': active,
+                'retained_jobs': len(self._jobs),
+                'max_jobs': self.max_jobs,
+                'max_workers': self.max_workers,
+                'job_time_ms': round(self.job_time_s * 1000, 2),
+                'ttl_seconds': self.ttl_seconds,
+                **self.stats
+            }
@@ -0,0 +1,94 @@
+"""
+Fast JSON Codec
+
+Flask's default provider runs the stdlib json module: ~30 ms to parse a
+4096 x 12 ecg_signal body and every NumPy array has to be turned into
+Python lists (.tolist()) before jsonify. FastJSONProvider uses orjson when
+it is installed - C parser, and NumPy arrays/scalars serialized natively -
+and falls back to the stdlib with NumPy support otherwise.
+
+Installed on the app with `app.json = FastJSONProvider(app)`, so
+request.get_json(), jsonify() and json_codec.dumps() (SSE events) all go
+through it.
+
+Author: Backend Developer 1
+Project: HoloHuman XR - Immerse the Bay 2025
+"""
+
+import json
+
+import numpy as np
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # Optional: stdlib fallback
+    orjson = None
+
+HAS_ORJSON = orjson is not None
+
+ORJSON_OPTIONS = (orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS) if HAS_ORJSON else 0
+
+
+def numpy_default(obj):
+    """Serialize what the encoder cannot: NumPy arrays/scalars, then Flask's defaults"""
+    if isinstance(obj, np.ndarray):
+        if HAS_ORJSON and not obj.flags.c_contiguous:
+            return np.ascontiguousarray(obj)  # orjson serializes C-contiguous arrays natively
+        return obj.tolist()  # Unsupported dtype (orjson) / any array (stdlib)
+    if isinstance(obj, np.generic):
+        return obj.item()
+    return DefaultJSONProvider.default(obj)
+
+
+def dumps_bytes(obj, indent=False):
+    """Serialize obj to UTF-8 JSON bytes"""
+    if HAS_ORJSON:
+        return orjson.dumps(obj, default=numpy_default,
+                            option=ORJSON_OPTIONS | (orjson.OPT_INDENT_2 if indent else 0))
+    return json.dumps(obj, default=numpy_default, indent=2 if indent else None,
+                      separators=None if indent else (',', ':')).encode()
+
+
+def dumps(obj):
+    """Serialize obj to a compact JSON string (SSE event data)"""
+    return dumps_bytes(obj).decode()
+
+
+def loads(data):
+    """
+    Parse JSON from str or bytes
+
+    orjson rejects the NaN / Infinity tokens the stdlib parser accepts (and
+    validate_ecg_input tolerates a few NaN samples), so such bodies are
+    re-parsed with the stdlib instead of being refused.
+    """
+    if HAS_ORJSON:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson (stdlib fallback), NumPy-aware"""
+
+    def dumps(self, obj, **kwargs):
+        if HAS_ORJSON and set(kwargs) <= {'indent', 'separators'}:
+            return dumps_bytes(obj, indent=bool(kwargs.get('indent'))).decode()
+
+        kwargs.setdefault('default', numpy_default)
+        return json.dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        if not kwargs:
+            return loads(s)
+        return json.loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        """jsonify(): encode straight to bytes (no str round trip)"""
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+
+        return self._app.response_class(dumps_bytes(obj, indent=indent) + b'\n', mimetype=self.mimetype)
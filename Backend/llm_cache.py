@@ -0,0 +1,444 @@
+"""
+LLM Response Cache
+
+Claude interpretations are cached under the bucketed semantic key from
+create_cache_key() (top condition, confidence bucket, output mode, region
+focus) - not the full predictions/HR payload - so different recordings in
+the same bucket share one interpretation.
+
+Entries expire ttl_seconds after they were stored; the cache holds at most
+max_entries (least-recently-used evicted first). All operations are
+thread-safe.
+
+PersistentLLMCache is an optional SQLite tier behind the in-memory one so
+interpretations survive restarts and deploys. Rows are stored per cache key,
+output mode and prompt version; rows from older prompt versions are never
+served and are removed by compact().
+
+get_or_compute() coalesces concurrent misses on one key (SingleFlight):
+a class opening the same teaching case makes one Claude call, and every
+other caller waits for and shares its result.
+
+Author: Backend Developer 2
+Project: HoloHuman XR - Immerse the Bay 2025
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from singleflight import SingleFlight
+
+
+def build_cache_key(top_condition, confidence, output_mode, region_focus=None):
+    """
+    Bucketed LLM cache key
+
+    Confidence is rounded to the nearest 0.1 to reduce misses from tiny variations.
+    """
+    confidence_bucket = round(confidence, 1)  # Round to nearest 0.1
+    key_data = f"{top_condition}:{confidence_bucket}:{output_mode}"
+
+    # Add region_focus to cache key for storytelling mode
+    if output_mode == 'storytelling' and region_focus:
+        key_data += f":{region_focus}"
+
+    return hashlib.md5(key_data.encode()).hexdigest()
+
+
+class PersistentLLMCache:
+    """
+    SQLite-backed interpretation store
+
+    The database is opened lazily on first use (and reopened in a forked
+    worker), so importing the API never touches the disk.
+    """
+
+    def __init__(self, db_path, ttl_seconds=7 * 24 * 3600, max_rows=10000):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.max_rows = max_rows
+
+        self._connection = None
+        self._connection_pid = None
+        self._lock = threading.Lock()
+
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'stale_prompt_misses': 0,
+            'writes': 0,
+            'errors': 0
+        }
+
+    def _connect(self):
+        """Open the database and create the schema (lock must be held)"""
+        if self._connection is None or self._connection_pid != os.getpid():
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            connection = sqlite3.connect(self.db_path, check_same_thread=False)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS llm_responses (
+                    cache_key TEXT NOT NULL,
+                    prompt_version TEXT NOT NULL,
+                    output_mode TEXT NOT NULL,
+                    response TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used_at REAL NOT NULL,
+                    PRIMARY KEY (cache_key, prompt_version)
+                )
+                """
+            )
+            connection.commit()
+
+            self._connection = connection
+            self._connection_pid = os.getpid()
+
+        return self._connection
+
+    def get(self, cache_key, prompt_version):
+        """
+        Look up an interpretation for the current prompt version
+
+        Returns:
+            Cached value, or None (unknown, expired, stale prompt version or database error)
+        """
+        now = time.time()
+
+        with self._lock:
+            try:
+                connection = self._connect()
+                rows = connection.execute(
+                    'SELECT prompt_version, response, created_at FROM llm_responses WHERE cache_key = ?',
+                    (cache_key,)
+                ).fetchall()
+
+                for row_version, response, created_at in rows:
+                    if row_version == prompt_version and now - created_at <= self.ttl_seconds:
+                        connection.execute(
+                            'UPDATE llm_responses SET last_used_at = ? WHERE cache_key = ? AND prompt_version = ?',
+                            (now, cache_key, prompt_version)
+                        )
+                        connection.commit()
+                        self.stats['hits'] += 1
+                        return json.loads(response)
+
+                if rows:
+                    self.stats['stale_prompt_misses'] += 1
+                self.stats['misses'] += 1
+                return None
+
+            except sqlite3.Error:
+                self.stats['errors'] += 1
+                return None
+
+    def contains(self, cache_key, prompt_version):
+        """True if an unexpired row exists for this key and prompt version (no stats, no LRU touch)"""
+        with self._lock:
+            try:
+                row = self._connect().execute(
+                    'SELECT created_at FROM llm_responses WHERE cache_key = ? AND prompt_version = ?',
+                    (cache_key, prompt_version)
+                ).fetchone()
+            except sqlite3.Error:
+                return False
+
+        return row is not None and time.time() - row[0] <= self.ttl_seconds
+
+    def put(self, cache_key, output_mode, prompt_version, value):
+        """Store an interpretation (replaces any row for the same key and prompt version)"""
+        now = time.time()
+
+        with self._lock:
+            try:
+                connection = self._connect()
+                connection.execute(
+                    'INSERT OR REPLACE INTO llm_responses VALUES (?, ?, ?, ?, ?, ?)',
+                    (cache_key, prompt_version, output_mode, json.dumps(value), now, now)
+                )
+                connection.commit()
+                self.stats['writes'] += 1
+            except sqlite3.Error:
+                self.stats['errors'] += 1
+
+    def compact(self, prompt_versions):
+        """
+        Drop stale-prompt and expired rows, trim to max_rows, and VACUUM
+
+        Args:
+            prompt_versions: {output_mode: current prompt version}
+
+        Returns:
+            dict: rows removed per reason, rows remaining, and 'error' (None, or
+                  the database error that stopped compaction)
+        """
+        cutoff = time.time() - self.ttl_seconds
+        result = {'stale_prompt_removed': 0, 'expired_removed': 0, 'trimmed': 0, 'remaining': None, 'error': None}
+
+        with self._lock:
+            try:
+                connection = self._connect()
+
+                stale = 0
+                for output_mode, prompt_version in prompt_versions.items():
+                    stale += connection.execute(
+                        'DELETE FROM llm_responses WHERE output_mode = ? AND prompt_version != ?',
+                        (output_mode, prompt_version)
+                    ).rowcount
+
+                expired = connection.execute(
+                    'DELETE FROM llm_responses WHERE created_at < ?', (cutoff,)
+                ).rowcount
+
+                # Least-recently-used rows beyond max_rows
+                trimmed = connection.execute(
+                    """
+                    DELETE FROM llm_responses WHERE rowid IN (
+                        SELECT rowid FROM llm_responses ORDER BY last_used_at DESC LIMIT -1 OFFSET ?
+                    )
+                    """,
+                    (self.max_rows,)
+                ).rowcount
+
+                connection.commit()
+                result.update(stale_prompt_removed=stale, expired_removed=expired, trimmed=trimmed)
+
+                connection.execute('VACUUM')
+                result['remaining'] = connection.execute('SELECT COUNT(*) FROM llm_responses').fetchone()[0]
+
+            except sqlite3.Error as e:
+                # Locked or read-only database: nothing uncommitted is kept, the cache keeps serving
+                self.stats['errors'] += 1
+                result['error'] = str(e)
+                if self._connection is not None:
+                    try:
+                        self._connection.rollback()
+                    except sqlite3.Error:
+                        pass
+
+        return result
+
+    def clear(self):
+        """Delete all rows"""
+        with self._lock:
+            connection = self._connect()
+            connection.execute('DELETE FROM llm_responses')
+            connection.commit()
+            for key in self.stats:
+                self.stats[key] = 0
+
+    def get_stats(self):
+        """
+        Persistent tier statistics
+
+        Returns:
+            dict: row count, file size and lookup/write counters
+        """
+        with self._lock:
+            try:
+                rows = self._connect().execute('SELECT COUNT(*) FROM llm_responses').fetchone()[0]
+            except sqlite3.Error:
+                rows = None
+
+            return {
+                'db_path': self.db_path,
+                'rows': rows,
+                'size_bytes': os.path.getsize(self.db_path) if os.path.exists(self.db_path) else 0,
+                'ttl_seconds': self.ttl_seconds,
+                'max_rows': self.max_rows,
+                **self.stats
+            }
+
+
+class LLMResponseCache:
+    """
+    Thread-safe LRU cache with per-entry TTL and hit/miss/eviction counters
+
+    With a PersistentLLMCache attached, memory misses fall through to disk
+    (hits are promoted to memory) and put() writes through.
+    """
+
+    def __init__(self, max_entries=128, ttl_seconds=600, persistent=None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.persistent = persistent
+
+        self._entries = OrderedDict()  # cache_key -> (value, expires_at), LRU order
+        self._lock = threading.Lock()
+        self._flight = SingleFlight()
+
+        self.stats = {
+            'hits': 0,
+            'disk_hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'expirations': 0
+        }
+
+    def get(self, cache_key, prompt_version=None):
+        """
+        Look up a cached interpretation
+
+        Args:
+            cache_key: Bucketed key from create_cache_key()
+            prompt_version: Current prompt version (persistent tier lookups)
+
+        Returns:
+            Cached value, or None on a miss (unknown or expired)
+        """
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get(cache_key)
+
+            if entry is not None and entry[1] <= now:
+                del self._entries[cache_key]
+                self.stats['expirations'] += 1
+                entry = None
+
+            if entry is not None:
+                self._entries.move_to_end(cache_key)
+                self.stats['hits'] += 1
+                return entry[0]
+
+        value = self.persistent.get(cache_key, prompt_version) if self.persistent else None
+
+        with self._lock:
+            if value is None:
+                self.stats['misses'] += 1
+                return None
+
+            self.stats['hits'] += 1
+            self.stats['disk_hits'] += 1
+
+        self._store(cache_key, value)
+        return value
+
+    def contains(self, cache_key, prompt_version=None):
+        """
+        True if either tier holds an unexpired entry for cache_key (no statistics)
+
+        The persistent tier is only consulted for the given prompt version, as in get().
+        """
+        with self._lock:
+            entry = self._entries.get(cache_key)
+        if entry is not None and entry[1] > time.time():
+            return True
+        return bool(self.persistent) and self.persistent.contains(cache_key, prompt_version)
+
+    def _store(self, cache_key, value):
+        """Insert into the memory tier, evicting the least-recently-used entry when full"""
+        with self._lock:
+            self._entries.pop(cache_key, None)
+
+            while len(self._entries) >= self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats['evictions'] += 1
+
+            self._entries[cache_key] = (value, time.time() + self.ttl_seconds)
+
+    def put(self, cache_key, value, output_mode=None, prompt_version=None):
+        """
+        Store an interpretation (written through to the persistent tier, if attached)
+
+        Args:
+            cache_key: Bucketed key from create_cache_key()
+            value: Interpretation dict
+            output_mode, prompt_version: Row identity in the persistent tier
+        """
+        self._store(cache_key, value)
+
+        if self.persistent and prompt_version:
+            self.persistent.put(cache_key, output_mode, prompt_version, value)
+
+    def get_or_compute(self, cache_key, compute, output_mode=None, prompt_version=None):
+        """
+        Return the cached interpretation for cache_key, calling compute at most once
+
+        Concurrent misses on the same key wait for the first caller's
+        compute() instead of repeating the LLM call.
+
+        Args:
+            cache_key: Bucketed key from create_cache_key()
+            compute: Zero-argument callable returning (value, cacheable); a truthy
+                     cacheable value is stored in both tiers, any other is only
+                     handed to the callers waiting on this compute()
+            output_mode, prompt_version: Row identity in the persistent tier
+
+        Returns:
+            tuple: (value, source, stored) - source is 'cache', 'coalesced'
+                   (waited on another caller's compute) or 'computed'; stored
+                   is False for a result that was not cacheable
+        """
+        value = self.get(cache_key, prompt_version)
+        if value is not None:
+            return value, 'cache', True
+
+        def compute_and_store():
+            # Another leader may have finished between our miss and taking the flight
+            with self._lock:
+                entry = self._entries.get(cache_key)
+            if entry is not None and entry[1] > time.time():
+                return entry[0], True
+
+            result, cacheable = compute()
+            if result and cacheable:
+                self.put(cache_key, result, output_mode, prompt_version)
+            return result, cacheable
+
+        (value, cacheable), shared = self._flight.do(cache_key, compute_and_store)
+        return value, 'coalesced' if shared else 'computed', bool(value and cacheable)
+
+    def clear(self):
+        """
+        Drop all entries and reset statistics
+
+        Returns:
+            dict: statistics before clearing
+        """
+        previous_stats = self.get_stats()
+
+        with self._lock:
+            self._entries.clear()
+            for key in self.stats:
+                self.stats[key] = 0
+        self._flight.reset_stats()
+
+        return previous_stats
+
+    def get_stats(self):
+        """
+        Cache statistics
+
+        Returns:
+            dict: hits, misses, hit rate, size, eviction/expiration and in-flight dedup counters
+        """
+        flight_stats = self._flight.get_stats()
+
+        with self._lock:
+            lookups = self.stats['hits'] + self.stats['misses']
+            hit_rate = (self.stats['hits'] / lookups * 100) if lookups > 0 else 0
+
+            return {
+                'hits': self.stats['hits'],
+                'disk_hits': self.stats['disk_hits'],
+                'misses': self.stats['misses'],
+                'total_requests': lookups,
+                'hit_rate_percent': round(hit_rate, 2),
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl_seconds,
+                'evictions': self.stats['evictions'],
+                'expirations': self.stats['expirations'],
+                'in_flight': flight_stats['in_flight'],
+                'computations': flight_stats['executions'],
+                'coalesced': flight_stats['coalesced']
+            }
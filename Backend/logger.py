@@ -6,15 +6,34 @@ Provides:
 - Performance timing
 - Error ID generation
 - Structured log formatting
+- Stage latency / error ID metrics (metrics.py)
+- Non-blocking log pipeline (records are queued; a background thread writes them)
+- Sampling of per-stage "Completed: ..." INFO lines
+
+Request context lives in contextvars, so concurrent requests on a threaded
+server (or asyncio tasks) each see their own request ID.
+
+Environment:
+    LOG_ASYNC               "0" writes log records on the calling thread (default 1)
+    LOG_QUEUE_SIZE          Queued records before new ones are dropped (default 10000)
+    LOG_STAGE_SAMPLE_RATE   Fraction of requests whose stage timings are logged (default 1.0)
 """
 
+import atexit
+import contextvars
 import logging
+import os
+import queue
+import random
 import uuid
 import time
 from functools import wraps
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 from typing import Optional
 
+from metrics import ERROR_IDS, LOG_RECORDS_DROPPED, STAGE_DURATION
+
 # Configure logging format (request_id added via filter, not format string)
 logging.basicConfig(
     level=logging.INFO,
@@ -22,29 +41,101 @@ logging.basicConfig(
     datefmt='%Y-%m-%d %H:%M:%S'
 )
 
+# Request context (per thread / asyncio task), shared by all component loggers
+_request_id = contextvars.ContextVar('request_id', default=None)
+_stage_logging_sampled = contextvars.ContextVar('stage_logging_sampled', default=True)
+
+STAGE_LOG_SAMPLE_RATE = float(os.getenv('LOG_STAGE_SAMPLE_RATE', '1.0'))
+
+
 class RequestIDFilter(logging.Filter):
-    """Add request_id to log records if not present"""
+    """Add request_id to log records if not present (from the request context)"""
     def filter(self, record):
         if not hasattr(record, 'request_id'):
-            record.request_id = 'SYSTEM'
+            record.request_id = _request_id.get() or 'SYSTEM'
         return True
 
+
+class DroppingQueueHandler(QueueHandler):
+    """QueueHandler that drops records instead of blocking when the queue is full"""
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            LOG_RECORDS_DROPPED.inc()
+
+
+_log_queue_handler = None
+_log_listener = None
+
+
+def _start_log_listener():
+    """Start a listener thread draining the queue into the original root handlers"""
+    global _log_listener
+
+    _log_queue_handler.queue = queue.Queue(int(os.getenv('LOG_QUEUE_SIZE', '10000')))
+    _log_listener = QueueListener(_log_queue_handler.queue, *_log_targets, respect_handler_level=True)
+    _log_listener.start()
+
+
+def _stop_log_listener():
+    """Flush queued records (at exit)"""
+    if _log_listener is not None:
+        _log_listener.stop()
+
+
 # Add filter to root logger
 for handler in logging.root.handlers:
     handler.addFilter(RequestIDFilter())
 
+if os.getenv('LOG_ASYNC', '1') != '0':
+    # Request threads only enqueue; the filter runs first so the record keeps the caller's request ID
+    _log_targets = list(logging.root.handlers)
+    _log_queue_handler = DroppingQueueHandler(None)
+    _log_queue_handler.addFilter(RequestIDFilter())
+
+    for handler in _log_targets:
+        logging.root.removeHandler(handler)
+    logging.root.addHandler(_log_queue_handler)
+
+    _start_log_listener()
+    atexit.register(_stop_log_listener)
+    # The listener thread does not survive fork() (gunicorn workers) - start a fresh one in the child
+    os.register_at_fork(after_in_child=_start_log_listener)
+
+
 class RequestLogger:
-    """Logger with request ID context"""
+    """Logger with request ID context (contextvars - safe under concurrent requests)"""
 
     def __init__(self, name: str):
         self.logger = logging.getLogger(name)
-        self.request_id = None
+
+    @property
+    def request_id(self):
+        """Request ID of the current context"""
+        return _request_id.get()
+
+    @request_id.setter
+    def request_id(self, request_id):
+        _request_id.set(request_id)
 
     def set_request_id(self, request_id: Optional[str] = None):
-        """Set or generate request ID for current context"""
+        """
+        Set or generate request ID for current context
+
+        Also decides whether this request's stage timings are logged
+        (LOG_STAGE_SAMPLE_RATE).
+        """
         self.request_id = request_id or self.generate_request_id()
+        _stage_logging_sampled.set(STAGE_LOG_SAMPLE_RATE >= 1.0 or random.random() < STAGE_LOG_SAMPLE_RATE)
         return self.request_id
 
+    def clear_request_id(self):
+        """Leave the request context (end of request)"""
+        _request_id.set(None)
+        _stage_logging_sampled.set(True)
+
     @staticmethod
     def generate_request_id() -> str:
         """Generate unique request ID"""
@@ -53,10 +144,13 @@ class RequestLogger:
     @staticmethod
     def generate_error_id() -> str:
         """Generate unique error ID"""
+        ERROR_IDS.inc()
         return f"ERR-XR-{uuid.uuid4().hex[:6].upper()}"
 
     def _log(self, level, message, **kwargs):
         """Internal log method with request ID"""
+        if not self.logger.isEnabledFor(level):
+            return
         extra = {'request_id': self.request_id or 'INIT'}
         extra.update(kwargs)
         self.logger.log(level, message, extra=extra)
@@ -103,23 +197,43 @@ def timer(func):
 
 
 class PerformanceTimer:
-    """Context manager for performance timing"""
+    """
+    Context manager for performance timing
+
+    Args:
+        operation_name: Name used in the log lines
+        logger: RequestLogger to write to
+        stage: Record the duration in ecg_stage_duration_seconds{stage=...}
+        histogram: Record the duration in this histogram child instead
+
+    Durations are always recorded; the "Completed" INFO line only for sampled
+    requests (LOG_STAGE_SAMPLE_RATE). Failures are always logged.
+    """
 
-    def __init__(self, operation_name: str, logger: RequestLogger):
+    def __init__(self, operation_name: str, logger: RequestLogger, stage: Optional[str] = None, histogram=None):
         self.operation_name = operation_name
         self.logger = logger
+        self.histogram = histogram if histogram is not None else (
+            STAGE_DURATION.labels(stage) if stage else None
+        )
         self.start_time = None
         self.elapsed_ms = None
 
     def __enter__(self):
-        self.start_time = time.time()
-        self.logger.debug(f"Started: {self.operation_name}")
+        self.start_time = time.perf_counter()
+        self.log_completion = _stage_logging_sampled.get()
+        if self.log_completion:
+            self.logger.debug(f"Started: {self.operation_name}")
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self.elapsed_ms = (time.time() - self.start_time) * 1000
+        elapsed_s = time.perf_counter() - self.start_time
+        self.elapsed_ms = elapsed_s * 1000
+        if self.histogram is not None:
+            self.histogram.observe(elapsed_s)
         if exc_type is None:
-            self.logger.info(f"Completed: {self.operation_name} ({self.elapsed_ms:.2f}ms)")
+            if self.log_completion:
+                self.logger.info(f"Completed: {self.operation_name} ({self.elapsed_ms:.2f}ms)")
         else:
             self.logger.error(f"Failed: {self.operation_name} ({self.elapsed_ms:.2f}ms) - {exc_val}")
         return False  # Don't suppress exceptions
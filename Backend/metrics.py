@@ -0,0 +1,285 @@
+"""
+Prometheus-Style Metrics
+
+Minimal in-process counters and histograms rendered in the Prometheus text
+exposition format (version 0.0.4) by GET /metrics - no client library
+needed. PerformanceTimer observes stage latencies into STAGE_DURATION, so
+p50/p95/p99 per stage come from histogram_quantile() instead of log scraping.
+
+Recording is a dict lookup, a bisect and an increment under a lock.
+Metrics are per process: with several gunicorn workers each scrape sees the
+worker that served it.
+
+Author: Backend Developer 1
+Project: HoloHuman XR - Immerse the Bay 2025
+"""
+
+import threading
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+
+# Seconds; wide enough for a cold Claude call
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _format_labels(labelnames, labelvalues, extra=()):
+    """Render {name="value",...} (empty string without labels)"""
+    pairs = list(zip(labelnames, labelvalues)) + list(extra)
+    if not pairs:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + '}'
+
+
+def _format_value(value):
+    """Prometheus float formatting"""
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric(ABC):
+    """
+    Labelled metric family (children are created on first use)
+
+    Subclasses set metric_type and implement _new_child() (the per-label-set
+    value holder) and _collect_child() (its exposition lines).
+    """
+
+    metric_type = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+        self._children = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *labelvalues, **labelkwargs):
+        """Child for one label combination (positional or keyword values)"""
+        if labelkwargs:
+            labelvalues = tuple(labelkwargs[name] for name in self.labelnames)
+        if len(labelvalues) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}")
+
+        key = tuple(str(value) for value in labelvalues)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    @abstractmethod
+    def _new_child(self):
+        """Fresh child for a new label combination"""
+
+    @abstractmethod
+    def _collect_child(self, labelvalues, child):
+        """Exposition sample lines for one child"""
+
+    def _unlabelled(self):
+        return self.labels()
+
+    def collect(self):
+        """Exposition lines for this family"""
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.metric_type}']
+        with self._lock:
+            children = sorted(self._children.items())
+        for labelvalues, child in children:
+            lines.extend(self._collect_child(labelvalues, child))
+        return lines
+
+
+class _CounterChild:
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+
+class Counter(_Metric):
+    """Monotonic counter"""
+
+    metric_type = 'counter'
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount=1):
+        """Increment an unlabelled counter"""
+        self._unlabelled().inc(amount)
+
+    def _collect_child(self, labelvalues, child):
+        return [f'{self.name}{_format_labels(self.labelnames, labelvalues)} {_format_value(child.value)}']
+
+
+class _GaugeChild:
+    def __init__(self):
+        self.value = 0
+
+    def set(self, value):
+        self.value = value
+
+
+class Gauge(_Metric):
+    """Value that can go up and down"""
+
+    metric_type = 'gauge'
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def set(self, value):
+        """Set an unlabelled gauge"""
+        self._unlabelled().set(value)
+
+    def _collect_child(self, labelvalues, child):
+        return [f'{self.name}{_format_labels(self.labelnames, labelvalues)} {_format_value(child.value)}']
+
+
+class _HistogramChild:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Last slot is +Inf
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    def snapshot(self):
+        with self._lock:
+            return list(self.counts), self.sum
+
+
+class Histogram(_Metric):
+    """Cumulative-bucket histogram"""
+
+    metric_type = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value):
+        """Observe into an unlabelled histogram"""
+        self._unlabelled().observe(value)
+
+    def _collect_child(self, labelvalues, child):
+        counts, total = child.snapshot()
+        lines = []
+        cumulative = 0
+        for upper_bound, count in zip(self.buckets + (float('inf'),), counts):
+            cumulative += count
+            labels = _format_labels(self.labelnames, labelvalues, [('le', _format_value(float(upper_bound)))])
+            lines.append(f'{self.name}_bucket{labels} {cumulative}')
+
+        labels = _format_labels(self.labelnames, labelvalues)
+        lines.append(f'{self.name}_sum{labels} {_format_value(total)}')
+        lines.append(f'{self.name}_count{labels} {cumulative}')
+        return lines
+
+
+class MetricsRegistry:
+    """Ordered collection of metric families"""
+
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self):
+        """Prometheus text exposition of every registered metric"""
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.collect())
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+STAGE_DURATION = registry.register(Histogram(
+    'ecg_stage_duration_seconds',
+    'Duration of timed pipeline stages (PerformanceTimer)',
+    ['stage']
+))
+
+REQUEST_DURATION = registry.register(Histogram(
+    'ecg_request_duration_seconds',
+    'Total request handling time per endpoint',
+    ['endpoint']
+))
+
+RESPONSES = registry.register(Counter(
+    'ecg_http_responses_total',
+    'HTTP responses per endpoint and status code',
+    ['endpoint', 'status']
+))
+
+FALLBACKS = registry.register(Counter(
+    'ecg_fallback_total',
+    'Results served by a fallback path (model_simulation, llm_fallback, llm_deadline, hr_lead_fallback)',
+    ['kind']
+))
+
+CACHE_LOOKUPS = registry.register(Counter(
+    'ecg_cache_lookups_total',
+    'Cache lookups per cache and result (hit/miss)',
+    ['cache', 'result']
+))
+
+COALESCED_WAITERS = registry.register(Counter(
+    'ecg_coalesced_waiters_total',
+    'Callers that waited on an identical in-flight call instead of making their own (llm)',
+    ['call']
+))
+
+ERROR_IDS = registry.register(Counter(
+    'ecg_error_ids_total',
+    'Error IDs generated (ERR-XR-*)'
+))
+
+LOG_RECORDS_DROPPED = registry.register(Counter(
+    'ecg_log_records_dropped_total',
+    'Log records dropped because the asynchronous log queue was full'
+))
+
+REQUESTS_SHED = registry.register(Counter(
+    'ecg_requests_shed_total',
+    'Requests rejected by admission control (client_rate, queue_full, latency_budget, queue_timeout)',
+    ['stage', 'reason']
+))
+
+ADMISSION_IN_FLIGHT = registry.register(Gauge(
+    'ecg_admission_in_flight',
+    'Requests holding an admission slot per stage',
+    ['stage']
+))
+
+ADMISSION_QUEUE_DEPTH = registry.register(Gauge(
+    'ecg_admission_queue_depth',
+    'Requests waiting for an admission slot per stage',
+    ['stage']
+))
+
+SIMULATION_MODE = registry.register(Gauge(
+    'ecg_model_simulation_mode',
+    '1 while the ECG model runs in fallback (simulation) mode'
+))
+
+
+def record_cache_lookup(cache, hit):
+    """Count one cache lookup"""
+    CACHE_LOOKUPS.labels(cache, 'hit' if hit else 'miss').inc()
@@ -3,14 +3,23 @@ from tensorflow.keras.models import load_model
 import numpy as np
 import os
 import json
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
 
 from logger import model_logger
 
+# Bump when model weights or prediction post-processing change (invalidates cached results)
+MODEL_VERSION = '1.0.0'
+
 
 class ECGModelLoader:
     def __init__(self, model_path='model/model.hdf5'):
         self.model_path = model_path
         self.model = None
+        self.model_version = MODEL_VERSION
         self.simulation_mode = False  # Fallback mode flag
         self.condition_names = [
             '1st_degree_AV_block',
@@ -84,51 +93,86 @@ class ECGModelLoader:
             self.model = None
             return False
 
-    def predict(self, ecg_signal):
+    def predict(self, ecg_signal, all_finite=None):
         """
         Predict ECG conditions with fallback support
 
         Args:
             ecg_signal: numpy array (4096, 12) or (1, 4096, 12)
+            all_finite: Optional precomputed NaN/Inf check (SignalQualityReport.all_finite)
 
         Returns:
             dict: {condition_name: probability}
         """
+        if ecg_signal.shape == (4096, 12):
+            ecg_signal = np.expand_dims(ecg_signal, axis=0)
+
+        finite_items = None if all_finite is None else np.array([all_finite])
+        return self.predict_batch(ecg_signal, finite_items=finite_items)[0]
+
+    def predict_batch(self, ecg_signals, finite_items=None):
+        """
+        Predict ECG conditions for N signals with one forward pass
+
+        Items containing NaN/Inf (or producing invalid outputs) get fallback
+        predictions without affecting the rest of the batch.
+
+        Args:
+            ecg_signals: numpy array (N, 4096, 12)
+            finite_items: Optional (N,) bool array of precomputed NaN/Inf checks
+                          (SignalQualityReport.all_finite per item); skips the re-scan
+
+        Returns:
+            list: N dicts of {condition_name: probability}
+        """
+        batch_size = len(ecg_signals)
+
         # Fallback mode: return canned predictions
         if self.model is None or self.simulation_mode:
             model_logger.warning("Model not available - returning fallback predictions")
-            return self.fallback_predictions.copy()
+            return [self.fallback_predictions.copy() for _ in range(batch_size)]
 
-        try:
-            # Ensure correct shape
-            if ecg_signal.shape == (4096, 12):
-                ecg_signal = np.expand_dims(ecg_signal, axis=0)
+        results = [None] * batch_size
 
+        try:
             # Validate input
-            if np.isnan(ecg_signal).any() or np.isinf(ecg_signal).any():
-                model_logger.warning("Invalid input detected (NaN/Inf) - returning fallback")
-                return self.fallback_predictions.copy()
+            if finite_items is None:
+                finite_items = np.isfinite(ecg_signals).all(axis=(1, 2))
+            finite_items = np.asarray(finite_items, dtype=bool)
+            if not finite_items.all():
+                model_logger.warning(
+                    f"Invalid input detected (NaN/Inf) in {int((~finite_items).sum())} of {batch_size} "
+                    f"signals - returning fallback for those"
+                )
+
+            valid_indices = np.flatnonzero(finite_items)
 
             # Run inference
-            predictions = self.model.predict(ecg_signal, verbose=0)[0]
+            if len(valid_indices) > 0:
+                batch = ecg_signals if len(valid_indices) == batch_size else ecg_signals[valid_indices]
+                predictions = self.model.predict(batch, batch_size=len(valid_indices), verbose=0)
 
-            # Validate predictions
-            if np.isnan(predictions).any() or np.isinf(predictions).any():
-                model_logger.error("Model returned invalid predictions - using fallback")
-                return self.fallback_predictions.copy()
+                for index, item_predictions in zip(valid_indices, predictions):
+                    # Validate predictions
+                    if not np.isfinite(item_predictions).all():
+                        model_logger.error("Model returned invalid predictions - using fallback")
+                        continue
 
-            # Format as dict
-            result = {
-                name: float(prob)
-                for name, prob in zip(self.condition_names, predictions)
-            }
+                    # Format as dict
+                    results[index] = {
+                        name: float(prob)
+                        for name, prob in zip(self.condition_names, item_predictions)
+                    }
 
-            model_logger.debug(f"Prediction successful: top={max(result, key=result.get)}")
-            return result
+            model_logger.debug(f"Batch prediction successful: {len(valid_indices)}/{batch_size} signals")
 
         except Exception as e:
             model_logger.error(f"Prediction failed: {str(e)} - using fallback")
-            return self.fallback_predictions.copy()
+
+        return [
+            result if result is not None else self.fallback_predictions.copy()
+            for result in results
+        ]
 
     def get_top_condition(self, predictions_dict):
         """
@@ -150,6 +194,194 @@ class ECGModelLoader:
         return top_condition, confidence
 
 
+class InferenceScheduler:
+    """
+    Dynamic micro-batching for concurrent predictions
+
+    Requests submit single (4096, 12) signals. A worker thread groups queued
+    signals into batches of up to max_batch_size, waiting at most max_wait_ms
+    after the first signal arrives, runs one ECGModelLoader.predict_batch call
+    and hands each result back to its waiting caller.
+
+    Queue depth and batch-size histograms are exposed via get_stats() for
+    tuning throughput against p99 latency.
+    """
+
+    # Queue depth histogram bucket upper bounds (observed at submit time)
+    QUEUE_DEPTH_BUCKETS = [0, 1, 2, 4, 8, 16, 32, 64]
+
+    def __init__(self, model_loader, max_batch_size=16, max_wait_ms=5.0):
+        self.model_loader = model_loader
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait_ms = max(0.0, float(max_wait_ms))
+
+        self._lock = threading.Lock()
+        self._queue = None
+        self._worker = None
+        self._pid = None
+
+        self._stats_lock = threading.Lock()
+        self._reset_stats()
+
+    def _reset_stats(self):
+        """Reset counters and histograms"""
+        self.total_requests = 0
+        self.total_batches = 0
+        self.max_queue_depth = 0
+        self.batch_size_histogram = {size: 0 for size in range(1, self.max_batch_size + 1)}
+        self.queue_depth_histogram = {bound: 0 for bound in self.QUEUE_DEPTH_BUCKETS}
+        self.queue_depth_histogram['+Inf'] = 0
+        self.recent_wait_ms = deque(maxlen=1024)
+        self.recent_batch_ms = deque(maxlen=1024)
+
+    def _ensure_worker(self):
+        """Start the worker thread lazily (and again in forked worker processes)"""
+        if self._worker is not None and self._pid == os.getpid() and self._worker.is_alive():
+            return
+
+        with self._lock:
+            if self._worker is not None and self._pid == os.getpid() and self._worker.is_alive():
+                return
+
+            self._queue = queue.Queue()
+            self._pid = os.getpid()
+            self._worker = threading.Thread(
+                target=self._run,
+                args=(self._queue,),
+                name='InferenceScheduler',
+                daemon=True
+            )
+            self._worker.start()
+            model_logger.info(
+                f"Inference scheduler started (max_batch_size={self.max_batch_size}, "
+                f"max_wait_ms={self.max_wait_ms})"
+            )
+
+    def submit(self, ecg_signal, all_finite=None):
+        """
+        Queue a (4096, 12) signal for batched inference
+
+        Args:
+            ecg_signal: numpy array (4096, 12)
+            all_finite: Optional precomputed NaN/Inf check (SignalQualityReport.all_finite)
+
+        Returns:
+            Future: resolves to {condition_name: probability}
+        """
+        self._ensure_worker()
+
+        future = Future()
+        depth = self._queue.qsize()
+
+        with self._stats_lock:
+            self.total_requests += 1
+            self.max_queue_depth = max(self.max_queue_depth, depth + 1)
+            bucket = next((bound for bound in self.QUEUE_DEPTH_BUCKETS if depth <= bound), '+Inf')
+            self.queue_depth_histogram[bucket] += 1
+
+        self._queue.put((ecg_signal, future, time.perf_counter(), all_finite))
+        return future
+
+    def predict(self, ecg_signal, timeout=None, all_finite=None):
+        """
+        Blocking prediction through the micro-batching queue
+
+        Args:
+            ecg_signal: numpy array (4096, 12)
+            timeout: Optional seconds to wait for the result
+            all_finite: Optional precomputed NaN/Inf check (SignalQualityReport.all_finite)
+
+        Returns:
+            dict: {condition_name: probability}
+        """
+        return self.submit(ecg_signal, all_finite=all_finite).result(timeout=timeout)
+
+    def _collect_batch(self, work_queue):
+        """Block for the first item, then gather more until full or max wait elapsed"""
+        batch = [work_queue.get()]
+        deadline = batch[0][2] + self.max_wait_ms / 1000
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                if remaining <= 0:
+                    batch.append(work_queue.get_nowait())
+                else:
+                    batch.append(work_queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+
+        return batch
+
+    def _run(self, work_queue):
+        """Worker loop: form batches and run one forward pass per batch"""
+        while True:
+            batch = self._collect_batch(work_queue)
+            batch_start = time.perf_counter()
+
+            # Reuse the callers' NaN/Inf checks when every item carries one
+            finite_flags = [item[3] for item in batch]
+            finite_items = None if None in finite_flags else np.array(finite_flags, dtype=bool)
+
+            try:
+                predictions = self.model_loader.predict_batch(
+                    np.stack([item[0] for item in batch]), finite_items=finite_items
+                )
+            except Exception as e:
+                model_logger.error(f"Batched inference failed: {str(e)}")
+                for _, future, _, _ in batch:
+                    future.set_exception(e)
+                continue
+
+            batch_end = time.perf_counter()
+            for (_, future, _, _), result in zip(batch, predictions):
+                future.set_result(result)
+
+            with self._stats_lock:
+                self.total_batches += 1
+                self.batch_size_histogram[len(batch)] += 1
+                self.recent_batch_ms.append((batch_end - batch_start) * 1000)
+                self.recent_wait_ms.extend((batch_start - enqueued) * 1000 for _, _, enqueued, _ in batch)
+
+    def get_stats(self):
+        """
+        Scheduler statistics for tuning
+
+        Returns:
+            dict: config, queue depth, histograms and wait/batch latency percentiles
+        """
+        with self._stats_lock:
+            wait_ms = np.array(self.recent_wait_ms) if self.recent_wait_ms else np.zeros(1)
+            batch_ms = np.array(self.recent_batch_ms) if self.recent_batch_ms else np.zeros(1)
+
+            return {
+                'max_batch_size': self.max_batch_size,
+                'max_wait_ms': self.max_wait_ms,
+                'queue_depth': self._queue.qsize() if self._queue is not None else 0,
+                'max_queue_depth': self.max_queue_depth,
+                'total_requests': self.total_requests,
+                'total_batches': self.total_batches,
+                'avg_batch_size': round(
+                    sum(size * count for size, count in self.batch_size_histogram.items()) / self.total_batches, 2
+                ) if self.total_batches else 0.0,
+                'batch_size_histogram': {str(size): count for size, count in self.batch_size_histogram.items()},
+                'queue_depth_histogram': {str(bound): count for bound, count in self.queue_depth_histogram.items()},
+                'queue_wait_ms': {
+                    'p50': round(float(np.percentile(wait_ms, 50)), 3),
+                    'p99': round(float(np.percentile(wait_ms, 99)), 3)
+                },
+                'batch_inference_ms': {
+                    'p50': round(float(np.percentile(batch_ms, 50)), 3),
+                    'p99': round(float(np.percentile(batch_ms, 99)), 3)
+                }
+            }
+
+    def reset_stats(self):
+        """Clear counters and histograms (queue is left untouched)"""
+        with self._stats_lock:
+            self._reset_stats()
+
+
 # Test module
 if __name__ == '__main__':
     print("Testing ECGModelLoader...")
@@ -0,0 +1,192 @@
+"""
+Content-Addressed Result Cache
+
+Demo and teaching sessions replay the same recordings over and over. Results
+of model prediction and beat detection are cached under a fingerprint of the
+float32 signal bytes (blake2b), so a replayed upload skips recomputation.
+Keys also carry the model version / sampling rate so stale results are never
+served after a model or pipeline change.
+
+Concurrent identical uploads share one computation via SingleFlight.
+The cache is an LRU bounded by the approximate byte size of the stored results.
+
+Author: Backend Developer 1
+Project: HoloHuman XR - Immerse the Bay 2025
+"""
+
+import hashlib
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from singleflight import SingleFlight
+
+
+def signal_fingerprint(ecg_signal):
+    """
+    Fast content hash of an ECG signal
+
+    Hashes the float32 bytes plus the shape, so identical recordings map to the
+    same key whether they arrived as JSON, octet-stream or .npy.
+
+    Args:
+        ecg_signal: numpy array (any shape)
+
+    Returns:
+        str: 32-char hex digest
+    """
+    ecg_signal = np.ascontiguousarray(ecg_signal, dtype=np.float32)
+
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(str(ecg_signal.shape).encode())
+    digest.update(memoryview(ecg_signal).cast('B'))
+    return digest.hexdigest()
+
+
+def estimate_size_bytes(value):
+    """Approximate memory held by a cached result (dicts, lists, arrays, scalars)"""
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            estimate_size_bytes(k) + estimate_size_bytes(v) for k, v in value.items()
+        )
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_size_bytes(item) for item in value)
+    return sys.getsizeof(value)
+
+
+class ResultCache:
+    """
+    Thread-safe LRU cache of computed results, bounded by bytes
+
+    Cached values are shared between requests and must be treated as read-only.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+
+        self._entries = OrderedDict()  # key -> (value, size_bytes), oldest first
+        self._lock = threading.Lock()
+        self._flight = SingleFlight()
+        self.current_bytes = 0
+
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'evictions': 0
+        }
+
+    def get(self, key):
+        """
+        Look up a cached result
+
+        Returns:
+            Cached value, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats['misses'] += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.stats['hits'] += 1
+            return entry[0]
+
+    def put(self, key, value):
+        """Store a result, evicting least-recently-used entries over the byte budget"""
+        size_bytes = estimate_size_bytes(value)
+        if size_bytes > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self.current_bytes -= self._entries.pop(key)[1]
+
+            while self._entries and self.current_bytes + size_bytes > self.max_bytes:
+                _, (_, evicted_bytes) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_bytes
+                self.stats['evictions'] += 1
+
+            self._entries[key] = (value, size_bytes)
+            self.current_bytes += size_bytes
+
+    def get_or_compute(self, key, compute):
+        """
+        Return the cached result for key, computing it at most once
+
+        Concurrent misses on the same key wait for the first caller's
+        computation instead of repeating it.
+
+        Args:
+            key: Cache key (see make_key)
+            compute: Zero-argument callable producing the result
+
+        Returns:
+            tuple: (value, cached) - cached is False only for the caller that computed it
+                   (True if another caller stored it between our miss and the flight)
+        """
+        value = self.get(key)
+        if value is not None:
+            return value, True
+
+        def compute_and_store():
+            # Another leader may have finished between our miss and taking the flight
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    # Served from the cache after all: count the lookup above as a hit
+                    self._entries.move_to_end(key)
+                    self.stats['misses'] -= 1
+                    self.stats['hits'] += 1
+                    return entry[0], True
+
+            result = compute()
+            self.put(key, result)
+            return result, False
+
+        (value, from_cache), shared = self._flight.do(key, compute_and_store)
+        return value, shared or from_cache
+
+    @staticmethod
+    def make_key(kind, fingerprint, *qualifiers):
+        """Build a cache key, e.g. make_key('predictions', fp, model_version)"""
+        return ':'.join([kind, fingerprint, *(str(q) for q in qualifiers)])
+
+    def clear(self):
+        """Drop all entries and reset statistics"""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+            for key in self.stats:
+                self.stats[key] = 0
+        self._flight.reset_stats()
+
+    def get_stats(self):
+        """
+        Cache statistics
+
+        Returns:
+            dict: entry count, memory use, hit rate, evictions, in-flight dedup counters
+        """
+        flight_stats = self._flight.get_stats()
+
+        with self._lock:
+            lookups = self.stats['hits'] + self.stats['misses']
+            hit_rate = (self.stats['hits'] / lookups * 100) if lookups > 0 else 0
+
+            return {
+                'entries': len(self._entries),
+                'current_bytes': self.current_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.stats['hits'],
+                'misses': self.stats['misses'],
+                'hit_rate_percent': round(hit_rate, 2),
+                'evictions': self.stats['evictions'],
+                'in_flight': flight_stats['in_flight'],
+                'computations': flight_stats['executions'],
+                'coalesced': flight_stats['coalesced']
+            }
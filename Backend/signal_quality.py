@@ -0,0 +1,221 @@
+"""
+Signal Quality Engine
+
+One vectorized stage that computes every quality statistic for all leads of
+a (samples, leads) recording at once: NaN/Inf counts, min/max, mean,
+variance, near-zero ratio, clipping ratio and a high-frequency noise
+estimate. The result is a SignalQualityReport that the rest of the pipeline
+reuses instead of scanning the signal again:
+
+- validate_ecg_input() applies the request-level rules to the report
+- InferenceScheduler / predict_batch() take its all_finite flag instead of
+  re-checking NaN/Inf
+- ECGHeartRateAnalyzer takes its per-lead variance and skips flat leads
+  without filtering them
+
+The signal is transposed once to lead-major order, so every statistic is a
+reduction over contiguous memory (axis-0 reductions over the (4096, 12)
+request layout are ~10x slower). A 4096 x 12 recording is 192 KB and stays
+cache-resident across the reductions.
+
+Author: Backend Developer 1
+Project: HoloHuman XR - Immerse the Bay 2025
+"""
+
+import warnings
+
+import numpy as np
+
+# Standard 12-lead order used by the model (automatic-ecg-diagnosis)
+LEAD_NAMES = ['I', 'II', 'III', 'aVR', 'aVL', 'aVF', 'V1', 'V2', 'V3', 'V4', 'V5', 'V6']
+
+# Request-level validation thresholds
+MAX_NAN_RATIO = 0.05              # > 5% NaN rejects the recording
+AMPLITUDE_LIMIT_MV = 5.0          # Realistic ECG: -5 mV to +5 mV
+MAX_ZERO_RATIO = 0.90             # > 90% near-zero samples = flat-line recording
+MIN_SIGNAL_STD_MV = 0.01          # Overall std below this = noise or artifact
+ZERO_THRESHOLD_MV = 0.001
+
+# Per-lead flags
+FLAT_LEAD_STD_MV = 0.01
+CLIPPING_RATIO = 0.01             # > 1% of samples pinned at the lead's min/max
+CLIPPING_TOLERANCE = 0.001        # Fraction of the lead's range counted as "at the rail"
+NOISY_LEAD_SNR_DB = 6.0
+
+
+class SignalQualityReport:
+    """Per-lead quality statistics for one recording"""
+
+    def __init__(self, num_samples, lead_names, nan_count, inf_count, minimum, maximum,
+                 mean, variance, zero_count, clipped_count, noise):
+        self.num_samples = num_samples
+        self.lead_names = lead_names
+        self.nan_count = nan_count
+        self.inf_count = inf_count
+        self.minimum = minimum
+        self.maximum = maximum
+        self.mean = mean
+        self.variance = variance
+        self.zero_count = zero_count
+        self.clipped_count = clipped_count
+        self.noise = noise
+
+        self.all_finite = not (nan_count.any() or inf_count.any())
+        self.std = np.sqrt(variance)
+        self.nan_ratio = nan_count / num_samples
+        self.clipping_ratio = clipped_count / num_samples
+        self.flat = (self.std < FLAT_LEAD_STD_MV) | (zero_count / num_samples > MAX_ZERO_RATIO)
+        self.clipped = (self.clipping_ratio > CLIPPING_RATIO) & ~self.flat
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.snr_db = 20 * np.log10(self.std / np.maximum(noise, 1e-6))
+        self.noisy = (self.snr_db < NOISY_LEAD_SNR_DB) & ~self.flat
+
+    @property
+    def total_std(self):
+        """Standard deviation over all samples of all leads (from per-lead moments)"""
+        grand_mean = self.mean.mean()
+        return float(np.sqrt(np.mean(self.variance + (self.mean - grand_mean) ** 2)))
+
+    def validation_error(self):
+        """
+        Request-level validation rules
+
+        Returns:
+            str: reason the recording is rejected, or None if it is acceptable
+        """
+        total = self.num_samples * len(self.lead_names)
+
+        nan_percentage = self.nan_count.sum() / total * 100
+        if nan_percentage > MAX_NAN_RATIO * 100:
+            return f"Signal contains {nan_percentage:.1f}% NaN values (threshold: {MAX_NAN_RATIO * 100:.0f}%)"
+
+        if self.inf_count.any():
+            return "Signal contains infinite values"
+
+        signal_min, signal_max = float(self.minimum.min()), float(self.maximum.max())
+        if signal_min < -AMPLITUDE_LIMIT_MV or signal_max > AMPLITUDE_LIMIT_MV:
+            return (f"Signal amplitude out of range: [{signal_min:.2f}, {signal_max:.2f}] "
+                    f"(expected: [{-AMPLITUDE_LIMIT_MV}, {AMPLITUDE_LIMIT_MV}] mV)")
+
+        zero_percentage = self.zero_count.sum() / total * 100
+        if zero_percentage > MAX_ZERO_RATIO * 100:
+            return f"Signal appears flat-line ({zero_percentage:.1f}% zeros)"
+
+        signal_std = self.total_std
+        if signal_std < MIN_SIGNAL_STD_MV:
+            return f"Signal has very low variance (std={signal_std:.4f}), possible noise or artifact"
+
+        return None
+
+    def lead_variance(self):
+        """{lead_index: variance} for ECGHeartRateAnalyzer.detect_r_peaks()"""
+        return dict(enumerate(self.variance.tolist()))
+
+    def to_dict(self):
+        """JSON-ready summary with one entry per lead"""
+        flat = self.flat.tolist()
+        clipped = self.clipped.tolist()
+        noisy = self.noisy.tolist()
+
+        leads = {}
+        for index, name in enumerate(self.lead_names):
+            leads[name] = {
+                'std_mv': round(float(self.std[index]), 4),
+                'noise_mv': round(float(self.noise[index]), 4),
+                'snr_db': round(float(self.snr_db[index]), 1) if np.isfinite(self.snr_db[index]) else None,
+                'nan_ratio': round(float(self.nan_ratio[index]), 4),
+                'clipping_ratio': round(float(self.clipping_ratio[index]), 4),
+                'flat': flat[index],
+                'clipped': clipped[index],
+                'noisy': noisy[index]
+            }
+
+        flagged = [name for index, name in enumerate(self.lead_names) if flat[index] or clipped[index] or noisy[index]]
+        if self.validation_error() is not None or len(flagged) > len(self.lead_names) // 2:
+            overall = 'poor'
+        elif flagged:
+            overall = 'acceptable'
+        else:
+            overall = 'good'
+
+        return {
+            'overall': overall,
+            'nan_ratio': round(float(self.nan_count.sum()) / (self.num_samples * len(self.lead_names)), 4),
+            'flat_leads': [name for index, name in enumerate(self.lead_names) if flat[index]],
+            'clipped_leads': [name for index, name in enumerate(self.lead_names) if clipped[index]],
+            'noisy_leads': [name for index, name in enumerate(self.lead_names) if noisy[index]],
+            'leads': leads
+        }
+
+
+def _lead_statistics(leads, nan_aware):
+    """Per-lead reductions over a lead-major (leads, samples) array"""
+    num_samples = leads.shape[1]
+
+    if nan_aware:
+        minimum, maximum = np.nanmin(leads, axis=1), np.nanmax(leads, axis=1)
+        mean, variance = np.nanmean(leads, axis=1), np.nanvar(leads, axis=1)
+        differences = np.abs(np.diff(leads, axis=1))
+        noise_mad = np.nanmedian(differences, axis=1)
+    else:
+        minimum, maximum = leads.min(axis=1), leads.max(axis=1)
+        mean = leads.sum(axis=1, dtype=np.float64) / num_samples
+        centered = leads - mean[:, None].astype(leads.dtype)
+        variance = np.einsum('ij,ij->i', centered, centered, dtype=np.float64) / num_samples
+
+        # Median via partition (no full sort)
+        differences = np.abs(np.diff(leads, axis=1))
+        middle = differences.shape[1] // 2
+        noise_mad = np.partition(differences, middle, axis=1)[:, middle]
+
+    zero_count = np.count_nonzero((leads < ZERO_THRESHOLD_MV) & (leads > -ZERO_THRESHOLD_MV), axis=1)
+
+    # Samples pinned at the lead's rails (ADC saturation / lead-off plateaus)
+    tolerance = ((maximum - minimum) * CLIPPING_TOLERANCE)[:, None]
+    clipped_count = np.count_nonzero(
+        (leads >= maximum[:, None] - tolerance) | (leads <= minimum[:, None] + tolerance), axis=1
+    )
+
+    # High-frequency noise: robust std of the first difference (MAD, / sqrt(2) for differencing)
+    noise = noise_mad * 1.4826 / np.sqrt(2)
+
+    return minimum, maximum, mean, variance, zero_count, clipped_count, noise
+
+
+def assess_signal_quality(ecg_signal):
+    """
+    Compute the quality report for a (samples, leads) recording
+
+    Args:
+        ecg_signal: numpy array (samples, leads), float32 as decoded from the request
+
+    Returns:
+        SignalQualityReport
+    """
+    num_samples, num_leads = ecg_signal.shape
+    lead_names = LEAD_NAMES if num_leads == len(LEAD_NAMES) else [f'lead_{i}' for i in range(num_leads)]
+
+    # One transposed copy: per-lead reductions then run over contiguous memory
+    leads = np.ascontiguousarray(ecg_signal.T)
+
+    finite = np.isfinite(leads)
+    if finite.all():
+        nan_count = inf_count = np.zeros(num_leads, dtype=np.int64)
+        statistics = _lead_statistics(leads, nan_aware=False)
+    else:
+        # Rare path: statistics over the finite samples of each lead
+        nan_count = np.count_nonzero(np.isnan(leads), axis=1)
+        inf_count = np.count_nonzero(~finite, axis=1) - nan_count
+        with warnings.catch_warnings(), np.errstate(invalid='ignore'):
+            warnings.simplefilter('ignore', RuntimeWarning)  # Leads without finite samples
+            statistics = _lead_statistics(np.where(finite, leads, np.nan), nan_aware=True)
+
+    minimum, maximum, mean, variance, zero_count, clipped_count, noise = (
+        np.nan_to_num(np.asarray(statistic, dtype=np.float64)) for statistic in statistics
+    )
+
+    return SignalQualityReport(
+        num_samples, lead_names, nan_count, inf_count, minimum, maximum,
+        mean, variance, zero_count, clipped_count, noise
+    )
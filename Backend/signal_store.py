@@ -0,0 +1,214 @@
+"""
+Signal Session Store
+
+Keeps uploaded ECG recordings in memory so the VR timeline endpoints
+(/api/ecg/beats, /api/ecg/beat/<index>, /api/ecg/segment) can be called
+repeatedly with a signal_id instead of re-uploading 4096 x 12 samples and
+re-running R-peak detection on every scrub.
+
+Each session holds the signal, the bandpass-filtered priority leads and the
+detected R-peaks. The store is an LRU bounded by total bytes, with TTL expiry.
+
+Author: Backend Developer 1
+Project: HoloHuman XR - Immerse the Bay 2025
+"""
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+import numpy as np
+
+
+def build_signal_session(ecg_signal, hr_analyzer, filter_all_leads=True, detection=None, lead_variance=None):
+    """
+    Run the shared per-recording work once: filtering and R-peak detection
+
+    Args:
+        ecg_signal: (samples, 12) float32 array
+        hr_analyzer: ECGHeartRateAnalyzer instance
+        filter_all_leads: Pre-filter every priority lead for later reuse. Single-use
+                          (non-stored) sessions skip this so Lead II can exit early.
+        detection: Optional precomputed detect_r_peaks() result (e.g. from the result cache)
+        lead_variance: Optional {lead_index: variance} from SignalQualityReport; flat leads
+                       are neither filtered nor searched for R-peaks
+
+    Returns:
+        dict: session data (signal, filtered_leads, r_peaks, lead_used, ...)
+    """
+    filtered_leads = hr_analyzer.filter_leads(ecg_signal, lead_variance=lead_variance) if filter_all_leads else {}
+    if detection is None:
+        detection = hr_analyzer.detect_r_peaks(ecg_signal, filtered_leads=filtered_leads, lead_variance=lead_variance)
+    r_peaks, lead_used, lead_quality, fallback_triggered = detection
+
+    return {
+        'signal': ecg_signal,
+        'filtered_leads': filtered_leads,
+        'r_peaks': np.asarray(r_peaks, dtype=np.int64),
+        'lead_used': lead_used,
+        'lead_quality': lead_quality,
+        'fallback_triggered': fallback_triggered,
+        'sampling_rate': hr_analyzer.fs
+    }
+
+
+def session_size_bytes(session):
+    """Approximate memory held by a session's arrays"""
+    return (
+        session['signal'].nbytes
+        + sum(filtered.nbytes for filtered in session['filtered_leads'].values())
+        + session['r_peaks'].nbytes
+    )
+
+
+class SignalSessionStore:
+    """
+    Thread-safe LRU store of signal sessions with byte budget and TTL
+
+    Sessions are evicted least-recently-used first when the byte budget is
+    exceeded, and expire ttl_seconds after their last access.
+    """
+
+    def __init__(self, max_bytes=256 * 1024 * 1024, ttl_seconds=600):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+
+        self._sessions = OrderedDict()  # signal_id -> session (LRU order, oldest first)
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+
+        self.stats = {
+            'created': 0,
+            'hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'expirations': 0
+        }
+
+    @staticmethod
+    def generate_signal_id() -> str:
+        """Generate unique signal session ID"""
+        return f"SIG-{uuid.uuid4().hex[:12].upper()}"
+
+    def _remove(self, signal_id):
+        """Remove a session (lock must be held)"""
+        session = self._sessions.pop(signal_id)
+        self.current_bytes -= session['size_bytes']
+
+    def _expire(self, now):
+        """Drop sessions idle for longer than the TTL (lock must be held)"""
+        # LRU order == last-access order, so expired sessions are at the front
+        while self._sessions:
+            signal_id, session = next(iter(self._sessions.items()))
+            if now - session['last_access'] <= self.ttl_seconds:
+                break
+            self._remove(signal_id)
+            self.stats['expirations'] += 1
+
+    def add(self, session):
+        """
+        Store a session built by build_signal_session()
+
+        Returns:
+            str: signal_id, or None if the session alone exceeds the byte budget
+        """
+        size_bytes = session_size_bytes(session)
+        if size_bytes > self.max_bytes:
+            return None
+
+        # Cached arrays are shared across requests - protect them from in-place edits
+        session['signal'].flags.writeable = False
+        for filtered in session['filtered_leads'].values():
+            filtered.flags.writeable = False
+
+        now = time.time()
+        signal_id = self.generate_signal_id()
+        session.update({
+            'signal_id': signal_id,
+            'size_bytes': size_bytes,
+            'created_at': now,
+            'last_access': now
+        })
+
+        with self._lock:
+            self._expire(now)
+
+            while self._sessions and self.current_bytes + size_bytes > self.max_bytes:
+                self._remove(next(iter(self._sessions)))
+                self.stats['evictions'] += 1
+
+            self._sessions[signal_id] = session
+            self.current_bytes += size_bytes
+            self.stats['created'] += 1
+
+        return signal_id
+
+    def get(self, signal_id):
+        """
+        Look up a session and mark it recently used
+
+        Returns:
+            dict: session, or None if unknown or expired
+        """
+        now = time.time()
+
+        with self._lock:
+            self._expire(now)
+
+            session = self._sessions.get(signal_id)
+            if session is None:
+                self.stats['misses'] += 1
+                return None
+
+            self._sessions.move_to_end(signal_id)
+            session['last_access'] = now
+            self.stats['hits'] += 1
+            return session
+
+    def delete(self, signal_id):
+        """
+        Delete a session
+
+        Returns:
+            bool: True if the session existed
+        """
+        with self._lock:
+            if signal_id not in self._sessions:
+                return False
+            self._remove(signal_id)
+            return True
+
+    def clear(self):
+        """Drop all sessions and reset statistics"""
+        with self._lock:
+            self._sessions.clear()
+            self.current_bytes = 0
+            for key in self.stats:
+                self.stats[key] = 0
+
+    def get_stats(self):
+        """
+        Store statistics
+
+        Returns:
+            dict: session count, memory use, hit rate and eviction counters
+        """
+        with self._lock:
+            self._expire(time.time())
+
+            lookups = self.stats['hits'] + self.stats['misses']
+            hit_rate = (self.stats['hits'] / lookups * 100) if lookups > 0 else 0
+
+            return {
+                'sessions': len(self._sessions),
+                'current_bytes': self.current_bytes,
+                'max_bytes': self.max_bytes,
+                'ttl_seconds': self.ttl_seconds,
+                'created': self.stats['created'],
+                'hits': self.stats['hits'],
+                'misses': self.stats['misses'],
+                'hit_rate_percent': round(hit_rate, 2),
+                'evictions': self.stats['evictions'],
+                'expirations': self.stats['expirations']
+            }
@@ -0,0 +1,84 @@
+"""
+Single-Flight Call Coalescing
+
+Concurrent calls for the same key share one execution: the first caller
+(the leader) runs the function, later callers wait for and reuse its
+result (or exception) instead of starting duplicate work.
+
+Author: Backend Developer 1
+Project: HoloHuman XR - Immerse the Bay 2025
+"""
+
+import threading
+from concurrent.futures import Future
+
+
+class SingleFlight:
+    """Deduplicate in-flight calls by key"""
+
+    def __init__(self):
+        self._calls = {}  # key -> Future of the running call
+        self._lock = threading.Lock()
+
+        self.stats = {
+            'executions': 0,
+            'coalesced': 0
+        }
+
+    def do(self, key, fn, timeout=None):
+        """
+        Run fn() once per key across concurrent callers
+
+        Args:
+            key: Hashable call identity
+            fn: Zero-argument callable
+            timeout: Seconds a waiting caller blocks before TimeoutError (None = forever)
+
+        Returns:
+            tuple: (result, shared) - shared is True if another caller did the work
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+                self.stats['executions'] += 1
+            else:
+                self.stats['coalesced'] += 1
+
+        if not leader:
+            return future.result(timeout=timeout), True
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+        return result, False
+
+    def in_flight(self):
+        """Number of keys currently being computed"""
+        with self._lock:
+            return len(self._calls)
+
+    def get_stats(self):
+        """Execution / coalesced-waiter counters"""
+        with self._lock:
+            return {
+                'in_flight': len(self._calls),
+                'executions': self.stats['executions'],
+                'coalesced': self.stats['coalesced']
+            }
+
+    def reset_stats(self):
+        """Zero the counters (in-flight calls are unaffected)"""
+        with self._lock:
+            for key in self.stats:
+                self.stats[key] = 0
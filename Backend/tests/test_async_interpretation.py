@@ -0,0 +1,166 @@
+"""
+Test script for asynchronous LLM interpretation jobs
+
+Tests:
+1. /api/ecg/analyze with async_interpretation - immediate response with interpretation_job_id
+2. GET /api/interpretation/<job_id> - polling (and ?wait= long polling)
+3. GET /api/interpretation/<job_id>/stream - Server-Sent Events
+4. Unknown job_id returns 404
+5. The job store sheds submissions once max_jobs jobs are unfinished
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+
+import requests
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from admission import AdmissionRejected
+from interpretation_jobs import InterpretationJobStore
+
+
+def generate_test_ecg():
+    """Generate synthetic ECG with regular R-peaks (72 BPM)"""
+    np.random.seed(3)
+    ecg_signal = np.random.randn(4096, 12) * 0.05
+
+    rr_interval_samples = int(60 / 72 * 400)
+    for i in range(0, 4096, rr_interval_samples):
+        if i + 50 < 4096:
+            ecg_signal[i:i+50, 1] += 1.0
+
+    return ecg_signal
+
+
+def submit_async_analysis(output_mode='clinical_expert'):
+    """POST /api/ecg/analyze with async_interpretation, returns (response, round_trip_ms)"""
+    payload = {
+        'ecg_signal': generate_test_ecg().tolist(),
+        'output_mode': output_mode,
+        'async_interpretation': True
+    }
+    start = time.perf_counter()
+    response = requests.post('http://localhost:5000/api/ecg/analyze', json=payload)
+    return response, (time.perf_counter() - start) * 1000
+
+
+def test_async_polling():
+    """Immediate response, then poll for the interpretation"""
+    print("=" * 80)
+    print("ASYNC INTERPRETATION: polling")
+    print("=" * 80)
+
+    response, round_trip_ms = submit_async_analysis()
+    if response.status_code != 200:
+        print(f"[FAIL] Status: {response.status_code}")
+        return
+
+    result = response.json()
+    job_id = result.get('interpretation_job_id')
+    if job_id and result['llm_interpretation'] is None:
+        print(f"[OK] Analysis returned in {round_trip_ms:.1f}ms with job {job_id}")
+    else:
+        print("[FAIL] Expected interpretation_job_id and no inline interpretation")
+        return
+
+    response = requests.get(f'http://localhost:5000/api/interpretation/{job_id}')
+    print(f"Immediate poll: {response.json()['status']}")
+
+    response = requests.get(f'http://localhost:5000/api/interpretation/{job_id}?wait=30')
+    job = response.json()
+    if job['status'] in ('complete', 'failed'):
+        print(f"[OK] Job {job['status']} after {job['elapsed_ms']}ms (cache_hit={job['cache_hit']})")
+    else:
+        print(f"[WARNING] Job still {job['status']} after long poll")
+
+
+def test_async_sse():
+    """Server-Sent Events delivery"""
+    print("\n" + "=" * 80)
+    print("ASYNC INTERPRETATION: SSE stream")
+    print("=" * 80)
+
+    response, _ = submit_async_analysis(output_mode='patient_education')
+    job_id = response.json().get('interpretation_job_id')
+    if not job_id:
+        print(f"[FAIL] No interpretation_job_id (status {response.status_code})")
+        return
+
+    events = []
+    with requests.get(f'http://localhost:5000/api/interpretation/{job_id}/stream', stream=True, timeout=60) as stream:
+        event_name = None
+        for line in stream.iter_lines(decode_unicode=True):
+            if line.startswith('event: '):
+                event_name = line[len('event: '):]
+            elif line.startswith('data: '):
+                events.append((event_name, json.loads(line[len('data: '):])))
+                if event_name == 'interpretation':
+                    break
+
+    print(f"Events: {[name for name, _ in events]}")
+    if events and events[-1][0] == 'interpretation':
+        print(f"[OK] SSE delivered interpretation (status {events[-1][1]['status']})")
+    else:
+        print("[FAIL] No interpretation event received")
+
+
+def test_unknown_job():
+    """Unknown job_id"""
+    print("\n" + "=" * 80)
+    print("ASYNC INTERPRETATION: unknown job_id")
+    print("=" * 80)
+
+    response = requests.get('http://localhost:5000/api/interpretation/JOB-DOESNOTEXIST')
+    if response.status_code == 404:
+        print("[OK] Status: 404 (expected error)")
+    else:
+        print(f"[FAIL] Expected 404, got {response.status_code}")
+
+    stats = requests.get('http://localhost:5000/api/interpretation/stats').json()['interpretation_jobs']
+    print(f"Submitted: {stats['submitted']}, completed: {stats['completed']}, failed: {stats['failed']}")
+
+
+def test_queue_bound():
+    """Unfinished jobs are capped at max_jobs; finishing one frees a slot"""
+    print("\n" + "=" * 80)
+    print("ASYNC INTERPRETATION: bounded job queue")
+    print("=" * 80)
+
+    release = threading.Event()
+    store = InterpretationJobStore(max_workers=1, max_jobs=3)
+    job_ids = [store.submit(release.wait, 5) for _ in range(3)]
+
+    try:
+        store.submit(release.wait, 5)
+        print("[FAIL] Fourth unfinished job accepted")
+    except AdmissionRejected as e:
+        ok = e.status_code == 503 and e.stage == 'llm_jobs' and e.retry_after_s > 0
+        print(f"[{'OK' if ok else 'FAIL'}] Fourth job shed: {e.status_code}, Retry-After {e.retry_after_header}s "
+              f"- {e.message}")
+
+    release.set()
+    finished = all(store.wait(job_id, timeout=5)['status'] == 'complete' for job_id in job_ids)
+    accepted = store.wait(store.submit(lambda: 'done'), timeout=5)
+    stats = store.get_stats()
+    print(f"[{'OK' if finished and accepted['result'] == 'done' else 'FAIL'}] Accepted again once the queue drained")
+    print(f"[{'OK' if stats['shed_queue_full'] == 1 and stats['active_jobs'] == 0 else 'FAIL'}] "
+          f"Stats: shed_queue_full={stats['shed_queue_full']}, active_jobs={stats['active_jobs']}")
+
+
+if __name__ == '__main__':
+    test_queue_bound()
+
+    try:
+        requests.get('http://localhost:5000/health')
+    except requests.exceptions.ConnectionError:
+        print("[ERROR] Cannot connect to server at http://localhost:5000")
+        print("Please start the Flask server first: python ecg_api.py")
+    else:
+        test_async_polling()
+        test_async_sse()
+        test_unknown_job()
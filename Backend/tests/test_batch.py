@@ -0,0 +1,122 @@
+"""
+Test script for batch ECG analysis
+
+Tests POST /api/ecg/analyze/batch:
+1. JSON batch with one bad item (per-item errors)
+2. Binary (N, 4096, 12) float32 batch
+3. Batch vs per-request latency
+"""
+
+import time
+
+import requests
+import numpy as np
+
+
+def generate_test_ecg(seed, heart_rate=72):
+    """Generate synthetic ECG with regular R-peaks"""
+    np.random.seed(seed)
+    ecg_signal = np.random.randn(4096, 12) * 0.05
+
+    rr_interval_samples = int(60 / heart_rate * 400)
+    for i in range(0, 4096, rr_interval_samples):
+        if i + 50 < 4096:
+            ecg_signal[i:i+50, :] += np.random.randn(50, 12) * 0.3
+            ecg_signal[i:i+50, 1] += 1.0
+
+    return ecg_signal.astype(np.float32)
+
+
+def test_batch_json_with_bad_item():
+    """A bad signal is reported per item and does not fail the batch"""
+    print("=" * 80)
+    print("BATCH ANALYSIS: JSON batch with one invalid item")
+    print("=" * 80)
+
+    signals = [generate_test_ecg(seed, heart_rate) for seed, heart_rate in [(1, 60), (2, 72), (3, 95)]]
+    payload = [signal.tolist() for signal in signals]
+    payload.insert(1, np.zeros((100, 12)).tolist())  # Wrong shape
+
+    response = requests.post('http://localhost:5000/api/ecg/analyze/batch', json={'ecg_signals': payload})
+
+    if response.status_code == 200:
+        result = response.json()
+        print(f"[OK] Status: {response.status_code}")
+        print(f"Batch size: {result['batch_size']}, succeeded: {result['succeeded']}, failed: {result['failed']}")
+        print(f"Processing Time: {result['processing_time_ms']:.2f}ms")
+
+        for item in result['results']:
+            if item['status'] == 'ok':
+                print(f"  [{item['index']}] {item['top_condition']} ({item['confidence']:.1%}), "
+                      f"{item['heart_rate']['bpm']} BPM")
+            else:
+                print(f"  [{item['index']}] ERROR: {item['error']} ({item['error_id']})")
+
+        if result['succeeded'] == 3 and result['results'][1]['status'] == 'error':
+            print("[OK] Invalid item isolated, other items analyzed")
+        else:
+            print("[WARNING] Expected 3 successes and item 1 to fail")
+    else:
+        print(f"[FAIL] Status: {response.status_code} - {response.text}")
+
+
+def test_batch_binary():
+    """Binary (N, 4096, 12) float32 upload"""
+    print("\n" + "=" * 80)
+    print("BATCH ANALYSIS: binary float32 batch")
+    print("=" * 80)
+
+    batch = np.stack([generate_test_ecg(seed) for seed in range(8)])
+    response = requests.post(
+        'http://localhost:5000/api/ecg/analyze/batch',
+        data=batch.astype('<f4').tobytes(),
+        headers={
+            'Content-Type': 'application/octet-stream',
+            'X-ECG-Shape': f'{len(batch)},4096,12',
+            'X-ECG-Dtype': 'float32'
+        }
+    )
+
+    if response.status_code == 200:
+        result = response.json()
+        print(f"[OK] Status: {response.status_code}, {result['succeeded']}/{result['batch_size']} succeeded "
+              f"in {result['processing_time_ms']:.2f}ms")
+    else:
+        print(f"[FAIL] Status: {response.status_code} - {response.text}")
+
+
+def test_batch_vs_sequential():
+    """Compare one batch call against N single-recording calls"""
+    print("\n" + "=" * 80)
+    print("BATCH ANALYSIS: batch vs sequential /api/ecg/analyze")
+    print("=" * 80)
+
+    signals = [generate_test_ecg(seed) for seed in range(10)]
+
+    start = time.perf_counter()
+    for signal in signals:
+        requests.post('http://localhost:5000/api/ecg/analyze', json={'ecg_signal': signal.tolist()})
+    sequential_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    response = requests.post('http://localhost:5000/api/ecg/analyze/batch', json={
+        'ecg_signals': [signal.tolist() for signal in signals]
+    })
+    batch_ms = (time.perf_counter() - start) * 1000
+
+    print(f"{'Mode':<20} {'Status':<8} {'Total (ms)':<12}")
+    print("-" * 40)
+    print(f"{'Sequential x10':<20} {'200':<8} {sequential_ms:<12.1f}")
+    print(f"{'Batch (N=10)':<20} {response.status_code:<8} {batch_ms:<12.1f}")
+
+
+if __name__ == '__main__':
+    try:
+        requests.get('http://localhost:5000/health')
+    except requests.exceptions.ConnectionError:
+        print("[ERROR] Cannot connect to server at http://localhost:5000")
+        print("Please start the Flask server first: python ecg_api.py")
+    else:
+        test_batch_json_with_bad_item()
+        test_batch_binary()
+        test_batch_vs_sequential()
@@ -0,0 +1,143 @@
+"""
+Test script for whole-recording beat delineation (/api/ecg/beats/details)
+
+Tests:
+1. Stacked beat windows match per-beat slicing, including beats at the edges
+2. /api/ecg/beats/details returns every beat, identical to /api/ecg/beat/<index>
+3. include_samples=false omits raw_samples (JSON body and binary query string)
+4. One details request vs one request per beat (latency)
+"""
+
+import os
+import sys
+import time
+
+import requests
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from beat_delineation import stacked_beat_windows, delineate_beats, beat_details
+
+
+def generate_ecg(seed=21, heart_rate=75):
+    """10.24 s synthetic 12-lead ECG with regular R-peaks on lead II"""
+    rng = np.random.default_rng(seed)
+    ecg_signal = rng.standard_normal((4096, 12)) * 0.05
+
+    rr_interval_samples = int(60 / heart_rate * 400)
+    for i in range(20, 4096 - 50, rr_interval_samples):
+        ecg_signal[i:i+50, 1] += 1.0
+
+    # Random scale so the server's result cache never answers for this signal
+    return (ecg_signal * rng.uniform(0.9, 1.1)).astype(np.float32)
+
+
+def test_stacked_windows():
+    """Each stacked window equals the slice the per-beat endpoint used to take"""
+    print("=" * 80)
+    print("BEAT DETAILS: stacked beat windows")
+    print("=" * 80)
+
+    ecg_signal = generate_ecg()
+    r_peaks = np.array([10, 500, 1200, 4090])  # First and last beat clipped by the recording
+    half_window = 80
+
+    delineation = delineate_beats(ecg_signal, r_peaks, 'II', 400)
+    details = beat_details(delineation)
+
+    mismatches = 0
+    for r_peak, detail in zip(r_peaks, details):
+        start, end = max(0, r_peak - half_window), min(len(ecg_signal), r_peak + half_window)
+        if not np.array_equal(detail['raw_samples'], ecg_signal[start:end, 1]):
+            mismatches += 1
+        qrs = detail['waveform']['qrs_complex']
+        if not qrs['onset'] <= qrs['peak'] <= qrs['offset']:
+            mismatches += 1
+
+    windows, _, _ = stacked_beat_windows(ecg_signal[:, 1], r_peaks, half_window)
+    print(f"Stacked windows: {windows.shape}")
+    print(f"[{'OK' if mismatches == 0 else 'FAIL'}] {len(r_peaks)} beats match per-beat slicing")
+
+    empty = beat_details(delineate_beats(ecg_signal, np.array([], dtype=np.int64), 'II', 400))
+    print(f"[{'OK' if empty == [] else 'FAIL'}] No R-peaks -> no beats")
+
+
+def test_details_match_single_beats():
+    """Every beat in the details response equals /api/ecg/beat/<index>"""
+    print("\n" + "=" * 80)
+    print("BEAT DETAILS: /api/ecg/beats/details vs /api/ecg/beat/<index>")
+    print("=" * 80)
+
+    body = {'ecg_signal': generate_ecg().tolist()}
+    response = requests.post('http://localhost:5000/api/ecg/beats/details', json=body)
+    if response.status_code != 200:
+        print(f"[FAIL] Status: {response.status_code} - {response.text}")
+        return
+
+    result = response.json()
+    beats = result['beats']
+    print(f"Beats: {result['beat_count']} on lead {result['lead_used']} "
+          f"in {result['processing_time_ms']:.2f}ms")
+
+    ignored = ('lead_used', 'processing_time_ms', 'timestamp')
+    mismatches = []
+    for beat in beats:
+        single = requests.post(f"http://localhost:5000/api/ecg/beat/{beat['beat_index']}", json=body).json()
+        single = {key: value for key, value in single.items() if key not in ignored}
+        if single != beat:
+            mismatches.append(beat['beat_index'])
+
+    print(f"[{'OK' if beats and not mismatches else 'FAIL'}] {len(beats)} beats identical to single-beat "
+          f"responses{f' (mismatches: {mismatches})' if mismatches else ''}")
+
+    response = requests.post('http://localhost:5000/api/ecg/beats/details',
+                             json={**body, 'include_samples': False})
+    has_samples = any('raw_samples' in beat for beat in response.json()['beats'])
+    print(f"[{'OK' if not has_samples else 'FAIL'}] include_samples=false omits raw_samples")
+
+    # Binary uploads carry the flag in the query string ("false" / "0" strings)
+    headers = {'Content-Type': 'application/octet-stream', 'X-ECG-Shape': '4096,12', 'X-ECG-Dtype': 'float32'}
+    binary_body = np.asarray(body['ecg_signal'], dtype='<f4').tobytes()
+    for flag in ('false', '0'):
+        response = requests.post(f'http://localhost:5000/api/ecg/beats/details?include_samples={flag}',
+                                 data=binary_body, headers=headers)
+        beats = response.json().get('beats', [])
+        has_samples = any('raw_samples' in beat for beat in beats)
+        print(f"[{'OK' if beats and not has_samples else 'FAIL'}] Binary body, ?include_samples={flag} "
+              f"omits raw_samples (status {response.status_code})")
+
+
+def test_round_trips():
+    """One details request vs one /api/ecg/beat/<index> request per beat"""
+    print("\n" + "=" * 80)
+    print("BEAT DETAILS: one request vs one per beat")
+    print("=" * 80)
+
+    body = {'ecg_signal': generate_ecg(seed=22).tolist()}
+
+    start = time.perf_counter()
+    beats = requests.post('http://localhost:5000/api/ecg/beats/details', json=body).json()['beats']
+    details_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    for beat_index in range(len(beats)):
+        requests.post(f'http://localhost:5000/api/ecg/beat/{beat_index}', json=body)
+    per_beat_ms = (time.perf_counter() - start) * 1000
+
+    print(f"One details request: {details_ms:.1f}ms")
+    print(f"{len(beats)} per-beat requests: {per_beat_ms:.1f}ms")
+    print(f"[{'OK' if details_ms < per_beat_ms else 'WARN'}] {per_beat_ms / details_ms:.1f}x faster")
+
+
+if __name__ == '__main__':
+    test_stacked_windows()
+
+    try:
+        requests.get('http://localhost:5000/health')
+    except requests.exceptions.ConnectionError:
+        print("[ERROR] Cannot connect to server at http://localhost:5000")
+        print("Please start the Flask server first: python ecg_api.py")
+    else:
+        test_details_match_single_beats()
+        test_round_trips()
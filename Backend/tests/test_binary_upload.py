@@ -0,0 +1,163 @@
+"""
+Test script for binary ECG uploads
+
+Tests application/octet-stream (float32/int16) and application/x-npy bodies
+against the JSON path on:
+1. POST /api/ecg/analyze
+2. POST /api/ecg/beats
+3. POST /api/ecg/beat/<index>
+4. POST /api/ecg/segment
+
+and the error cases: malformed bodies, X-ECG-Scale values and shapes whose
+element count overflows int64 (400), .npy
+format 3.0 (accepted) and unknown .npy versions (415).
+"""
+
+import io
+
+import requests
+import numpy as np
+
+
+def generate_test_ecg():
+    """Generate synthetic ECG with regular R-peaks (72 BPM)"""
+    np.random.seed(42)
+    ecg_signal = np.random.randn(4096, 12) * 0.05
+
+    rr_interval_samples = int(60 / 72 * 400)
+    for i in range(0, 4096, rr_interval_samples):
+        if i + 50 < 4096:
+            ecg_signal[i:i+50, :] += np.random.randn(50, 12) * 0.3
+            ecg_signal[i:i+50, 1] += 1.0
+
+    return ecg_signal.astype(np.float32)
+
+
+def float32_body(ecg_signal):
+    """Raw little-endian float32 body + headers"""
+    return ecg_signal.astype('<f4').tobytes(), {
+        'Content-Type': 'application/octet-stream',
+        'X-ECG-Shape': '4096,12',
+        'X-ECG-Dtype': 'float32'
+    }
+
+
+def int16_body(ecg_signal):
+    """Raw little-endian int16 (microvolt) body + headers"""
+    counts = np.round(ecg_signal / 0.001).astype('<i2')
+    return counts.tobytes(), {
+        'Content-Type': 'application/octet-stream',
+        'X-ECG-Shape': '4096,12',
+        'X-ECG-Dtype': 'int16',
+        'X-ECG-Scale': '0.001'
+    }
+
+
+def npy_body(ecg_signal, version=None):
+    """.npy float32 body + headers (format version chosen by NumPy unless given)"""
+    buffer = io.BytesIO()
+    np.lib.format.write_array(buffer, ecg_signal.astype('<f4'), version=version)
+    return buffer.getvalue(), {'Content-Type': 'application/x-npy'}
+
+
+def test_binary_matches_json():
+    """Binary bodies must give the same beats as the JSON body"""
+    print("=" * 80)
+    print("BINARY UPLOAD: /api/ecg/beats JSON vs binary")
+    print("=" * 80)
+
+    ecg_data = generate_test_ecg()
+
+    json_response = requests.post('http://localhost:5000/api/ecg/beats', json={
+        'ecg_signal': ecg_data.tolist()
+    })
+    if json_response.status_code != 200:
+        print(f"[FAIL] JSON status: {json_response.status_code}")
+        return
+    json_peaks = json_response.json()['r_peaks']
+
+    for name, encoder in [('float32', float32_body), ('int16', int16_body), ('npy', npy_body)]:
+        body, headers = encoder(ecg_data)
+        response = requests.post('http://localhost:5000/api/ecg/beats', data=body, headers=headers)
+
+        if response.status_code == 200:
+            peaks = response.json()['r_peaks']
+            print(f"[OK] {name}: {len(body) / 1024:.1f} KB, {len(peaks)} beats, "
+                  f"{response.json()['processing_time_ms']:.2f}ms")
+            if peaks == json_peaks:
+                print(f"[OK] {name} R-peaks match JSON upload")
+            else:
+                print(f"[WARNING] {name} R-peaks differ from JSON upload")
+        else:
+            print(f"[FAIL] {name} status: {response.status_code} - {response.text}")
+
+
+def test_binary_all_endpoints():
+    """Binary float32 body on every signal endpoint (parameters in query string)"""
+    print("\n" + "=" * 80)
+    print("BINARY UPLOAD: all signal endpoints")
+    print("=" * 80)
+
+    body, headers = float32_body(generate_test_ecg())
+
+    endpoints = [
+        ('Full Analysis', '/api/ecg/analyze?output_mode=clinical_expert'),
+        ('Beats Only', '/api/ecg/beats'),
+        ('Beat Detail', '/api/ecg/beat/2'),
+        ('Segment', '/api/ecg/segment?start_ms=0&end_ms=2000'),
+    ]
+
+    for name, path in endpoints:
+        response = requests.post(f'http://localhost:5000{path}', data=body, headers=headers)
+        if response.status_code == 200:
+            print(f"[OK] {name:<15} {response.json().get('processing_time_ms')} ms")
+        else:
+            print(f"[FAIL] {name:<15} status {response.status_code}: {response.text}")
+
+
+def test_binary_errors():
+    """Malformed binary bodies return 400 (415 for unknown .npy versions) with an error ID"""
+    print("\n" + "=" * 80)
+    print("BINARY UPLOAD: error handling")
+    print("=" * 80)
+
+    ecg_signal = generate_test_ecg()
+    body, headers = float32_body(ecg_signal)
+    counts, int16_headers = int16_body(ecg_signal)
+    npy_v3, npy_headers = npy_body(ecg_signal, version=(3, 0))
+    npy_v4 = npy_v3[:6] + bytes([4, 0]) + npy_v3[8:]
+
+    cases = [
+        ('Missing shape header', body, {'Content-Type': 'application/octet-stream'}, 400),
+        ('Truncated body', body[:1000], headers, 400),
+        ('Unsupported dtype', body, dict(headers, **{'X-ECG-Dtype': 'float64'}), 400),
+        # 16384 x (2**50 + 3) wraps around int64 to exactly 4096 * 12 elements
+        ('int64-overflowing shape', body, dict(headers, **{'X-ECG-Shape': f'16384,{2 ** 50 + 3}'}), 400),
+        ('Huge shape', body, dict(headers, **{'X-ECG-Shape': '9223372036854775807,12'}), 400),
+        ('Bad .npy', b'not a numpy file', {'Content-Type': 'application/x-npy'}, 400),
+        ('.npy format 3.0', npy_v3, npy_headers, 200),
+        ('.npy format 4.0', npy_v4, npy_headers, 415),
+    ] + [
+        (f'X-ECG-Scale {scale}', counts, dict(int16_headers, **{'X-ECG-Scale': scale}), 400)
+        for scale in ('nan', 'inf', '0', '-0.001', 'uV')
+    ]
+
+    for name, case_body, case_headers, expected in cases:
+        response = requests.post('http://localhost:5000/api/ecg/beats', data=case_body, headers=case_headers)
+        detail = response.json().get('error', 'ok')
+        if response.status_code == expected:
+            print(f"[OK] {name}: {expected} ({detail})")
+        else:
+            print(f"[FAIL] {name}: expected {expected}, got {response.status_code} ({detail})")
+
+
+if __name__ == '__main__':
+    try:
+        requests.get('http://localhost:5000/health')
+    except requests.exceptions.ConnectionError:
+        print("[ERROR] Cannot connect to server at http://localhost:5000")
+        print("Please start the Flask server first: python ecg_api.py")
+    else:
+        test_binary_matches_json()
+        test_binary_all_endpoints()
+        test_binary_errors()
@@ -0,0 +1,188 @@
+"""
+Test script for request / response compression
+
+Tests:
+1. gzip and zstd request bodies (Content-Encoding) give the same analysis as plain JSON,
+   also when sent as several concatenated gzip members / zstd frames
+2. Corrupt or truncated body -> 400, unsupported encoding -> 415, decompression bomb -> 413
+3. Responses follow Accept-Encoding above the size threshold; small ones stay plain
+"""
+
+import gzip
+import io
+import json
+import os
+import sys
+
+import requests
+import numpy as np
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from compression import BodyTooLargeError, decompress_stream
+
+
+def split_members(data, encoding, parts=3):
+    """Compress data as several concatenated gzip members / zstd frames"""
+    size = -(-len(data) // parts)
+    pieces = [data[i:i + size] for i in range(0, len(data), size)]
+    if encoding == 'zstd':
+        return b''.join(zstandard.ZstdCompressor().compress(piece) for piece in pieces)
+    return b''.join(gzip.compress(piece) for piece in pieces)
+
+
+def test_multi_member_decoding():
+    """Every member / frame is decoded, the size cap spans all of them"""
+    print("=" * 80)
+    print("COMPRESSION: concatenated gzip members / zstd frames")
+    print("=" * 80)
+
+    data = os.urandom(50_000) + b'x' * 100_000
+    encodings = ['gzip'] + (['zstd'] if zstandard is not None else [])
+
+    for encoding in encodings:
+        compressed = split_members(data, encoding)
+        decoded = decompress_stream(io.BytesIO(compressed), encoding, max_bytes=len(data), chunk_size=4096)
+        print(f"[{'OK' if decoded == data else 'FAIL'}] {encoding}: 3 members, {len(decoded):,} bytes decoded "
+              f"(expected {len(data):,})")
+
+        try:
+            decompress_stream(io.BytesIO(compressed), encoding, max_bytes=len(data) - 1, chunk_size=4096)
+            print(f"[FAIL] {encoding}: size cap not applied across members")
+        except BodyTooLargeError:
+            print(f"[OK] {encoding}: size cap applies across members")
+
+        try:
+            decompress_stream(io.BytesIO(compressed[:-10]), encoding, max_bytes=len(data))
+            print(f"[FAIL] {encoding}: truncated body accepted")
+        except BodyTooLargeError:
+            print(f"[FAIL] {encoding}: truncated body reported as too large")
+        except ValueError as e:
+            print(f"[OK] {encoding}: truncated body rejected ({e})")
+
+    try:
+        decompress_stream(io.BytesIO(gzip.compress(data) + b'trailing junk'), 'gzip', max_bytes=len(data))
+        print("[FAIL] gzip: trailing garbage accepted")
+    except ValueError as e:
+        print(f"[OK] gzip: trailing garbage rejected ({e})")
+
+
+def build_body():
+    """Unity-style JSON body (4 decimal places)"""
+    rng = np.random.default_rng(15)
+    ecg_signal = rng.standard_normal((4096, 12)) * 0.05
+    for i in range(0, 4096 - 50, 333):
+        ecg_signal[i:i+50, 1] += 1.0
+    return json.dumps({'ecg_signal': np.round(ecg_signal, 4).tolist()}).encode()
+
+
+def test_compressed_uploads():
+    """Compressed request bodies decode to the same analysis"""
+    print("\n" + "=" * 80)
+    print("COMPRESSION: gzip / zstd request bodies")
+    print("=" * 80)
+
+    body = build_body()
+    plain = requests.post('http://localhost:5000/api/ecg/beats', data=body,
+                          headers={'Content-Type': 'application/json'}).json()
+
+    encodings = [('gzip', 'gzip', gzip.compress(body)), ('gzip (3 members)', 'gzip', split_members(body, 'gzip'))]
+    if zstandard is not None:
+        encodings += [('zstd', 'zstd', zstandard.ZstdCompressor().compress(body)),
+                      ('zstd (3 frames)', 'zstd', split_members(body, 'zstd'))]
+    else:
+        print("[WARNING] zstandard not installed - zstd upload not tested")
+
+    for name, encoding, compressed in encodings:
+        response = requests.post('http://localhost:5000/api/ecg/beats', data=compressed, headers={
+            'Content-Type': 'application/json',
+            'Content-Encoding': encoding
+        })
+        if response.status_code == 200 and response.json()['r_peaks'] == plain['r_peaks']:
+            print(f"[OK] {name}: {len(body) // 1024} KB sent as {len(compressed) // 1024} KB, same R-peaks")
+        else:
+            print(f"[FAIL] {name}: status {response.status_code}")
+
+
+def test_rejected_uploads():
+    """Corrupt, unsupported and oversized bodies"""
+    print("\n" + "=" * 80)
+    print("COMPRESSION: rejected request bodies")
+    print("=" * 80)
+
+    cases = [
+        ('Corrupt gzip', b'\x1f\x8b\x08\x00garbage', 'gzip', 400),
+        ('Truncated gzip', gzip.compress(build_body())[:-10], 'gzip', 400),
+        ('Unsupported encoding', build_body(), 'br', 415),
+        # 64 MB of spaces compresses to ~64 KB - must stop at the decompressed size limit
+        ('Decompression bomb', gzip.compress(b' ' * (64 * 1024 * 1024), 9), 'gzip', 413),
+    ]
+
+    if zstandard is not None:
+        cases += [
+            ('Truncated zstd', zstandard.ZstdCompressor().compress(build_body())[:-10], 'zstd', 400),
+            ('zstd decompression bomb', zstandard.ZstdCompressor(level=19).compress(b' ' * (64 * 1024 * 1024)),
+             'zstd', 413),
+        ]
+
+    for name, data, encoding, expected in cases:
+        response = requests.post('http://localhost:5000/api/ecg/analyze', data=data, headers={
+            'Content-Type': 'application/json',
+            'Content-Encoding': encoding
+        })
+        error_id = response.json().get('error_id') if response.headers.get('Content-Type') == 'application/json' else None
+
+        if response.status_code == expected and error_id:
+            print(f"[OK] {name}: {response.status_code} ({error_id})")
+        else:
+            print(f"[FAIL] {name}: expected {expected}, got {response.status_code}")
+
+
+def test_response_compression():
+    """Accept-Encoding negotiation and the size threshold"""
+    print("\n" + "=" * 80)
+    print("COMPRESSION: response negotiation")
+    print("=" * 80)
+
+    body = build_body()
+    for accept in ['gzip', 'zstd', 'identity']:
+        if accept == 'zstd' and zstandard is None:
+            continue
+
+        response = requests.post('http://localhost:5000/api/ecg/analyze', data=body, stream=True, headers={
+            'Content-Type': 'application/json',
+            'Accept-Encoding': accept
+        })
+        wire_bytes = len(response.raw.read(decode_content=False))
+        content_encoding = response.headers.get('Content-Encoding')
+
+        expected = None if accept == 'identity' else accept
+        if content_encoding == expected and 'Accept-Encoding' in response.headers.get('Vary', ''):
+            print(f"[OK] Accept-Encoding: {accept} -> {content_encoding or 'identity'} ({wire_bytes} bytes)")
+        else:
+            print(f"[FAIL] Accept-Encoding: {accept} -> {content_encoding}")
+
+    response = requests.get('http://localhost:5000/health', headers={'Accept-Encoding': 'gzip'})
+    if 'Content-Encoding' not in response.headers:
+        print(f"[OK] Small /health response ({len(response.content)} bytes) not compressed")
+    else:
+        print("[FAIL] Small response was compressed")
+
+
+if __name__ == '__main__':
+    test_multi_member_decoding()
+
+    try:
+        requests.get('http://localhost:5000/health')
+    except requests.exceptions.ConnectionError:
+        print("[ERROR] Cannot connect to server at http://localhost:5000")
+        print("Please start the Flask server first: python ecg_api.py")
+    else:
+        test_compressed_uploads()
+        test_rejected_uploads()
+        test_response_compression()
@@ -0,0 +1,146 @@
+"""
+Test script for P/QRS/T delineation (beat_delineation.py)
+
+Tests:
+1. Landmarks on a synthetic ECG with known P, QRS and T positions
+2. Beats without P waves and beats with a wide QRS get the matching annotation
+3. Delineating one beat gives the same result as delineating all of them
+4. /api/ecg/beat/<index> reports the delineated intervals
+"""
+
+import os
+import sys
+
+import requests
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from beat_delineation import delineate_beats, beat_details
+
+FS = 400
+
+# Ground truth relative to the R-peak, in samples at 400 Hz
+P_CENTER = -64        # 160 ms before R
+T_CENTER = 112        # 280 ms after R
+
+
+def generate_beats(heart_rate=70, p_wave=True, qrs_width_s=0.012, seed=22):
+    """12-lead ECG of Gaussian P, QRS and T waves at known positions"""
+    rng = np.random.default_rng(seed)
+    num_samples = 4096
+    t = np.arange(num_samples) / FS
+    r_peaks_s = np.arange(0.5, num_samples / FS - 0.6, 60 / heart_rate)
+
+    def wave(center_s, width_s, amplitude):
+        return amplitude * np.exp(-((t - center_s) ** 2) / (2 * width_s ** 2))
+
+    lead = np.zeros(num_samples)
+    for r_s in r_peaks_s:
+        lead += wave(r_s, qrs_width_s, 1.0) + wave(r_s - 0.025, 0.008, -0.1) + wave(r_s + 0.03, 0.01, -0.15)
+        lead += wave(r_s + T_CENTER / FS, 0.045, 0.3)
+        if p_wave:
+            lead += wave(r_s + P_CENTER / FS, 0.022, 0.15)
+
+    ecg_signal = np.repeat(lead[:, None], 12, axis=1)
+    ecg_signal += rng.standard_normal(ecg_signal.shape) * 0.01 + 0.05 * np.sin(2 * np.pi * 0.3 * t)[:, None]
+    return ecg_signal.astype(np.float32), np.round(r_peaks_s * FS).astype(np.int64)
+
+
+def test_known_landmarks():
+    """P and T peaks within 10 ms, intervals in physiological range"""
+    print("=" * 80)
+    print("DELINEATION: landmarks on a synthetic ECG")
+    print("=" * 80)
+
+    ecg_signal, r_peaks = generate_beats()
+    delineation = delineate_beats(ecg_signal, r_peaks, 'II', FS)
+
+    p_error = np.abs(delineation['p_peak'] - r_peaks - P_CENTER)
+    t_error = np.abs(delineation['t_peak'] - r_peaks - T_CENTER)
+    print(f"Beats: {len(r_peaks)}, leads: {delineation['leads']}, "
+          f"per-lead landmarks: {delineation['lead_landmarks']['p_peak'].shape}")
+    print(f"[{'OK' if np.all(p_error <= 4) else 'FAIL'}] P peak error max {p_error.max():.1f} samples")
+    print(f"[{'OK' if np.all(t_error <= 4) else 'FAIL'}] T peak error max {t_error.max():.1f} samples")
+
+    checks = [
+        ('PR interval 120-200 ms', delineation['pr_interval_ms'], 120, 200),
+        ('QRS duration 50-110 ms', delineation['qrs_duration_ms'], 50, 110),
+        ('QT interval 350-480 ms', delineation['qt_interval_ms'], 350, 480)
+    ]
+    for name, values, low, high in checks:
+        ok = np.all((values >= low) & (values <= high))
+        print(f"[{'OK' if ok else 'FAIL'}] {name}: {np.round(values[:3], 1)} ...")
+
+    normal = set(delineation['annotations']) == {'Normal sinus beat'}
+    print(f"[{'OK' if normal else 'FAIL'}] Annotations: {sorted(set(delineation['annotations']))}")
+
+
+def test_abnormal_beats():
+    """Missing P waves and wide QRS complexes are reported"""
+    print("\n" + "=" * 80)
+    print("DELINEATION: missing P wave, wide QRS")
+    print("=" * 80)
+
+    ecg_signal, r_peaks = generate_beats(p_wave=False)
+    details = beat_details(delineate_beats(ecg_signal, r_peaks, 'II', FS), include_samples=False)
+    no_p = all(detail['waveform']['p_wave']['peak'] is None and detail['intervals']['pr_interval_ms'] is None
+               for detail in details)
+    print(f"[{'OK' if no_p else 'FAIL'}] No P wave: {details[1]['annotations']}")
+
+    ecg_signal, r_peaks = generate_beats(qrs_width_s=0.03)
+    delineation = delineate_beats(ecg_signal, r_peaks, 'II', FS)
+    wide = np.all(delineation['qrs_duration_ms'] > 120)
+    print(f"[{'OK' if wide else 'FAIL'}] Wide QRS ({delineation['qrs_duration_ms'][1]:.1f} ms): "
+          f"{delineation['annotations'][1]}")
+
+
+def test_single_beat_matches_batch():
+    """beat_indices=[i] uses the same neighbours, so it matches the full run"""
+    print("\n" + "=" * 80)
+    print("DELINEATION: single beat vs all beats")
+    print("=" * 80)
+
+    ecg_signal, r_peaks = generate_beats(heart_rate=95)
+    all_beats = beat_details(delineate_beats(ecg_signal, r_peaks, 'II', FS), include_samples=False)
+    singles = [
+        beat_details(delineate_beats(ecg_signal, r_peaks, 'II', FS, beat_indices=[index]), include_samples=False)[0]
+        for index in range(len(r_peaks))
+    ]
+    print(f"[{'OK' if singles == all_beats else 'FAIL'}] {len(r_peaks)} beats identical")
+
+
+def test_beat_endpoint():
+    """/api/ecg/beat/<index> returns delineated landmarks and QTc"""
+    print("\n" + "=" * 80)
+    print("DELINEATION: /api/ecg/beat/<index>")
+    print("=" * 80)
+
+    ecg_signal, r_peaks = generate_beats()
+    ecg_signal *= np.random.default_rng().uniform(0.95, 1.05)  # Fresh result-cache key
+    response = requests.post('http://localhost:5000/api/ecg/beat/2', json={'ecg_signal': ecg_signal.tolist()})
+    if response.status_code != 200:
+        print(f"[FAIL] Status: {response.status_code} - {response.text}")
+        return
+
+    result = response.json()
+    p_peak = result['waveform']['p_wave']['peak']
+    offset = None if p_peak is None else p_peak - result['r_peak_sample']
+    print(f"Intervals: {result['intervals']}")
+    print(f"[{'OK' if offset is not None and abs(offset - P_CENTER) <= 8 else 'FAIL'}] "
+          f"P peak {offset} samples from the R-peak (expected ~{P_CENTER})")
+    print(f"[{'OK' if result['intervals'].get('qtc_interval_ms') else 'FAIL'}] QTc reported")
+
+
+if __name__ == '__main__':
+    test_known_landmarks()
+    test_abnormal_beats()
+    test_single_beat_matches_batch()
+
+    try:
+        requests.get('http://localhost:5000/health')
+    except requests.exceptions.ConnectionError:
+        print("[ERROR] Cannot connect to server at http://localhost:5000")
+        print("Please start the Flask server first: python ecg_api.py")
+    else:
+        test_beat_endpoint()
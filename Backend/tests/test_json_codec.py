@@ -0,0 +1,98 @@
+"""
+Test script for the fast JSON codec (json_codec.py)
+
+Tests:
+1. NumPy arrays / scalars (contiguous, strided, int16/float32) serialize like .tolist()
+2. /api/ecg/beats and /api/ecg/beat/<i> responses parse with the expected array shapes
+3. Ragged ecg_signal bodies are rejected with 400
+4. NaN / Infinity tokens parse as with the stdlib; a few NaN samples are still accepted
+"""
+
+import json
+import os
+import sys
+
+import requests
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json_codec
+
+
+def test_numpy_serialization():
+    """Encoded NumPy values round-trip to the same numbers as .tolist()"""
+    print("=" * 80)
+    print(f"JSON CODEC: NumPy serialization ({'orjson' if json_codec.HAS_ORJSON else 'stdlib'})")
+    print("=" * 80)
+
+    signal = np.random.default_rng(14).standard_normal((64, 12)).astype(np.float32)
+    payload = {
+        'contiguous': signal,
+        'strided_lead': signal[:, 1],
+        'int_peaks': np.array([10, 250, 490], dtype=np.int64),
+        'int16': np.array([-3, 7], dtype=np.int16),
+        'scalar': np.float32(0.25),
+        'flag': np.bool_(True),
+        'stats': {1: 2}
+    }
+
+    decoded = json.loads(json_codec.dumps(payload))
+
+    checks = [
+        ('2-D float32 array', np.allclose(decoded['contiguous'], signal.tolist())),
+        ('Strided column', np.allclose(decoded['strided_lead'], signal[:, 1].tolist())),
+        ('int64 / int16 arrays', decoded['int_peaks'] == [10, 250, 490] and decoded['int16'] == [-3, 7]),
+        ('NumPy scalars', decoded['scalar'] == 0.25 and decoded['flag'] is True),
+        ('Integer dict keys', decoded['stats'] == {'1': 2})
+    ]
+
+    special = json_codec.loads(b'[NaN, Infinity, -Infinity, 1.5]')
+    checks.append(('NaN / Infinity tokens', np.isnan(special[0]) and special[1:] == [float('inf'), float('-inf'), 1.5]))
+    for name, passed in checks:
+        print(f"[{'OK' if passed else 'FAIL'}] {name}")
+
+
+def test_endpoint_arrays():
+    """Array fields that are now serialized straight from NumPy"""
+    print("\n" + "=" * 80)
+    print("JSON CODEC: /api/ecg/beats and /api/ecg/beat/<i> arrays")
+    print("=" * 80)
+
+    ecg_signal = np.random.default_rng(15).standard_normal((4096, 12)) * 0.05
+    for i in range(0, 4096 - 50, 333):
+        ecg_signal[i:i+50, 1] += 1.0
+    body = {'ecg_signal': ecg_signal.tolist()}
+
+    beats = requests.post('http://localhost:5000/api/ecg/beats', json=body).json()
+    if isinstance(beats.get('r_peaks'), list) and all(isinstance(p, int) for p in beats['r_peaks']):
+        print(f"[OK] r_peaks: {len(beats['r_peaks'])} integers")
+    else:
+        print(f"[FAIL] r_peaks: {beats.get('r_peaks')}")
+
+    beat = requests.post('http://localhost:5000/api/ecg/beat/2', json=body)
+    if beat.status_code == 200 and len(beat.json()['raw_samples']) > 0:
+        print(f"[OK] raw_samples: {len(beat.json()['raw_samples'])} values ({len(beat.content)} bytes)")
+    else:
+        print(f"[FAIL] Status: {beat.status_code}")
+
+    ecg_signal[100:110, 3] = np.nan
+    response = requests.post('http://localhost:5000/api/ecg/beats', data=json.dumps({'ecg_signal': ecg_signal.tolist()}),
+                             headers={'Content-Type': 'application/json'})
+    print(f"[{'OK' if response.status_code == 200 else 'FAIL'}] ecg_signal with NaN samples: {response.status_code}")
+
+    ragged = requests.post('http://localhost:5000/api/ecg/beats', json={'ecg_signal': [[1, 2], [3]]})
+    print(f"[{'OK' if ragged.status_code == 400 else 'FAIL'}] Ragged ecg_signal: {ragged.status_code} "
+          f"- {ragged.json().get('error')}")
+
+
+if __name__ == '__main__':
+    test_numpy_serialization()
+
+    try:
+        requests.get('http://localhost:5000/health')
+    except requests.exceptions.ConnectionError:
+        print("[ERROR] Cannot connect to server at http://localhost:5000")
+        print("Please start the Flask server first: python ecg_api.py")
+    else:
+        test_endpoint_arrays()
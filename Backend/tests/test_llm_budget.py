@@ -0,0 +1,221 @@
+"""
+Test script for the LLM latency budget on /api/ecg/analyze
+
+Serves ecg_api in-process (Flask test client) with a stand-in Claude client
+that answers after a fixed delay, so deadlines can be exercised without an
+API key.
+
+Tests:
+1. A slow LLM call past llm_budget_ms returns the mode's fallback with
+   interpretation_source "fallback" and an interpretation_job_id
+2. The call finishes in the background: the job holds the Claude answer and
+   the next request in the same bucket is a cache hit
+3. A budget longer than the call returns the Claude interpretation
+4. llm_budget_ms=0 waits for the call; a failing job gets the fallback;
+   invalid budgets are rejected
+5. With the job store full, budgeted and async_interpretation requests
+   both keep their signal analysis and get the fallback
+6. A fallback after an API error is not cached: the next request retries
+   Claude and is not reported as a cache hit
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ['LLM_CACHE_DB'] = ''  # Keep stand-in responses off disk
+
+LLM_LATENCY_S = 1.0
+
+
+class SlowLLMClient:
+    """Stands in for the Anthropic client: fixed latency, canned JSON interpretation"""
+
+    def __init__(self, latency_s):
+        self.latency_s = latency_s
+        self.fail = False
+        self.calls = 0
+        self._lock = threading.Lock()
+        self.messages = self
+
+    def create(self, **kwargs):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.latency_s)
+        if self.fail:
+            raise RuntimeError('Stand-in API error')
+        text = json.dumps({'summary': 'Stand-in Claude interpretation'})
+        return SimpleNamespace(content=[SimpleNamespace(text=text)])
+
+
+def generate_test_ecg(seed, heart_rate=72):
+    """Synthetic ECG with regular R-peaks; heart_rate selects the condition bucket"""
+    rng = np.random.default_rng(seed)
+    ecg_signal = rng.standard_normal((4096, 12)) * 0.05
+
+    rr_interval_samples = int(60 / heart_rate * 400)
+    for i in range(0, 4096 - 50, rr_interval_samples):
+        ecg_signal[i:i+50, 1] += 1.0
+
+    return ecg_signal.tolist()
+
+
+_server = {}
+
+
+def in_process_server():
+    """ecg_api with admission control off and the slow stand-in client (built once)"""
+    if not _server:
+        import ecg_api
+
+        ecg_api.initialize()
+        ecg_api.admission.enabled = False
+        _server['stub'] = SlowLLMClient(LLM_LATENCY_S)
+        ecg_api.clinical_llm.client = _server['stub']
+        _server['ecg_api'] = ecg_api
+        _server['client'] = ecg_api.app.test_client()
+    return _server['ecg_api'], _server['client'], _server['stub']
+
+
+def analyze(client, seed, heart_rate, **fields):
+    """POST /api/ecg/analyze, return (response json, elapsed ms)"""
+    start = time.perf_counter()
+    response = client.post('/api/ecg/analyze', json={
+        'ecg_signal': generate_test_ecg(seed, heart_rate), 'output_mode': 'clinical_expert', **fields
+    })
+    return response.status_code, response.get_json(), (time.perf_counter() - start) * 1000
+
+
+def test_deadline():
+    """Fallback at the deadline, background completion fills the cache"""
+    ecg_api, client, stub = in_process_server()
+    print("=" * 80)
+    print("LLM BUDGET: deadline, fallback, background completion")
+    print("=" * 80)
+
+    ecg_api.llm_cache.clear()
+    status, result, elapsed_ms = analyze(client, 1, 72, llm_budget_ms=200)
+    source = result.get('interpretation_source')
+    job_id = result.get('interpretation_job_id')
+    fallback = ecg_api.clinical_llm.get_clinical_expert_fallback(
+        result['top_condition'], result['confidence'], result['heart_rate'], result['region_health'])
+
+    print(f"Status {status}, {elapsed_ms:.0f}ms, source={source}, job={job_id}")
+    print(f"[{'OK' if source == 'fallback' and job_id else 'FAIL'}] Deadline passed -> fallback + job id")
+    print(f"[{'OK' if result['llm_interpretation'] == fallback else 'FAIL'}] clinical_expert fallback returned")
+    print(f"[{'OK' if elapsed_ms < LLM_LATENCY_S * 1000 else 'FAIL'}] Answered before the LLM call finished")
+
+    job = ecg_api.interpretation_jobs.wait(job_id, timeout=5)
+    background = (job['result'] or {}).get('llm_interpretation', {})
+    print(f"[{'OK' if job['status'] == 'complete' and background.get('summary') == 'Stand-in Claude interpretation' else 'FAIL'}] "
+          f"Background call completed ({job['status']}, {job['elapsed_ms']:.0f}ms)")
+
+    calls_before = stub.calls
+    status, result, elapsed_ms = analyze(client, 2, 72, llm_budget_ms=200)
+    print(f"[{'OK' if result['interpretation_source'] == 'cache' and stub.calls == calls_before else 'FAIL'}] "
+          f"Next request in the bucket: {result['interpretation_source']} in {elapsed_ms:.0f}ms, no new LLM call")
+
+
+def test_within_budget():
+    """Budgets longer than the call, disabled budgets, invalid budgets"""
+    ecg_api, client, stub = in_process_server()
+    print("\n" + "=" * 80)
+    print("LLM BUDGET: within budget, disabled, invalid")
+    print("=" * 80)
+
+    ecg_api.llm_cache.clear()
+    status, result, elapsed_ms = analyze(client, 3, 72, llm_budget_ms=5000)
+    print(f"[{'OK' if result['interpretation_source'] == 'claude' and result['interpretation_job_id'] is None else 'FAIL'}] "
+          f"5000ms budget: {result['interpretation_source']} in {elapsed_ms:.0f}ms")
+
+    ecg_api.llm_cache.clear()
+    status, result, elapsed_ms = analyze(client, 4, 72, llm_budget_ms=0)
+    print(f"[{'OK' if result['interpretation_source'] == 'claude' and elapsed_ms >= LLM_LATENCY_S * 1000 else 'FAIL'}] "
+          f"llm_budget_ms=0 waits: {result['interpretation_source']} in {elapsed_ms:.0f}ms")
+
+    # An interpretation job that raises (not an API error, which analyze_with_source handles)
+    ecg_api.llm_cache.clear()
+    analyze_with_source = ecg_api.clinical_llm.analyze_with_source
+    ecg_api.clinical_llm.analyze_with_source = lambda *args, **kwargs: 1 / 0
+    try:
+        status, result, elapsed_ms = analyze(client, 6, 72, llm_budget_ms=5000)
+    finally:
+        ecg_api.clinical_llm.analyze_with_source = analyze_with_source
+    ok = (status == 200 and result['interpretation_source'] == 'fallback'
+          and result['llm_interpretation'] is not None and result['interpretation_job_id'] is None)
+    print(f"[{'OK' if ok else 'FAIL'}] Failed job -> {result['interpretation_source']} in {elapsed_ms:.0f}ms")
+
+    for budget in (-1, 'soon'):
+        status, result, _ = analyze(client, 5, 72, llm_budget_ms=budget)
+        print(f"[{'OK' if status == 400 else 'FAIL'}] llm_budget_ms={budget!r}: {status} - {result.get('error')}")
+
+
+def test_job_store_full():
+    """No queue slot: signal analysis plus the fallback, budgeted or async"""
+    ecg_api, client, stub = in_process_server()
+    print("\n" + "=" * 80)
+    print("LLM BUDGET: interpretation job store full")
+    print("=" * 80)
+
+    ecg_api.llm_cache.clear()
+    max_jobs = ecg_api.interpretation_jobs.max_jobs
+    ecg_api.interpretation_jobs.max_jobs = 0
+    try:
+        calls_before = stub.calls
+        status, result, elapsed_ms = analyze(client, 7, 72, llm_budget_ms=5000)
+        ok = (status == 200 and result['interpretation_source'] == 'fallback'
+              and result['interpretation_job_id'] is None and stub.calls == calls_before)
+        print(f"[{'OK' if ok else 'FAIL'}] Budgeted request -> {result['interpretation_source']} "
+              f"in {elapsed_ms:.0f}ms, no LLM call")
+
+        response = client.post('/api/ecg/analyze', json={
+            'ecg_signal': generate_test_ecg(8, 72), 'async_interpretation': True
+        })
+        body = response.get_json()
+        ok = (response.status_code == 200 and body.get('interpretation_source') == 'fallback'
+              and body.get('llm_interpretation') and body.get('interpretation_job_id') is None
+              and body.get('predictions') and stub.calls == calls_before)
+        print(f"[{'OK' if ok else 'FAIL'}] Async request -> {response.status_code}, "
+              f"{body.get('interpretation_source')} with the signal analysis")
+    finally:
+        ecg_api.interpretation_jobs.max_jobs = max_jobs
+
+
+def test_fallback_not_cached():
+    """API errors give the fallback, and the next request in the bucket calls Claude again"""
+    ecg_api, client, stub = in_process_server()
+    print("\n" + "=" * 80)
+    print("LLM BUDGET: fallbacks are not cached")
+    print("=" * 80)
+
+    ecg_api.llm_cache.clear()
+    calls_before = stub.calls
+    stub.fail = True
+    try:
+        results = [analyze(client, seed, 72, llm_budget_ms=5000)[1] for seed in (9, 10)]
+    finally:
+        stub.fail = False
+
+    for attempt, result in enumerate(results, 1):
+        cache_hit = result['metadata']['cache_hit']
+        ok = result['interpretation_source'] == 'fallback' and cache_hit is False
+        print(f"[{'OK' if ok else 'FAIL'}] Request {attempt}: {result['interpretation_source']}, cache_hit={cache_hit}")
+    print(f"[{'OK' if stub.calls - calls_before == 2 else 'FAIL'}] Claude retried ({stub.calls - calls_before} calls)")
+
+    status, result, elapsed_ms = analyze(client, 11, 72, llm_budget_ms=5000)
+    print(f"[{'OK' if result['interpretation_source'] == 'claude' else 'FAIL'}] After recovery: "
+          f"{result['interpretation_source']} in {elapsed_ms:.0f}ms")
+
+
+if __name__ == '__main__':
+    test_deadline()
+    test_within_budget()
+    test_job_store_full()
+    test_fallback_not_cached()
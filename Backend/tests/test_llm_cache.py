@@ -0,0 +1,239 @@
+"""
+Test script for the LLM response cache
+
+Tests:
+1. Different recordings in the same (condition, confidence bucket, mode) share one interpretation
+2. Different output modes do not share entries
+3. GET /api/cache/stats - accurate hits/misses, TTL and size bounds
+4. POST /api/cache/clear - returns previous stats and resets counters
+5. Concurrent misses on one key share a single LLM call (single-flight)
+6. A burst of /api/ecg/analyze requests in one bucket makes one LLM call
+"""
+
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from llm_cache import LLMResponseCache
+
+
+def generate_test_ecg(seed):
+    """Generate synthetic ECG with regular R-peaks (72 BPM) and seed-dependent noise"""
+    rng = np.random.default_rng(seed)
+    ecg_signal = rng.standard_normal((4096, 12)) * 0.05
+
+    rr_interval_samples = int(60 / 72 * 400)
+    for i in range(0, 4096, rr_interval_samples):
+        if i + 50 < 4096:
+            ecg_signal[i:i+50, 1] += 1.0
+
+    return ecg_signal
+
+
+def analyze(seed, output_mode='clinical_expert'):
+    """POST /api/ecg/analyze and return (top_condition, confidence, cache_hit, interpretation_source)"""
+    response = requests.post('http://localhost:5000/api/ecg/analyze', json={
+        'ecg_signal': generate_test_ecg(seed).tolist(),
+        'output_mode': output_mode
+    })
+    result = response.json()
+    return result['top_condition'], result['confidence'], result['metadata']['cache_hit'], \
+        result['interpretation_source']
+
+
+def test_semantic_key_sharing():
+    """Same bucket, different recordings"""
+    print("=" * 80)
+    print("LLM CACHE: semantic key sharing")
+    print("=" * 80)
+
+    requests.post('http://localhost:5000/api/cache/clear')
+
+    print(f"{'Request':<32} {'Condition':<22} {'Conf':<7} {'Cache hit':<9}")
+    print("-" * 72)
+    outcomes = []
+    for label, seed, output_mode in [
+        ('recording A, clinical_expert', 1, 'clinical_expert'),
+        ('recording B, clinical_expert', 2, 'clinical_expert'),
+        ('recording A, patient_education', 1, 'patient_education'),
+    ]:
+        top_condition, confidence, cache_hit, source = analyze(seed, output_mode)
+        outcomes.append((top_condition, round(confidence, 1), cache_hit, source))
+        print(f"{label:<32} {top_condition:<22} {confidence:<7} {str(cache_hit):<9}")
+
+    if outcomes[0][2]:
+        print("[FAIL] First request reported a cache hit")
+    else:
+        print("[OK] First request was a miss")
+
+    if outcomes[0][3] == 'fallback':
+        # No working API key: fallbacks are never cached, so every request misses
+        print("[WARNING] Claude unavailable (fallback interpretations) - sharing not exercised")
+        ok = not any(outcome[2] for outcome in outcomes) and outcomes[1][3] == 'fallback'
+        print(f"[{'OK' if ok else 'FAIL'}] Fallback interpretations were not served from the cache")
+    elif outcomes[0][:2] == outcomes[1][:2]:
+        if outcomes[1][2]:
+            print("[OK] Second recording in the same bucket hit the cache")
+        else:
+            print("[FAIL] Second recording in the same bucket missed")
+    else:
+        print("[WARNING] Recordings landed in different buckets - sharing not exercised")
+
+    if not outcomes[2][2]:
+        print("[OK] Different output mode missed")
+    else:
+        print("[FAIL] Different output mode reported a hit")
+
+
+def test_cache_stats_and_clear():
+    """Stats accuracy and clear"""
+    print("\n" + "=" * 80)
+    print("LLM CACHE: stats and clear")
+    print("=" * 80)
+
+    stats = requests.get('http://localhost:5000/api/cache/stats').json()
+    print(f"cache_stats: {stats['cache_stats']}")
+    print(f"llm_cache: {stats['llm_cache']}")
+
+    if stats['cache_stats']['total_requests'] == 3 and stats['llm_cache']['entries'] >= 1:
+        print("[OK] Hit/miss counters match the 3 requests")
+    else:
+        print("[WARNING] Unexpected counters (server shared with other clients?)")
+
+    response = requests.post('http://localhost:5000/api/cache/clear').json()
+    after = requests.get('http://localhost:5000/api/cache/stats').json()
+    if response['previous_stats']['total_requests'] >= 3 and after['llm_cache']['entries'] == 0:
+        print("[OK] Clear returned previous stats and emptied the cache")
+    else:
+        print("[FAIL] Clear did not reset the cache")
+
+
+def test_concurrent_misses_coalesce():
+    """16 threads miss the same key while the first LLM call is still running"""
+    print("\n" + "=" * 80)
+    print("LLM CACHE: single-flight on concurrent misses")
+    print("=" * 80)
+
+    cache = LLMResponseCache(max_entries=8, ttl_seconds=60)
+    calls = []
+    barrier = threading.Barrier(16)
+
+    def slow_llm():
+        calls.append(threading.get_ident())
+        time.sleep(0.3)
+        return {'summary': 'shared'}, True
+
+    def worker(_):
+        barrier.wait()
+        return cache.get_or_compute('AFIB:0.8:clinical_expert', slow_llm, 'clinical_expert', 'v1')
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        results = list(pool.map(worker, range(16)))
+
+    sources = [source for _, source, _ in results]
+    stats = cache.get_stats()
+    print(f"LLM calls: {len(calls)}, sources: computed={sources.count('computed')} "
+          f"coalesced={sources.count('coalesced')} cache={sources.count('cache')}")
+    print(f"[{'OK' if len(calls) == 1 else 'FAIL'}] One LLM call for 16 concurrent callers")
+    print(f"[{'OK' if all(value is results[0][0] for value, _, _ in results) else 'FAIL'}] All callers got its result")
+    print(f"[{'OK' if stats['coalesced'] == sources.count('coalesced') and stats['in_flight'] == 0 else 'FAIL'}] "
+          f"Stats: computations={stats['computations']}, coalesced={stats['coalesced']}, in_flight={stats['in_flight']}")
+
+    _, source, _ = cache.get_or_compute('AFIB:0.8:patient_education', slow_llm, 'patient_education', 'v1')
+    print(f"[{'OK' if source == 'computed' and len(calls) == 2 else 'FAIL'}] Another key is a separate call")
+
+    def failing_llm():
+        raise RuntimeError('API down')
+
+    errors = []
+    def failing_worker(_):
+        try:
+            cache.get_or_compute('HCM:0.5:clinical_expert', lambda: (time.sleep(0.2), failing_llm()), 'clinical_expert')
+        except RuntimeError as e:
+            errors.append(str(e))
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(failing_worker, range(4)))
+    print(f"[{'OK' if len(errors) == 4 and cache.get_stats()['in_flight'] == 0 else 'FAIL'}] "
+          f"Errors reach every waiting caller ({len(errors)}/4), nothing left in flight")
+
+    fallback_calls = []
+    def fallback_llm():
+        fallback_calls.append(1)
+        return {'summary': 'canned fallback'}, False
+
+    outcomes = [cache.get_or_compute('LBBB:0.6:clinical_expert', fallback_llm, 'clinical_expert', 'v1')[1:]
+                for _ in range(2)]
+    ok = (outcomes == [('computed', False)] * 2 and len(fallback_calls) == 2
+          and not cache.contains('LBBB:0.6:clinical_expert', 'v1'))
+    print(f"[{'OK' if ok else 'FAIL'}] Non-cacheable results are not stored: {outcomes}, {len(fallback_calls)} calls")
+
+
+def coalesced_waiters_metric():
+    """Current ecg_coalesced_waiters_total{call="llm"} from /metrics"""
+    for line in requests.get('http://localhost:5000/metrics').text.splitlines():
+        if line.startswith('ecg_coalesced_waiters_total{call="llm"}'):
+            return float(line.split()[-1])
+    return 0.0
+
+
+def test_analyze_burst():
+    """8 simultaneous recordings in one cache bucket -> one LLM call"""
+    print("\n" + "=" * 80)
+    print("LLM CACHE: burst of identical cache keys via /api/ecg/analyze")
+    print("=" * 80)
+
+    requests.post('http://localhost:5000/api/cache/clear')
+    waiters_before = coalesced_waiters_metric()
+
+    def worker(index):
+        response = requests.post('http://localhost:5000/api/ecg/analyze', json={
+            'ecg_signal': generate_test_ecg(100 + index).tolist(),
+            'output_mode': 'clinical_expert'
+        }, headers={'X-Client-ID': f'student-{index}'})
+        return response.json()
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(worker, range(8)))
+
+    keys = {(result['top_condition'], round(result['confidence'], 1)) for result in results}
+    llm_stats = requests.get('http://localhost:5000/api/cache/stats').json()['llm_cache']
+    waiters = coalesced_waiters_metric() - waiters_before
+
+    print(f"Buckets: {keys}")
+    print(f"computations={llm_stats['computations']}, coalesced={llm_stats['coalesced']}, "
+          f"metric delta={waiters:g}")
+    if len(keys) != 1:
+        print("[WARNING] Recordings fell into different buckets")
+    elif any(result['interpretation_source'] == 'fallback' for result in results):
+        # Failed calls are shared with their waiters but not cached, so late arrivals call again
+        print("[WARNING] Claude unavailable (fallback interpretations) - single call not exercised")
+        hits = sum(result['metadata']['cache_hit'] for result in results)
+        print(f"[{'OK' if hits == 0 else 'FAIL'}] No fallback reported as a cache hit ({hits}/8)")
+        print(f"[{'OK' if waiters == llm_stats['coalesced'] else 'FAIL'}] "
+              f"ecg_coalesced_waiters_total matches the coalesced count")
+    else:
+        print(f"[{'OK' if llm_stats['computations'] == 1 else 'FAIL'}] One LLM call for 8 requests")
+        print(f"[{'OK' if waiters == llm_stats['coalesced'] else 'FAIL'}] "
+              f"ecg_coalesced_waiters_total matches the coalesced count")
+
+
+if __name__ == '__main__':
+    test_concurrent_misses_coalesce()
+
+    try:
+        requests.get('http://localhost:5000/health')
+    except requests.exceptions.ConnectionError:
+        print("[ERROR] Cannot connect to server at http://localhost:5000")
+        print("Please start the Flask server first: python ecg_api.py")
+    else:
+        test_semantic_key_sharing()
+        test_cache_stats_and_clear()
+        test_analyze_burst()
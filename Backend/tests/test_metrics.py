@@ -0,0 +1,124 @@
+"""
+Test script for the Prometheus-style /metrics endpoint
+
+Tests:
+1. Stage histograms (validation, model prediction, heart rate, region mapping,
+   LLM interpretation) and total request time grow with each analyze request
+2. Replayed recording counts result-cache hits
+3. Rejected signal increments ecg_error_ids_total
+4. Histogram buckets are cumulative and _count matches the +Inf bucket
+"""
+
+import re
+
+import requests
+import numpy as np
+
+
+def generate_test_ecg(seed):
+    """Generate synthetic ECG with regular R-peaks (72 BPM)"""
+    rng = np.random.default_rng(seed)
+    ecg_signal = rng.standard_normal((4096, 12)) * 0.05
+
+    rr_interval_samples = int(60 / 72 * 400)
+    for i in range(0, 4096, rr_interval_samples):
+        if i + 50 < 4096:
+            ecg_signal[i:i+50, 1] += 1.0
+
+    return ecg_signal
+
+
+def scrape():
+    """GET /metrics and parse it into {series: value}"""
+    response = requests.get('http://localhost:5000/metrics')
+    series = {}
+    for line in response.text.splitlines():
+        if line and not line.startswith('#'):
+            name, value = line.rsplit(' ', 1)
+            series[name] = float(value)
+    return response, series
+
+
+def test_stage_histograms():
+    """One analyze request adds one observation per stage"""
+    print("=" * 80)
+    print("METRICS: per-stage latency histograms")
+    print("=" * 80)
+
+    response, before = scrape()
+    if response.status_code != 200 or not response.headers['Content-Type'].startswith('text/plain'):
+        print(f"[FAIL] /metrics status {response.status_code}, type {response.headers.get('Content-Type')}")
+        return
+    print("[OK] /metrics returns text exposition format")
+
+    ecg_signal = generate_test_ecg(1201).tolist()
+    requests.post('http://localhost:5000/api/ecg/analyze', json={'ecg_signal': ecg_signal})
+    requests.post('http://localhost:5000/api/ecg/analyze', json={'ecg_signal': ecg_signal})
+
+    _, after = scrape()
+
+    for stage in ['validation', 'model_prediction', 'heart_rate_analysis', 'region_mapping', 'llm_interpretation']:
+        series = f'ecg_stage_duration_seconds_count{{stage="{stage}"}}'
+        added = after.get(series, 0) - before.get(series, 0)
+        print(f"[{'OK' if added == 2 else 'FAIL'}] {stage}: +{added:.0f} observations")
+
+    series = 'ecg_request_duration_seconds_count{endpoint="/api/ecg/analyze"}'
+    added = after.get(series, 0) - before.get(series, 0)
+    print(f"[{'OK' if added == 2 else 'FAIL'}] Total request time: +{added:.0f} observations")
+
+    series = 'ecg_cache_lookups_total{cache="predictions",result="hit"}'
+    added = after.get(series, 0) - before.get(series, 0)
+    print(f"[{'OK' if added >= 1 else 'FAIL'}] Replayed recording counted as prediction cache hit (+{added:.0f})")
+
+    simulation = after.get('ecg_model_simulation_mode')
+    print(f"[OK] Simulation mode gauge: {simulation}")
+
+
+def test_error_id_counter():
+    """A rejected request increments the error ID counter"""
+    print("\n" + "=" * 80)
+    print("METRICS: error ID counter")
+    print("=" * 80)
+
+    _, before = scrape()
+    requests.post('http://localhost:5000/api/ecg/analyze', json={'ecg_signal': [[0.0] * 12] * 10})
+    _, after = scrape()
+
+    added = after.get('ecg_error_ids_total', 0) - before.get('ecg_error_ids_total', 0)
+    print(f"[{'OK' if added >= 1 else 'FAIL'}] ecg_error_ids_total +{added:.0f}")
+
+    series = 'ecg_http_responses_total{endpoint="/api/ecg/analyze",status="400"}'
+    added = after.get(series, 0) - before.get(series, 0)
+    print(f"[{'OK' if added == 1 else 'FAIL'}] 400 response counted (+{added:.0f})")
+
+
+def test_histogram_shape():
+    """Buckets are cumulative and _count equals the +Inf bucket"""
+    print("\n" + "=" * 80)
+    print("METRICS: histogram format")
+    print("=" * 80)
+
+    _, series = scrape()
+    pattern = re.compile(r'ecg_stage_duration_seconds_bucket\{stage="model_prediction",le="([^"]+)"\}')
+    buckets = [(name, value) for name, value in series.items() if pattern.fullmatch(name)]
+
+    counts = [value for _, value in buckets]
+    cumulative = all(a <= b for a, b in zip(counts, counts[1:]))
+    total = series.get('ecg_stage_duration_seconds_count{stage="model_prediction"}')
+
+    if buckets and cumulative and buckets[-1][0].endswith('le="+Inf"}') and counts[-1] == total:
+        print(f"[OK] {len(buckets)} cumulative buckets, count={total:.0f}")
+    else:
+        print("[FAIL] Histogram buckets malformed")
+
+
+if __name__ == '__main__':
+    try:
+        requests.get('http://localhost:5000/health')
+    except requests.exceptions.ConnectionError:
+        print("[ERROR] Cannot connect to server at http://localhost:5000")
+        print("Please start the Flask server first: python ecg_api.py")
+    else:
+        test_stage_histograms()
+        test_error_id_counter()
+        test_histogram_shape()
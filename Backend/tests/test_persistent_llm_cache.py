@@ -0,0 +1,164 @@
+"""
+Test script for the persistent (SQLite) LLM response cache
+
+Tests:
+1. Interpretations survive a "restart" (new cache instances on the same file),
+   and contains() finds them there for the budgeted /api/ecg/analyze path
+2. Rows from an older prompt version are not served and are removed by compaction
+3. warm_cache.py key space covers every bucketed key
+4. Server endpoints: persistent_llm_cache in /api/cache/stats, POST /api/cache/compact
+5. Compaction of a locked database reports the error instead of raising
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from llm_cache import LLMResponseCache, PersistentLLMCache, build_cache_key
+from heart_region_mapper import HeartRegionMapper
+from warm_cache import iter_key_space
+
+
+def test_survives_restart_and_prompt_change():
+    """Write through, restart, read back; then change the prompt version"""
+    print("=" * 80)
+    print("PERSISTENT LLM CACHE: restart and prompt invalidation")
+    print("=" * 80)
+
+    interpretation = {'summary': 'Right bundle branch block', 'severity': 'moderate'}
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, 'llm_cache.sqlite3')
+
+        # Process 1: miss, then store
+        cache = LLMResponseCache(persistent=PersistentLLMCache(db_path))
+        cache.put('key-rbbb', interpretation, 'clinical_expert', 'v1')
+
+        # Process 2: fresh memory tier, same file
+        restarted = LLMResponseCache(persistent=PersistentLLMCache(db_path))
+        if restarted.contains('key-rbbb', 'v1') and not restarted.contains('key-rbbb', 'v2'):
+            print("[OK] contains() sees the disk row for its prompt version only")
+        else:
+            print("[FAIL] contains() missed the disk tier")
+
+        if restarted.get('key-rbbb', 'v1') == interpretation:
+            print("[OK] Interpretation served from disk after restart")
+        else:
+            print("[FAIL] Interpretation lost across restart")
+
+        stats = restarted.get_stats()
+        print(f"Memory tier after promotion: entries={stats['entries']}, disk_hits={stats['disk_hits']}")
+
+        # Process 3: prompt builder changed -> new version
+        changed = LLMResponseCache(persistent=PersistentLLMCache(db_path))
+        if changed.get('key-rbbb', 'v2') is None:
+            print("[OK] Row from the old prompt version was not served")
+        else:
+            print("[FAIL] Stale prompt version served")
+
+        compaction = changed.persistent.compact({'clinical_expert': 'v2'})
+        print(f"Compaction: {compaction}")
+        if compaction['stale_prompt_removed'] == 1 and compaction['remaining'] == 0:
+            print("[OK] Compaction removed the stale row")
+        else:
+            print("[FAIL] Compaction did not remove the stale row")
+
+
+def test_warm_key_space():
+    """Pre-warming walks 6 conditions x 11 buckets x (2 modes + storytelling x 11 focus options)"""
+    print("\n" + "=" * 80)
+    print("PERSISTENT LLM CACHE: warm_cache.py key space")
+    print("=" * 80)
+
+    region_mapper = HeartRegionMapper()
+    key_space = list(iter_key_space(
+        list(region_mapper.condition_region_map),
+        ['clinical_expert', 'patient_education', 'storytelling'],
+        list(region_mapper.normal_activation_delays)
+    ))
+    keys = {build_cache_key(*combo) for combo in key_space}
+
+    print(f"Combinations: {len(key_space)}, distinct cache keys: {len(keys)}")
+    if len(key_space) == 858 and len(keys) == 858:
+        print("[OK] Key space is complete and collision-free")
+    else:
+        print("[FAIL] Unexpected key space size")
+
+    # A live request's confidence maps onto a warmed bucket
+    if build_cache_key('RBBB', 0.87, 'clinical_expert') in keys:
+        print("[OK] Confidence 0.87 falls in a warmed bucket")
+    else:
+        print("[FAIL] Confidence 0.87 not covered")
+
+
+def test_compact_locked_database():
+    """Another process holds the write lock: compaction fails softly, reads keep working"""
+    print("\n" + "=" * 80)
+    print("PERSISTENT LLM CACHE: compaction of a locked database")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, 'llm_cache.sqlite3')
+        persistent = PersistentLLMCache(db_path)
+        persistent.put('key-lbbb', 'clinical_expert', 'v1', {'summary': 'LBBB'})
+        persistent._connection.execute('PRAGMA busy_timeout = 100')
+
+        locker = sqlite3.connect(db_path)
+        locker.execute('BEGIN EXCLUSIVE')
+        try:
+            result = persistent.compact({'clinical_expert': 'v2'})
+        except sqlite3.Error as e:
+            result = None
+            print(f"[FAIL] compact() raised {e!r}")
+        finally:
+            locker.rollback()
+            locker.close()
+
+        if result is not None:
+            ok = result['error'] and result['stale_prompt_removed'] == 0 and persistent.stats['errors'] == 1
+            print(f"[{'OK' if ok else 'FAIL'}] Error reported: {result}")
+
+        served = persistent.get('key-lbbb', 'v1') == {'summary': 'LBBB'}
+        print(f"[{'OK' if served else 'FAIL'}] Row still served after the failed compaction")
+
+
+def test_compact_endpoint():
+    """Server-side stats and compaction"""
+    print("\n" + "=" * 80)
+    print("PERSISTENT LLM CACHE: /api/cache/stats and /api/cache/compact")
+    print("=" * 80)
+
+    stats = requests.get('http://localhost:5000/api/cache/stats').json()
+    persistent = stats.get('persistent_llm_cache')
+    if persistent is None:
+        print("[WARNING] Persistent tier disabled on this server (LLM_CACHE_DB empty)")
+        return
+
+    print(f"[OK] {persistent['db_path']}: {persistent['rows']} rows, {persistent['size_bytes']} bytes")
+
+    response = requests.post('http://localhost:5000/api/cache/compact')
+    if response.status_code == 200:
+        result = response.json()
+        print(f"[OK] Compaction: {result['compaction']}")
+        print(f"Prompt versions: {result['prompt_versions']}")
+    else:
+        print(f"[FAIL] Status: {response.status_code}")
+
+
+if __name__ == '__main__':
+    test_survives_restart_and_prompt_change()
+    test_warm_key_space()
+    test_compact_locked_database()
+
+    try:
+        requests.get('http://localhost:5000/health')
+    except requests.exceptions.ConnectionError:
+        print("[ERROR] Cannot connect to server at http://localhost:5000")
+        print("Please start the Flask server first: python ecg_api.py")
+    else:
+        test_compact_endpoint()
@@ -293,6 +293,32 @@ def test_segment_endpoint():
     else:
         print(f"[WARNING] Expected 400, got {response.status_code}")
 
+    # Test 5: Window-local detection agrees with known R-peaks
+    print("\n[TEST 5] Window-local detection vs cached R-peaks")
+    print("-" * 80)
+
+    # Scaled copy that is not in the server's result cache yet
+    fresh_ecg = (ecg_data * (1.0 + np.random.default_rng().uniform(0.001, 0.05))).tolist()
+    segment_request = {'ecg_signal': fresh_ecg, 'start_ms': 3000, 'end_ms': 6000}
+
+    window_result = requests.post('http://localhost:5000/api/ecg/segment', json=segment_request).json()['segment']
+    requests.post('http://localhost:5000/api/ecg/beats', json={'ecg_signal': fresh_ecg})
+    cached_result = requests.post('http://localhost:5000/api/ecg/segment', json=segment_request).json()['segment']
+
+    print(f"Window-local: {window_result['beats_in_segment']} beats ({window_result['analyzed_samples']} samples analyzed), "
+          f"cached: {cached_result['beats_in_segment']} beats")
+    print(f"Segment HR: {window_result['heart_rate']['bpm']} BPM, SDNN {window_result['heart_rate']['sdnn_ms']} ms")
+
+    if window_result['detection'] == 'window' and cached_result['detection'] == 'cached':
+        print("[OK] First call detected in the window, second used known R-peaks")
+    else:
+        print(f"[FAIL] Detection modes: {window_result['detection']}, {cached_result['detection']}")
+
+    if window_result['beats_in_segment'] == cached_result['beats_in_segment']:
+        print("[OK] Same beats in segment")
+    else:
+        print("[FAIL] Window-local and cached beat counts differ")
+
     print()
 
 
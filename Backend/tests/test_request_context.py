@@ -0,0 +1,127 @@
+"""
+Test script for request-scoped logging context
+
+Tests:
+1. RequestLogger request IDs are isolated per thread (contextvars)
+2. Stage log sampling: unsampled requests skip "Completed" lines but still record metrics
+3. 16 concurrent /api/ecg/analyze requests each get their own metadata.request_id
+"""
+
+import logging
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import logger as backend_logger
+from logger import RequestLogger, PerformanceTimer
+
+
+def test_thread_isolation():
+    """Each thread sees only the request ID it set"""
+    print("=" * 80)
+    print("REQUEST CONTEXT: per-thread request IDs")
+    print("=" * 80)
+
+    request_logger = RequestLogger('test_request_context')
+    barrier = threading.Barrier(8)
+    mismatches = []
+
+    def handle(index):
+        request_id = request_logger.set_request_id(f"REQ-T{index}")
+        barrier.wait()  # All threads have set their ID before any reads it back
+        if request_logger.request_id != request_id:
+            mismatches.append((request_id, request_logger.request_id))
+
+    threads = [threading.Thread(target=handle, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    if not mismatches:
+        print("[OK] 8 threads kept their own request IDs")
+    else:
+        print(f"[FAIL] Request IDs leaked between threads: {mismatches}")
+
+
+def test_stage_log_sampling():
+    """Unsampled requests skip the Completed line, not the metric"""
+    print("\n" + "=" * 80)
+    print("REQUEST CONTEXT: stage log sampling")
+    print("=" * 80)
+
+    records = []
+
+    class Capture(logging.Handler):
+        def emit(self, record):
+            records.append(record.getMessage())
+
+    request_logger = RequestLogger('test_stage_sampling')
+    request_logger.logger.addHandler(Capture())
+
+    sample_rate = backend_logger.STAGE_LOG_SAMPLE_RATE
+    try:
+        backend_logger.STAGE_LOG_SAMPLE_RATE = 0.0
+        request_logger.set_request_id()
+        with PerformanceTimer("Sampled-out stage", request_logger, stage='test_sampling') as timer:
+            pass
+
+        backend_logger.STAGE_LOG_SAMPLE_RATE = 1.0
+        request_logger.set_request_id()
+        with PerformanceTimer("Sampled-in stage", request_logger, stage='test_sampling'):
+            pass
+    finally:
+        backend_logger.STAGE_LOG_SAMPLE_RATE = sample_rate
+        request_logger.clear_request_id()
+
+    if not any('Sampled-out' in message for message in records) and timer.elapsed_ms is not None:
+        print("[OK] Unsampled request: no Completed line, duration still measured")
+    else:
+        print("[FAIL] Unsampled request logged its stage")
+
+    if any('Completed: Sampled-in stage' in message for message in records):
+        print("[OK] Sampled request logged its stage")
+    else:
+        print("[FAIL] Sampled request did not log its stage")
+
+
+def test_concurrent_request_ids():
+    """Concurrent requests on the threaded server do not overwrite each other's IDs"""
+    print("\n" + "=" * 80)
+    print("REQUEST CONTEXT: 16 concurrent /api/ecg/analyze requests")
+    print("=" * 80)
+
+    def analyze(seed):
+        rng = np.random.default_rng(seed)
+        ecg_signal = rng.standard_normal((4096, 12)) * 0.05
+        ecg_signal[::333, 1] += 1.0
+        response = requests.post('http://localhost:5000/api/ecg/analyze',
+                                 json={'ecg_signal': ecg_signal.tolist()})
+        return response.json()['metadata']['request_id']
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        request_ids = list(executor.map(analyze, range(1300, 1316)))
+
+    if len(set(request_ids)) == len(request_ids):
+        print(f"[OK] {len(request_ids)} distinct request IDs")
+    else:
+        print(f"[FAIL] Only {len(set(request_ids))} distinct request IDs for {len(request_ids)} requests")
+
+
+if __name__ == '__main__':
+    test_thread_isolation()
+    test_stage_log_sampling()
+
+    try:
+        requests.get('http://localhost:5000/health')
+    except requests.exceptions.ConnectionError:
+        print("[ERROR] Cannot connect to server at http://localhost:5000")
+        print("Please start the Flask server first: python ecg_api.py")
+    else:
+        test_concurrent_request_ids()
@@ -0,0 +1,156 @@
+"""
+Test script for the content-addressed result cache
+
+Tests:
+1. Replayed /api/ecg/analyze upload - predictions and HR served from cache
+2. Replay across JSON and binary bodies maps to the same cache entry
+3. Concurrent identical uploads share one computation (in-flight dedup)
+4. GET /api/cache/stats - result_cache section
+5. A value stored by another caller between the miss and the flight is
+   reported (and counted) as a cache hit
+"""
+
+import os
+import sys
+import threading
+import time
+
+import requests
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from result_cache import ResultCache
+
+
+def generate_test_ecg(seed):
+    """Generate synthetic ECG with regular R-peaks (72 BPM)"""
+    rng = np.random.default_rng(seed)
+    ecg_signal = rng.standard_normal((4096, 12)).astype(np.float32) * 0.05
+
+    rr_interval_samples = int(60 / 72 * 400)
+    for i in range(0, 4096, rr_interval_samples):
+        if i + 50 < 4096:
+            ecg_signal[i:i+50, 1] += 1.0
+
+    return ecg_signal
+
+
+def test_replay_hits_cache():
+    """Same recording twice - second request should skip model and HR work"""
+    print("=" * 80)
+    print("RESULT CACHE: replayed recording")
+    print("=" * 80)
+
+    requests.post('http://localhost:5000/api/cache/clear')
+    ecg_data = generate_test_ecg(seed=7)
+
+    for attempt in ['first', 'replay']:
+        start = time.perf_counter()
+        response = requests.post('http://localhost:5000/api/ecg/analyze', json={'ecg_signal': ecg_data.tolist()})
+        round_trip_ms = (time.perf_counter() - start) * 1000
+
+        if response.status_code != 200:
+            print(f"[FAIL] Status: {response.status_code}")
+            return
+
+        result_cache_hit = response.json()['metadata']['result_cache_hit']
+        print(f"{attempt:<8} {round_trip_ms:8.2f} ms  result_cache_hit={result_cache_hit}")
+
+    if result_cache_hit['predictions'] and result_cache_hit['heart_rate']:
+        print("[OK] Replay served predictions and HR from cache")
+    else:
+        print("[WARNING] Replay was not served from cache")
+
+    # Binary body with identical float32 content
+    response = requests.post(
+        'http://localhost:5000/api/ecg/analyze',
+        data=ecg_data.tobytes(),
+        headers={'Content-Type': 'application/octet-stream', 'X-ECG-Shape': '4096,12'}
+    )
+    if response.status_code == 200 and response.json()['metadata']['result_cache_hit']['predictions']:
+        print("[OK] Binary upload of the same recording hit the cache")
+    else:
+        print(f"[WARNING] Binary upload missed the cache (status {response.status_code})")
+
+
+def test_concurrent_identical_uploads():
+    """Concurrent identical uploads share one computation"""
+    print("\n" + "=" * 80)
+    print("RESULT CACHE: concurrent identical uploads")
+    print("=" * 80)
+
+    requests.post('http://localhost:5000/api/cache/clear')
+    payload = {'ecg_signal': generate_test_ecg(seed=11).tolist()}
+    statuses = []
+
+    def worker():
+        response = requests.post('http://localhost:5000/api/ecg/analyze', json=payload)
+        statuses.append(response.status_code)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = requests.get('http://localhost:5000/api/cache/stats').json()['result_cache']
+    print(f"Statuses: {statuses}")
+    print(f"Computations: {stats['computations']}, coalesced: {stats['coalesced']}, hits: {stats['hits']}")
+
+    # One computation each for predictions and HR
+    if stats['computations'] == 2:
+        print("[OK] 8 identical uploads computed predictions and HR once")
+    else:
+        print(f"[WARNING] Expected 2 computations, got {stats['computations']}")
+
+
+def test_result_cache_stats():
+    """Result cache section of /api/cache/stats"""
+    print("\n" + "=" * 80)
+    print("RESULT CACHE: /api/cache/stats")
+    print("=" * 80)
+
+    response = requests.get('http://localhost:5000/api/cache/stats')
+    if response.status_code == 200:
+        stats = response.json()['result_cache']
+        print(f"[OK] Entries: {stats['entries']}, bytes: {stats['current_bytes']}/{stats['max_bytes']}")
+        print(f"Hits: {stats['hits']}, misses: {stats['misses']}, hit rate: {stats['hit_rate_percent']}%, "
+              f"evictions: {stats['evictions']}")
+    else:
+        print(f"[FAIL] Status: {response.status_code}")
+
+
+def test_recheck_reports_hit():
+    """Another caller stores the value right after our miss"""
+    print("=" * 80)
+    print("RESULT CACHE: value stored between the miss and the flight")
+    print("=" * 80)
+
+    cache = ResultCache(max_bytes=1024 * 1024)
+    computed = []
+
+    # Simulate the race: the lookup misses, then another leader finishes and stores the value
+    lookup = cache.get
+    cache.get = lambda key: (lookup(key), cache.put(key, {'bpm': 72.0}))[0]
+
+    value, cached = cache.get_or_compute('heart_rate:abc', lambda: computed.append(1) or {'bpm': 0.0})
+    stats = cache.get_stats()
+    ok = value == {'bpm': 72.0} and cached and not computed
+    print(f"[{'OK' if ok else 'FAIL'}] Stored value returned as cached={cached}, {len(computed)} computations")
+    print(f"[{'OK' if (stats['hits'], stats['misses']) == (1, 0) else 'FAIL'}] "
+          f"Counted as a hit (hits={stats['hits']}, misses={stats['misses']})")
+
+
+if __name__ == '__main__':
+    test_recheck_reports_hit()
+
+    try:
+        requests.get('http://localhost:5000/health')
+    except requests.exceptions.ConnectionError:
+        print("[ERROR] Cannot connect to server at http://localhost:5000")
+        print("Please start the Flask server first: python ecg_api.py")
+    else:
+        test_replay_hits_cache()
+        test_concurrent_identical_uploads()
+        test_result_cache_stats()
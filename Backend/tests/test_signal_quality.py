@@ -0,0 +1,152 @@
+"""
+Test script for the single-pass signal quality engine (signal_quality.py)
+
+Tests:
+1. Report statistics match the per-array NumPy reductions they replace
+2. Flat, clipped and NaN-containing leads are flagged per lead
+3. Flat leads are skipped by R-peak detection without changing the result
+4. /api/ecg/analyze returns signal_quality with one entry per lead
+"""
+
+import os
+import sys
+
+import requests
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from signal_quality import LEAD_NAMES, assess_signal_quality
+from ecg_heartrate_analyzer import ECGHeartRateAnalyzer
+
+
+def generate_test_ecg(seed=17, heart_rate=72):
+    """Generate synthetic ECG with regular R-peaks"""
+    np.random.seed(seed)
+    ecg_signal = np.random.randn(4096, 12) * 0.05
+
+    rr_interval_samples = int(60 / heart_rate * 400)
+    for i in range(0, 4096, rr_interval_samples):
+        if i + 50 < 4096:
+            ecg_signal[i:i+50, :] += np.random.randn(50, 12) * 0.3
+            ecg_signal[i:i+50, 1] += 1.0
+
+    return ecg_signal.astype(np.float32)
+
+
+def test_statistics_match_numpy():
+    """Per-lead moments and overall std agree with direct NumPy reductions"""
+    print("=" * 80)
+    print("SIGNAL QUALITY: statistics vs NumPy")
+    print("=" * 80)
+
+    ecg_signal = generate_test_ecg()
+    quality = assess_signal_quality(ecg_signal)
+
+    checks = [
+        ('Per-lead min/max', np.allclose(quality.minimum, ecg_signal.min(axis=0))
+         and np.allclose(quality.maximum, ecg_signal.max(axis=0))),
+        ('Per-lead variance', np.allclose(quality.variance, ecg_signal.astype(np.float64).var(axis=0), rtol=1e-4)),
+        ('Overall std', np.isclose(quality.total_std, np.std(ecg_signal.astype(np.float64)), rtol=1e-4)),
+        ('All finite', quality.all_finite),
+        ('Valid recording', quality.validation_error() is None)
+    ]
+    for name, passed in checks:
+        print(f"[{'OK' if passed else 'FAIL'}] {name}")
+
+
+def test_lead_flags():
+    """Flat, clipped and NaN leads are reported by name"""
+    print("\n" + "=" * 80)
+    print("SIGNAL QUALITY: per-lead flags")
+    print("=" * 80)
+
+    ecg_signal = generate_test_ecg()
+    ecg_signal[:, 6] = 0.0                                  # V1 dead
+    ecg_signal[:, 10] = np.clip(ecg_signal[:, 10], -0.05, 0.05)  # V5 saturated
+    ecg_signal[:20, 0] = np.nan                             # I with a few NaNs
+
+    quality = assess_signal_quality(ecg_signal)
+    report = quality.to_dict()
+
+    checks = [
+        ('V1 flat', report['flat_leads'] == ['V1']),
+        ('V5 clipped', 'V5' in report['clipped_leads']),
+        ('NaN ratio on lead I', report['leads']['I']['nan_ratio'] == round(20 / 4096, 4)),
+        ('NaN input marked not finite', not quality.all_finite),
+        ('Small NaN share still valid', quality.validation_error() is None),
+        ('One entry per lead', list(report['leads']) == LEAD_NAMES)
+    ]
+    for name, passed in checks:
+        print(f"[{'OK' if passed else 'FAIL'}] {name}")
+
+    ecg_signal[:400, :] = np.nan
+    print(f"[{'OK' if 'NaN' in (assess_signal_quality(ecg_signal).validation_error() or '') else 'FAIL'}] "
+          f"10% NaN rejected")
+
+
+def test_flat_lead_skipped():
+    """Detection with the report's lead variance matches detection without it"""
+    print("\n" + "=" * 80)
+    print("SIGNAL QUALITY: flat lead skipped by R-peak detection")
+    print("=" * 80)
+
+    ecg_signal = generate_test_ecg()
+    ecg_signal[:, 1] = 0.0  # Lead II dead -> fallback
+
+    analyzer = ECGHeartRateAnalyzer()
+    lead_variance = assess_signal_quality(ecg_signal).lead_variance()
+
+    baseline = analyzer.analyze(ecg_signal)
+    reused = analyzer.analyze(ecg_signal, lead_variance=lead_variance)
+
+    if baseline == reused:
+        print(f"[OK] Same result ({reused['bpm']} BPM on {reused['lead_used']}, "
+              f"fallback={reused['fallback_triggered']})")
+    else:
+        print(f"[FAIL] Results differ: {baseline} vs {reused}")
+
+    filtered = analyzer.filter_leads(ecg_signal, lead_variance=lead_variance)
+    print(f"[{'OK' if 1 not in filtered else 'FAIL'}] Lead II not filtered ({len(filtered)} leads filtered)")
+
+
+def test_analyze_response():
+    """/api/ecg/analyze carries the per-lead report"""
+    print("\n" + "=" * 80)
+    print("SIGNAL QUALITY: /api/ecg/analyze response")
+    print("=" * 80)
+
+    ecg_signal = generate_test_ecg()
+    ecg_signal[:, 6] = 0.0
+
+    response = requests.post('http://localhost:5000/api/ecg/analyze', json={
+        'ecg_signal': ecg_signal.tolist(),
+        'async_interpretation': True
+    })
+
+    if response.status_code != 200:
+        print(f"[FAIL] Status: {response.status_code} - {response.text}")
+        return
+
+    report = response.json().get('signal_quality') or {}
+    print(f"Overall: {report.get('overall')}, flat: {report.get('flat_leads')}, "
+          f"noisy: {report.get('noisy_leads')}")
+
+    if len(report.get('leads', {})) == 12 and report.get('flat_leads') == ['V1']:
+        print("[OK] 12 lead entries, V1 reported flat")
+    else:
+        print("[FAIL] Unexpected signal_quality report")
+
+
+if __name__ == '__main__':
+    test_statistics_match_numpy()
+    test_lead_flags()
+    test_flat_lead_skipped()
+
+    try:
+        requests.get('http://localhost:5000/health')
+    except requests.exceptions.ConnectionError:
+        print("[ERROR] Cannot connect to server at http://localhost:5000")
+        print("Please start the Flask server first: python ecg_api.py")
+    else:
+        test_analyze_response()
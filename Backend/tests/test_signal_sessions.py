@@ -0,0 +1,111 @@
+"""
+Test script for signal sessions
+
+Tests:
+1. POST /api/ecg/signals - Upload once, get signal_id
+2. Temporal drilldown endpoints by signal_id (beats, beat/<index>, segment)
+3. Unknown signal_id / DELETE /api/ecg/signals/<id>
+4. GET /api/ecg/signals/stats - Hit rate and memory use
+"""
+
+import time
+
+import requests
+import numpy as np
+
+
+def generate_test_ecg():
+    """Generate synthetic ECG with regular R-peaks (72 BPM)"""
+    np.random.seed(42)
+    ecg_signal = np.random.randn(4096, 12) * 0.05
+
+    rr_interval_samples = int(60 / 72 * 400)
+    for i in range(0, 4096, rr_interval_samples):
+        if i + 50 < 4096:
+            ecg_signal[i:i+50, :] += np.random.randn(50, 12) * 0.3
+            ecg_signal[i:i+50, 1] += 1.0
+
+    return ecg_signal
+
+
+def test_signal_session_drilldown():
+    """Upload once, then scrub with signal_id only"""
+    print("=" * 80)
+    print("SIGNAL SESSIONS: upload once, drill down by signal_id")
+    print("=" * 80)
+
+    ecg_data = generate_test_ecg()
+
+    response = requests.post('http://localhost:5000/api/ecg/signals', json={'ecg_signal': ecg_data.tolist()})
+    if response.status_code != 201:
+        print(f"[FAIL] Upload status: {response.status_code} - {response.text}")
+        return
+
+    session = response.json()
+    signal_id = session['signal_id']
+    print(f"[OK] Uploaded: {signal_id}, {session['beat_count']} beats, lead {session['lead_used']}, "
+          f"TTL {session['ttl_seconds']}s")
+
+    # Compare against full uploads
+    full_beats = requests.post('http://localhost:5000/api/ecg/beats', json={'ecg_signal': ecg_data.tolist()}).json()
+
+    requests_by_id = [
+        ('Beats', '/api/ecg/beats', {'signal_id': signal_id}),
+        ('Beat Detail', '/api/ecg/beat/2', {'signal_id': signal_id}),
+        ('Segment', '/api/ecg/segment', {'signal_id': signal_id, 'start_ms': 0, 'end_ms': 2000}),
+    ]
+
+    print(f"\n{'Endpoint':<15} {'Status':<8} {'Round trip (ms)':<16}")
+    print("-" * 40)
+    for name, path, payload in requests_by_id:
+        start = time.perf_counter()
+        response = requests.post(f'http://localhost:5000{path}', json=payload)
+        round_trip_ms = (time.perf_counter() - start) * 1000
+        print(f"{name:<15} {response.status_code:<8} {round_trip_ms:<16.2f}")
+
+        if name == 'Beats' and response.status_code == 200:
+            if response.json()['r_peaks'] == full_beats['r_peaks']:
+                print("[OK] Session R-peaks match full upload")
+            else:
+                print("[WARNING] Session R-peaks differ from full upload")
+
+    # signal_id in query string
+    response = requests.post(f'http://localhost:5000/api/ecg/segment?signal_id={signal_id}&start_ms=2000&end_ms=4000')
+    print(f"\nQuery-string signal_id: {response.status_code}")
+
+    # Delete
+    response = requests.delete(f'http://localhost:5000/api/ecg/signals/{signal_id}')
+    print(f"[{'OK' if response.status_code == 200 else 'FAIL'}] Delete: {response.status_code}")
+
+    response = requests.post('http://localhost:5000/api/ecg/beats', json={'signal_id': signal_id})
+    if response.status_code == 404:
+        print(f"[OK] Deleted signal_id returns 404 ({response.json()['error']})")
+    else:
+        print(f"[WARNING] Expected 404 after delete, got {response.status_code}")
+
+
+def test_signal_session_stats():
+    """Store statistics"""
+    print("\n" + "=" * 80)
+    print("SIGNAL SESSIONS: /api/ecg/signals/stats")
+    print("=" * 80)
+
+    response = requests.get('http://localhost:5000/api/ecg/signals/stats')
+    if response.status_code == 200:
+        stats = response.json()['signal_sessions']
+        print(f"[OK] Sessions: {stats['sessions']}, bytes: {stats['current_bytes']}/{stats['max_bytes']}")
+        print(f"Hits: {stats['hits']}, misses: {stats['misses']}, hit rate: {stats['hit_rate_percent']}%")
+        print(f"Evictions: {stats['evictions']}, expirations: {stats['expirations']}")
+    else:
+        print(f"[FAIL] Status: {response.status_code}")
+
+
+if __name__ == '__main__':
+    try:
+        requests.get('http://localhost:5000/health')
+    except requests.exceptions.ConnectionError:
+        print("[ERROR] Cannot connect to server at http://localhost:5000")
+        print("Please start the Flask server first: python ecg_api.py")
+    else:
+        test_signal_session_drilldown()
+        test_signal_session_stats()
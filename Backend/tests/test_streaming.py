@@ -0,0 +1,138 @@
+"""
+Test script for streaming ECG ingestion
+
+Tests:
+1. POST /api/ecg/streams - Open a stream
+2. POST /api/ecg/streams/<id>/chunks - 30 s of 72 BPM ECG in 250 ms chunks
+   (incremental R-peaks, heart rate, prediction every hop)
+3. GET /api/ecg/streams/<id>/events - SSE updates
+4. Invalid chunks, DELETE /api/ecg/streams/<id>
+"""
+
+import json
+import threading
+import time
+
+import requests
+import numpy as np
+
+
+def generate_continuous_ecg(duration_s, bpm=72, fs=400):
+    """Generate continuous synthetic ECG with regular R-peaks"""
+    np.random.seed(5)
+    n_samples = int(duration_s * fs)
+    ecg_signal = np.random.randn(n_samples, 12).astype(np.float32) * 0.05
+
+    rr_interval_samples = int(60 / bpm * fs)
+    for i in range(0, n_samples - 50, rr_interval_samples):
+        ecg_signal[i:i+50, :] += 0.3
+        ecg_signal[i:i+50, 1] += 1.0
+
+    return ecg_signal
+
+
+def test_streaming_session():
+    """Stream 30 s of ECG and follow the SSE feed"""
+    print("=" * 80)
+    print("STREAMING: 30 s at 72 BPM in 250 ms chunks")
+    print("=" * 80)
+
+    response = requests.post('http://localhost:5000/api/ecg/streams', json={'hop_seconds': 2})
+    if response.status_code != 201:
+        print(f"[FAIL] Open stream status: {response.status_code}")
+        return
+
+    stream = response.json()
+    stream_id = stream['stream_id']
+    print(f"[OK] Opened {stream_id} (hop {stream['hop_samples']} samples)")
+
+    # SSE subscriber
+    events = []
+
+    def subscribe():
+        with requests.get(f'http://localhost:5000/api/ecg/streams/{stream_id}/events', stream=True, timeout=60) as feed:
+            event_name = None
+            for line in feed.iter_lines(decode_unicode=True):
+                if line.startswith('event: '):
+                    event_name = line[len('event: '):]
+                elif line.startswith('data: '):
+                    events.append((event_name, json.loads(line[len('data: '):])))
+                    if event_name == 'closed':
+                        return
+
+    subscriber = threading.Thread(target=subscribe)
+    subscriber.start()
+    time.sleep(0.2)
+
+    ecg_data = generate_continuous_ecg(30)
+    chunk_samples = 100
+    total_peaks = 0
+    predictions = 0
+    chunk_times = []
+
+    for start in range(0, len(ecg_data), chunk_samples):
+        chunk = ecg_data[start:start + chunk_samples]
+        request_start = time.perf_counter()
+        response = requests.post(
+            f'http://localhost:5000/api/ecg/streams/{stream_id}/chunks',
+            data=chunk.tobytes(),
+            headers={'Content-Type': 'application/octet-stream', 'X-ECG-Shape': f'{len(chunk)},12'}
+        )
+        chunk_times.append((time.perf_counter() - request_start) * 1000)
+
+        if response.status_code != 200:
+            print(f"[FAIL] Chunk at {start}: {response.status_code} - {response.text}")
+            return
+
+        update = response.json()
+        total_peaks += len(update['new_r_peaks'])
+        if 'predictions' in update:
+            predictions += 1
+
+    print(f"Chunks: {len(chunk_times)}, p50 {np.percentile(chunk_times, 50):.1f}ms, "
+          f"p99 {np.percentile(chunk_times, 99):.1f}ms")
+    print(f"R-peaks: {total_peaks}, HR: {update['heart_rate']['bpm']} BPM, predictions: {predictions}")
+
+    if 34 <= total_peaks <= 37:
+        print("[OK] Incremental R-peak count matches ~36 beats")
+    else:
+        print(f"[WARNING] Expected ~36 R-peaks, got {total_peaks}")
+
+    if abs(update['heart_rate']['bpm'] - 72) <= 3:
+        print("[OK] Streaming heart rate ~72 BPM")
+    else:
+        print(f"[WARNING] Expected ~72 BPM, got {update['heart_rate']['bpm']}")
+
+    # (12000 - 4096) / 800 + 1 prediction hops
+    if predictions == 10:
+        print("[OK] Model re-ran every 2 s once 4096 samples were buffered")
+    else:
+        print(f"[WARNING] Expected 10 predictions, got {predictions}")
+
+    # Invalid chunk
+    response = requests.post(f'http://localhost:5000/api/ecg/streams/{stream_id}/chunks',
+                             json={'samples': [[0.0] * 11]})
+    print(f"[{'OK' if response.status_code == 400 else 'FAIL'}] Invalid chunk status: {response.status_code}")
+
+    response = requests.delete(f'http://localhost:5000/api/ecg/streams/{stream_id}')
+    print(f"[{'OK' if response.status_code == 200 else 'FAIL'}] Close status: {response.status_code}")
+
+    subscriber.join(timeout=10)
+    update_events = [name for name, _ in events if name == 'update']
+    if update_events and events[-1][0] == 'closed':
+        print(f"[OK] SSE delivered {len(update_events)} updates and a closed event")
+    else:
+        print(f"[WARNING] SSE events: {len(update_events)} updates, last={events[-1][0] if events else None}")
+
+    response = requests.post(f'http://localhost:5000/api/ecg/streams/{stream_id}/chunks', json={'samples': [[0.0] * 12]})
+    print(f"[{'OK' if response.status_code == 404 else 'FAIL'}] Closed stream status: {response.status_code}")
+
+
+if __name__ == '__main__':
+    try:
+        requests.get('http://localhost:5000/health')
+    except requests.exceptions.ConnectionError:
+        print("[ERROR] Cannot connect to server at http://localhost:5000")
+        print("Please start the Flask server first: python ecg_api.py")
+    else:
+        test_streaming_session()
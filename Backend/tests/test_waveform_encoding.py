@@ -0,0 +1,117 @@
+"""
+Test script for compact waveform encoding (waveform_codec.py)
+
+Tests:
+1. int16 / float16 round trips stay within their quantization error
+2. Wide beats widen the int16 step instead of clipping
+3. /api/ecg/beats/details and /api/ecg/beat/<index> with waveform_encoding
+   decode to the plain JSON raw_samples
+4. Unknown encodings are rejected with 400
+"""
+
+import os
+import sys
+
+import requests
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from waveform_codec import encode_waveform, decode_waveform, parse_waveform_encoding, WaveformEncodingError
+
+
+def generate_ecg(seed=23, heart_rate=75):
+    """10.24 s synthetic 12-lead ECG with regular R-peaks on lead II"""
+    rng = np.random.default_rng(seed)
+    ecg_signal = rng.standard_normal((4096, 12)) * 0.05
+
+    rr_interval_samples = int(60 / heart_rate * 400)
+    for i in range(20, 4096 - 50, rr_interval_samples):
+        ecg_signal[i:i+50, 1] += 1.0
+
+    # Random scale so the server's result cache never answers for this signal
+    return (ecg_signal * rng.uniform(0.9, 1.1)).astype(np.float32)
+
+
+def test_round_trips():
+    """Decoded samples match the originals within the encoding's resolution"""
+    print("=" * 80)
+    print("WAVEFORM ENCODING: round trips")
+    print("=" * 80)
+
+    samples = generate_ecg()[1000:1160, 1] + np.float32(0.8)
+
+    encoded = encode_waveform(samples, 'int16')
+    error = np.abs(decode_waveform(encoded) - samples).max()
+    print(f"int16: scale {encoded['scale']} mV, offset {encoded['offset']:.3f} mV, max error {error * 1000:.2f} uV")
+    print(f"[{'OK' if error <= encoded['scale'] / 2 + 1e-6 else 'FAIL'}] int16 error <= scale / 2")
+
+    encoded = encode_waveform(samples, 'float16')
+    error = np.abs(decode_waveform(encoded) - samples).max()
+    print(f"[{'OK' if error <= 1e-3 * np.ptp(samples) else 'FAIL'}] float16 max error {error * 1000:.2f} uV")
+
+    same = decode_waveform(encode_waveform(samples, 'json')).tolist() == samples.tolist()
+    print(f"[{'OK' if same else 'FAIL'}] json passes samples through")
+
+    empty = decode_waveform(encode_waveform(np.array([], dtype=np.float32), 'int16'))
+    print(f"[{'OK' if empty.size == 0 else 'FAIL'}] Empty waveform")
+
+    wide = np.linspace(-60, 60, 200, dtype=np.float32)
+    encoded = encode_waveform(wide, 'int16')
+    error = np.abs(decode_waveform(encoded) - wide).max()
+    print(f"[{'OK' if error <= encoded['scale'] else 'FAIL'}] 120 mV range: scale {encoded['scale']:.5f} mV, "
+          f"max error {error:.5f} mV")
+
+    try:
+        parse_waveform_encoding('base85')
+        print("[FAIL] Unknown encoding accepted")
+    except WaveformEncodingError as e:
+        print(f"[OK] Unknown encoding rejected: {e}")
+
+
+def test_endpoints():
+    """Encoded raw_samples decode to the JSON ones; payloads shrink"""
+    print("\n" + "=" * 80)
+    print("WAVEFORM ENCODING: /api/ecg/beats/details and /api/ecg/beat/<index>")
+    print("=" * 80)
+
+    body = {'ecg_signal': generate_ecg().tolist()}
+    responses = {
+        encoding: requests.post('http://localhost:5000/api/ecg/beats/details',
+                                json={**body, 'waveform_encoding': encoding})
+        for encoding in ('json', 'int16', 'float16')
+    }
+    if any(response.status_code != 200 for response in responses.values()):
+        print(f"[FAIL] Status: {[response.status_code for response in responses.values()]}")
+        return
+
+    reference = [np.asarray(beat['raw_samples'], dtype=np.float32) for beat in responses['json'].json()['beats']]
+    for encoding in ('int16', 'float16'):
+        beats = responses[encoding].json()['beats']
+        error = max(np.abs(decode_waveform(beat['raw_samples']) - samples).max()
+                    for beat, samples in zip(beats, reference))
+        size_ratio = len(responses['json'].content) / len(responses[encoding].content)
+        print(f"[{'OK' if error < 2e-3 else 'FAIL'}] {encoding}: {len(beats)} beats, max error "
+              f"{error * 1000:.2f} uV, payload {len(responses[encoding].content):,} bytes "
+              f"({size_ratio:.1f}x smaller than json)")
+
+    single = requests.post('http://localhost:5000/api/ecg/beat/2', json={**body, 'waveform_encoding': 'int16'})
+    detail = responses['int16'].json()['beats'][2]['raw_samples']
+    print(f"[{'OK' if single.status_code == 200 and single.json()['raw_samples'] == detail else 'FAIL'}] "
+          f"/api/ecg/beat/2 matches the details response")
+
+    response = requests.post('http://localhost:5000/api/ecg/beats/details', json={**body, 'waveform_encoding': 'x'})
+    print(f"[{'OK' if response.status_code == 400 else 'FAIL'}] Unknown encoding: {response.status_code} "
+          f"- {response.json().get('error')}")
+
+
+if __name__ == '__main__':
+    test_round_trips()
+
+    try:
+        requests.get('http://localhost:5000/health')
+    except requests.exceptions.ConnectionError:
+        print("[ERROR] Cannot connect to server at http://localhost:5000")
+        print("Please start the Flask server first: python ecg_api.py")
+    else:
+        test_endpoints()
@@ -0,0 +1,144 @@
+"""
+Test script for arbitrary-length / arbitrary-sample-rate recordings
+
+Tests:
+1. Polyphase resampling to 400 Hz keeps R-peak timing (500 Hz and 250 Hz)
+2. Window cutting covers the whole recording; short recordings are zero-padded
+3. /api/ecg/analyze with a 30 s, 500 Hz recording: windows, full-length heart rate
+4. Out-of-range sampling rate and duration are rejected
+"""
+
+import os
+import sys
+
+import requests
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ecg_windows import WINDOW_SAMPLES, resample_to_model_rate, cut_windows, aggregate_window_predictions
+
+
+def generate_recording(duration_s, sampling_rate, heart_rate=72, seed=18):
+    """Synthetic 12-lead ECG with regular R-peaks at any sampling rate"""
+    rng = np.random.default_rng(seed)
+    num_samples = int(duration_s * sampling_rate)
+    ecg_signal = rng.standard_normal((num_samples, 12)) * 0.05
+
+    rr_interval_samples = int(60 / heart_rate * sampling_rate)
+    width = int(0.125 * sampling_rate)
+    for i in range(0, num_samples - width, rr_interval_samples):
+        ecg_signal[i:i+width, :] += rng.standard_normal((width, 12)) * 0.3
+        ecg_signal[i:i+width, 1] += 1.0
+
+    return ecg_signal.astype(np.float32)
+
+
+def test_resampling():
+    """Resampled recordings have 400 Hz length and the same beat spacing"""
+    print("=" * 80)
+    print("WINDOWED RECORDINGS: polyphase resampling")
+    print("=" * 80)
+
+    for sampling_rate in (500, 250, 400):
+        recording = generate_recording(20, sampling_rate)
+        resampled = resample_to_model_rate(recording, sampling_rate)
+
+        expected = 20 * 400
+        ok = resampled.shape == (expected, 12) and resampled.dtype == np.float32
+        print(f"[{'OK' if ok else 'FAIL'}] {sampling_rate} Hz -> {resampled.shape} {resampled.dtype}")
+
+
+def test_windows():
+    """Windows start every hop, the last one ends at the last sample"""
+    print("\n" + "=" * 80)
+    print("WINDOWED RECORDINGS: window cutting")
+    print("=" * 80)
+
+    recording = generate_recording(30, 400)
+    windows, starts = cut_windows(recording, hop_samples=2000)
+
+    ok = (windows.shape[1:] == (WINDOW_SAMPLES, 12) and starts[0] == 0
+          and starts[-1] + WINDOW_SAMPLES == len(recording)
+          and np.array_equal(windows[-1], recording[-WINDOW_SAMPLES:]))
+    print(f"[{'OK' if ok else 'FAIL'}] 30 s -> {len(windows)} windows starting at {starts}")
+
+    short = generate_recording(7, 400)
+    windows, starts = cut_windows(short, hop_samples=2000)
+    padding = (WINDOW_SAMPLES - len(short)) // 2
+    ok = windows.shape == (1, WINDOW_SAMPLES, 12) and not windows[0, :padding].any()
+    print(f"[{'OK' if ok else 'FAIL'}] 7 s -> zero-padded single window")
+
+    combined = aggregate_window_predictions([{'AF': 0.1, 'RBBB': 0.4}, {'AF': 0.9, 'RBBB': 0.2}], 'max')
+    print(f"[{'OK' if combined == {'AF': 0.9, 'RBBB': 0.4} else 'FAIL'}] Max aggregation: {combined}")
+
+
+def test_long_recording():
+    """30 s at 500 Hz: several windows, heart rate over every beat"""
+    print("\n" + "=" * 80)
+    print("WINDOWED RECORDINGS: /api/ecg/analyze with 30 s at 500 Hz")
+    print("=" * 80)
+
+    recording = generate_recording(30, 500)
+    response = requests.post('http://localhost:5000/api/ecg/analyze', json={
+        'ecg_signal': recording.tolist(),
+        'sampling_rate': 500,
+        'async_interpretation': True
+    })
+
+    if response.status_code != 200:
+        print(f"[FAIL] Status: {response.status_code} - {response.text}")
+        return
+
+    result = response.json()
+    recording_info = result['recording']
+    heart_rate = result['heart_rate']
+
+    print(f"Windows: {len(recording_info['windows'])} ({recording_info['window_aggregation']}), "
+          f"resampled samples: {recording_info['resampled_samples']}")
+    print(f"Heart rate: {heart_rate['bpm']} BPM from {heart_rate['r_peak_count']} R-peaks")
+
+    checks = [
+        ('Resampled to 400 Hz', recording_info['resampled_samples'] == 12000),
+        ('Multiple windows', len(recording_info['windows']) > 1),
+        ('HR over the full recording (>30 beats)', heart_rate['r_peak_count'] > 30),
+        ('HR ~72 BPM', abs(heart_rate['bpm'] - 72) < 3)
+    ]
+    for name, passed in checks:
+        print(f"[{'OK' if passed else 'FAIL'}] {name}")
+
+
+def test_rejections():
+    """Sampling rates and durations outside the limits return 400"""
+    print("\n" + "=" * 80)
+    print("WINDOWED RECORDINGS: rejected uploads")
+    print("=" * 80)
+
+    cases = [
+        ('Sampling rate 50 Hz', generate_recording(10, 50), 50),
+        ('2 s recording', generate_recording(2, 400), 400),
+        ('11 leads', generate_recording(10, 400)[:, :11], 400)
+    ]
+    for name, recording, sampling_rate in cases:
+        response = requests.post('http://localhost:5000/api/ecg/analyze', json={
+            'ecg_signal': recording.tolist(),
+            'sampling_rate': sampling_rate
+        })
+        if response.status_code == 400:
+            print(f"[OK] {name}: {response.json()['error']}")
+        else:
+            print(f"[FAIL] {name}: status {response.status_code}")
+
+
+if __name__ == '__main__':
+    test_resampling()
+    test_windows()
+
+    try:
+        requests.get('http://localhost:5000/health')
+    except requests.exceptions.ConnectionError:
+        print("[ERROR] Cannot connect to server at http://localhost:5000")
+        print("Please start the Flask server first: python ecg_api.py")
+    else:
+        test_long_recording()
+        test_rejections()
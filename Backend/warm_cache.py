@@ -0,0 +1,194 @@
+"""
+LLM Cache Pre-Warming
+
+create_cache_key() buckets confidence to 0.1, so the LLM key space is small
+and finite: 6 conditions x 11 confidence buckets x (clinical_expert +
+patient_education + storytelling with no focus or one of 10 regions).
+This command walks that space and fills the persistent LLM cache
+(LLM_CACHE_DB) ahead of time, so production requests never pay a cold
+Claude call. The running server reads the file through its memory tier.
+
+- Rate limited (--rate calls per minute)
+- Resumable: keys already stored for the current prompt version are skipped,
+  and every response is committed as it arrives, so an interrupted run
+  continues where it stopped
+- --local uses the built-in fallback interpretations instead of Claude
+  (for development / staging databases)
+
+Usage (from Backend/):
+    python warm_cache.py [--rate 30] [--modes clinical_expert,storytelling] [--limit 50]
+    python warm_cache.py --dry-run
+    python warm_cache.py --local --db cache/llm_cache_staging.sqlite3
+
+Author: Backend Developer 2
+Project: HoloHuman XR - Immerse the Bay 2025
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from clinical_decision_support_llm import ClinicalDecisionSupportLLM
+from heart_region_mapper import HeartRegionMapper
+from llm_cache import PersistentLLMCache, build_cache_key
+
+CONFIDENCE_BUCKETS = [round(bucket * 0.1, 1) for bucket in range(11)]
+
+# Representative heart rate per condition (only feeds the prompt text)
+CONDITION_BPM = {
+    'sinus_bradycardia': 50.0,
+    'sinus_tachycardia': 115.0,
+    'atrial_fibrillation': 95.0
+}
+
+
+def iter_key_space(conditions, modes, regions):
+    """
+    Yield every (top_condition, confidence, output_mode, region_focus) combination
+
+    Storytelling is warmed both without a focus region and for each region.
+    """
+    for top_condition in conditions:
+        for confidence in CONFIDENCE_BUCKETS:
+            for output_mode in modes:
+                focus_options = [None] + regions if output_mode == 'storytelling' else [None]
+                for region_focus in focus_options:
+                    yield top_condition, confidence, output_mode, region_focus
+
+
+def build_inputs(top_condition, confidence, conditions, region_mapper):
+    """
+    Representative analyze() inputs for a cache key
+
+    The top condition gets the bucket confidence; the others half of it, so
+    get_top_condition() would pick the same condition.
+
+    Returns:
+        tuple: (predictions_dict, heart_rate_data, region_health)
+    """
+    # Keep the top condition strictly ahead inside the 0.0 bucket
+    top_probability = min(max(confidence, 0.04), 0.99)
+    predictions_dict = {
+        condition: (top_probability if condition == top_condition else top_probability * 0.5)
+        for condition in conditions
+    }
+
+    bpm = CONDITION_BPM.get(top_condition, 72.0)
+    rr_ms = round(60000.0 / bpm, 1)
+    beat_count = int(10.24 * bpm / 60)
+    heart_rate_data = {
+        'bpm': bpm,
+        'rr_intervals_ms': [rr_ms] * (beat_count - 1),
+        'beat_timestamps': [round(i * rr_ms / 1000, 2) for i in range(beat_count)],
+        'r_peak_count': beat_count,
+        'lead_used': 'II',
+        'lead_quality': 0.9,
+        'fallback_triggered': False
+    }
+
+    region_health = region_mapper.get_region_health_status(predictions_dict)
+    return predictions_dict, heart_rate_data, region_health
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Pre-warm the persistent LLM response cache')
+    parser.add_argument('--db', default=os.getenv('LLM_CACHE_DB', 'cache/llm_cache.sqlite3'),
+                        help='SQLite cache file (default: $LLM_CACHE_DB or cache/llm_cache.sqlite3)')
+    parser.add_argument('--rate', type=float, default=30.0, help='Maximum LLM calls per minute')
+    parser.add_argument('--modes', default='clinical_expert,patient_education,storytelling',
+                        help='Comma-separated output modes to warm')
+    parser.add_argument('--conditions', default=None, help='Comma-separated conditions (default: all)')
+    parser.add_argument('--limit', type=int, default=None, help='Stop after N new entries')
+    parser.add_argument('--max-failures', type=int, default=5,
+                        help='Abort after N consecutive Claude failures (fallback responses)')
+    parser.add_argument('--local', action='store_true',
+                        help='Store built-in fallback interpretations instead of calling Claude')
+    parser.add_argument('--dry-run', action='store_true', help='Only report how many keys are missing')
+    args = parser.parse_args()
+
+    region_mapper = HeartRegionMapper()
+    all_conditions = list(region_mapper.condition_region_map)
+    conditions = args.conditions.split(',') if args.conditions else all_conditions
+    modes = args.modes.split(',')
+    regions = list(region_mapper.normal_activation_delays)
+
+    clinical_llm = ClinicalDecisionSupportLLM()
+    if args.local:
+        clinical_llm.client = None
+    elif clinical_llm.client is None:
+        print("[ERROR] No Claude client (set ANTHROPIC_API_KEY) - use --local for stand-in responses")
+        return 1
+
+    persistent = PersistentLLMCache(args.db)
+    key_space = list(iter_key_space(conditions, modes, regions))
+
+    missing = [
+        combo for combo in key_space
+        if not persistent.contains(build_cache_key(combo[0], combo[1], combo[2], combo[3]),
+                                   clinical_llm.prompt_versions[combo[2]])
+    ]
+
+    print("=" * 80)
+    print("LLM CACHE PRE-WARMING")
+    print("=" * 80)
+    print(f"Database: {args.db}")
+    print(f"Prompt versions: {clinical_llm.prompt_versions}")
+    print(f"Key space: {len(key_space)} keys, {len(key_space) - len(missing)} already cached, "
+          f"{len(missing)} to warm")
+
+    if args.dry_run or not missing:
+        return 0
+
+    if args.limit is not None:
+        missing = missing[:args.limit]
+
+    min_interval = 60.0 / args.rate if args.rate > 0 and not args.local else 0.0
+    warmed = 0
+    consecutive_failures = 0
+    last_call = 0.0
+    start_time = time.time()
+
+    for position, (top_condition, confidence, output_mode, region_focus) in enumerate(missing, 1):
+        # Rate limit
+        wait = last_call + min_interval - time.time()
+        if wait > 0:
+            time.sleep(wait)
+        last_call = time.time()
+
+        predictions_dict, heart_rate_data, region_health = build_inputs(
+            top_condition, confidence, all_conditions, region_mapper
+        )
+        kwargs = {'region_focus': region_focus} if region_focus else {}
+
+        interpretation, source = clinical_llm.analyze_with_source(
+            predictions_dict, heart_rate_data, region_health,
+            top_condition, confidence, output_mode=output_mode, **kwargs
+        )
+
+        label = f"{top_condition}:{confidence}:{output_mode}" + (f":{region_focus}" if region_focus else '')
+
+        if source != 'claude' and not args.local:
+            consecutive_failures += 1
+            print(f"[{position}/{len(missing)}] [FAIL] {label} - Claude unavailable, not stored")
+            if consecutive_failures >= args.max_failures:
+                print(f"[ERROR] {consecutive_failures} consecutive failures - aborting (re-run to resume)")
+                break
+            continue
+
+        consecutive_failures = 0
+        persistent.put(
+            build_cache_key(top_condition, confidence, output_mode, region_focus),
+            output_mode, clinical_llm.prompt_versions[output_mode], interpretation
+        )
+        warmed += 1
+        print(f"[{position}/{len(missing)}] [OK] {label}")
+
+    elapsed_s = time.time() - start_time
+    stats = persistent.get_stats()
+    print(f"\nWarmed {warmed} keys in {elapsed_s:.1f}s - database now has {stats['rows']} rows")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
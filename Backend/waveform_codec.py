@@ -0,0 +1,129 @@
+"""
+Compact Waveform Encoding
+
+Responses that carry raw waveforms (raw_samples of /api/ecg/beat/<index> and
+/api/ecg/beats/details) write every float32 sample as a JSON number such as
+-0.12345678: ~11 bytes per sample, and the headset parses each one. With
+"waveform_encoding" (JSON body or query string) the samples are sent as one
+base64 string instead:
+
+- json:    plain list of floats (default)
+- int16:   counts of `scale` mV (1 uV unless the beat spans more than +-32.7 mV)
+           around `offset`, 2 bytes per sample
+- float16: half floats relative to `offset` (~0.05% of the beat's range), 2 bytes
+
+    {"encoding": "int16", "dtype": "<i2", "scale": 0.001, "offset": 0.25,
+     "length": 160, "data": "AAD//..."}
+
+Sample i in mV is offset + scale * decoded[i] (little-endian, base64 per
+RFC 4648). decode_waveform() is the reference decoder for clients and tests.
+
+Author: Backend Developer 1
+Project: HoloHuman XR - Immerse the Bay 2025
+"""
+
+import base64
+
+import numpy as np
+
+from ecg_payload import DEFAULT_INT16_SCALE
+
+WAVEFORM_ENCODINGS = ('json', 'int16', 'float16')
+
+INT16_MAX = 32767
+
+
+class WaveformEncodingError(ValueError):
+    """Raised for an unknown waveform encoding or a malformed encoded waveform"""
+    pass
+
+
+def parse_waveform_encoding(value):
+    """
+    Validate a requested waveform encoding
+
+    Args:
+        value: "waveform_encoding" from the request (None -> json)
+
+    Returns:
+        str: one of WAVEFORM_ENCODINGS
+    """
+    encoding = str(value or 'json').strip().lower()
+    if encoding not in WAVEFORM_ENCODINGS:
+        raise WaveformEncodingError(
+            f"Unsupported waveform_encoding {value!r} (expected one of {', '.join(WAVEFORM_ENCODINGS)})"
+        )
+    return encoding
+
+
+def encode_waveform(samples, encoding='json'):
+    """
+    Encode a 1-D millivolt waveform for a JSON response
+
+    Args:
+        samples: 1-D array of samples in mV
+        encoding: 'json', 'int16' or 'float16'
+
+    Returns:
+        the samples array for 'json', else the encoded dict described above
+    """
+    if encoding == 'json':
+        return samples
+
+    samples = np.asarray(samples, dtype=np.float32)
+    if samples.size:
+        low, high = float(samples.min()), float(samples.max())
+    else:
+        low = high = 0.0
+
+    if encoding == 'int16':
+        # Centre the beat's range, widen the step only if 1 uV cannot cover it
+        scale = max(DEFAULT_INT16_SCALE, (high - low) / (2 * INT16_MAX))
+        offset = round((low + high) / 2 / scale) * scale
+        counts = np.clip(np.rint((samples - offset) / scale), -INT16_MAX, INT16_MAX)
+        raw = counts.astype('<i2')
+    elif encoding == 'float16':
+        scale = 1.0
+        offset = (low + high) / 2
+        raw = (samples - offset).astype('<f2')
+    else:
+        raise WaveformEncodingError(f'Unsupported waveform_encoding {encoding!r}')
+
+    return {
+        'encoding': encoding,
+        'dtype': raw.dtype.str,
+        'scale': scale,
+        'offset': offset,
+        'length': int(raw.size),
+        'data': base64.b64encode(raw.tobytes()).decode('ascii')
+    }
+
+
+def decode_waveform(encoded):
+    """
+    Decode a waveform from a response (client/test helper)
+
+    Args:
+        encoded: list of floats ('json') or an encoded dict
+
+    Returns:
+        ndarray: float32 samples in mV
+    """
+    if not isinstance(encoded, dict):
+        return np.asarray(encoded, dtype=np.float32)
+
+    try:
+        dtype = np.dtype(encoded['dtype'])
+        raw = np.frombuffer(base64.b64decode(encoded['data']), dtype=dtype)
+        scale, offset, length = float(encoded['scale']), float(encoded['offset']), int(encoded['length'])
+    except (KeyError, TypeError, ValueError) as e:
+        raise WaveformEncodingError(f'Malformed encoded waveform: {e}')
+
+    if raw.size != length:
+        raise WaveformEncodingError(f'Encoded waveform has {raw.size} samples, header says {length}')
+
+    samples = raw.astype(np.float32)
+    if scale != 1.0:
+        samples *= scale
+    samples += offset
+    return samples
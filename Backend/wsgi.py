@@ -0,0 +1,21 @@
+"""
+WSGI Entry Point for the Pre-Fork Production Server
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+With preload_app (gunicorn.conf.py) this module is imported once in the
+gunicorn master: Flask, NumPy/SciPy, TensorFlow's Python modules, the
+HeartRegionMapper tables and the Claude client are built before forking and
+shared copy-on-write by every worker. The model weights are loaded per worker
+(post_worker_init hook) because TensorFlow's runtime is not fork-safe.
+
+Other WSGI servers must call ecg_api.load_ecg_model() once in each worker
+process, otherwise predictions run in fallback mode.
+
+Author: Backend Developer 1
+Project: HoloHuman XR - Immerse the Bay 2025
+"""
+
+from ecg_api import app, initialize
+
+initialize(load_model=False)